@@ -0,0 +1,146 @@
+"""
+Module providing a pool of reusable result buffers for analysis kernels.
+
+Repeated analysis of series with the same length (e.g. a dashboard refresh
+loop) can reuse output arrays instead of allocating new ones on every call.
+A set handed out by acquire() is returned with release(), either directly
+or through the results backed by it (e.g. the dict of Series returned by
+AnalysisService.analyze(out=pool)).
+Idle buffers are accounted to the memory budget as the 'cache' category
+and are dropped when the budget's limit is exceeded.
+"""
+
+import weakref
+from collections import defaultdict
+from typing import Optional
+import numpy as np
+from numpy.typing import DTypeLike
+from core.memory import MemoryBudget, get_budget
+
+
+class BufferPool:
+    """
+    Pool of output buffers keyed by length.
+
+    Attributes:
+        names (tuple[str, ...]): Names of the buffers handed out per acquire.
+        max_per_length (int): Maximum number of released buffer sets kept per length.
+        dtype (np.dtype): Dtype of the buffers (float64 or float32).
+        budget (MemoryBudget): Budget the idle buffers are accounted to.
+    """
+
+    def __init__(
+        self,
+        names: tuple[str, ...] = ("returns", "volatility"),
+        max_per_length: int = 4,
+        dtype: DTypeLike = np.float64,
+        budget: Optional[MemoryBudget] = None,
+    ) -> None:
+        """
+        Initialize an empty buffer pool.
+
+        Args:
+            names: Names of the buffers in each acquired set.
+            max_per_length: Maximum number of idle buffer sets kept per length.
+            dtype: Dtype of the buffers; must match the analysis precision.
+            budget: Memory budget; the process-wide budget by default.
+        """
+        self.names = names
+        self.max_per_length = max_per_length
+        self.dtype = np.dtype(dtype)
+        self.budget = budget or get_budget()
+        self._free: dict[int, list[dict[str, np.ndarray]]] = defaultdict(list)
+        # Sets handed out and not yet released, held weakly so that sets
+        # the caller drops are simply garbage collected.
+        self._lent: list[tuple[weakref.ref, ...]] = []
+        self.budget.register(self)
+        weakref.finalize(self, BufferPool._drop, self.budget, self._free, self._size(1))
+
+    def _size(self, length: int) -> int:
+        """Bytes of one buffer set."""
+        return length * len(self.names) * self.dtype.itemsize
+
+    def acquire(self, length: int) -> dict[str, np.ndarray]:
+        """
+        Get a set of buffers of the given length, reusing a released one if possible.
+
+        Args:
+            length: Length of every buffer in the set.
+
+        Returns:
+            dict[str, np.ndarray]: Mapping of buffer name to uninitialized array.
+        """
+        free = self._free.get(length)
+        if free:
+            self.budget.release(self._size(length), "cache")
+            buffers = free.pop()
+        else:
+            buffers = {name: np.empty(length, dtype=self.dtype) for name in self.names}
+        self._lent.append(tuple(weakref.ref(buffers[name]) for name in self.names))
+        return buffers
+
+    def _reclaim(self, values: dict) -> Optional[dict[str, np.ndarray]]:
+        """Remove and return the lent set sharing memory with values, if any."""
+        arrays = [np.asarray(v) for v in values.values()]
+        for position, refs in enumerate(self._lent):
+            buffers = [ref() for ref in refs]
+            if any(b is None for b in buffers):
+                continue
+            if any(np.may_share_memory(a, b) for a in arrays for b in buffers):
+                del self._lent[position]
+                return dict(zip(self.names, buffers))
+        return None
+
+    def release(self, buffers: dict[str, np.ndarray]) -> None:
+        """
+        Return a buffer set to the pool.
+
+        The caller must not use any Series or array backed by these buffers
+        after releasing them.
+
+        Args:
+            buffers: Buffer set previously obtained from acquire(), or
+                results (e.g. Series) backed by one. Results that are not
+                backed by a set of this pool, such as those of the pandas
+                fallback for unclean prices, are ignored.
+        """
+        self._lent = [
+            refs for refs in self._lent if all(ref() is not None for ref in refs)
+        ]
+        owned = self._reclaim(buffers)
+        if owned is not None:
+            buffers = owned
+        elif not all(isinstance(v, np.ndarray) for v in buffers.values()):
+            return
+        lengths = {array.shape[0] for array in buffers.values()}
+        if len(lengths) != 1 or set(buffers) != set(self.names):
+            raise ValueError("Buffer set does not belong to this pool")
+        length = lengths.pop()
+        free = self._free[length]
+        if len(free) < self.max_per_length:
+            free.append(buffers)
+            self.budget.allocate(self._size(length), "cache")
+
+    def spill(self, size: int) -> int:
+        """
+        Drop idle buffer sets until at least size bytes are freed.
+
+        Args:
+            size: Bytes to free.
+
+        Returns:
+            int: Bytes freed.
+        """
+        freed = 0
+        for length, free in self._free.items():
+            while free and freed < size:
+                free.pop()
+                self.budget.release(self._size(length), "cache")
+                freed += self._size(length)
+        return freed
+
+    @staticmethod
+    def _drop(budget: MemoryBudget, free: dict, unit: int) -> None:
+        """Release the account of idle buffers of a garbage-collected pool."""
+        size = sum(length * unit * len(sets) for length, sets in free.items())
+        budget.release(size, "cache")
@@ -0,0 +1,332 @@
+"""
+Module for rolling covariance, correlation and beta of many assets.
+
+Rolling covariance matrices are derived from prefix sums of return
+cross-products, so each window costs O(k^2) regardless of its length.
+The full (time, k, k) result of hundreds of assets does not fit in memory,
+so matrices are produced in time chunks whose size is bounded by a memory
+budget. The cross-products of the last window - 1 rows are carried from
+chunk to chunk, so the outer product of every row is computed once, and
+each chunk re-accumulates its own prefix sums, which bounds floating-point
+cancellation. When even one window of (k, k) cross-products exceeds the
+budget, only the running window sums are carried and each chunk is filled
+block by block of assets: rows entering and leaving the window update the
+sums.
+Rolling beta only needs cross-products with the benchmark and is computed
+in O(n*k).
+"""
+
+import math
+from typing import Iterator, Mapping, Sequence, Union
+import numpy as np
+import pandas as pd
+from core.exceptions import CalculationError
+from data.alignment import align
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+PriceData = Union[pd.DataFrame, Mapping[str, pd.Series]]
+
+
+def _returns_frame(prices: PriceData) -> pd.DataFrame:
+    """Simple returns of prices aligned on their common dates."""
+    frame = align(prices, "intersection")
+    values = frame.to_numpy(dtype=np.float64)
+    return pd.DataFrame(
+        values[1:] / values[:-1] - 1.0, index=frame.index[1:], columns=frame.columns
+    )
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sums over trailing windows along axis 0 via a zero-padded prefix sum."""
+    prefix = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=prefix[1:])
+    return prefix[window:] - prefix[:-window]
+
+
+class RollingCovariance:
+    """
+    Rolling covariance and correlation matrices of a returns matrix.
+
+    Attributes:
+        symbols (list[str]): Asset symbols in column order.
+        index (pd.Index): Dates of the returns rows.
+        window (int): Rolling window in rows.
+        chunk_rows (int): Number of output rows per chunk.
+        block_size (int): Number of assets per block of cross-products.
+    """
+
+    def __init__(
+        self,
+        returns: pd.DataFrame,
+        window: int = 21,
+        max_chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    ) -> None:
+        """
+        Initialize the calculator.
+
+        Rows with missing values are dropped.
+
+        Args:
+            returns: Returns with dates as rows and assets as columns.
+            window: Rolling window in rows (at least 2).
+            max_chunk_bytes: Memory budget for one chunk of matrices.
+
+        Raises:
+            CalculationError: If the window is invalid or exceeds the data.
+        """
+        returns = returns.dropna()
+        if window < 2:
+            raise CalculationError(f"Window must be at least 2, got {window}")
+        if window > len(returns):
+            raise CalculationError(
+                f"Window {window} exceeds the {len(returns)} available rows"
+            )
+        self.symbols = [str(c) for c in returns.columns]
+        self.index = returns.index
+        self.window = window
+        self._values = returns.to_numpy(dtype=np.float64)
+        # Centering keeps the cross-product sums small.
+        self._values = self._values - self._values.mean(axis=0)
+        self.chunk_rows, self.block_size, self._blocked = self._plan_chunks(
+            max_chunk_bytes // 8, len(self.symbols), window
+        )
+
+    @staticmethod
+    def _plan_chunks(cells: int, size: int, window: int) -> tuple[int, int, bool]:
+        """
+        Choose rows per chunk and assets per block within a budget of cells.
+
+        For R output rows, a chunk holds the output (R*k*k) and the previous
+        chunk still held by the consumer (R*k*k). Without blocking it also
+        holds the cross-products of its R + window - 1 rows and the
+        window - 1 rows carried to the next chunk. With blocks of b assets it
+        holds the running window sums (k*k) and, per block, at most three
+        arrays of R*b*b.
+        """
+        matrix = size * size
+        rows = (cells // matrix - 2 * window + 2) // 3
+        if rows >= 1:
+            return rows, size, False
+        # Half of the budget for the two outputs, the rest for one block.
+        rows = max(1, cells // (4 * matrix))
+        free = max(cells - (2 * rows + 1) * matrix, 0) // (3 * rows)
+        return rows, max(1, min(size, math.isqrt(free))), True
+
+    @classmethod
+    def from_prices(
+        cls, prices: PriceData, window: int = 21, **kwargs
+    ) -> "RollingCovariance":
+        """
+        Create a calculator from prices aligned on their common dates.
+
+        Args:
+            prices: DataFrame or mapping of symbol to price Series.
+            window: Rolling window in rows.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            RollingCovariance: Calculator over simple returns.
+        """
+        return cls(_returns_frame(prices), window, **kwargs)
+
+    def chunks(self) -> Iterator[tuple[pd.Index, np.ndarray]]:
+        """
+        Yield rolling covariance matrices in time chunks.
+
+        Only rows with a full window are produced.
+
+        Yields:
+            tuple: Dates of the chunk and covariances of shape (rows, k, k).
+        """
+        return self._blocked_chunks() if self._blocked else self._carried_chunks()
+
+    def _carried_chunks(self) -> Iterator[tuple[pd.Index, np.ndarray]]:
+        """Chunks from cross-products carried over between chunks."""
+        window, size, values = self.window, len(self.symbols), self._values
+        carry = np.empty((0, size, size))
+        for start in range(window - 1, len(values), self.chunk_rows):
+            stop = min(start + self.chunk_rows, len(values))
+            head = len(carry)
+            new = values[start - window + 1 + head : stop]
+            products = np.empty((head + len(new), size, size))
+            products[:head] = carry
+            del carry
+            np.multiply(new[:, :, None], new[:, None, :], out=products[head:])
+            carry = products[len(products) - window + 1 :].copy()
+            # Window sums are differences of the prefix sums of the products.
+            np.cumsum(products, axis=0, out=products)
+            cross = products[window - 1 :].copy()
+            cross[1:] -= products[: len(products) - window]
+            del products
+            sums = _window_sums(values[start - window + 1 : stop], window)
+            yield self.index[start:stop], self._block(cross, sums)
+
+    def _blocked_chunks(self) -> Iterator[tuple[pd.Index, np.ndarray]]:
+        """Chunks filled block by block from running window sums."""
+        window, size, block = self.window, len(self.symbols), self.block_size
+        values = self._values
+        # Cross-product sums of the window - 1 rows before the next output.
+        running = values[: window - 1].T @ values[: window - 1]
+        for start in range(window - 1, len(values), self.chunk_rows):
+            stop = min(start + self.chunk_rows, len(values))
+            sums = _window_sums(values[start - window + 1 : stop], window)
+            entering = values[start:stop]
+            leaving = values[max(start - window, 0) : stop - window]
+            # The first output has no row leaving its window.
+            skip = len(entering) - len(leaving)
+            cross = np.empty((stop - start, size, size))
+            for i in range(0, size, block):
+                rows = slice(i, i + block)
+                # Covariance is symmetric: fill the lower blocks by transposing.
+                for j in range(i, size, block):
+                    cols = slice(j, j + block)
+                    part = entering[:, rows, None] * entering[:, None, cols]
+                    part[skip:] -= leaving[:, rows, None] * leaving[:, None, cols]
+                    np.cumsum(part, axis=0, out=part)
+                    part += running[rows, cols]
+                    running[rows, cols] = part[-1]
+                    part = self._block(part, sums, rows, cols)
+                    cross[:, rows, cols] = part
+                    cross[:, cols, rows] = part.transpose(0, 2, 1)
+                    del part
+            yield self.index[start:stop], cross
+
+    def _block(
+        self,
+        cross: np.ndarray,
+        sums: np.ndarray,
+        rows: slice = slice(None),
+        cols: slice = slice(None),
+    ) -> np.ndarray:
+        """Turn window sums of cross-products of two asset blocks into covariances."""
+        window = self.window
+        outer = sums[:, rows, None] * sums[:, None, cols]
+        outer /= window
+        cross -= outer
+        cross /= window - 1
+        return cross
+
+    def correlation_chunks(self) -> Iterator[tuple[pd.Index, np.ndarray]]:
+        """
+        Yield rolling correlation matrices in time chunks.
+
+        Yields:
+            tuple: Dates of the chunk and correlations of shape (rows, k, k).
+        """
+        for index, cov in self.chunks():
+            std = np.sqrt(np.maximum(np.diagonal(cov, axis1=1, axis2=2), 0.0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # Two in-place divisions avoid another (rows, k, k) array.
+                cov /= std[:, :, None]
+                cov /= std[:, None, :]
+            yield index, cov
+
+    def pairs(self, pairs: Sequence[tuple[str, str]]) -> pd.DataFrame:
+        """
+        Rolling correlation time series for selected pairs.
+
+        Args:
+            pairs: Pairs of symbols.
+
+        Returns:
+            pd.DataFrame: One column 'A/B' per pair, dates as rows.
+
+        Raises:
+            CalculationError: If a symbol is unknown.
+        """
+        position = {s: i for i, s in enumerate(self.symbols)}
+        unknown = {s for pair in pairs for s in pair} - set(position)
+        if unknown:
+            raise CalculationError(f"Unknown symbols: {', '.join(sorted(unknown))}")
+        rows = np.array([position[a] for a, _ in pairs], dtype=np.intp)
+        cols = np.array([position[b] for _, b in pairs], dtype=np.intp)
+
+        indexes, parts = [], []
+        for index, corr in self.correlation_chunks():
+            indexes.append(index)
+            parts.append(corr[:, rows, cols])
+        return pd.DataFrame(
+            np.concatenate(parts),
+            index=indexes[0].append(indexes[1:]),
+            columns=[f"{a}/{b}" for a, b in pairs],
+        )
+
+    def to_frame(self, kind: str = "correlation") -> pd.DataFrame:
+        """
+        Materialize all matrices as a long DataFrame for export.
+
+        Args:
+            kind: 'correlation' or 'covariance'.
+
+        Returns:
+            pd.DataFrame: Rows indexed by (date, symbol), one column per symbol.
+
+        Raises:
+            ValueError: If kind is not supported.
+        """
+        if kind == "correlation":
+            chunks = self.correlation_chunks()
+        elif kind == "covariance":
+            chunks = self.chunks()
+        else:
+            raise ValueError(f"Unsupported matrix kind: {kind}")
+        size = len(self.symbols)
+        frames = [
+            pd.DataFrame(
+                values.reshape(-1, size),
+                index=pd.MultiIndex.from_product([index, self.symbols]),
+                columns=self.symbols,
+            )
+            for index, values in chunks
+        ]
+        return pd.concat(frames)
+
+
+def rolling_beta(
+    returns: pd.DataFrame,
+    benchmark: Union[str, pd.Series],
+    window: int = 21,
+) -> pd.DataFrame:
+    """
+    Calculate rolling beta of every asset against a benchmark.
+
+    Beta is cov(asset, benchmark) / var(benchmark) over each window, computed
+    from prefix sums of cross-products with the benchmark in O(n*k).
+
+    Args:
+        returns: Returns with dates as rows and assets as columns.
+        benchmark: Column name in returns, or a separate returns Series.
+        window: Rolling window in rows (at least 2).
+
+    Returns:
+        pd.DataFrame: Beta with dates as rows and assets as columns; NaN
+            until the window is full.
+
+    Raises:
+        CalculationError: If the benchmark is unknown or the window invalid.
+    """
+    if window < 2:
+        raise CalculationError(f"Window must be at least 2, got {window}")
+    if isinstance(benchmark, str):
+        if benchmark not in returns.columns:
+            raise CalculationError(f"Unknown benchmark: {benchmark}")
+        frame = returns.dropna()
+        bench = frame[benchmark].to_numpy(dtype=np.float64)
+    else:
+        frame = returns.join(benchmark.rename("__benchmark__"), how="inner").dropna()
+        bench = frame.pop("__benchmark__").to_numpy(dtype=np.float64)
+    values = frame.to_numpy(dtype=np.float64)
+
+    result = np.full(values.shape, np.nan)
+    if window <= len(values):
+        values = values - values.mean(axis=0)
+        bench = bench - bench.mean()
+        sum_x = _window_sums(values, window)
+        sum_b = _window_sums(bench, window)
+        cross = _window_sums(values * bench[:, None], window)
+        var_b = _window_sums(bench * bench, window) - sum_b * sum_b / window
+        cov = cross - sum_x * sum_b[:, None] / window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[window - 1 :] = cov / var_b[:, None]
+    return pd.DataFrame(result, index=frame.index, columns=frame.columns)
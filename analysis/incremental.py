@@ -0,0 +1,233 @@
+"""
+Module for incremental (streaming) calculation of returns, volatility and correlation.
+
+Each update costs O(1) per symbol (O(k^2) for a k-asset correlation update),
+so analytics can follow a live feed without recomputing over history. The
+rolling volatility matches VolatilityCalculator: sample standard deviation
+of the last ``window`` returns scaled by ``sqrt(window)``.
+"""
+
+from collections import deque
+from typing import Optional, Sequence
+import numpy as np
+import pandas as pd
+from core.exceptions import CalculationError
+
+
+class RollingMoments:
+    """Rolling mean and sample variance over a fixed window with O(1) updates."""
+
+    def __init__(self, window: int) -> None:
+        """
+        Initialize an empty window.
+
+        Args:
+            window: Number of most recent values to keep.
+
+        Raises:
+            CalculationError: If window is not a positive integer.
+        """
+        if window < 1:
+            raise CalculationError(f"Window must be positive, got {window}")
+        self.window = window
+        self.values: deque[float] = deque(maxlen=window)
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the window is full."""
+        return len(self.values) == self.window
+
+    def update(self, x: float) -> None:
+        """
+        Add a value, evicting the oldest one once the window is full.
+
+        Args:
+            x: New value.
+        """
+        if self.is_ready:
+            y = self.values[0]
+            delta = x - y
+            new_mean = self.mean + delta / self.window
+            self._m2 = max(self._m2 + delta * (x - new_mean + y - self.mean), 0.0)
+            self.mean = new_mean
+        else:
+            count = len(self.values) + 1
+            delta = x - self.mean
+            self.mean += delta / count
+            self._m2 += delta * (x - self.mean)
+        self.values.append(x)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of a full window, NaN otherwise."""
+        if not self.is_ready or self.window < 2:
+            return float("nan")
+        return float(np.sqrt(self._m2 / (self.window - 1)))
+
+
+class IncrementalVolatility:
+    """Incremental returns and rolling volatility for a single price stream."""
+
+    def __init__(self, window: int = 21, log_returns: bool = True) -> None:
+        """
+        Initialize the state.
+
+        Args:
+            window: Rolling volatility window in observations.
+            log_returns: If True, use log returns; otherwise simple returns.
+        """
+        self.window = window
+        self.log_returns = log_returns
+        self.last_price: Optional[float] = None
+        self.last_return = float("nan")
+        self.moments = RollingMoments(window)
+
+    def update(self, price: float) -> Optional[float]:
+        """
+        Feed a new price.
+
+        Args:
+            price: Latest price.
+
+        Returns:
+            Optional[float]: The new return, or None for the first price.
+        """
+        previous, self.last_price = self.last_price, price
+        if previous is None:
+            return None
+        if self.log_returns:
+            value = float(np.log(price / previous))
+        else:
+            value = price / previous - 1.0
+        self.last_return = value
+        self.moments.update(value)
+        return value
+
+    @property
+    def volatility(self) -> float:
+        """Rolling volatility scaled by sqrt(window), NaN during warm-up."""
+        return self.moments.std * np.sqrt(self.window)
+
+
+class RollingCorrelation:
+    """Rolling correlation matrix of return vectors with O(k^2) updates."""
+
+    def __init__(self, symbols: Sequence[str], window: int = 21) -> None:
+        """
+        Initialize an empty window.
+
+        Args:
+            symbols: Asset symbols defining the vector order.
+            window: Number of most recent return vectors to keep.
+        """
+        self.symbols = list(symbols)
+        self.window = window
+        size = len(self.symbols)
+        self.rows: deque[np.ndarray] = deque(maxlen=window)
+        self._sum = np.zeros(size)
+        self._cross = np.zeros((size, size))
+
+    def update(self, returns: np.ndarray) -> None:
+        """
+        Add a return vector, evicting the oldest one once the window is full.
+
+        Args:
+            returns: Returns of all symbols for one period.
+        """
+        row = np.asarray(returns, dtype=np.float64)
+        if len(self.rows) == self.window:
+            old = self.rows[0]
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+        self.rows.append(row)
+        self._sum += row
+        self._cross += np.outer(row, row)
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Return the correlation matrix over the current window.
+
+        Returns:
+            pd.DataFrame: Correlation matrix (NaN until two vectors are seen).
+        """
+        count = len(self.rows)
+        size = len(self.symbols)
+        if count < 2:
+            values = np.full((size, size), np.nan)
+        else:
+            cov = (self._cross - np.outer(self._sum, self._sum) / count) / (count - 1)
+            std = np.sqrt(np.maximum(np.diag(cov), 0.0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = cov / np.outer(std, std)
+        return pd.DataFrame(values, index=self.symbols, columns=self.symbols)
+
+
+class IncrementalAnalytics:
+    """Incremental returns, volatility and cross-asset correlation for many symbols."""
+
+    def __init__(
+        self, symbols: Sequence[str], window: int = 21, log_returns: bool = True
+    ) -> None:
+        """
+        Initialize per-symbol state.
+
+        Args:
+            symbols: Symbols expected in the stream.
+            window: Rolling window for volatility and correlation.
+            log_returns: If True, use log returns; otherwise simple returns.
+        """
+        self.symbols = list(symbols)
+        self.log_returns = log_returns
+        self.states = {s: IncrementalVolatility(window, log_returns) for s in symbols}
+        self.correlation = RollingCorrelation(self.symbols, window)
+        self._snapshot_prices: Optional[np.ndarray] = None
+
+    def update(self, symbol: str, price: float) -> Optional[float]:
+        """
+        Feed a new price for a symbol.
+
+        Args:
+            symbol: Symbol of the tick.
+            price: Latest price.
+
+        Returns:
+            Optional[float]: The new return, or None for the first price.
+
+        Raises:
+            CalculationError: If the symbol is unknown.
+        """
+        state = self.states.get(symbol)
+        if state is None:
+            raise CalculationError(f"Unknown symbol in stream: {symbol}")
+        return state.update(price)
+
+    def snapshot(self) -> dict:
+        """
+        Take a synchronized snapshot of the latest prices and update correlation.
+
+        Correlation is computed over returns between consecutive snapshots,
+        so symbols ticking at different rates are compared on the same grid.
+
+        Returns:
+            dict: 'returns' and 'volatility' per symbol plus the 'correlation' matrix.
+        """
+        prices = np.array(
+            [
+                np.nan if s.last_price is None else s.last_price
+                for s in self.states.values()
+            ]
+        )
+        if self._snapshot_prices is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = prices / self._snapshot_prices
+                step = np.log(ratio) if self.log_returns else ratio - 1.0
+            if np.all(np.isfinite(step)):
+                self.correlation.update(step)
+        self._snapshot_prices = prices
+        return {
+            "returns": {s: st.last_return for s, st in self.states.items()},
+            "volatility": {s: st.volatility for s, st in self.states.items()},
+            "correlation": self.correlation.correlation(),
+        }
@@ -0,0 +1,509 @@
+"""
+Module providing low-level numerical kernels for returns and rolling statistics.
+
+Kernels operate on contiguous float64 or float32 arrays and write into
+preallocated output buffers of the same dtype. Whatever the storage dtype,
+arithmetic and rolling accumulators run in float64. Two interchangeable
+backends are available:
+
+- ``"numba"``: a fused single-pass loop compiled with ``nogil=True`` so that
+  several kernels can run concurrently from a thread pool. When numba is not
+  installed the same loop runs as plain Python, which keeps the code path
+  testable but is only suitable for small inputs.
+- ``"numpy"``: a vectorized implementation that processes the data in fixed
+  size blocks, so scratch memory stays bounded regardless of input length.
+
+The default backend is ``"numba"`` when numba is importable and ``"numpy"``
+otherwise. Inputs are expected to be finite; callers are responsible for
+handling missing values before calling into a kernel.
+"""
+
+from typing import Callable, Iterable, Optional
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+
+
+HAS_NUMBA = numba is not None
+
+BACKENDS = ("numba", "numpy")
+
+DEFAULT_BACKEND = "numba" if HAS_NUMBA else "numpy"
+
+METRICS = ("returns", "mean", "std", "drawdown")
+
+BLOCK_SIZE = 4096
+
+_EMPTY = np.empty(0, dtype=np.float64)
+
+
+def _jit(func: Callable) -> Callable:
+    """Compile a loop kernel with numba if available, otherwise return it as is."""
+    if numba is None:
+        return func
+    return numba.njit(nogil=True, cache=True)(func)
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    """Return a validated backend name, falling back to the default."""
+    if backend is None:
+        return DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend: {backend}")
+    return backend
+
+
+def _as_float_array(values: np.ndarray) -> np.ndarray:
+    """Return values as a contiguous 1-D float32/float64 array, copying only if needed."""
+    dtype = np.float32 if getattr(values, "dtype", None) == np.float32 else np.float64
+    array = np.ascontiguousarray(values, dtype=dtype)
+    if array.ndim != 1:
+        raise ValueError("Kernel input must be one-dimensional")
+    return array
+
+
+def _check_out(
+    out: Optional[np.ndarray], length: int, name: str, dtype=np.float64
+) -> np.ndarray:
+    """Validate a caller-provided output buffer or allocate a new one."""
+    if out is None:
+        return np.empty(length, dtype=dtype)
+    if out.dtype != dtype or out.shape != (length,):
+        raise ValueError(
+            f"Output buffer '{name}' must be {np.dtype(dtype).name} "
+            f"with shape ({length},)"
+        )
+    if not out.flags.c_contiguous or not out.flags.writeable:
+        raise ValueError(f"Output buffer '{name}' must be contiguous and writeable")
+    return out
+
+
+def _check_window(window: int) -> None:
+    """Validate a rolling window size."""
+    if not isinstance(window, (int, np.integer)) or window < 1:
+        raise ValueError(f"Window must be a positive integer, got {window!r}")
+
+
+# -----------------------------
+# Loop kernels
+# -----------------------------
+
+
+@_jit
+def _fused_loop(
+    prices,
+    window,
+    log_returns,
+    scale,
+    ret,
+    mean_out,
+    std_out,
+    dd_out,
+    want_mean,
+    want_std,
+    want_dd,
+):
+    """Single pass computing returns, rolling mean/std of returns and drawdown."""
+    n = prices.shape[0]
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    peak = np.float64(prices[0]) if n > 0 else 0.0
+    if want_dd and n > 0:
+        dd_out[0] = 0.0
+    for i in range(1, n):
+        price = np.float64(prices[i])
+        if want_dd:
+            if price > peak:
+                peak = price
+            dd_out[i] = price / peak - 1.0
+
+        if log_returns:
+            x = np.log(price / np.float64(prices[i - 1]))
+        else:
+            x = price / np.float64(prices[i - 1]) - 1.0
+        j = i - 1
+        ret[j] = x
+        # Accumulate the stored value so that evicting it later cancels exactly;
+        # np.float64() because float() keeps float32 under numba.
+        x = np.float64(ret[j])
+
+        if count < window:
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+        else:
+            y = np.float64(ret[j - window])
+            delta = x - y
+            new_mean = mean + delta / window
+            m2 += delta * (x - new_mean + y - mean)
+            mean = new_mean
+            if m2 < 0.0:
+                m2 = 0.0
+
+        if count < window:
+            if want_mean:
+                mean_out[j] = np.nan
+            if want_std:
+                std_out[j] = np.nan
+        else:
+            if want_mean:
+                mean_out[j] = mean
+            if want_std:
+                if window > 1:
+                    std_out[j] = np.sqrt(m2 / (window - 1)) * scale
+                else:
+                    std_out[j] = np.nan
+
+
+@_jit
+def _rolling_loop(values, window, scale, mean_out, std_out, want_mean, want_std):
+    """Single pass computing rolling mean and standard deviation."""
+    n = values.shape[0]
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        x = np.float64(values[i])
+        if count < window:
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+        else:
+            y = np.float64(values[i - window])
+            delta = x - y
+            new_mean = mean + delta / window
+            m2 += delta * (x - new_mean + y - mean)
+            mean = new_mean
+            if m2 < 0.0:
+                m2 = 0.0
+
+        if count < window:
+            if want_mean:
+                mean_out[i] = np.nan
+            if want_std:
+                std_out[i] = np.nan
+        else:
+            if want_mean:
+                mean_out[i] = mean
+            if want_std:
+                if window > 1:
+                    std_out[i] = np.sqrt(m2 / (window - 1)) * scale
+                else:
+                    std_out[i] = np.nan
+
+
+# -----------------------------
+# NumPy kernels
+# -----------------------------
+
+
+def _returns_numpy(prices: np.ndarray, log_returns: bool, out: np.ndarray) -> None:
+    """Compute returns in place into out without temporaries."""
+    if out.dtype != np.float64:
+        # Reduced-precision storage: compute each block in float64 scratch.
+        scratch = np.empty(BLOCK_SIZE, dtype=np.float64)
+        for start in range(0, out.shape[0], BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, out.shape[0])
+            block = scratch[: stop - start]
+            np.divide(
+                prices[start + 1 : stop + 1],
+                prices[start:stop],
+                out=block,
+                dtype=np.float64,
+            )
+            if log_returns:
+                np.log(block, out=block)
+            else:
+                np.subtract(block, 1.0, out=block)
+            out[start:stop] = block
+        return
+    np.divide(prices[1:], prices[:-1], out=out)
+    if log_returns:
+        np.log(out, out=out)
+    else:
+        np.subtract(out, 1.0, out=out)
+
+
+def _rolling_numpy(
+    values: np.ndarray,
+    window: int,
+    scale: float,
+    mean_out: Optional[np.ndarray],
+    std_out: Optional[np.ndarray],
+    block: int = BLOCK_SIZE,
+) -> None:
+    """
+    Compute rolling mean/std from blocked prefix sums.
+
+    Each block re-accumulates its prefix sums from the start of its first
+    window, shifted by the first value of that segment, which bounds the
+    cancellation error in the sum of squares by the block length rather than
+    the series length. Scratch memory is O(window + block).
+    """
+    n = values.shape[0]
+    if n == 0:
+        return
+    block = max(block, window)
+    sum1 = np.empty(window + block + 1, dtype=np.float64)
+    sum2 = np.empty(window + block + 1, dtype=np.float64)
+    tmp = np.empty(window + block, dtype=np.float64)
+    # float64 scratch for the variance when results are stored in float32.
+    var = None if std_out is None or std_out.dtype == np.float64 else np.empty(block)
+
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        lo = max(start - window + 1, 0)
+        seg = stop - lo
+        shift = float(values[lo])
+
+        x = tmp[:seg]
+        np.subtract(values[lo:stop], shift, out=x, dtype=np.float64)
+        c1 = sum1[: seg + 1]
+        c2 = sum2[: seg + 1]
+        c1[0] = 0.0
+        c2[0] = 0.0
+        np.cumsum(x, out=c1[1:])
+        np.multiply(x, x, out=x)
+        np.cumsum(x, out=c2[1:])
+
+        # Window sums ending at the first full window inside the segment.
+        first = max(start, window - 1)
+        if first >= stop:
+            count = 0
+        else:
+            count = stop - first
+            offset = first - lo + 1
+            s1 = tmp[:count]
+            np.subtract(
+                c1[offset : offset + count],
+                c1[offset - window : offset - window + count],
+                out=s1,
+            )
+            s2 = c2[offset - window : offset - window + count]
+            np.subtract(c2[offset : offset + count], s2, out=s2)
+
+            if mean_out is not None:
+                mo = mean_out[first:stop]
+                np.divide(s1, window, out=mo)
+                mo += shift
+            if std_out is not None:
+                so = std_out[first:stop] if var is None else var[:count]
+                if window > 1:
+                    # var = (S2 - S1^2 / w) / (w - 1)
+                    np.multiply(s1, s1, out=so)
+                    so /= window
+                    np.subtract(s2, so, out=so)
+                    so /= window - 1
+                    np.maximum(so, 0.0, out=so)
+                    np.sqrt(so, out=so)
+                    if scale != 1.0:
+                        so *= scale
+                else:
+                    so.fill(np.nan)
+                if var is not None:
+                    std_out[first:stop] = so
+
+        if first > start:
+            warm_stop = min(first, stop)
+            if mean_out is not None:
+                mean_out[start:warm_stop] = np.nan
+            if std_out is not None:
+                std_out[start:warm_stop] = np.nan
+
+
+def _drawdown_numpy(prices: np.ndarray, out: np.ndarray) -> None:
+    """Compute drawdown from running peak in place into out."""
+    np.maximum.accumulate(prices, out=out)
+    np.divide(prices, out, out=out)
+    np.subtract(out, 1.0, out=out)
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+
+
+def returns(
+    prices: np.ndarray, log_returns: bool = True, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Compute period returns from prices.
+
+    Args:
+        prices: 1-D array of prices.
+        log_returns: If True, compute log returns; otherwise simple returns.
+        out: Optional preallocated output of length ``len(prices) - 1``.
+
+    Returns:
+        np.ndarray: Returns array of length ``len(prices) - 1``.
+    """
+    prices = _as_float_array(prices)
+    out = _check_out(out, max(prices.shape[0] - 1, 0), "returns", prices.dtype)
+    if prices.shape[0] > 1:
+        _returns_numpy(prices, log_returns, out)
+    return out
+
+
+def rolling_mean(
+    values: np.ndarray,
+    window: int,
+    out: Optional[np.ndarray] = None,
+    backend: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Compute the rolling mean with NaN for the first ``window - 1`` entries.
+
+    Args:
+        values: 1-D array of finite values.
+        window: Rolling window size.
+        out: Optional preallocated output of the same length as values.
+        backend: Kernel backend, ``"numba"`` or ``"numpy"``.
+
+    Returns:
+        np.ndarray: Rolling mean array.
+    """
+    _check_window(window)
+    values = _as_float_array(values)
+    out = _check_out(out, values.shape[0], "mean", values.dtype)
+    if _resolve_backend(backend) == "numba":
+        _rolling_loop(values, window, 1.0, out, _EMPTY, True, False)
+    else:
+        _rolling_numpy(values, window, 1.0, out, None)
+    return out
+
+
+def rolling_std(
+    values: np.ndarray,
+    window: int,
+    out: Optional[np.ndarray] = None,
+    scale: float = 1.0,
+    backend: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Compute the rolling sample standard deviation (ddof=1).
+
+    Matches ``pd.Series.rolling(window).std()`` for finite inputs: the first
+    ``window - 1`` entries are NaN, as is every entry when ``window == 1``.
+
+    Args:
+        values: 1-D array of finite values.
+        window: Rolling window size.
+        out: Optional preallocated output of the same length as values.
+        scale: Factor applied to the result (e.g. ``sqrt(window)``).
+        backend: Kernel backend, ``"numba"`` or ``"numpy"``.
+
+    Returns:
+        np.ndarray: Rolling standard deviation array.
+    """
+    _check_window(window)
+    values = _as_float_array(values)
+    out = _check_out(out, values.shape[0], "std", values.dtype)
+    if _resolve_backend(backend) == "numba":
+        _rolling_loop(values, window, float(scale), _EMPTY, out, False, True)
+    else:
+        _rolling_numpy(values, window, float(scale), None, out)
+    return out
+
+
+def drawdown(prices: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute drawdown relative to the running peak price.
+
+    Args:
+        prices: 1-D array of prices.
+        out: Optional preallocated output of the same length as prices.
+
+    Returns:
+        np.ndarray: Drawdown array with values in ``[-1, 0]``.
+    """
+    prices = _as_float_array(prices)
+    out = _check_out(out, prices.shape[0], "drawdown", prices.dtype)
+    if prices.shape[0]:
+        _drawdown_numpy(prices, out)
+    return out
+
+
+def fused_statistics(
+    prices: np.ndarray,
+    window: int,
+    log_returns: bool = True,
+    out: Optional[dict[str, np.ndarray]] = None,
+    metrics: Optional[Iterable[str]] = None,
+    scale: float = 1.0,
+    backend: Optional[str] = None,
+) -> dict[str, np.ndarray]:
+    """
+    Compute returns, rolling mean/std of returns and drawdown in one pass.
+
+    Rolling statistics are computed over the returns, so ``returns``, ``mean``
+    and ``std`` have length ``len(prices) - 1`` while ``drawdown`` has the
+    length of prices.
+
+    Args:
+        prices: 1-D array of finite, positive prices.
+        window: Rolling window size applied to returns.
+        log_returns: If True, compute log returns; otherwise simple returns.
+        out: Optional mapping of metric name to preallocated output buffer.
+        metrics: Metrics to compute (subset of METRICS). Defaults to all.
+        scale: Factor applied to the rolling standard deviation.
+        backend: Kernel backend, ``"numba"`` or ``"numpy"``.
+
+    Returns:
+        dict[str, np.ndarray]: Mapping of metric name to result array.
+    """
+    _check_window(window)
+    wanted = tuple(METRICS if metrics is None else metrics)
+    unknown = set(wanted) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}")
+
+    prices = _as_float_array(prices)
+    if prices.shape[0] < 2:
+        raise ValueError("At least two prices are required")
+    out = out or {}
+    length = prices.shape[0] - 1
+
+    dtype = prices.dtype
+    result = {"returns": _check_out(out.get("returns"), length, "returns", dtype)}
+    for name in ("mean", "std"):
+        if name in wanted:
+            result[name] = _check_out(out.get(name), length, name, dtype)
+    if "drawdown" in wanted:
+        result["drawdown"] = _check_out(
+            out.get("drawdown"), prices.shape[0], "drawdown", dtype
+        )
+
+    if _resolve_backend(backend) == "numba":
+        _fused_loop(
+            prices,
+            window,
+            log_returns,
+            float(scale),
+            result["returns"],
+            result.get("mean", _EMPTY),
+            result.get("std", _EMPTY),
+            result.get("drawdown", _EMPTY),
+            "mean" in result,
+            "std" in result,
+            "drawdown" in result,
+        )
+    else:
+        _returns_numpy(prices, log_returns, result["returns"])
+        if "mean" in result or "std" in result:
+            _rolling_numpy(
+                result["returns"],
+                window,
+                float(scale),
+                result.get("mean"),
+                result.get("std"),
+            )
+        if "drawdown" in result:
+            _drawdown_numpy(prices, result["drawdown"])
+
+    return {name: result[name] for name in METRICS if name in result}
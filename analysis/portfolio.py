@@ -0,0 +1,191 @@
+"""
+Module for portfolio-level analytics over a shared ticker universe.
+
+Computes the returns matrix and covariance matrix of the universe once and
+evaluates any number of portfolio weight vectors as matrix products:
+weighted returns, portfolio volatility and contribution to risk, optionally
+with periodic rebalancing. Raises CalculationError on invalid input.
+"""
+
+from typing import Mapping, Union
+import numpy as np
+import pandas as pd
+from core.exceptions import CalculationError
+from data.alignment import align
+
+Weights = Union[np.ndarray, pd.DataFrame, Mapping[str, Mapping[str, float]]]
+Rebalance = Union[int, str, None]
+
+
+class PortfolioCalculator:
+    """
+    Calculator for many portfolios sharing one universe of assets.
+
+    Attributes:
+        symbols (list[str]): Asset symbols in column order.
+        index (pd.Index): Dates of the returns rows.
+        returns (np.ndarray): Simple returns matrix of shape (time, assets).
+        mean (np.ndarray): Mean return per asset.
+        cov (np.ndarray): Sample covariance matrix of asset returns.
+    """
+
+    def __init__(self, prices: Union[pd.DataFrame, Mapping[str, pd.Series]]) -> None:
+        """
+        Build the shared returns and covariance matrices.
+
+        Prices are aligned on the dates common to all assets.
+
+        Args:
+            prices: DataFrame or mapping of symbol to price Series.
+
+        Raises:
+            CalculationError: If fewer than two common price rows are available.
+        """
+        frame = align(prices, "intersection")
+        if len(frame) < 2 or frame.shape[1] == 0:
+            raise CalculationError("Portfolio analysis needs at least two common rows")
+        values = frame.to_numpy(dtype=np.float64)
+
+        self.symbols = [str(c) for c in frame.columns]
+        self.index = frame.index[1:]
+        self.returns = values[1:] / values[:-1] - 1.0
+        self.mean = self.returns.mean(axis=0)
+        self.cov = np.atleast_2d(np.cov(self.returns, rowvar=False))
+
+    def weights_matrix(self, weights: Weights) -> tuple[list[str], np.ndarray]:
+        """
+        Normalize weights into a (portfolios, assets) matrix.
+
+        Args:
+            weights: Array of shape (portfolios, assets) or (assets,), a DataFrame
+                with portfolios as rows and symbols as columns, or a mapping of
+                portfolio name to {symbol: weight}. Missing symbols weigh zero.
+
+        Returns:
+            tuple: Portfolio names and the weights matrix.
+
+        Raises:
+            CalculationError: If weights do not match the universe.
+        """
+        if isinstance(weights, Mapping):
+            weights = pd.DataFrame.from_dict(weights, orient="index")
+        if isinstance(weights, pd.DataFrame):
+            unknown = set(map(str, weights.columns)) - set(self.symbols)
+            if unknown:
+                raise CalculationError(
+                    f"Unknown symbols in weights: {', '.join(sorted(unknown))}"
+                )
+            frame = weights.reindex(columns=self.symbols).fillna(0.0)
+            return [str(n) for n in frame.index], frame.to_numpy(dtype=np.float64)
+
+        matrix = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        if matrix.ndim != 2 or matrix.shape[1] != len(self.symbols):
+            raise CalculationError(
+                f"Weights must have {len(self.symbols)} columns, got {matrix.shape}"
+            )
+        return [str(i) for i in range(matrix.shape[0])], matrix
+
+    def volatility(self, weights: Weights) -> pd.Series:
+        """
+        Calculate per-period portfolio volatility from the covariance matrix.
+
+        Args:
+            weights: Portfolio weights (see weights_matrix).
+
+        Returns:
+            pd.Series: Volatility per portfolio.
+        """
+        names, matrix = self.weights_matrix(weights)
+        variance = np.einsum("pi,pi->p", matrix @ self.cov, matrix)
+        return pd.Series(np.sqrt(np.maximum(variance, 0.0)), index=names)
+
+    def risk_contribution(self, weights: Weights) -> pd.DataFrame:
+        """
+        Calculate each asset's contribution to portfolio volatility.
+
+        Contributions ``w_i * (Σw)_i / σ`` sum to the portfolio volatility.
+
+        Args:
+            weights: Portfolio weights (see weights_matrix).
+
+        Returns:
+            pd.DataFrame: Contributions with portfolios as rows and symbols as columns.
+        """
+        names, matrix = self.weights_matrix(weights)
+        marginal = matrix @ self.cov
+        sigma = np.sqrt(np.maximum(np.einsum("pi,pi->p", marginal, matrix), 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            contribution = matrix * marginal / sigma[:, None]
+        return pd.DataFrame(
+            np.nan_to_num(contribution), index=names, columns=self.symbols
+        )
+
+    def portfolio_returns(
+        self, weights: Weights, rebalance: Rebalance = None
+    ) -> pd.DataFrame:
+        """
+        Calculate weighted portfolio returns for every period.
+
+        Without rebalancing, weights are held constant each period. With a
+        schedule, weights are reset to target at the start of each segment
+        and drift with asset prices in between. Weights are fractions of
+        capital and need not sum to 1 (leveraged or long/short portfolios):
+        each period's return is the profit of the drifted positions divided
+        by the capital at the start of that period.
+
+        Args:
+            weights: Portfolio weights (see weights_matrix).
+            rebalance: None for constant weights, an int number of periods
+                between rebalances, or a pandas period frequency (e.g. 'M', 'Q').
+
+        Returns:
+            pd.DataFrame: Returns with dates as rows and portfolios as columns.
+        """
+        names, matrix = self.weights_matrix(weights)
+        if rebalance is None:
+            values = self.returns @ matrix.T
+        else:
+            values = np.empty((self.returns.shape[0], matrix.shape[0]))
+            bounds = self._segments(rebalance)
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                growth = np.cumprod(1.0 + self.returns[start:stop], axis=0)
+                # Exposure of each portfolio, starting at the weight sum.
+                exposure = np.vstack([matrix.sum(axis=1), growth @ matrix.T])
+                # Capital is 1 at the rebalance plus the profit since, so
+                # leveraged and long/short weights need not sum to 1.
+                capital = 1.0 + exposure[:-1] - exposure[0]
+                values[start:stop] = np.diff(exposure, axis=0) / capital
+        return pd.DataFrame(values, index=self.index, columns=names)
+
+    def summary(self, weights: Weights) -> pd.DataFrame:
+        """
+        Calculate mean return and volatility per portfolio.
+
+        Args:
+            weights: Portfolio weights (see weights_matrix).
+
+        Returns:
+            pd.DataFrame: Columns 'mean_return' and 'volatility' per portfolio.
+        """
+        names, matrix = self.weights_matrix(weights)
+        return pd.DataFrame(
+            {
+                "mean_return": matrix @ self.mean,
+                "volatility": self.volatility(matrix).to_numpy(),
+            },
+            index=names,
+        )
+
+    def _segments(self, rebalance: Rebalance) -> np.ndarray:
+        """Return row offsets where rebalancing segments start, plus the end."""
+        length = self.returns.shape[0]
+        if isinstance(rebalance, str):
+            periods = pd.DatetimeIndex(self.index).to_period(rebalance)
+            starts = np.flatnonzero(
+                np.concatenate(([True], periods[1:] != periods[:-1]))
+            )
+        elif isinstance(rebalance, (int, np.integer)) and rebalance > 0:
+            starts = np.arange(0, length, rebalance)
+        else:
+            raise CalculationError(f"Invalid rebalance schedule: {rebalance!r}")
+        return np.append(starts, length)
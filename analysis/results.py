@@ -0,0 +1,311 @@
+"""
+Module defining a columnar container for per-symbol analysis results.
+
+AnalysisResult stores every metric as one contiguous (time, symbols) array
+over an index shared by all symbols (the union of their dates), with NaN
+where a symbol has no row. Arrays are column-major, so each symbol's rows
+form a contiguous block that kernels can write into directly and that is
+exposed without copying.
+
+For backward compatibility the container is a read-only mapping of symbol
+to a mapping of metric to Series (``results['AAPL']['returns']``); these
+per-symbol Series are created lazily on access and cover the symbol's own
+dates only. Cross-sectional operations such as ranking or top-N selection
+run on the arrays without Python-level loops over symbols.
+"""
+
+from typing import Iterator, Mapping, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from core.memory import MemoryBudget, SpillStore
+
+Rows = Union[slice, np.ndarray]
+
+
+class SymbolView(Mapping):
+    """Read-only mapping of metric to Series for one symbol of an AnalysisResult."""
+
+    def __init__(self, result: "AnalysisResult", column: int) -> None:
+        self._result = result
+        self._column = column
+
+    def __getitem__(self, metric: str) -> pd.Series:
+        result = self._result
+        rows = result.rows[self._column]
+        return pd.Series(
+            result.arrays[metric][rows, self._column],
+            index=result.index[rows],
+            name=result.names[self._column],
+            copy=False,
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._result.arrays)
+
+    def __len__(self) -> int:
+        return len(self._result.arrays)
+
+    def __repr__(self) -> str:
+        return f"SymbolView({self._result.symbols[self._column]!r}, {list(self)})"
+
+
+class AnalysisResult(Mapping):
+    """
+    Analysis metrics of many symbols as (time, symbols) arrays.
+
+    Attributes:
+        index (pd.Index): Dates shared by all symbols.
+        symbols (list[str]): Symbols in column order.
+        arrays (dict[str, np.ndarray] | SpillStore): Column-major array per metric.
+        rows (list[slice | np.ndarray]): Rows of index covered by each symbol.
+        names (list): Name of each symbol's Series.
+    """
+
+    def __init__(
+        self,
+        index: pd.Index,
+        symbols: Sequence[str],
+        arrays: Mapping[str, np.ndarray],
+        rows: Optional[Sequence[Rows]] = None,
+        names: Optional[Sequence] = None,
+    ) -> None:
+        """
+        Initialize the container from precomputed arrays.
+
+        Args:
+            index: Shared dates.
+            symbols: Symbols in column order.
+            arrays: Array of shape (len(index), len(symbols)) per metric.
+            rows: Rows of each symbol (slices or positions); all rows by default.
+            names: Series names per symbol; the symbols by default.
+        """
+        self.index = index
+        self.symbols = list(symbols)
+        # A SpillStore is kept as is, so spilled arrays are mapped on access.
+        self.arrays = arrays if isinstance(arrays, SpillStore) else dict(arrays)
+        self.rows = list(rows) if rows is not None else [slice(None)] * len(symbols)
+        self.names = list(names) if names is not None else list(self.symbols)
+        self._columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._last: Optional[np.ndarray] = None
+
+    @staticmethod
+    def allocate(
+        index: pd.Index,
+        symbols: Sequence[str],
+        metrics: Sequence[str],
+        dtype: np.dtype = np.float64,
+        budget: Optional[MemoryBudget] = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Allocate NaN-filled column-major arrays for the given metrics.
+
+        Args:
+            index: Shared dates.
+            symbols: Symbols in column order.
+            metrics: Metric names.
+            dtype: Storage dtype.
+            budget: Memory budget; arrays that do not fit in its limit are
+                created in spill files (see MemoryBudget.mapped).
+
+        Returns:
+            dict[str, np.ndarray]: Array per metric.
+        """
+        shape = (len(index), len(symbols))
+        size = shape[0] * shape[1] * np.dtype(dtype).itemsize
+        arrays, resident = {}, 0
+        for metric in metrics:
+            if budget is not None and not budget.fits(resident + size):
+                arrays[metric] = budget.mapped(shape, np.nan, dtype, "F", metric)
+            else:
+                arrays[metric] = np.full(shape, np.nan, dtype=dtype, order="F")
+                resident += size
+        return arrays
+
+    @staticmethod
+    def shared_index(indexes: Sequence[pd.Index]) -> tuple[pd.Index, list[Rows]]:
+        """
+        Build the shared index of several symbols and the rows of each one.
+
+        A symbol whose dates form a contiguous block of the shared index gets
+        a slice, so its column block is a view; other symbols get positions.
+
+        Args:
+            indexes: Unique sorted dates of each symbol.
+
+        Returns:
+            tuple: Shared index and the rows of every symbol in it.
+        """
+        if not indexes:
+            return pd.Index([]), []
+        first = indexes[0]
+        if all(index.equals(first) for index in indexes[1:]):
+            return first, [slice(None)] * len(indexes)
+        shared = first.append(list(indexes[1:])).unique().sort_values()
+        rows: list[Rows] = []
+        for index in indexes:
+            positions = shared.get_indexer(index)
+            if not len(positions):
+                rows.append(slice(0, 0))
+            elif positions[-1] - positions[0] + 1 == len(positions):
+                rows.append(slice(int(positions[0]), int(positions[-1]) + 1))
+            else:
+                rows.append(positions)
+        return shared, rows
+
+    @classmethod
+    def from_series(
+        cls, results: Mapping[str, Mapping[str, pd.Series]]
+    ) -> "AnalysisResult":
+        """
+        Build a container from nested per-symbol results.
+
+        Metrics of one symbol must share their index.
+
+        Args:
+            results: Mapping of symbol to mapping of metric to Series.
+
+        Returns:
+            AnalysisResult: Columnar copy of the results.
+        """
+        if isinstance(results, AnalysisResult):
+            return results
+        symbols = list(results)
+        metrics = list(dict.fromkeys(m for ms in results.values() for m in ms))
+        indexes = [next(iter(results[s].values())).index for s in symbols]
+        index, rows = cls.shared_index(indexes)
+        dtype = np.result_type(
+            *(series.dtype for ms in results.values() for series in ms.values())
+        )
+        arrays = cls.allocate(index, symbols, metrics, dtype)
+        for column, symbol in enumerate(symbols):
+            for metric, series in results[symbol].items():
+                arrays[metric][rows[column], column] = series.to_numpy()
+        names = [next(iter(results[s].values())).name for s in symbols]
+        return cls(index, symbols, arrays, rows, names)
+
+    def __getitem__(self, symbol: str) -> SymbolView:
+        return SymbolView(self, self._columns[symbol])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._columns
+
+    def __repr__(self) -> str:
+        return (
+            f"AnalysisResult({len(self.symbols)} symbols x {len(self.index)} rows, "
+            f"metrics={list(self.arrays)})"
+        )
+
+    @property
+    def metrics(self) -> list[str]:
+        """Metric names."""
+        return list(self.arrays)
+
+    def frame(self, metric: str) -> pd.DataFrame:
+        """
+        Return a metric as a DataFrame with dates as rows and symbols as columns.
+
+        Args:
+            metric: Metric name.
+
+        Returns:
+            pd.DataFrame: Frame backed by the metric array where possible.
+        """
+        return pd.DataFrame(
+            self.arrays[metric], index=self.index, columns=self.symbols, copy=False
+        )
+
+    def last_rows(self) -> np.ndarray:
+        """Row of each symbol's latest date (-1 for symbols without rows)."""
+        if self._last is not None:
+            return self._last
+        last = np.empty(len(self.symbols), dtype=np.intp)
+        size = len(self.index)
+        for column, rows in enumerate(self.rows):
+            if isinstance(rows, slice):
+                start, stop, _ = rows.indices(size)
+                last[column] = stop - 1 if stop > start else -1
+            else:
+                last[column] = rows[-1] if len(rows) else -1
+        self._last = last
+        return last
+
+    def cross_section(self, metric: str, row: Optional[int] = None) -> np.ndarray:
+        """
+        Return one value per symbol.
+
+        Args:
+            metric: Metric name.
+            row: Row of the shared index; each symbol's latest row by default.
+
+        Returns:
+            np.ndarray: Values in symbol order (NaN where missing).
+        """
+        values = self.arrays[metric]
+        if row is not None:
+            return values[row]
+        last = self.last_rows()
+        result = values[last, np.arange(len(self.symbols))]
+        result[last < 0] = np.nan
+        return result
+
+    def rank(
+        self, metric: str, row: Optional[int] = None, ascending: bool = False
+    ) -> pd.Series:
+        """
+        Rank symbols by a metric (1 is the best; NaN values rank last).
+
+        Args:
+            metric: Metric name.
+            row: Row of the shared index; each symbol's latest row by default.
+            ascending: If True, the smallest value ranks first.
+
+        Returns:
+            pd.Series: Ranks indexed by symbol.
+        """
+        values = self.cross_section(metric, row).astype(np.float64)
+        keys = np.where(np.isnan(values), np.inf, values if ascending else -values)
+        ranks = np.empty(len(keys), dtype=np.int64)
+        ranks[np.argsort(keys, kind="stable")] = np.arange(1, len(keys) + 1)
+        return pd.Series(ranks, index=self.symbols, name=metric)
+
+    def top(
+        self,
+        metric: str,
+        n: int,
+        row: Optional[int] = None,
+        largest: bool = True,
+    ) -> pd.Series:
+        """
+        Select the n symbols with the largest (or smallest) values of a metric.
+
+        Uses ``np.argpartition``, so the cost is linear in the number of
+        symbols; only the selected values are sorted. NaN values are skipped.
+
+        Args:
+            metric: Metric name.
+            n: Number of symbols.
+            row: Row of the shared index; each symbol's latest row by default.
+            largest: If False, select the smallest values.
+
+        Returns:
+            pd.Series: Selected values indexed by symbol, best first.
+        """
+        values = self.cross_section(metric, row)
+        valid = np.flatnonzero(~np.isnan(values))
+        keys = -values[valid] if largest else values[valid]
+        n = min(max(n, 0), len(valid))
+        if n < len(valid):
+            selected = np.argpartition(keys, n - 1)[:n] if n else valid[:0]
+        else:
+            selected = np.arange(len(valid))
+        selected = selected[np.argsort(keys[selected], kind="stable")]
+        columns = valid[selected]
+        return pd.Series(
+            values[columns], index=[self.symbols[c] for c in columns], name=metric
+        )
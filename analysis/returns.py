@@ -2,25 +2,54 @@
 Module for calculating financial returns.
 
 Provides functionality to compute daily returns from price data,
-including both logarithmic and simple returns. Raises CalculationError
-on invalid input or calculation issues.
+including both logarithmic and simple returns. Returns can be normalized
+to one trading session and annualized using a trading calendar, so that
+rows separated by holidays or data gaps are not treated as consecutive
+periods. Raises CalculationError on invalid input or calculation issues.
 """
 
 import numpy as np
 import pandas as pd
+from core.calendar import CalendarLike, get_calendar
 from core.exceptions import CalculationError
+from core.precision import PrecisionLike, get_policy
 
 
 class ReturnsCalculator:
-    """Calculator for financial returns."""
+    """
+    Calculator for financial returns.
 
-    def calculate(self, prices: pd.Series, log_returns: bool = True) -> pd.Series:
+    Attributes:
+        precision (PrecisionPolicy): Storage precision of the results.
+        calendar (TradingCalendar): Calendar of session counts and annualization.
+    """
+
+    def __init__(
+        self, precision: PrecisionLike = None, calendar: CalendarLike = None
+    ) -> None:
+        """
+        Initialize the calculator.
+
+        Args:
+            precision: 'float64' (default) or 'float32'; returns are always
+                computed in float64 and only stored in this precision.
+            calendar: Trading calendar name ('XNYS' by default, 'FX') or object.
+        """
+        self.precision = get_policy(precision)
+        self.calendar = get_calendar(calendar)
+
+    def calculate(
+        self, prices: pd.Series, log_returns: bool = True, per_session: bool = False
+    ) -> pd.Series:
         """
         Calculate daily returns from price data.
 
         Args:
             prices (pd.Series): Series of closing prices.
             log_returns (bool, optional): If True, calculate log returns; otherwise simple returns. Defaults to True.
+            per_session (bool, optional): If True, convert each return to the
+                equivalent return of one trading session, so a return over a
+                two-session gap is split evenly. Requires a DatetimeIndex.
 
         Returns:
             pd.Series: Series of daily returns.
@@ -29,8 +58,48 @@ class ReturnsCalculator:
             CalculationError: If calculation fails due to invalid input or computation error.
         """
         try:
-            if log_returns:
-                return np.log(prices / prices.shift(1)).dropna()
-            return prices.pct_change().dropna()
+            if prices.dtype != np.float64:
+                prices = prices.astype(np.float64)
+            if log_returns or per_session:
+                returns = np.log(prices / prices.shift(1))
+            else:
+                returns = prices.pct_change()
+            if per_session:
+                # Log returns are additive, so a k-session return is split evenly.
+                returns.iloc[1:] /= self.calendar.elapsed(prices.index)
+                if not log_returns:
+                    returns = np.expm1(returns)
+            return returns.dropna().astype(self.precision.dtype)
+        except Exception as e:
+            raise CalculationError(f"Returns calculation error: {str(e)}")
+
+    def annualized(self, prices: pd.Series, log_returns: bool = True) -> float:
+        """
+        Calculate the annualized return between the first and last price.
+
+        The period is measured in trading sessions of the calendar and
+        scaled by its sessions per year.
+
+        Args:
+            prices (pd.Series): Series of closing prices with a DatetimeIndex.
+            log_returns (bool, optional): If True, return the annualized log
+                return; otherwise the compound annual growth rate.
+
+        Returns:
+            float: Annualized return.
+
+        Raises:
+            CalculationError: If fewer than two prices span at least one session.
+        """
+        prices = prices.dropna()
+        if len(prices) < 2:
+            raise CalculationError("Annualized return needs at least two prices")
+        try:
+            sessions = self.calendar.count(prices.index[0], prices.index[-1])
+            total = float(np.log(prices.iloc[-1] / prices.iloc[0]))
         except Exception as e:
             raise CalculationError(f"Returns calculation error: {str(e)}")
+        if sessions < 1:
+            raise CalculationError("Prices do not span a trading session")
+        rate = total * self.calendar.sessions_per_year / sessions
+        return rate if log_returns else float(np.expm1(rate))
@@ -0,0 +1,383 @@
+"""
+Module for cross-sectional screening and ranking of a symbol universe.
+
+Prices of all symbols are held in one (time, symbols) matrix over the
+union of dates, and every metric is computed for all symbols at once with
+vectorized NumPy over each symbol's own latest observations. Prices are not
+forward-filled, so symbols trading on different calendars get no zero
+returns on the other calendars' dates:
+
+- price: latest price;
+- returns: simple return over the window;
+- volatility: standard deviation of log returns over the window scaled by
+  ``sqrt(window)``, as VolatilityCalculator;
+- drawdown: latest price relative to the running peak (<= 0);
+- max_drawdown: deepest drawdown over the history (<= 0);
+- correlation: correlation of log returns with a benchmark over the window,
+  the benchmark's returns taken between the same dates as the symbol's.
+
+Filters and sort keys are small expressions over these names, for example
+``volatility > 0.05 and drawdown > -0.2`` or ``returns / volatility``. They
+support arithmetic, comparisons, ``and``/``or``/``not``, ``abs()`` and
+numbers, are parsed once into a restricted syntax tree (nothing else is
+evaluated) and are applied to whole metric arrays. Only the metrics an
+expression uses are computed, and the top K symbols are selected with
+``np.argpartition`` in linear time.
+"""
+
+import ast
+from typing import Mapping, Optional, Union
+import numpy as np
+import pandas as pd
+from analysis.results import AnalysisResult
+from core.exceptions import CalculationError
+
+METRICS = ("price", "returns", "volatility", "drawdown", "max_drawdown", "correlation")
+
+PriceData = Union[pd.DataFrame, Mapping[str, pd.Series]]
+
+_BINARY = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+}
+
+_COMPARE = {
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+
+class Expression:
+    """
+    Parsed screening expression.
+
+    Attributes:
+        text (str): Source text.
+        names (set[str]): Metrics used by the expression.
+    """
+
+    def __init__(self, text: str) -> None:
+        """
+        Parse and check an expression.
+
+        Args:
+            text: Expression over METRICS.
+
+        Raises:
+            CalculationError: If the expression is malformed or uses
+                unsupported names or syntax.
+        """
+        self.text = text
+        try:
+            self._tree = ast.parse(text.strip(), mode="eval").body
+        except SyntaxError as e:
+            raise CalculationError(f"Invalid expression '{text}': {e.msg}")
+        self.names: set[str] = set()
+        self._check(self._tree)
+
+    def _check(self, node: ast.AST) -> None:
+        """Reject any syntax outside the supported subset."""
+        if isinstance(node, ast.Name):
+            if node.id not in METRICS:
+                raise CalculationError(
+                    f"Unknown metric '{node.id}' in '{self.text}'; "
+                    f"use one of: {', '.join(METRICS)}"
+                )
+            self.names.add(node.id)
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise CalculationError(f"Unsupported constant in '{self.text}'")
+        elif isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            self._check(node.left)
+            self._check(node.right)
+        elif isinstance(node, ast.UnaryOp) and isinstance(
+            node.op, (ast.USub, ast.UAdd, ast.Not)
+        ):
+            self._check(node.operand)
+        elif isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self._check(value)
+        elif isinstance(node, ast.Compare) and all(
+            type(op) in _COMPARE for op in node.ops
+        ):
+            for value in [node.left, *node.comparators]:
+                self._check(value)
+        elif (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id == "abs"
+            and len(node.args) == 1
+            and not node.keywords
+        ):
+            self._check(node.args[0])
+        else:
+            raise CalculationError(
+                f"Unsupported syntax '{ast.unparse(node)}' in '{self.text}'"
+            )
+
+    def evaluate(self, metrics: Mapping[str, np.ndarray]) -> np.ndarray:
+        """
+        Evaluate the expression over metric arrays.
+
+        Args:
+            metrics: Array per metric name used by the expression.
+
+        Returns:
+            np.ndarray: Values (or booleans for filters) per symbol.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._evaluate(self._tree, metrics)
+
+    def _evaluate(self, node: ast.AST, metrics: Mapping[str, np.ndarray]):
+        """Evaluate a checked node."""
+        if isinstance(node, ast.Name):
+            return metrics[node.id]
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.BinOp):
+            return _BINARY[type(node.op)](
+                self._evaluate(node.left, metrics),
+                self._evaluate(node.right, metrics),
+            )
+        if isinstance(node, ast.UnaryOp):
+            operand = self._evaluate(node.operand, metrics)
+            if isinstance(node.op, ast.Not):
+                return np.logical_not(operand)
+            return np.negative(operand) if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = self._evaluate(node.values[0], metrics)
+            for value in node.values[1:]:
+                result = combine(result, self._evaluate(value, metrics))
+            return result
+        if isinstance(node, ast.Compare):
+            left = self._evaluate(node.left, metrics)
+            result = True
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._evaluate(comparator, metrics)
+                result = np.logical_and(result, _COMPARE[type(op)](left, right))
+                left = right
+            return result
+        return np.abs(self._evaluate(node.args[0], metrics))
+
+
+def _price_matrix(prices: PriceData) -> tuple[pd.Index, list[str], np.ndarray]:
+    """(time, symbols) price matrix over the union of dates, NaN where missing."""
+    if isinstance(prices, pd.DataFrame):
+        frame = prices.sort_index()
+        symbols = [str(c) for c in frame.columns]
+        matrix = frame.to_numpy(dtype=np.float64, copy=True)
+        index = frame.index
+    else:
+        symbols = [str(s) for s in prices]
+        series = list(prices.values())
+        index, rows = AnalysisResult.shared_index([s.index for s in series])
+        matrix = AnalysisResult.allocate(index, symbols, ("price",))["price"]
+        for column, values in enumerate(series):
+            matrix[rows[column], column] = values.to_numpy(dtype=np.float64)
+    return index, symbols, matrix
+
+
+def _own_rows(matrix: np.ndarray) -> np.ndarray:
+    """Row positions per column with the observed rows, in date order, last."""
+    # A stable sort on the observed flag moves missing rows to the top.
+    return np.argsort(~np.isnan(matrix), axis=0, kind="stable")
+
+
+class Screener:
+    """
+    Screener computing metrics for every symbol from a shared price matrix.
+
+    Attributes:
+        index (pd.Index): Dates of the price matrix.
+        symbols (list[str]): Symbols in column order.
+        prices (np.ndarray): Prices, shape (time, symbols); NaN where a
+            symbol has no quote.
+        window (int): Window of return, volatility and correlation.
+    """
+
+    def __init__(
+        self,
+        prices: PriceData,
+        window: int = 21,
+        benchmark: Optional[Union[str, pd.Series]] = None,
+    ) -> None:
+        """
+        Initialize the screener.
+
+        Args:
+            prices: DataFrame or mapping of symbol to price Series.
+            window: Window of return, volatility and correlation (at least 2).
+            benchmark: Symbol among prices, or a price Series, for the
+                'correlation' metric.
+
+        Raises:
+            CalculationError: If the window is invalid or the benchmark unknown.
+        """
+        if window < 2:
+            raise CalculationError(f"Window must be at least 2, got {window}")
+        self.index, self.symbols, self.prices = _price_matrix(prices)
+        self.window = window
+        self._cache: dict[str, np.ndarray] = {}
+        # Each symbol's observations moved to the bottom of its column, so
+        # the last rows hold its own latest prices.
+        if np.isnan(self.prices).any():
+            self._rows = _own_rows(self.prices)
+            self._own = np.take_along_axis(self.prices, self._rows, axis=0)
+        else:
+            # Every symbol has every date: the rows are already in place.
+            rows = np.arange(len(self.prices))[:, None]
+            self._rows = np.broadcast_to(rows, self.prices.shape)
+            self._own = self.prices
+        # Benchmark price level at every date of the matrix.
+        self._benchmark: Optional[np.ndarray] = None
+        if isinstance(benchmark, str):
+            if benchmark not in self.symbols:
+                raise CalculationError(f"Unknown benchmark: {benchmark}")
+            benchmark = pd.Series(self.prices[:, self.symbols.index(benchmark)])
+            self._benchmark = benchmark.ffill().to_numpy(dtype=np.float64)
+        elif benchmark is not None:
+            aligned = benchmark.reindex(self.index).ffill()
+            self._benchmark = aligned.to_numpy(dtype=np.float64)
+
+    def metric(self, name: str) -> np.ndarray:
+        """
+        Compute one metric for all symbols (cached).
+
+        Args:
+            name: One of METRICS.
+
+        Returns:
+            np.ndarray: Value per symbol; NaN where history is too short.
+
+        Raises:
+            CalculationError: If the metric is unknown or needs a missing benchmark.
+        """
+        if name in self._cache:
+            return self._cache[name]
+        if name not in METRICS:
+            raise CalculationError(f"Unknown metric: {name}")
+        prices, window = self._own, self.window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if name == "price":
+                value = (
+                    prices[-1] if len(prices) else np.full(len(self.symbols), np.nan)
+                )
+            elif name == "returns":
+                value = self._tail(window + 1)
+                value = value[-1] / value[0] - 1.0
+            elif name == "volatility":
+                returns = np.diff(np.log(self._tail(window + 1)), axis=0)
+                value = returns.std(axis=0, ddof=1) * np.sqrt(window)
+            elif name == "drawdown":
+                value = prices[-1] / np.fmax.reduce(prices, axis=0) - 1.0
+            elif name == "max_drawdown":
+                peaks = np.fmax.accumulate(prices, axis=0)
+                value = np.nanmin(prices / peaks, axis=0) - 1.0
+            else:
+                value = self._correlation()
+        self._cache[name] = value
+        return value
+
+    def _tail(self, rows: int) -> np.ndarray:
+        """Each symbol's last own prices; NaN where its history is shorter."""
+        if len(self._own) >= rows:
+            return self._own[-rows:]
+        return np.full((rows, len(self.symbols)), np.nan)
+
+    def _correlation(self) -> np.ndarray:
+        """Correlation of windowed log returns with the benchmark."""
+        if self._benchmark is None:
+            raise CalculationError("Metric 'correlation' needs a benchmark")
+        rows = self.window + 1
+        if len(self._own) < rows:
+            return np.full(len(self.symbols), np.nan)
+        returns = np.diff(np.log(self._tail(rows)), axis=0)
+        # Benchmark returns between the dates of each symbol's returns.
+        bench = np.diff(np.log(self._benchmark)[self._rows[-rows:]], axis=0)
+        returns = returns - returns.mean(axis=0)
+        bench = bench - bench.mean(axis=0)
+        cov = (bench * returns).sum(axis=0)
+        scale = (returns * returns).sum(axis=0) * (bench * bench).sum(axis=0)
+        return cov / np.sqrt(scale)
+
+    def metrics(self, names: Optional[list[str]] = None) -> pd.DataFrame:
+        """
+        Return metrics of all symbols as a frame with symbols as rows.
+
+        Args:
+            names: Metrics to include; all available ones by default.
+
+        Returns:
+            pd.DataFrame: One column per metric.
+        """
+        if names is None:
+            names = [
+                m for m in METRICS if m != "correlation" or self._benchmark is not None
+            ]
+        return pd.DataFrame(
+            {name: self.metric(name) for name in names}, index=self.symbols
+        )
+
+    def screen(
+        self,
+        where: Optional[str] = None,
+        sort: str = "volatility",
+        top: Optional[int] = None,
+        ascending: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Filter and rank symbols.
+
+        Symbols whose filter or sort key is NaN are excluded.
+
+        Args:
+            where: Filter expression; all symbols by default.
+            sort: Sort key expression.
+            top: Number of symbols to return; all matches by default.
+            ascending: If True, the smallest keys rank first.
+
+        Returns:
+            pd.DataFrame: Used metrics and the sort key ('score') of the
+                selected symbols in rank order.
+
+        Raises:
+            CalculationError: If an expression is invalid.
+        """
+        key_expression = Expression(sort)
+        filter_expression = Expression(where) if where else None
+        names = sorted(
+            key_expression.names
+            | (filter_expression.names if filter_expression else set()),
+            key=METRICS.index,
+        )
+        values = {name: self.metric(name) for name in names}
+
+        key = np.broadcast_to(
+            np.asarray(key_expression.evaluate(values), dtype=np.float64),
+            (len(self.symbols),),
+        )
+        mask = ~np.isnan(key)
+        if filter_expression is not None:
+            mask &= np.broadcast_to(
+                np.asarray(filter_expression.evaluate(values), dtype=bool), mask.shape
+            )
+        candidates = np.flatnonzero(mask)
+        keys = key[candidates] if ascending else -key[candidates]
+        if top is not None and top < len(candidates):
+            keep = np.argpartition(keys, top - 1)[:top] if top > 0 else []
+            candidates, keys = candidates[keep], keys[keep]
+        order = candidates[np.argsort(keys, kind="stable")]
+
+        result = pd.DataFrame(
+            {name: values[name][order] for name in names},
+            index=pd.Index([self.symbols[i] for i in order], name="symbol"),
+        )
+        result["score"] = key[order]
+        return result
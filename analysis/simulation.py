@@ -0,0 +1,485 @@
+"""
+Module for Monte Carlo simulation of price paths from historical returns.
+
+Three models generate per-step log returns for many symbols jointly:
+
+- 'gbm': geometric Brownian motion with the historical mean and covariance
+  (optionally rescaled to given current volatilities);
+- 'bootstrap': historical return rows resampled with replacement, which keeps
+  fat tails and cross-asset dependence;
+- 'filtered': filtered historical simulation, resampling EWMA-standardized
+  residuals and re-applying an EWMA volatility that evolves along each path.
+
+Paths are generated in chunks whose size is bounded by a memory budget and
+reduced immediately into fixed-grid histograms of cumulative log returns,
+one per recorded step and symbol. VaR, expected shortfall and path
+percentiles are read from the histograms, so millions of paths never exist
+in memory at once. Every chunk draws from its own stream spawned from one
+SeedSequence, so results are reproducible and identical whether chunks run
+serially or on a process pool.
+"""
+
+from concurrent.futures import Executor
+from typing import Mapping, NamedTuple, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from core.exceptions import CalculationError
+from data.alignment import align
+
+METHODS = ("gbm", "bootstrap", "filtered")
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+# RiskMetrics decay of the EWMA variance used by filtered simulation.
+DEFAULT_DECAY = 0.94
+
+# Histogram range in standard deviations of the cumulative log return;
+# values outside fall into overflow bins bounded by the observed extremes.
+GRID_WIDTH = 8.0
+
+
+class _Grid(NamedTuple):
+    """Histogram grid of cumulative log returns per recorded step and symbol."""
+
+    steps: np.ndarray
+    lower: np.ndarray
+    width: np.ndarray
+    bins: int
+
+
+class _Histogram(NamedTuple):
+    """Partial histogram of a chunk of paths."""
+
+    counts: np.ndarray
+    tail_sums: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+
+
+class SimulationResult(NamedTuple):
+    """
+    Risk measures and path percentiles of a simulation.
+
+    Returns are simple returns relative to the starting price; VaR and ES are
+    positive loss fractions.
+
+    Attributes:
+        symbols: Symbols in column order.
+        paths: Number of simulated paths.
+        steps: Recorded horizon steps (the last one is the horizon).
+        levels: Confidence levels of VaR and ES.
+        var: Value at risk over the horizon, shape (levels, symbols).
+        es: Expected shortfall over the horizon, shape (levels, symbols).
+        quantiles: Probabilities of the path percentiles.
+        percentiles: Percentiles of cumulative returns, shape
+            (quantiles, steps, symbols).
+    """
+
+    symbols: list[str]
+    paths: int
+    steps: np.ndarray
+    levels: np.ndarray
+    var: np.ndarray
+    es: np.ndarray
+    quantiles: np.ndarray
+    percentiles: np.ndarray
+
+    def risk_frame(self) -> pd.DataFrame:
+        """VaR and ES as a frame with symbols as rows and one column per measure and level."""
+        columns = {}
+        for i, level in enumerate(self.levels):
+            columns[f"VaR {level:.1%}"] = self.var[i]
+            columns[f"ES {level:.1%}"] = self.es[i]
+        return pd.DataFrame(columns, index=self.symbols)
+
+    def percentile_frame(self, symbol: str) -> pd.DataFrame:
+        """Percentiles of one symbol's cumulative return with steps as rows."""
+        column = self.symbols.index(symbol)
+        return pd.DataFrame(
+            self.percentiles[:, :, column].T,
+            index=pd.Index(self.steps, name="step"),
+            columns=[f"p{q * 100:g}" for q in self.quantiles],
+        )
+
+
+class MonteCarloSimulator:
+    """
+    Simulator of joint price paths for many symbols.
+
+    Attributes:
+        symbols (list[str]): Symbols in column order.
+        method (str): One of METHODS.
+        returns (np.ndarray): Historical log returns, shape (time, symbols).
+        mean (np.ndarray): Mean log return per step and symbol.
+        sigma (np.ndarray): Current per-step volatility of each symbol.
+        decay (float): EWMA decay of filtered simulation.
+        chunk_bytes (int): Memory budget of one chunk of paths.
+    """
+
+    def __init__(
+        self,
+        returns: pd.DataFrame,
+        method: str = "gbm",
+        volatility: Optional[Union[Mapping[str, float], pd.Series]] = None,
+        decay: float = DEFAULT_DECAY,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    ) -> None:
+        """
+        Initialize the simulator.
+
+        Rows with missing values are dropped.
+
+        Args:
+            returns: Historical log returns with dates as rows and symbols as
+                columns (e.g. ReturnsCalculator output per symbol).
+            method: One of METHODS.
+            volatility: Current per-step volatility of log returns by symbol;
+                defaults to the historical (GBM, bootstrap) or EWMA
+                (filtered) estimate. Bootstrap ignores it.
+            decay: EWMA decay in (0, 1) for filtered simulation.
+            chunk_bytes: Memory budget of one chunk of paths.
+
+        Raises:
+            CalculationError: If the method, decay or data is invalid.
+        """
+        if method not in METHODS:
+            raise CalculationError(f"Unsupported simulation method: {method}")
+        if not 0 < decay < 1:
+            raise CalculationError(f"Decay must be in (0, 1), got {decay}")
+        returns = returns.dropna()
+        if len(returns) < 2 or returns.shape[1] == 0:
+            raise CalculationError("Simulation needs at least two rows of returns")
+        self.symbols = [str(c) for c in returns.columns]
+        self.method = method
+        self.decay = decay
+        self.chunk_bytes = chunk_bytes
+        self.returns = returns.to_numpy(dtype=np.float64)
+        self.mean = self.returns.mean(axis=0)
+
+        residuals = self.returns - self.mean
+        # EWMA variance known before each row, seeded with the sample variance.
+        variance = np.empty_like(residuals)
+        variance[0] = residuals.var(axis=0)
+        for t in range(1, len(residuals)):
+            variance[t] = decay * variance[t - 1] + (1 - decay) * residuals[t - 1] ** 2
+        forecast = decay * variance[-1] + (1 - decay) * residuals[-1] ** 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._standardized = np.nan_to_num(residuals / np.sqrt(variance))
+
+        if volatility is not None:
+            sigma = np.array([volatility[s] for s in self.symbols], dtype=np.float64)
+        elif method == "filtered":
+            sigma = np.sqrt(forecast)
+        else:
+            sigma = residuals.std(axis=0, ddof=1)
+        self.sigma = sigma
+
+        # GBM shocks: historical correlation scaled to the current volatility.
+        cov = np.atleast_2d(np.cov(self.returns, rowvar=False))
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.nan_to_num(cov / np.outer(std, std))
+        np.fill_diagonal(corr, 1.0)
+        eigenvalues, eigenvectors = np.linalg.eigh(corr * np.outer(sigma, sigma))
+        self._factor = eigenvectors * np.sqrt(np.maximum(eigenvalues, 0.0))
+
+    @classmethod
+    def from_prices(
+        cls, prices: Union[pd.DataFrame, Mapping[str, pd.Series]], **kwargs
+    ) -> "MonteCarloSimulator":
+        """
+        Create a simulator from log returns of prices aligned on their common dates.
+
+        Args:
+            prices: DataFrame or mapping of symbol to price Series.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            MonteCarloSimulator: Simulator over the price history.
+        """
+        frame = align(prices, "intersection")
+        values = frame.to_numpy(dtype=np.float64)
+        returns = pd.DataFrame(
+            np.log(values[1:] / values[:-1]),
+            index=frame.index[1:],
+            columns=frame.columns,
+        )
+        return cls(returns, **kwargs)
+
+    @classmethod
+    def from_analysis(
+        cls,
+        results: Mapping[str, Mapping[str, pd.Series]],
+        window: int = 21,
+        **kwargs,
+    ) -> "MonteCarloSimulator":
+        """
+        Create a simulator from AnalysisService.analyze_multiple results.
+
+        The latest rolling volatility of each symbol (scaled by
+        ``sqrt(window)``) is converted back to a per-step volatility.
+
+        Args:
+            results: Mapping of symbol to 'returns' and 'volatility' Series.
+            window: Rolling window the volatility was computed with.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            MonteCarloSimulator: Simulator over the analyzed returns.
+        """
+        returns = align(
+            {symbol: metrics["returns"] for symbol, metrics in results.items()},
+            "intersection",
+        )
+        volatility = {}
+        for symbol, metrics in results.items():
+            latest = metrics["volatility"].dropna()
+            if len(latest):
+                volatility[symbol] = float(latest.iloc[-1]) / np.sqrt(window)
+        if len(volatility) == len(results):
+            kwargs.setdefault("volatility", volatility)
+        return cls(returns, **kwargs)
+
+    def chunk_sizes(self, paths: int, horizon: int) -> list[int]:
+        """
+        Split paths into chunks that fit the memory budget.
+
+        Args:
+            paths: Total number of paths.
+            horizon: Number of steps per path.
+
+        Returns:
+            list[int]: Paths per chunk.
+        """
+        # Step returns, cumulative sums and bin indices take one array each.
+        per_path = 3 * 8 * horizon * len(self.symbols)
+        size = max(1, min(paths, self.chunk_bytes // per_path))
+        return [min(size, paths - start) for start in range(0, paths, size)]
+
+    def simulate(
+        self,
+        paths: int,
+        horizon: int,
+        seed: Optional[int] = None,
+        levels: Sequence[float] = (0.95, 0.99),
+        percentiles: Sequence[float] = (5, 50, 95),
+        steps: Optional[Sequence[int]] = None,
+        bins: int = 1000,
+        executor: Optional[Executor] = None,
+    ) -> SimulationResult:
+        """
+        Simulate paths and reduce them to risk measures and percentiles.
+
+        Histograms take ``len(steps) * symbols * (bins + 2)`` counters;
+        restrict steps for long horizons over many symbols.
+
+        Args:
+            paths: Number of paths.
+            horizon: Number of steps per path.
+            seed: Seed of the root SeedSequence; None draws fresh entropy.
+            levels: Confidence levels of VaR and ES, in (0, 1).
+            percentiles: Path percentiles in [0, 100].
+            steps: Horizon steps to record percentiles at; every step by
+                default. The horizon is always recorded.
+            bins: Histogram bins per step and symbol.
+            executor: Optional executor (e.g. a ProcessPoolExecutor) running
+                the chunks; results do not depend on it.
+
+        Returns:
+            SimulationResult: VaR, ES and percentiles.
+
+        Raises:
+            CalculationError: If an argument is out of range.
+        """
+        levels = np.asarray(levels, dtype=np.float64)
+        quantiles = np.asarray(percentiles, dtype=np.float64) / 100
+        if paths < 1 or horizon < 1 or bins < 1:
+            raise CalculationError("Paths, horizon and bins must be positive")
+        if np.any((levels <= 0) | (levels >= 1)):
+            raise CalculationError(f"Levels must be in (0, 1): {list(levels)}")
+        if np.any((quantiles < 0) | (quantiles > 1)):
+            raise CalculationError("Percentiles must be in [0, 100]")
+        if steps is None:
+            recorded = np.arange(1, horizon + 1)
+        else:
+            recorded = np.unique(np.r_[steps, horizon]).astype(np.intp)
+        if recorded[0] < 1 or recorded[-1] > horizon:
+            raise CalculationError(f"Steps must be within 1..{horizon}")
+
+        grid = self._grid(recorded, bins)
+        sizes = self.chunk_sizes(paths, horizon)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        if executor is None:
+            parts = (self.run_chunk(s, n, horizon, grid) for s, n in zip(seeds, sizes))
+        else:
+            futures = [
+                executor.submit(self.run_chunk, s, n, horizon, grid)
+                for s, n in zip(seeds, sizes)
+            ]
+            parts = (future.result() for future in futures)
+
+        total = None
+        # Partial histograms are merged in chunk order for reproducible sums.
+        for part in parts:
+            if total is None:
+                total = part
+                continue
+            total = _Histogram(
+                total.counts + part.counts,
+                total.tail_sums + part.tail_sums,
+                np.minimum(total.minimum, part.minimum),
+                np.maximum(total.maximum, part.maximum),
+            )
+        return self._result(total, grid, paths, levels, quantiles)
+
+    def run_chunk(
+        self,
+        seed: np.random.SeedSequence,
+        paths: int,
+        horizon: int,
+        grid: _Grid,
+    ) -> _Histogram:
+        """
+        Generate one chunk of paths and reduce it to a histogram.
+
+        Args:
+            seed: Stream of this chunk.
+            paths: Paths in the chunk.
+            horizon: Steps per path.
+            grid: Histogram grid shared by all chunks.
+
+        Returns:
+            _Histogram: Partial histogram of the chunk.
+        """
+        rng = np.random.default_rng(seed)
+        cumulative = np.cumsum(self._step_returns(rng, paths, horizon), axis=1)
+        values = cumulative[:, grid.steps - 1, :]
+
+        size = grid.bins + 2
+        position = np.floor((values - grid.lower) / grid.width)
+        np.clip(position + 1, 0, size - 1, out=position)
+        cells = np.arange(values.shape[1] * values.shape[2]).reshape(values.shape[1:])
+        flat = position.astype(np.intp) + cells * size
+        counts = np.bincount(flat.ravel(), minlength=cells.size * size)
+
+        # Simple returns per terminal bin give the expected shortfall.
+        terminal = flat[:, -1, :] - cells[-1, 0] * size
+        tail_sums = np.bincount(
+            terminal.ravel(),
+            weights=np.expm1(values[:, -1, :]).ravel(),
+            minlength=values.shape[2] * size,
+        )
+        return _Histogram(
+            counts.reshape(values.shape[1], values.shape[2], size),
+            tail_sums.reshape(values.shape[2], size),
+            values.min(axis=0),
+            values.max(axis=0),
+        )
+
+    def _step_returns(
+        self, rng: np.random.Generator, paths: int, horizon: int
+    ) -> np.ndarray:
+        """Per-step log returns of shape (paths, horizon, symbols)."""
+        size = len(self.symbols)
+        if self.method == "gbm":
+            shocks = rng.standard_normal((paths, horizon, size))
+            return shocks @ self._factor.T + self.mean
+        rows = rng.integers(0, len(self.returns), size=(paths, horizon))
+        if self.method == "bootstrap":
+            return self.returns[rows]
+
+        result = np.empty((paths, horizon, size))
+        variance = np.broadcast_to(self.sigma**2, (paths, size))
+        for step in range(horizon):
+            residual = np.sqrt(variance) * self._standardized[rows[:, step]]
+            result[:, step] = self.mean + residual
+            variance = self.decay * variance + (1 - self.decay) * residual**2
+        return result
+
+    def _grid(self, steps: np.ndarray, bins: int) -> _Grid:
+        """Histogram grid centered on the expected cumulative log return."""
+        spread = np.maximum(self.sigma, self.returns.std(axis=0))
+        spread = np.where(spread > 0, spread, 1e-12)
+        t = steps[:, None].astype(np.float64)
+        half = GRID_WIDTH * spread * np.sqrt(t)
+        return _Grid(steps, self.mean * t - half, 2 * half / bins, bins)
+
+    def _result(
+        self,
+        total: _Histogram,
+        grid: _Grid,
+        paths: int,
+        levels: np.ndarray,
+        quantiles: np.ndarray,
+    ) -> SimulationResult:
+        """Read risk measures and percentiles from the merged histogram."""
+        # Edges of every bin, with overflow bins spanning to the extremes.
+        inner = grid.lower[..., None] + grid.width[..., None] * np.arange(grid.bins + 1)
+        left = np.concatenate(
+            (np.minimum(total.minimum, grid.lower)[..., None], inner), axis=-1
+        )
+        right = np.concatenate(
+            (inner, np.maximum(total.maximum, inner[..., -1])[..., None]), axis=-1
+        )
+        cumulative = np.cumsum(total.counts, axis=-1)
+
+        def locate(counts, cum, probability):
+            target = probability * paths
+            position = np.minimum(
+                (cum < target[..., None]).sum(axis=-1), cum.shape[-1] - 1
+            )
+            below = np.where(
+                position > 0,
+                np.take_along_axis(cum, np.maximum(position - 1, 0)[..., None], -1)[
+                    ..., 0
+                ],
+                0,
+            )
+            inside = np.take_along_axis(counts, position[..., None], -1)[..., 0]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                fraction = np.where(inside > 0, (target - below) / inside, 0.0)
+            return position, np.clip(fraction, 0.0, 1.0)
+
+        def value(position, fraction, lo, hi):
+            lo = np.take_along_axis(lo, position[..., None], -1)[..., 0]
+            hi = np.take_along_axis(hi, position[..., None], -1)[..., 0]
+            return lo + fraction * (hi - lo)
+
+        shape = total.counts.shape[:2]
+        percentiles = np.empty((len(quantiles),) + shape)
+        for i, q in enumerate(quantiles):
+            position, fraction = locate(total.counts, cumulative, np.full(shape, q))
+            percentiles[i] = np.expm1(value(position, fraction, left, right))
+
+        size = len(self.symbols)
+        counts, cum = total.counts[-1], cumulative[-1]
+        tail_sums = np.cumsum(total.tail_sums, axis=-1)
+        var = np.empty((len(levels), size))
+        es = np.empty((len(levels), size))
+        for i, level in enumerate(levels):
+            tail = np.full(size, 1 - level)
+            position, fraction = locate(counts, cum, tail)
+            var[i] = -np.expm1(value(position, fraction, left[-1], right[-1]))
+            below = np.where(
+                position > 0,
+                np.take_along_axis(tail_sums, np.maximum(position - 1, 0)[:, None], -1)[
+                    :, 0
+                ],
+                0.0,
+            )
+            # Paths of the boundary bin contribute their share of its mean.
+            partial = (
+                fraction
+                * np.take_along_axis(total.tail_sums, position[:, None], -1)[:, 0]
+            )
+            es[i] = -(below + partial) / (tail * paths)
+        return SimulationResult(
+            self.symbols,
+            paths,
+            grid.steps,
+            levels,
+            var,
+            es,
+            quantiles,
+            percentiles,
+        )
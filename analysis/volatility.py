@@ -2,25 +2,83 @@
 Module for calculating financial price volatility.
 
 Provides functionality to compute rolling volatility from return data,
-using a specified rolling window. Raises CalculationError on invalid input
-or calculation errors.
+using a specified rolling window or several windows at once. Integer
+windows count rows; windows such as '21 sessions' or '30D' follow the
+trading calendar, so gaps in the data do not stretch a window. Raises
+CalculationError on invalid input or calculation errors.
 """
 
+from typing import Sequence, Union
 import numpy as np
 import pandas as pd
+from core.calendar import CalendarLike, get_calendar
 from core.exceptions import CalculationError
+from core.precision import PrecisionLike, get_policy
+
+DEFAULT_WINDOWS = (5, 10, 21, 63, 126, 252)
+
+
+def _prefix_sums(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Prefix sums, sums of squares and NaN counts (each of length n + 1)."""
+    missing = np.isnan(values)
+    finite = values[~missing]
+    # Shifting by the mean keeps the prefix sums small and limits cancellation.
+    shifted = np.where(missing, 0.0, values - (finite.mean() if len(finite) else 0.0))
+    n = len(values)
+    sums = np.zeros(n + 1)
+    squares = np.zeros(n + 1)
+    gaps = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(shifted, out=sums[1:])
+    np.cumsum(shifted * shifted, out=squares[1:])
+    np.cumsum(missing, out=gaps[1:])
+    return sums, squares, gaps
 
 
 class VolatilityCalculator:
-    """Calculator for price volatility."""
+    """
+    Calculator for price volatility.
+
+    Attributes:
+        precision (PrecisionPolicy): Storage precision of the results.
+        calendar (TradingCalendar): Calendar of session windows and annualization.
+    """
 
-    def calculate(self, returns: pd.Series, window: int = 21) -> pd.Series:
+    def __init__(
+        self, precision: PrecisionLike = None, calendar: CalendarLike = None
+    ) -> None:
+        """
+        Initialize the calculator.
+
+        Args:
+            precision: 'float64' (default) or 'float32'; rolling sums are
+                always accumulated in float64 and only stored in this precision.
+            calendar: Trading calendar name ('XNYS' by default, 'FX') or object.
+        """
+        self.precision = get_policy(precision)
+        self.calendar = get_calendar(calendar)
+
+    def calculate(
+        self,
+        returns: pd.Series,
+        window: Union[int, str] = 21,
+        annualize: bool = False,
+    ) -> pd.Series:
         """
         Calculate rolling volatility over a specified window.
 
+        An integer window covers that many rows and is scaled by
+        ``sqrt(window)``. A calendar window ('21 sessions', '30D') covers the
+        rows dated within it and is scaled by the square root of the
+        sessions it spans; the window bounds of all rows are resolved at once
+        with a binary search, and the statistics use the same prefix sums as
+        calculate_multi(). Windows reaching before the first row are NaN.
+
         Args:
             returns (pd.Series): Series of daily returns.
-            window (int, optional): Rolling window size in days. Defaults to 21.
+            window (int | str, optional): Rolling window size in rows, or a
+                calendar window. Defaults to 21.
+            annualize (bool, optional): If True, scale by the square root of
+                the calendar's sessions per year instead.
 
         Returns:
             pd.Series: Rolling volatility series.
@@ -28,7 +86,97 @@ class VolatilityCalculator:
         Raises:
             CalculationError: If calculation fails due to invalid input or computation error.
         """
+        if isinstance(window, str):
+            return self._calculate_calendar(returns, window, annualize)
+        try:
+            if returns.dtype != np.float64:
+                returns = returns.astype(np.float64)
+            scale = self._annual_scale() if annualize else np.sqrt(window)
+            volatility = returns.rolling(window=window).std() * scale
+            return volatility.astype(self.precision.dtype)
+        except Exception as e:
+            raise CalculationError(f"Volatility calculation error: {str(e)}")
+
+    def _annual_scale(self) -> float:
+        """Square root of the calendar's sessions per year."""
+        return float(np.sqrt(self.calendar.sessions_per_year))
+
+    def _calculate_calendar(
+        self, returns: pd.Series, window: str, annualize: bool
+    ) -> pd.Series:
+        """Rolling volatility over a calendar window."""
         try:
-            return returns.rolling(window=window).std() * np.sqrt(window)
+            bounds = self.calendar.window_bounds(returns.index, window)
+            positions = self.calendar.positions(returns.index)
+            values = np.asarray(returns, dtype=np.float64)
+
+            sums, squares, gaps = _prefix_sums(values)
+            stops = np.arange(1, len(values) + 1)
+            starts = np.searchsorted(positions, bounds, side="right")
+            counts = stops - starts
+            total = sums[stops] - sums[starts]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                variance = (
+                    squares[stops] - squares[starts] - total * total / counts
+                ) / (counts - 1)
+                spans = positions - bounds
+                scale = self._annual_scale() if annualize else np.sqrt(spans)
+                volatility = np.sqrt(np.maximum(variance, 0.0)) * scale
+            invalid = (counts < 2) | (gaps[stops] != gaps[starts])
+            if len(positions):
+                invalid |= bounds < positions[0] - 1
+            volatility[invalid] = np.nan
+            return pd.Series(
+                self.precision.cast(volatility), index=returns.index, name=returns.name
+            )
         except Exception as e:
             raise CalculationError(f"Volatility calculation error: {str(e)}")
+
+    def calculate_multi(
+        self, returns: pd.Series, windows: Sequence[int] = DEFAULT_WINDOWS
+    ) -> pd.DataFrame:
+        """
+        Calculate rolling volatility for several windows in one pass.
+
+        Cumulative sums and sums of squares are built once and every window
+        is derived from prefix differences, so the cost is O(n) per window
+        instead of a fresh rolling computation per call. Warm-up and missing
+        values follow calculate(): a window that is not full or contains NaN
+        yields NaN.
+
+        Args:
+            returns (pd.Series): Series of daily returns.
+            windows (Sequence[int], optional): Rolling window sizes in days.
+                Defaults to DEFAULT_WINDOWS.
+
+        Returns:
+            pd.DataFrame: Volatility with dates as rows and windows as columns.
+
+        Raises:
+            CalculationError: If a window is not a positive integer or the
+                input is not numeric.
+        """
+        windows = [int(w) for w in windows]
+        if not windows or min(windows) < 1:
+            raise CalculationError(f"Windows must be positive integers: {windows}")
+        try:
+            values = np.asarray(returns, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise CalculationError(f"Volatility calculation error: {str(e)}")
+
+        sums, squares, gaps = _prefix_sums(values)
+        n = len(values)
+        result = np.full((n, len(windows)), np.nan)
+        for column, window in enumerate(windows):
+            if window < 2 or window > n:
+                continue
+            total = sums[window:] - sums[:-window]
+            variance = (
+                squares[window:] - squares[:-window] - total * total / window
+            ) / (window - 1)
+            volatility = np.sqrt(np.maximum(variance, 0.0)) * np.sqrt(window)
+            volatility[gaps[window:] != gaps[:-window]] = np.nan
+            result[window - 1 :, column] = volatility
+        return pd.DataFrame(
+            self.precision.cast(result), index=returns.index, columns=windows
+        )
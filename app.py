@@ -10,16 +10,35 @@ Usage examples:
     python app.py --excel data_example/test_data.xlsx
     python app.py --tickers AAPL MSFT --period 6mo
     python app.py --currencies USDRUB EURRUB --period 1y
+    python app.py --tickers AAPL MSFT --stream --interval 30
+    python app.py --csv quotes.csv --follow --interval 60
+    python app.py --tickers AAPL MSFT --export results.parquet
+    python app.py --tickers AAPL MSFT NVDA --export corr.parquet --matrices correlation
+    python app.py --universe universe.csv --export results.parquet
+    python app.py --csv data_example/test_data.csv --sidecar
+    python app.py --tickers AAPL MSFT NVDA --screen "volatility > 0.05" --top 2
+    python app.py --universe universe.csv --export results.parquet --max-memory 2GB
 """
 
+import asyncio
+import os
 from cli.parser import parse_arguments
 from cli.parser import (
     VALID_PERIODS,
     SUPPORTED_CURRENCY_PAIRS,
     SUPPORTED_STOCK_NAMES,
 )
+from analysis.correlation import RollingCovariance
+from analysis.screener import Screener
 from services.analysis import AnalysisService
+from services.currency_service import CurrencyService
 from services.data_service import DataService
+from services.export_service import ExportService
+from services.sidecar_service import SidecarService
+from services.streaming_service import StreamingService
+from core.exceptions import CalculationError, DataLoadError, ExportError
+from core.memory import configure, format_size
+from data.stream_sources import CSVTailSource, ReplaySource, YahooPollingSource
 from services.visualization import (
     VisualizationService,
     CurrencyVisualizationService,
@@ -27,10 +46,116 @@ from services.visualization import (
 )
 
 
+def print_metrics(metrics: dict) -> None:
+    """Print a streaming metrics snapshot."""
+    latency = metrics["latency"]
+    print(
+        f"\n📡 ticks={latency['count']} queue={metrics['queue_depth']} "
+        f"latency p50={latency['p50'] * 1e3:.3f}ms p99={latency['p99'] * 1e3:.3f}ms"
+    )
+    for symbol, value in metrics["volatility"].items():
+        print(
+            f"  {symbol}: return={metrics['returns'][symbol]:.6f} volatility={value:.6f}"
+        )
+
+
+async def stream(args) -> None:
+    """Run streaming analytics for the data source selected by args."""
+    if args.tickers:
+        source = YahooPollingSource(args.tickers, interval=args.interval)
+    elif args.currencies:
+        service = CurrencyService(registry=getattr(args, "registry", None))
+        source = service.stream_source(args.currencies, interval=args.interval)
+    elif args.follow:
+        source = CSVTailSource([args.csv], interval=args.interval)
+    else:
+        data, _ = DataService.load_data(args)
+        source = ReplaySource({"Close": data["Close"]})
+    await StreamingService(source, emit_interval=args.interval).run(print_metrics)
+
+
+def export(args, data, analysis=None) -> None:
+    """Analyze loaded data (unless analysis is given) and write it to args.export."""
+    if args.matrices:
+        export_matrices(args, data)
+        return
+    if args.currencies or args.tickers:
+        results = AnalysisService.analyze_multiple(data, precision=args.precision)
+    else:
+        source = args.csv or args.excel
+        name = os.path.splitext(os.path.basename(source))[0]
+        if analysis is None:
+            analysis = AnalysisService.analyze(data, precision=args.precision)
+        results = {name: analysis}
+    try:
+        rows = ExportService.export(
+            results, args.export, args.format, args.layout, args.compression
+        )
+    except ExportError as e:
+        print(f"❌ Error: {e}")
+        return
+    print(f"✅ Exported {rows} rows to {args.export}")
+
+
+def export_matrices(args, data) -> None:
+    """Stream rolling correlation or covariance matrices to args.export."""
+    try:
+        calc = RollingCovariance.from_prices(data)
+        chunks = (
+            calc.correlation_chunks()
+            if args.matrices == "correlation"
+            else calc.chunks()
+        )
+        rows = ExportService.export_matrices(
+            chunks, calc.symbols, args.export, args.format, args.compression
+        )
+    except (CalculationError, ExportError) as e:
+        print(f"❌ Error: {e}")
+        return
+    print(f"✅ Exported {rows} rows of {args.matrices} matrices to {args.export}")
+
+
+def screen(args, data) -> None:
+    """Rank the loaded symbols by args.sort after filtering them with args.screen."""
+    try:
+        screener = Screener(data, benchmark=args.benchmark)
+        table = screener.screen(
+            args.screen or None, args.sort, args.top, args.ascending
+        )
+    except CalculationError as e:
+        print(f"❌ Error: {e}")
+        return
+    print(f"\n🔎 {len(table)} symbols by {args.sort}")
+    print(table.to_string(float_format=lambda value: f"{value:.6f}"))
+
+
+def print_memory(report: dict) -> None:
+    """Print current and peak usage of the memory budget."""
+    limit = format_size(report["limit"]) if report["limit"] else "none"
+    print(
+        f"\n🧠 Memory: current={format_size(report['current'])} "
+        f"peak={format_size(report['peak'])} "
+        f"spilled={format_size(report['spilled'])} limit={limit}"
+    )
+    for category, size in report["categories"].items():
+        print(f"  {category}: {format_size(size)}")
+
+
 def main() -> None:
     """Main entry point for the application."""
     args = parse_arguments()
+    if args.max_memory is None:
+        run(args)
+        return
+    budget = configure(args.max_memory)
+    try:
+        run(args)
+    finally:
+        print_memory(budget.report())
 
+
+def run(args) -> None:
+    """Load, analyze and present the data selected by parsed arguments."""
     if not any([args.currencies, args.tickers, args.csv, args.excel]):
         print("\n⚠️  No data source specified.")
         print("Please specify one of the following options to load data:\n")
@@ -47,7 +172,8 @@ def main() -> None:
         print("  --currencies USDRUB EURRUB")
         print("  Analyze currency exchange rate pairs.\n")
         print("  ✅ Supported currency pairs:")
-        print("    ", ", ".join(SUPPORTED_CURRENCY_PAIRS), "\n")
+        print("    ", ", ".join(SUPPORTED_CURRENCY_PAIRS))
+        print("  Cross pairs of these currencies (e.g. EURUSD) are derived.\n")
 
         print("📈 Stock Market Analysis:")
         print("  --tickers AAPL MSFT")
@@ -57,10 +183,54 @@ def main() -> None:
 
         print("⏱️  Period Option (optional):")
         print("  --period 1mo")
-        print("  Time period for Yahoo Finance data (default is 1y).\n")
+        print("  Time period for Yahoo Finance data (default is 1y).")
+        print("  For CSV/Excel files it is counted back from the latest row.\n")
         print("  ✅ Supported periods:")
         print("    ", ", ".join(VALID_PERIODS), "\n")
 
+        print("📅 Date Range (optional):")
+        print("  --start 2024-01-01 --end 2024-03-31")
+        print("  Inclusive date bounds applied to any data source.\n")
+
+        print("📡 Streaming Mode (optional):")
+        print("  --stream --interval 30")
+        print("  Poll quotes (or replay files) and update metrics incrementally.")
+        print("  --csv quotes.csv --follow reads only rows appended to the file.\n")
+
+        print("💾 Export (optional):")
+        print(
+            "  --export results.parquet [--format csv] [--layout wide] [--compression zstd]"
+        )
+        print("  Write returns and volatility to a file instead of plotting.")
+        print("  --matrices correlation streams rolling correlation matrices.\n")
+
+        print("🌐 Symbol Universe (optional):")
+        print("  --universe universe.csv")
+        print("  Validate symbols against a universe file (.npz or CSV with a")
+        print("  'symbol' column); without --tickers/--currencies analyze all of it.\n")
+
+        print("🗂️  Analysis Sidecar (optional):")
+        print("  --csv data.csv --sidecar [--cache-dir .cache]")
+        print("  Reuse parsed data and results on re-runs; appended rows are")
+        print("  analyzed incrementally.\n")
+
+        print("🔎 Screener (optional):")
+        print(
+            '  --tickers AAPL MSFT NVDA --screen "drawdown > -0.1" '
+            '--sort "returns / volatility" --top 5'
+        )
+        print("  Filter and rank symbols by returns, volatility, drawdown,")
+        print("  max_drawdown or correlation with a --benchmark symbol.\n")
+
+        print("🧠 Memory Budget (optional):")
+        print("  --max-memory 2GB")
+        print("  Spill cold series and results to temporary files beyond the")
+        print("  budget and report current and peak memory use.\n")
+
+        print("🎯 Precision (optional):")
+        print("  --precision float32")
+        print("  Store prices and results in float32 to halve memory use.\n")
+
         print("💡 Example:")
         print("  python app.py --csv data_example/test_data.csv")
         print("  python app.py --excel data_example/test_data.xlsx")
@@ -69,21 +239,46 @@ def main() -> None:
 
         return
 
+    if args.stream:
+        try:
+            asyncio.run(stream(args))
+        except (ValueError, DataLoadError) as e:
+            print(f"❌ Error: {e}")
+        return
+
+    analysis = None
     try:
-        data, title = DataService.load_data(args)
-    except ValueError as e:
+        if args.sidecar:
+            source = args.csv or args.excel
+            sidecar = SidecarService(args.cache_dir, precision=args.precision)
+            data, analysis = sidecar.load(source)
+            title = f"{'CSV' if args.csv else 'Excel'}: {source}"
+        else:
+            data, title = DataService.load_data(args)
+    except (ValueError, DataLoadError) as e:
         print(f"❌ Error: {e}")
         return
 
+    if args.screen is not None:
+        screen(args, data)
+        return
+
+    if args.export:
+        export(args, data, analysis)
+        return
+
     if args.currencies:
         CurrencyVisualizationService.show(data, title)
 
     elif args.tickers:
-        analysis_results = AnalysisService.analyze_multiple(data)
+        analysis_results = AnalysisService.analyze_multiple(
+            data, precision=args.precision
+        )
         StockVisualizationService.show(data, analysis_results)
 
     else:
-        analysis = AnalysisService.analyze(data)
+        if analysis is None:
+            analysis = AnalysisService.analyze(data, precision=args.precision)
         VisualizationService.show(data["Close"], analysis, title)
 
 
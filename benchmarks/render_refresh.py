@@ -0,0 +1,76 @@
+"""
+Benchmark of dashboard refresh against rebuilding the figure on every frame.
+
+Usage:
+    python benchmarks/render_refresh.py --series 50 --points 252 --frames 20
+"""
+
+import argparse
+import os
+import sys
+import time
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.analysis import AnalysisService  # noqa: E402
+from services.visualization import (  # noqa: E402
+    StockDashboard,
+    StockVisualizationService,
+)
+
+
+def make_prices(series: int, points: int, seed: int = 0) -> dict[str, pd.Series]:
+    """Random-walk prices of several symbols on a shared daily index."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=points)
+    return {
+        f"S{i:03d}": pd.Series(
+            100 * np.exp(np.cumsum(rng.normal(0, 0.01, points))), index=index
+        )
+        for i in range(series)
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print frame time statistics."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--series", type=int, default=50)
+    parser.add_argument("--points", type=int, default=252)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    prices = make_prices(args.series, args.points)
+    analysis = AnalysisService.analyze_multiple(prices)
+
+    dashboard = StockDashboard()
+    for _ in range(args.frames):
+        dashboard.refresh(prices, analysis)
+    refresh = dashboard.frame_times.summary()
+    dashboard.close()
+
+    plt.show = lambda: None
+    rebuild = []
+    for _ in range(min(args.frames, 5)):
+        start = time.perf_counter()
+        StockVisualizationService.show(prices, analysis)
+        plt.gcf().canvas.draw()
+        rebuild.append(time.perf_counter() - start)
+        plt.close("all")
+
+    print(f"{args.series} series x {args.points} points, {args.frames} frames")
+    print(
+        f"refresh: max={refresh['max'] * 1e3:.1f}ms "
+        f"p50={refresh['p50'] * 1e3:.1f}ms p99={refresh['p99'] * 1e3:.1f}ms"
+    )
+    print(f"rebuild: p50={np.median(rebuild) * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
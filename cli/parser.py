@@ -1,14 +1,26 @@
 """
 Command-line interface (CLI) argument parser for PyFinance financial analysis tool.
 
-Defines valid time periods, supported currency pairs, and stock tickers.
-Parses, validates, and normalizes CLI inputs.
+Defines valid time periods, supported currency pairs, and stock tickers,
+which form the default symbol registry; a larger universe can be loaded
+from a file with --universe. Parses, validates, and normalizes CLI inputs.
 """
 
 import argparse
+from datetime import datetime
+from analysis.screener import METRICS, Expression
+from core.exceptions import CalculationError, DataLoadError
+from core.memory import parse_size
+from data.cross_rates import CurrencyGraph
+from data.symbols import SymbolInfo, SymbolRegistry
+from services.export_service import EXPORT_FORMATS
 
 VALID_PERIODS = ["1d", "5d", "1mo", "6mo", "ytd", "1y", "5y", "max"]
 
+DEFAULT_PERIOD = "1y"
+
+PRECISIONS = ["float64", "float32"]
+
 SUPPORTED_CURRENCY_PAIRS = [
     "USDRUB",
     "EURRUB",
@@ -35,6 +47,11 @@ SUPPORTED_STOCK_NAMES = [
     "V",
 ]
 
+DEFAULT_REGISTRY = SymbolRegistry(
+    [SymbolInfo(p, "currency", "FX", p[3:], "FX") for p in SUPPORTED_CURRENCY_PAIRS]
+    + [SymbolInfo(t, "stock", "US", "USD", "XNYS") for t in SUPPORTED_STOCK_NAMES]
+)
+
 
 def parse_arguments() -> argparse.Namespace:
     """Parse and validate command-line arguments for PyFinance.
@@ -58,32 +75,252 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--period",
         choices=VALID_PERIODS,
-        help="Time period for Yahoo Finance (1d, 1mo, 1y)",
+        help=(
+            "Time period (1d, 1mo, 1y); for CSV/Excel files it is counted "
+            "back from the latest row"
+        ),
         type=str,
-        default="1y",
     )
 
+    parser.add_argument("--start", help="Inclusive start date (YYYY-MM-DD)", type=str)
+
+    parser.add_argument("--end", help="Inclusive end date (YYYY-MM-DD)", type=str)
+
     parser.add_argument(
         "--currencies",
         nargs="+",
-        help="List of currency pairs (e.g., USDRUB EURRUB)",
+        help="List of currency pairs (e.g., USDRUB EURRUB); cross pairs such as EURUSD are derived",
+        type=str,
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream quotes (polling for tickers/currencies, replay for files)",
+    )
+
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Stream a growing --csv file, reading only rows appended since the last poll",
+    )
+
+    parser.add_argument(
+        "--interval",
+        help="Seconds between polls and metric updates in streaming mode",
+        type=float,
+        default=60.0,
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of a download cache shared by concurrent runs",
+        type=str,
+    )
+
+    parser.add_argument(
+        "--export",
+        help="Write analysis results to this file instead of plotting them",
+        type=str,
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        help="Export format (inferred from the --export extension by default)",
+        type=str,
+    )
+
+    parser.add_argument(
+        "--layout",
+        choices=["long", "wide"],
+        default="long",
+        help="Export table layout: one row per date and symbol, or one column per series",
+    )
+
+    parser.add_argument(
+        "--matrices",
+        choices=["correlation", "covariance"],
+        help=(
+            "Export rolling correlation or covariance matrices of the selected "
+            "symbols, streamed chunk by chunk, instead of per-symbol metrics"
+        ),
+    )
+
+    parser.add_argument(
+        "--compression",
+        help="Export compression codec (e.g. gzip, zstd, snappy; arrow: lz4, zstd)",
+        type=str,
+    )
+
+    parser.add_argument(
+        "--universe",
+        help=(
+            "Symbol universe file (.npz or CSV with a 'symbol' column); "
+            "without --tickers/--currencies every symbol in it is analyzed"
+        ),
+        type=str,
+    )
+
+    parser.add_argument(
+        "--precision",
+        choices=PRECISIONS,
+        default="float64",
+        help="Storage precision of prices and results (float32 halves memory)",
+    )
+
+    parser.add_argument(
+        "--sidecar",
+        action="store_true",
+        help=(
+            "Keep parsed --csv/--excel data and its analysis in a sidecar file "
+            "(in --cache-dir if given) and reuse or extend it on re-runs"
+        ),
+    )
+
+    parser.add_argument(
+        "--screen",
+        nargs="?",
+        const="",
+        metavar="FILTER",
+        help=(
+            "Screen the selected symbols with an optional filter over "
+            f"{', '.join(METRICS)} (e.g. 'volatility > 0.05 and drawdown > -0.2')"
+        ),
+        type=str,
+    )
+
+    parser.add_argument(
+        "--sort",
+        default="volatility",
+        help="Sort key expression of --screen (e.g. 'returns / volatility')",
+        type=str,
+    )
+
+    parser.add_argument(
+        "--ascending",
+        action="store_true",
+        help="Rank the smallest --sort keys first",
+    )
+
+    parser.add_argument(
+        "--top",
+        default=20,
+        help="Number of symbols listed by --screen",
+        type=int,
+    )
+
+    parser.add_argument(
+        "--benchmark",
+        help="Symbol among --tickers/--currencies for the 'correlation' metric",
+        type=str,
+    )
+
+    parser.add_argument(
+        "--max-memory",
+        help=(
+            "Memory budget for loaded data, caches and results (e.g. 512MB, 2GB); "
+            "cold series and results beyond it are spilled to temporary files"
+        ),
         type=str,
     )
 
     args = parser.parse_args()
 
+    # Files are loaded in full unless a period is given explicitly.
+    args.period_explicit = args.period is not None
+    args.period = args.period or DEFAULT_PERIOD
+
+    if args.max_memory is not None:
+        try:
+            args.max_memory = parse_size(args.max_memory)
+        except ValueError as e:
+            parser.error(f"❌ {e}")
+
+    dates = {}
+    for name in ("start", "end"):
+        value = getattr(args, name)
+        if value is not None:
+            try:
+                dates[name] = datetime.fromisoformat(value)
+            except ValueError:
+                parser.error(f"❌ Invalid --{name} date: {value}")
+    if len(dates) == 2 and dates["start"] > dates["end"]:
+        parser.error("❌ --start must not be later than --end")
+
+    if args.follow:
+        if not args.csv:
+            parser.error("❌ --follow requires --csv")
+        args.stream = True
+
+    if args.sidecar:
+        if not (args.csv or args.excel):
+            parser.error("❌ --sidecar requires --csv or --excel")
+        if args.start or args.end or args.period_explicit:
+            parser.error(
+                "❌ --sidecar analyzes whole files; drop --start/--end/--period"
+            )
+
+    if args.matrices:
+        if not args.export:
+            parser.error("❌ --matrices requires --export")
+        if args.csv or args.excel:
+            parser.error("❌ --matrices relates --tickers/--currencies, not files")
+
+    if args.screen is not None:
+        if args.csv or args.excel:
+            parser.error("❌ --screen ranks --tickers/--currencies, not files")
+        if args.stream:
+            parser.error("❌ --screen cannot be combined with --stream")
+        if args.top < 1:
+            parser.error("❌ --top must be positive")
+        try:
+            expressions = [Expression(args.sort)]
+            if args.screen:
+                expressions.append(Expression(args.screen))
+        except CalculationError as e:
+            parser.error(f"❌ {e}")
+        uses_benchmark = any("correlation" in e.names for e in expressions)
+        if uses_benchmark and not args.benchmark:
+            parser.error("❌ The 'correlation' metric requires --benchmark")
+
+    registry = DEFAULT_REGISTRY
+    if args.universe:
+        registry = SymbolRegistry.open(args.universe)
+        try:
+            stocks = registry.symbols("stock")
+            currencies = registry.symbols("currency")
+        except DataLoadError as e:
+            parser.error(f"❌ {e}")
+        if not (args.tickers or args.currencies or args.csv or args.excel):
+            if stocks and currencies:
+                parser.error(
+                    "❌ The universe mixes stocks and currencies; "
+                    "select symbols with --tickers or --currencies"
+                )
+            args.tickers = stocks or None
+            args.currencies = currencies or None
+    args.registry = registry
+
     if args.currencies:
-        invalid = [
-            c for c in args.currencies if c.upper() not in SUPPORTED_CURRENCY_PAIRS
-        ]
+        # Pairs outside the registry are accepted if they can be derived.
+        graph = CurrencyGraph(registry.symbols("currency"))
+        invalid = [c for c in args.currencies if not graph.can_derive(c)]
         if invalid:
             parser.error(f"❌ Unsupported currency pairs: {', '.join(invalid)}")
         args.currencies = [c.upper() for c in args.currencies]
 
     if args.tickers:
-        invalid = [t for t in args.tickers if t.upper() not in SUPPORTED_STOCK_NAMES]
+        invalid = registry.unknown(args.tickers, "stock")
         if invalid:
             parser.error(f"❌ Unsupported stock tickers: {', '.join(invalid)}")
         args.tickers = [t.upper() for t in args.tickers]
 
+    if args.benchmark:
+        args.benchmark = args.benchmark.upper()
+        if args.benchmark not in (args.tickers or args.currencies or []):
+            parser.error(
+                "❌ --benchmark must be one of the selected tickers or currencies"
+            )
+
     return args
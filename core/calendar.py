@@ -0,0 +1,272 @@
+"""
+Module defining trading calendars with precomputed session arrays.
+
+A calendar holds the sorted array of its trading sessions (days) between
+SESSION_START and SESSION_END, built once per process from a weekmask and
+a list of holidays. Positions of dates among the sessions are found with
+``np.searchsorted``, so counting sessions between rows and resolving
+windows costs O(log n) per date and no Python-level date arithmetic:
+
+- ``XNYS``: New York Stock Exchange, Monday to Friday without exchange
+  holidays (New Year, Martin Luther King Jr. Day, Presidents Day, Good
+  Friday, Memorial Day, Juneteenth from 2022, Independence Day, Labor Day,
+  Thanksgiving and Christmas, with weekend observance);
+- ``FX``: the 24/5 currency market, every weekday.
+
+Windows are given as a number of sessions (``21``, ``"21 sessions"``) or
+as calendar time (``"30D"``, ``"4W"``). Either kind is resolved for all
+rows at once into the exclusive lower session bound of every row's window,
+from which rolling statistics use integer offsets only. Annualization uses
+the calendar's average number of sessions per year instead of a fixed 252.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Union
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+
+SESSION_START = "1990-01-01"
+
+SESSION_END = "2040-12-31"
+
+CALENDARS = ("XNYS", "FX")
+
+DEFAULT_CALENDAR = "XNYS"
+
+_WINDOW_PATTERN = re.compile(
+    r"^\s*(\d+)\s*(sessions?|d|days?|w|weeks?)\s*$", re.IGNORECASE
+)
+
+
+class _NYSEHolidays(AbstractHolidayCalendar):
+    """Full-day closures of the New York Stock Exchange."""
+
+    rules = [
+        # A Saturday New Year's Day is not observed on the preceding Friday.
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday(
+            "Juneteenth",
+            month=6,
+            day=19,
+            start_date="2022-01-01",
+            observance=nearest_workday,
+        ),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+class Window(NamedTuple):
+    """
+    Parsed window specification.
+
+    Attributes:
+        size: Number of sessions or calendar days.
+        unit: 'sessions' or 'days'.
+    """
+
+    size: int
+    unit: str
+
+
+def parse_window(window: Union[int, str, Window]) -> Window:
+    """
+    Parse a window given as sessions or calendar time.
+
+    Args:
+        window: Integer number of sessions, or a string such as
+            '21 sessions', '30D', '30 days' or '4W'.
+
+    Returns:
+        Window: Size and unit.
+
+    Raises:
+        ValueError: If the window is malformed or not positive.
+    """
+    if isinstance(window, Window):
+        return window
+    if isinstance(window, (int, np.integer)) and not isinstance(window, bool):
+        size, unit = int(window), "sessions"
+    else:
+        match = _WINDOW_PATTERN.match(str(window))
+        if match is None:
+            raise ValueError(
+                f"Invalid window '{window}'; use e.g. '21 sessions', '30D' or '4W'"
+            )
+        size = int(match.group(1))
+        unit = match.group(2).lower()[0]
+        if unit == "w":
+            size, unit = size * 7, "days"
+        else:
+            unit = "sessions" if unit == "s" else "days"
+    if size < 1:
+        raise ValueError(f"Window must be positive, got {window}")
+    return Window(size, unit)
+
+
+class TradingCalendar:
+    """
+    Trading sessions of an exchange.
+
+    Attributes:
+        name (str): Calendar name.
+        sessions (np.ndarray): Sorted session days as datetime64[D].
+        sessions_per_year (float): Average number of sessions per year.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        weekmask: str = "1111100",
+        holidays: Iterable = (),
+        start: str = SESSION_START,
+        end: str = SESSION_END,
+    ) -> None:
+        """
+        Initialize the calendar and precompute its sessions.
+
+        Args:
+            name: Calendar name.
+            weekmask: Trading weekdays from Monday, as for np.busdaycalendar.
+            holidays: Non-trading days.
+            start: First day of the session range.
+            end: Last day of the session range.
+        """
+        self.name = name
+        days = np.arange(
+            np.datetime64(start, "D"), np.datetime64(end, "D") + 1, dtype="M8[D]"
+        )
+        business = np.busdaycalendar(
+            weekmask=weekmask,
+            holidays=np.asarray(list(holidays), dtype="M8[D]"),
+        )
+        self.sessions = days[np.is_busday(days, busdaycal=business)]
+        years = (days[-1] - days[0] + 1).astype(np.int64) / 365.2425
+        self.sessions_per_year = len(self.sessions) / years
+
+    def __repr__(self) -> str:
+        return f"TradingCalendar({self.name!r}, {len(self.sessions)} sessions)"
+
+    def _days(self, index: pd.Index) -> np.ndarray:
+        """Days of an index as datetime64[D], in local time for aware indexes."""
+        index = pd.DatetimeIndex(index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.to_numpy().astype("M8[D]")
+
+    def positions(self, index: pd.Index) -> np.ndarray:
+        """
+        Return the session position of every date.
+
+        A date that is not a session (e.g. a weekend quote) belongs to the
+        latest session before it; dates before the first session get -1.
+
+        Args:
+            index: Dates.
+
+        Returns:
+            np.ndarray: Positions into sessions.
+        """
+        return np.searchsorted(self.sessions, self._days(index), side="right") - 1
+
+    def elapsed(self, index: pd.Index) -> np.ndarray:
+        """
+        Return the number of sessions between consecutive dates.
+
+        Rows within one session count as one session apart.
+
+        Args:
+            index: Sorted dates.
+
+        Returns:
+            np.ndarray: len(index) - 1 session counts (at least 1).
+        """
+        return np.maximum(np.diff(self.positions(index)), 1)
+
+    def count(self, start, end) -> int:
+        """
+        Return the number of sessions after start up to and including end.
+
+        Args:
+            start: First date (exclusive).
+            end: Last date (inclusive).
+
+        Returns:
+            int: Number of sessions.
+        """
+        positions = self.positions(pd.DatetimeIndex([start, end]))
+        return int(positions[1] - positions[0])
+
+    def window_bounds(
+        self, index: pd.Index, window: Union[int, str, Window]
+    ) -> np.ndarray:
+        """
+        Resolve a window into the exclusive lower session bound of every row.
+
+        The window of a row at session ``p`` covers the sessions in
+        ``(bound, p]``: the last ``size`` sessions for session windows, or
+        the sessions after ``date - size days`` for calendar-time windows.
+
+        Args:
+            index: Sorted dates of the rows.
+            window: Window specification (see parse_window()).
+
+        Returns:
+            np.ndarray: Bound per row.
+        """
+        window = parse_window(window)
+        if window.unit == "sessions":
+            return self.positions(index) - window.size
+        lower = self._days(index) - np.timedelta64(window.size, "D")
+        return np.searchsorted(self.sessions, lower, side="right") - 1
+
+
+@lru_cache(maxsize=None)
+def _build(name: str) -> TradingCalendar:
+    """Build a named calendar once per process."""
+    if name == "XNYS":
+        holidays = _NYSEHolidays().holidays(SESSION_START, SESSION_END)
+        return TradingCalendar(name, holidays=holidays.to_numpy())
+    if name == "FX":
+        return TradingCalendar(name)
+    raise ValueError(f"Unknown trading calendar: {name}")
+
+
+CalendarLike = Union[str, TradingCalendar, None]
+
+
+def get_calendar(calendar: CalendarLike = None) -> TradingCalendar:
+    """
+    Resolve a calendar name or calendar.
+
+    Args:
+        calendar: 'XNYS', 'FX', a calendar, or None for the default.
+
+    Returns:
+        TradingCalendar: The calendar.
+
+    Raises:
+        ValueError: If the calendar is not supported.
+    """
+    if isinstance(calendar, TradingCalendar):
+        return calendar
+    return _build((calendar or DEFAULT_CALENDAR).upper())
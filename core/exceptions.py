@@ -16,7 +16,27 @@ class DataLoadError(FinanceException):
     pass
 
 
+class SchemaError(DataLoadError):
+    """
+    Exception raised when loaded data does not match its schema.
+
+    Attributes:
+        problems (list): Validation problems with affected row numbers.
+    """
+
+    def __init__(self, problems: list) -> None:
+        self.problems = list(problems)
+        details = "; ".join(str(p) for p in self.problems)
+        super().__init__(f"Schema validation failed: {details}")
+
+
 class CalculationError(FinanceException):
     """Exception raised for calculation errors."""
 
     pass
+
+
+class ExportError(FinanceException):
+    """Exception raised when exporting results fails."""
+
+    pass
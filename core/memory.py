@@ -0,0 +1,581 @@
+"""
+Module providing a process-wide memory budget with spilling to disk.
+
+MemoryBudget accounts the bytes held by loaded price data, the analytics
+buffer cache and analysis results, per category, and records the current
+and peak usage. Tracked objects are released from the account when they
+are garbage collected.
+
+Values kept in a SpillStore can be evicted when the budget's limit is
+exceeded: the least recently used arrays, Series and DataFrames are written
+to ``.npy`` files in a temporary directory and dropped from memory, and are
+reloaded on demand as memory maps, so the operating system pages in only
+the parts that are read. Other registered consumers (e.g. BufferPool)
+release cached memory instead of spilling it. A single value that does not
+fit even after that (e.g. a large CSV frame, see MemoryBudget.hold) is
+replaced by its memory-mapped copy, and arrays that would not fit can be
+created in a spill file from the start (see MemoryBudget.mapped). Without
+a limit nothing is spilled and plain dicts are used, so the budget only
+reports usage.
+
+Reloaded values are copy-on-write memory maps: they can be modified, but
+writes only change private copies of the touched pages and never reach the
+spill file.
+"""
+
+import os
+import re
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, Mapping, MutableMapping, Optional
+import numpy as np
+import pandas as pd
+
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(i?b?)\s*$", re.IGNORECASE)
+
+_SIZE_POWERS = {"": 0, "k": 1, "m": 2, "g": 3, "t": 4}
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a memory size such as '512MB', '2G' or '1.5GiB' into bytes.
+
+    Units are binary (1 KB = 1024 bytes); a bare number is bytes.
+
+    Args:
+        text: Size text.
+
+    Returns:
+        int: Number of bytes.
+
+    Raises:
+        ValueError: If the size is malformed or not positive.
+    """
+    match = _SIZE_PATTERN.match(str(text))
+    if match is None:
+        raise ValueError(f"Invalid memory size: {text}")
+    size = int(float(match.group(1)) * 1024 ** _SIZE_POWERS[match.group(2).lower()])
+    if size < 1:
+        raise ValueError(f"Memory size must be positive: {text}")
+    return size
+
+
+def format_size(size: int) -> str:
+    """Human-readable size with a binary unit, e.g. '1.5 MB'."""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}" if unit != "B" else f"{int(value)} B"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+def nbytes(value: Any) -> int:
+    """
+    Return the memory held by an array, Series, DataFrame or mapping of them.
+
+    Args:
+        value: Object to measure; other objects count as 0 bytes.
+
+    Returns:
+        int: Size in bytes (without Python object overhead).
+    """
+    if isinstance(value, np.ndarray):
+        return 0 if isinstance(value, np.memmap) else value.nbytes
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, Mapping):
+        return sum(nbytes(v) for v in value.values())
+    return 0
+
+
+class MemoryBudget:
+    """
+    Memory account with an optional limit enforced by spilling.
+
+    Attributes:
+        limit (int | None): Limit in bytes; None only reports usage.
+        directory (str | None): Parent directory of spill files; the
+            system temporary directory by default.
+        peak (int): Highest accounted usage in bytes.
+        spilled (int): Bytes currently held in spill files.
+    """
+
+    def __init__(
+        self, limit: Optional[int] = None, directory: Optional[str] = None
+    ) -> None:
+        """
+        Initialize the budget.
+
+        Args:
+            limit: Limit in bytes, or None for no limit.
+            directory: Parent directory of spill files.
+        """
+        self.limit = limit
+        self.directory = directory
+        self.peak = 0
+        self.spilled = 0
+        self._usage: dict[str, int] = {}
+        self._consumers: list[weakref.ref] = []
+        self._lock = threading.RLock()
+        self._enforcing = False
+        self._spill_dir: Optional[tempfile.TemporaryDirectory] = None
+        self._files = 0
+
+    @property
+    def current(self) -> int:
+        """Accounted usage in bytes."""
+        return sum(self._usage.values())
+
+    def allocate(self, size: int, category: str) -> None:
+        """
+        Account bytes to a category and spill if the limit is exceeded.
+
+        Args:
+            size: Number of bytes.
+            category: Consumer category, e.g. 'loaders', 'cache' or 'results'.
+        """
+        with self._lock:
+            self._usage[category] = self._usage.get(category, 0) + size
+            self.peak = max(self.peak, self.current)
+            self._enforce()
+
+    def fits(self, size: int) -> bool:
+        """
+        Make room for size more bytes and tell whether they fit in the limit.
+
+        Registered consumers are asked to free memory first; nothing is
+        accounted.
+
+        Args:
+            size: Number of bytes about to be allocated.
+
+        Returns:
+            bool: True if usage plus size is within the limit (always without one).
+        """
+        if self.limit is None:
+            return True
+        with self._lock:
+            self._enforce(size)
+            return self.current + size <= self.limit
+
+    def release(self, size: int, category: str) -> None:
+        """
+        Remove bytes from a category's account.
+
+        Args:
+            size: Number of bytes.
+            category: Consumer category.
+        """
+        with self._lock:
+            self._usage[category] = self._usage.get(category, 0) - size
+
+    def track(self, value: Any, category: str) -> Any:
+        """
+        Account an object until it is garbage collected.
+
+        Args:
+            value: Array, Series or DataFrame.
+            category: Consumer category.
+
+        Returns:
+            The value itself.
+        """
+        size = nbytes(value)
+        if size:
+            self.allocate(size, category)
+            weakref.finalize(value, self.release, size, category)
+        return value
+
+    def hold(self, value: Any, category: str, name: str = "value") -> Any:
+        """
+        Account an object like track(), spilling it if it does not fit.
+
+        With a limit, a value that exceeds it even after the registered
+        consumers freed memory is written to spill files and replaced by
+        its memory-mapped copy, which is not accounted as resident. Values
+        that cannot be mapped (object dtype) are tracked as they are.
+
+        Args:
+            value: Array, Series or DataFrame.
+            category: Consumer category.
+            name: Readable part of the spill file names.
+
+        Returns:
+            The value itself or its memory-mapped copy.
+        """
+        size = nbytes(value)
+        if not size or self.fits(size):
+            return self.track(value, category)
+        written = _write(self, name, value)
+        if written is None:
+            return self.track(value, category)
+        paths, load = written
+        with self._lock:
+            self.spilled += size
+        mapped = load()
+        weakref.finalize(mapped, self._unspill, size, paths)
+        return mapped
+
+    def mapped(
+        self,
+        shape: tuple[int, ...],
+        fill_value: float,
+        dtype: Any = np.float64,
+        order: str = "C",
+        name: str = "array",
+    ) -> np.ndarray:
+        """
+        Create a filled, writable array backed by a spill file.
+
+        Used for arrays that would not fit in the limit (see fits()); the
+        bytes are counted as spilled until the array is garbage collected.
+
+        Args:
+            shape: Array shape.
+            fill_value: Initial value of every element.
+            dtype: Array dtype.
+            order: 'C' or 'F' memory layout.
+            name: Readable part of the spill file name.
+
+        Returns:
+            np.ndarray: Memory-mapped array.
+        """
+        path = self.spill_path(name)
+        array = np.lib.format.open_memmap(
+            path, mode="w+", dtype=dtype, shape=shape, fortran_order=order == "F"
+        )
+        array[...] = fill_value
+        size = array.size * array.itemsize
+        with self._lock:
+            self.spilled += size
+        weakref.finalize(array, self._unspill, size, [path])
+        return array
+
+    def _unspill(self, size: int, paths: list[str]) -> None:
+        """Forget a spilled value that is no longer used and delete its files."""
+        with self._lock:
+            self.spilled -= size
+        _remove(paths)
+
+    def store(
+        self, category: str, values: Optional[Mapping[str, Any]] = None
+    ) -> MutableMapping[str, Any]:
+        """
+        Return a mapping whose values are accounted to a category.
+
+        With a limit, the mapping is a SpillStore that can spill its least
+        recently used values; otherwise the values are tracked in a dict.
+
+        Args:
+            category: Consumer category.
+            values: Initial values.
+
+        Returns:
+            MutableMapping: SpillStore or dict.
+        """
+        if self.limit is None:
+            return {
+                key: self.track(value, category)
+                for key, value in (values or {}).items()
+            }
+        store = SpillStore(self, category)
+        store.update(values or {})
+        return store
+
+    def register(self, consumer: Any) -> None:
+        """
+        Register a consumer that can free memory when the limit is exceeded.
+
+        Consumers are held weakly and asked in registration order to free
+        bytes through their ``spill(size) -> int`` method.
+
+        Args:
+            consumer: Object with a spill() method.
+        """
+        with self._lock:
+            self._consumers.append(weakref.ref(consumer, self._consumers.remove))
+
+    def _enforce(self, incoming: int = 0) -> None:
+        """Ask consumers to free memory until usage plus incoming bytes fits."""
+        if self.limit is None or self._enforcing:
+            return
+        self._enforcing = True
+        try:
+            for ref in list(self._consumers):
+                excess = self.current + incoming - self.limit
+                if excess <= 0:
+                    break
+                consumer = ref()
+                if consumer is not None:
+                    consumer.spill(excess)
+        finally:
+            self._enforcing = False
+
+    def spill_path(self, name: str) -> str:
+        """
+        Return a new path for a spill file.
+
+        Args:
+            name: Readable part of the file name.
+
+        Returns:
+            str: Path in the budget's temporary directory.
+        """
+        with self._lock:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.TemporaryDirectory(
+                    prefix="pyfinance-spill-",
+                    dir=self.directory,
+                    ignore_cleanup_errors=True,
+                )
+            self._files += 1
+            safe = re.sub(r"[^\w.-]", "_", name)[:64]
+            return os.path.join(self._spill_dir.name, f"{self._files}-{safe}.npy")
+
+    def report(self) -> dict[str, Any]:
+        """
+        Return current and peak usage.
+
+        Returns:
+            dict: 'current', 'peak', 'spilled' and 'limit' in bytes and
+                'categories' with the current bytes per category.
+        """
+        with self._lock:
+            return {
+                "current": self.current,
+                "peak": self.peak,
+                "spilled": self.spilled,
+                "limit": self.limit,
+                "categories": dict(self._usage),
+            }
+
+
+class _Entry:
+    """Value of a SpillStore, resident or spilled."""
+
+    __slots__ = ("value", "size", "paths", "load")
+
+    def __init__(self, value: Any, size: int) -> None:
+        self.value = value
+        self.size = size
+        self.paths: list[str] = []
+        self.load: Optional[Callable[[], Any]] = None
+
+
+def _save(array: np.ndarray, path: str) -> None:
+    """Write an array to an .npy file."""
+    with open(path, "wb") as f:
+        np.save(f, array, allow_pickle=False)
+
+
+def _mapped(path: str) -> np.ndarray:
+    """Copy-on-write memory map of an .npy file."""
+    return np.load(path, mmap_mode="c", allow_pickle=False)
+
+
+def _remove(paths: list[str]) -> None:
+    """Delete spill files, ignoring those already gone."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _save_index(
+    budget: MemoryBudget, key: Any, index: pd.Index, paths: list[str]
+) -> Callable[[], pd.Index]:
+    """Spill a naive DatetimeIndex and return its loader; keep other indexes."""
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is not None:
+        return lambda: index
+    paths.append(budget.spill_path(f"{key}.index"))
+    _save(index.to_numpy(), paths[-1])
+    path, name, freq = paths[-1], index.name, index.freq
+    return lambda: pd.DatetimeIndex(_mapped(path), name=name, freq=freq)
+
+
+def _write(
+    budget: MemoryBudget, key: Any, value: Any
+) -> Optional[tuple[list[str], Callable[[], Any]]]:
+    """
+    Write a value to spill files.
+
+    Series and DataFrames keep their values (a DataFrame only if all its
+    columns share one dtype) and a naive DatetimeIndex in files; other
+    indexes stay in memory.
+
+    Returns:
+        tuple | None: Spill file paths and a loader of the memory-mapped
+            value, or None if the value cannot be spilled.
+    """
+    paths: list[str] = []
+    if isinstance(value, pd.Series):
+        values = value.to_numpy()
+        if values.dtype == object:
+            return None
+        paths.append(budget.spill_path(f"{key}.values"))
+        _save(values, paths[0])
+        index, name = _save_index(budget, key, value.index, paths), value.name
+
+        def load() -> pd.Series:
+            return pd.Series(_mapped(paths[0]), index=index(), name=name, copy=False)
+
+    elif isinstance(value, pd.DataFrame):
+        if value.dtypes.nunique() != 1 or value.dtypes.iloc[0] == object:
+            return None
+        paths.append(budget.spill_path(f"{key}.values"))
+        _save(value.to_numpy(), paths[0])
+        index, columns = _save_index(budget, key, value.index, paths), value.columns
+
+        def load() -> pd.DataFrame:
+            return pd.DataFrame(
+                _mapped(paths[0]), index=index(), columns=columns, copy=False
+            )
+
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        paths.append(budget.spill_path(str(key)))
+        _save(value, paths[0])
+
+        def load() -> np.ndarray:
+            return _mapped(paths[0])
+
+    else:
+        return None
+    return paths, load
+
+
+class SpillStore(MutableMapping):
+    """
+    Mapping of arrays, Series and DataFrames that spills cold values to disk.
+
+    Values are kept in least recently used order. When the budget asks for
+    memory, the oldest resident values are written to ``.npy`` files and
+    replaced by loaders that memory-map them on the next access. Values
+    that cannot be mapped (object dtype) stay resident.
+
+    Attributes:
+        budget (MemoryBudget): Budget the values are accounted to.
+        category (str): Account category.
+    """
+
+    def __init__(self, budget: MemoryBudget, category: str) -> None:
+        """
+        Initialize an empty store and register it with the budget.
+
+        Args:
+            budget: Budget the values are accounted to.
+            category: Account category.
+        """
+        self.budget = budget
+        self.category = category
+        self._entries: OrderedDict[Any, _Entry] = OrderedDict()
+        self._finalizer = weakref.finalize(
+            self, SpillStore._cleanup, budget, category, self._entries
+        )
+        budget.register(self)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key in self._entries:
+            del self[key]
+        entry = _Entry(value, nbytes(value))
+        self._entries[key] = entry
+        self.budget.allocate(entry.size, self.category)
+
+    def __getitem__(self, key: Any) -> Any:
+        entry = self._entries[key]
+        self._entries.move_to_end(key)
+        if entry.value is None:
+            # Kept as a memory map; the operating system pages it in on demand.
+            entry.value = entry.load()
+        return entry.value
+
+    def __delitem__(self, key: Any) -> None:
+        entry = self._entries.pop(key)
+        SpillStore._discard(self.budget, self.category, entry)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        spilled = sum(1 for e in self._entries.values() if e.load is not None)
+        return f"SpillStore({self.category!r}, {len(self)} values, {spilled} spilled)"
+
+    def is_spilled(self, key: Any) -> bool:
+        """Whether a value lives in a spill file."""
+        return self._entries[key].load is not None
+
+    def spill(self, size: int) -> int:
+        """
+        Spill least recently used values until at least size bytes are freed.
+
+        Args:
+            size: Bytes to free.
+
+        Returns:
+            int: Bytes freed.
+        """
+        freed = 0
+        for key, entry in list(self._entries.items()):
+            if freed >= size:
+                break
+            if entry.load is not None or not entry.size:
+                continue
+            written = _write(self.budget, key, entry.value)
+            if written is None:
+                continue
+            entry.paths, entry.load = written
+            entry.value = None
+            self.budget.release(entry.size, self.category)
+            self.budget.spilled += entry.size
+            freed += entry.size
+        return freed
+
+    @staticmethod
+    def _discard(budget: MemoryBudget, category: str, entry: _Entry) -> None:
+        """Remove an entry from the account and delete its spill files."""
+        if entry.load is None:
+            budget.release(entry.size, category)
+        else:
+            budget.spilled -= entry.size
+        _remove(entry.paths)
+
+    @staticmethod
+    def _cleanup(budget: MemoryBudget, category: str, entries: dict) -> None:
+        """Release all entries of a garbage-collected store."""
+        for entry in entries.values():
+            SpillStore._discard(budget, category, entry)
+        entries.clear()
+
+
+_budget = MemoryBudget()
+
+
+def get_budget() -> MemoryBudget:
+    """Return the process-wide memory budget."""
+    return _budget
+
+
+def configure(
+    limit: Optional[int] = None, directory: Optional[str] = None
+) -> MemoryBudget:
+    """
+    Replace the process-wide memory budget.
+
+    Args:
+        limit: Limit in bytes, or None to only report usage.
+        directory: Parent directory of spill files.
+
+    Returns:
+        MemoryBudget: The new budget.
+    """
+    global _budget
+    _budget = MemoryBudget(limit, directory)
+    return _budget
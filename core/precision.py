@@ -0,0 +1,121 @@
+"""
+Module defining the floating-point precision policy of the analysis pipeline.
+
+The policy selects the storage dtype of loaded prices and analysis results.
+``float64`` is the default; ``float32`` halves memory and bandwidth for
+large screening workloads. Arithmetic is always carried out in float64:
+returns are computed from float64-promoted prices and rolling sums use
+float64 accumulators, so the only extra error comes from rounding values
+to float32 when they are stored.
+
+Error bounds (``u`` is the unit roundoff of the storage dtype, 2**-24 for
+float32), valid for returns with ``|r| <= 1``:
+
+- returns: ``|r32 - r64| <= 5u`` (two price roundings, propagated through
+  the ratio, plus rounding of the result);
+- rolling volatility over ``w`` returns scaled by ``sqrt(w)``:
+  ``|v32 - v64| <= 5u * w / sqrt(w - 1) + u * v64``, because the sample
+  standard deviation is ``1 / sqrt(w - 1)``-Lipschitz in the L2 norm of its
+  inputs.
+"""
+
+from typing import NamedTuple, Union
+import numpy as np
+import pandas as pd
+
+PRECISIONS = ("float64", "float32")
+
+DEFAULT_PRECISION = "float64"
+
+
+class PrecisionPolicy(NamedTuple):
+    """
+    Storage precision of prices and results.
+
+    Attributes:
+        name: 'float64' or 'float32'.
+    """
+
+    name: str = DEFAULT_PRECISION
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Storage dtype."""
+        return np.dtype(self.name)
+
+    @property
+    def unit_roundoff(self) -> float:
+        """Unit roundoff ``u`` of the storage dtype."""
+        return float(np.finfo(self.dtype).eps) / 2
+
+    def returns_atol(self) -> float:
+        """Absolute error bound of returns relative to the float64 path."""
+        return 5 * self.unit_roundoff
+
+    def volatility_atol(self, window: int, volatility: float = 0.0) -> float:
+        """
+        Absolute error bound of rolling volatility relative to the float64 path.
+
+        Args:
+            window: Rolling window (at least 2).
+            volatility: Magnitude of the float64 volatility.
+
+        Returns:
+            float: Error bound.
+        """
+        u = self.unit_roundoff
+        return 5 * u * window / np.sqrt(window - 1) + u * volatility
+
+    def cast(self, values: np.ndarray) -> np.ndarray:
+        """Return values in the storage dtype, without copying if they already are."""
+        return np.asarray(values, dtype=self.dtype)
+
+    def cast_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert the floating-point columns of a frame to the storage dtype.
+
+        Args:
+            data: Frame to convert; it is not modified.
+
+        Returns:
+            pd.DataFrame: Frame with converted columns (the input if unchanged).
+        """
+        floats = [
+            i
+            for i, dtype in enumerate(data.dtypes)
+            if pd.api.types.is_float_dtype(dtype) and dtype != self.dtype
+        ]
+        if not floats:
+            return data
+        result = data.copy(deep=False)
+        for i in floats:
+            result.isetitem(i, data.iloc[:, i].to_numpy(dtype=self.dtype))
+        return result
+
+
+FLOAT64 = PrecisionPolicy("float64")
+
+FLOAT32 = PrecisionPolicy("float32")
+
+PrecisionLike = Union[str, PrecisionPolicy, None]
+
+
+def get_policy(precision: PrecisionLike = None) -> PrecisionPolicy:
+    """
+    Resolve a precision name or policy.
+
+    Args:
+        precision: 'float64', 'float32', a policy, or None for the default.
+
+    Returns:
+        PrecisionPolicy: The policy.
+
+    Raises:
+        ValueError: If the precision is not supported.
+    """
+    if isinstance(precision, PrecisionPolicy):
+        return precision
+    name = precision or DEFAULT_PRECISION
+    if name not in PRECISIONS:
+        raise ValueError(f"Unsupported precision: {name}")
+    return PrecisionPolicy(name)
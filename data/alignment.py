@@ -0,0 +1,335 @@
+"""
+Module for aligning several price series with different calendars.
+
+Series are reduced to sorted int64 timestamps and merged on a shared index
+with one of three strategies:
+
+- 'union': every timestamp seen in any series, optionally forward-filled;
+- 'intersection': only timestamps present in every series;
+- 'asof': the first series' timestamps, other series taking their last
+  observation at or before each timestamp.
+
+The resulting AlignmentPlan stores, per series, the source row to take for
+every target row, so applying it is a single gather. Plans are cached per
+symbol set and reused while the inputs keep the same timestamps.
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Mapping, Optional, Union
+import numpy as np
+import pandas as pd
+
+STRATEGIES = ("union", "intersection", "asof")
+
+PriceData = Union[pd.DataFrame, Mapping[str, pd.Series]]
+
+# (length, hash of the timestamps) of a cleaned series.
+Fingerprint = tuple[int, int]
+
+
+def _clean(series: pd.Series, tz) -> tuple[np.ndarray, np.ndarray]:
+    """Return sorted unique int64 timestamps and float values of a series."""
+    series = series.dropna()
+    index = series.index
+    if isinstance(index, pd.DatetimeIndex):
+        if tz is not None:
+            index = (
+                index.tz_convert(tz) if index.tz is not None else index.tz_localize(tz)
+            )
+        stamps = index.as_unit("ns").asi8
+    elif pd.api.types.is_integer_dtype(index):
+        stamps = index.to_numpy(dtype=np.int64)
+    else:
+        stamps = pd.DatetimeIndex(index).as_unit("ns").asi8
+    values = series.to_numpy(dtype=np.float64)
+
+    if len(stamps) > 1 and not np.all(stamps[1:] > stamps[:-1]):
+        order = np.argsort(stamps, kind="stable")
+        stamps, values = stamps[order], values[order]
+        # Keep the last observation of duplicated timestamps.
+        keep = np.append(stamps[1:] != stamps[:-1], True)
+        stamps, values = stamps[keep], values[keep]
+    return stamps, values
+
+
+def _unit(series: Mapping[str, pd.Series]) -> Optional[str]:
+    """Finest DatetimeIndex resolution among inputs; None if all are integer-indexed."""
+    if series and all(pd.api.types.is_integer_dtype(s.index) for s in series.values()):
+        return None
+    units = [
+        s.index.unit for s in series.values() if isinstance(s.index, pd.DatetimeIndex)
+    ]
+    return max(units, key=["s", "ms", "us", "ns"].index, default="ns")
+
+
+def _fingerprint(stamps: np.ndarray) -> Fingerprint:
+    """Hash of a cleaned timestamp array, checked before a full comparison."""
+    return (len(stamps), hash(stamps.tobytes()))
+
+
+class AlignmentPlan:
+    """
+    Precomputed mapping of several series onto a shared index.
+
+    Attributes:
+        symbols (list[str]): Series names in column order.
+        stamps (np.ndarray): Sorted int64 timestamps of the target index.
+        positions (np.ndarray): Source row per (target row, symbol); -1 for missing.
+        fingerprints (list[Fingerprint]): Hashes of the inputs the plan was built for.
+        sources (list[np.ndarray]): Timestamps of the inputs the plan was built for.
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        stamps: np.ndarray,
+        positions: np.ndarray,
+        fingerprints: list[Fingerprint],
+        unit: Optional[str] = "ns",
+        tz=None,
+        sources: Optional[list[np.ndarray]] = None,
+    ) -> None:
+        """
+        Initialize a plan; use AlignmentPlan.build to compute one.
+
+        Args:
+            symbols: Series names in column order.
+            stamps: Sorted int64 timestamps of the target index.
+            positions: Source row per (target row, symbol); -1 for missing.
+            fingerprints: Hashes of the inputs the plan was built for.
+            unit: Resolution of the output DatetimeIndex; None for an integer index.
+            tz: Time zone of the output index.
+            sources: Timestamps of the inputs the plan was built for.
+        """
+        self.symbols = symbols
+        self.stamps = stamps
+        self.positions = positions
+        self.fingerprints = fingerprints
+        self.sources = sources or []
+        self._unit = unit
+        self._tz = tz
+
+    @classmethod
+    def build(
+        cls,
+        symbols: list[str],
+        stamps: list[np.ndarray],
+        strategy: str = "union",
+        limit: Optional[int] = 0,
+        tolerance: Optional[pd.Timedelta] = None,
+        unit: Optional[str] = "ns",
+        tz=None,
+    ) -> "AlignmentPlan":
+        """
+        Build a plan from sorted unique timestamp arrays.
+
+        Args:
+            symbols: Series names in column order.
+            stamps: Sorted unique int64 timestamps per series.
+            strategy: One of STRATEGIES.
+            limit: For 'union', how many consecutive target rows a value may be
+                carried forward (0 disables filling, None is unlimited).
+            tolerance: For 'asof', the maximum age of a carried observation.
+            unit: Resolution of the output DatetimeIndex; None for an integer index.
+            tz: Time zone of the output index.
+
+        Returns:
+            AlignmentPlan: The plan.
+
+        Raises:
+            ValueError: If the strategy is not supported.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unsupported alignment strategy: {strategy}")
+        if strategy == "asof":
+            target = stamps[0] if stamps else np.empty(0, dtype=np.int64)
+        else:
+            # Sorted runs are merged by timsort in O(n log k), not a full sort.
+            merged = np.sort(
+                np.concatenate(stamps or [np.empty(0, np.int64)]), kind="stable"
+            )
+            target = (
+                merged[np.append(True, merged[1:] != merged[:-1])]
+                if len(merged)
+                else merged
+            )
+
+        rows = np.arange(len(target))
+        positions = np.empty((len(target), len(stamps)), dtype=np.int64)
+        exact_all = np.ones(len(target), dtype=bool)
+        for column, source in enumerate(stamps):
+            last = np.searchsorted(source, target, side="right") - 1
+            valid = last >= 0
+            if strategy == "asof":
+                if tolerance is not None:
+                    age = target - source[np.maximum(last, 0)]
+                    valid &= age <= pd.Timedelta(tolerance).value
+            else:
+                exact = valid & (source[np.maximum(last, 0)] == target)
+                exact_all &= exact
+                if limit is not None:
+                    last_exact = np.maximum.accumulate(np.where(exact, rows, -1))
+                    valid &= (rows - last_exact <= limit) & (last_exact >= 0)
+            positions[:, column] = np.where(valid, last, -1)
+
+        if strategy == "intersection":
+            target, positions = target[exact_all], positions[exact_all]
+        return cls(
+            symbols,
+            target,
+            positions,
+            [_fingerprint(s) for s in stamps],
+            unit,
+            tz,
+            stamps,
+        )
+
+    def matches(self, stamps: list[np.ndarray]) -> bool:
+        """
+        Check whether the plan was built for exactly these timestamps.
+
+        Hashes are compared first; on a match the arrays are compared in
+        full, so a hash collision never reuses a wrong plan.
+
+        Args:
+            stamps: Sorted unique int64 timestamps per series.
+
+        Returns:
+            bool: True if the plan applies to the inputs.
+        """
+        if self.fingerprints != [_fingerprint(s) for s in stamps]:
+            return False
+        return len(self.sources) == len(stamps) and all(
+            np.array_equal(a, b) for a, b in zip(self.sources, stamps)
+        )
+
+    @property
+    def index(self) -> pd.Index:
+        """Target index as a pandas Index."""
+        if self._unit is None:
+            return pd.Index(self.stamps)
+        index = pd.DatetimeIndex(self.stamps.view("M8[ns]")).as_unit(self._unit)
+        return index.tz_localize("UTC").tz_convert(self._tz) if self._tz else index
+
+    def apply(self, values: list[np.ndarray]) -> pd.DataFrame:
+        """
+        Gather series values onto the target index.
+
+        Args:
+            values: Cleaned float values per series, in plan column order.
+
+        Returns:
+            pd.DataFrame: Aligned values with NaN where a series has no data.
+        """
+        result = np.full(self.positions.shape, np.nan)
+        for column, source in enumerate(values):
+            rows = self.positions[:, column]
+            present = rows >= 0
+            result[present, column] = source[rows[present]]
+        return pd.DataFrame(result, index=self.index, columns=self.symbols)
+
+
+class Aligner:
+    """
+    Aligner caching one plan per symbol set and strategy.
+
+    A cached plan is reused when every input still has exactly the same
+    timestamps (a hash, then a full comparison), so repeated refreshes skip
+    the merge entirely.
+    """
+
+    def __init__(self, max_plans: int = 64) -> None:
+        """
+        Initialize an empty plan cache.
+
+        Args:
+            max_plans: Number of plans kept (least recently used are evicted).
+        """
+        self.max_plans = max_plans
+        self._plans: OrderedDict[Hashable, AlignmentPlan] = OrderedDict()
+
+    def plan(
+        self,
+        data: PriceData,
+        strategy: str = "union",
+        limit: Optional[int] = 0,
+        tolerance: Optional[pd.Timedelta] = None,
+    ) -> tuple[AlignmentPlan, list[np.ndarray]]:
+        """
+        Return the (possibly cached) plan for data and the cleaned values.
+
+        Args:
+            data: DataFrame or mapping of symbol to price Series.
+            strategy: One of STRATEGIES.
+            limit: Forward-fill limit for 'union' (see AlignmentPlan.build).
+            tolerance: Maximum observation age for 'asof'.
+
+        Returns:
+            tuple: The plan and cleaned values per series.
+        """
+        series = {str(k): v for k, v in dict(data).items()}
+        tz = next(
+            (
+                s.index.tz
+                for s in series.values()
+                if isinstance(s.index, pd.DatetimeIndex) and s.index.tz is not None
+            ),
+            None,
+        )
+        cleaned = [_clean(s, tz) for s in series.values()]
+        stamps = [c[0] for c in cleaned]
+        values = [c[1] for c in cleaned]
+
+        key = (tuple(series), strategy, limit, tolerance, str(tz))
+        plan = self._plans.get(key)
+        if plan is None or not plan.matches(stamps):
+            plan = AlignmentPlan.build(
+                list(series), stamps, strategy, limit, tolerance, _unit(series), tz
+            )
+            self._plans[key] = plan
+            if len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        self._plans.move_to_end(key)
+        return plan, values
+
+    def align(
+        self,
+        data: PriceData,
+        strategy: str = "union",
+        limit: Optional[int] = 0,
+        tolerance: Optional[pd.Timedelta] = None,
+    ) -> pd.DataFrame:
+        """
+        Align several series on a shared index.
+
+        Args:
+            data: DataFrame or mapping of symbol to price Series.
+            strategy: One of STRATEGIES.
+            limit: Forward-fill limit for 'union' (see AlignmentPlan.build).
+            tolerance: Maximum observation age for 'asof'.
+
+        Returns:
+            pd.DataFrame: Aligned prices with one column per symbol.
+
+        Raises:
+            ValueError: If the strategy is not supported.
+        """
+        plan, values = self.plan(data, strategy, limit, tolerance)
+        return plan.apply(values)
+
+
+_default = Aligner()
+
+
+def align(
+    data: PriceData,
+    strategy: str = "union",
+    limit: Optional[int] = 0,
+    tolerance: Optional[pd.Timedelta] = None,
+) -> pd.DataFrame:
+    """
+    Align several series using the shared module-level plan cache.
+
+    See Aligner.align for the arguments.
+    """
+    return _default.align(data, strategy, limit, tolerance)
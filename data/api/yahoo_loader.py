@@ -1,24 +1,58 @@
 """
 Module for loading financial data using the Yahoo Finance API,
 with validation and error handling.
+
+Downloads can be shared between processes through an optional SharedCache.
 """
 
+from typing import Optional
 import yfinance as yf
 import pandas as pd
+from core.precision import PrecisionLike
 from data.base_loader import BaseDataLoader
-from core.exceptions import DataLoadError
+from data.cache import SharedCache
+from data.date_range import DateLike, resolve_bounds
+from core.exceptions import DataLoadError, SchemaError
 
 
 class YahooFinanceLoader(BaseDataLoader):
-    """Data loader for Yahoo Finance API."""
+    """
+    Data loader for Yahoo Finance API.
+
+    Attributes:
+        cache (SharedCache | None): Host-level cache of downloaded frames.
+        precision (PrecisionPolicy): Storage precision of loaded price columns.
+    """
+
+    def __init__(
+        self, cache: Optional[SharedCache] = None, precision: PrecisionLike = None
+    ) -> None:
+        """
+        Initialize the loader.
 
-    def load(self, symbol: str, period: str = "1y") -> pd.DataFrame:
+        Args:
+            cache: Optional shared cache; identical requests from concurrent
+                processes are then downloaded only once.
+            precision: 'float64' (default) or 'float32' storage of price columns.
+        """
+        super().__init__(precision)
+        self.cache = cache
+
+    def load(
+        self,
+        symbol: str,
+        period: str = "1y",
+        start: DateLike = None,
+        end: DateLike = None,
+    ) -> pd.DataFrame:
         """
         Load financial data from Yahoo Finance.
 
         Args:
             symbol: Financial instrument symbol (ticker, currency pair, etc.).
             period: Time period to load (e.g., '1d', '1mo', '1y').
+            start: Optional inclusive start date; overrides period.
+            end: Optional inclusive end date; overrides period.
 
         Returns:
             pd.DataFrame: Loaded market data.
@@ -26,9 +60,41 @@ class YahooFinanceLoader(BaseDataLoader):
         Raises:
             DataLoadError: If API request fails.
         """
+        if self.cache is None:
+            return self._download(symbol, period, start, end)
+        key = SharedCache.make_key(
+            "yahoo",
+            symbol if isinstance(symbol, str) else tuple(symbol),
+            period if start is None and end is None else None,
+            str(start),
+            str(end),
+            self.precision.name,
+        )
+        return self.cache.get_or_compute(
+            key, lambda: self._download(symbol, period, start, end)
+        )
+
+    def _download(
+        self, symbol: str, period: str, start: DateLike, end: DateLike
+    ) -> pd.DataFrame:
+        """Download and validate data from Yahoo Finance."""
         try:
-            data = yf.download(symbol, period=period)
-            self._validate_data(data)
-            return data
+            if start is None and end is None:
+                data = yf.download(symbol, period=period)
+            else:
+                lower, upper = resolve_bounds(start, end)
+                # Yahoo treats 'end' as exclusive.
+                data = yf.download(
+                    symbol,
+                    start=lower.date() if lower is not None else None,
+                    end=(
+                        (upper.normalize() + pd.Timedelta(days=1)).date()
+                        if upper is not None
+                        else None
+                    ),
+                )
+            return self._validate_data(data)
+        except SchemaError:
+            raise
         except Exception as e:
             raise DataLoadError(f"Yahoo Finance error: {str(e)}")
@@ -0,0 +1,173 @@
+"""
+Module providing asynchronous counterparts of the data loaders.
+
+The existing loaders parse files and call the Yahoo Finance API
+synchronously; the adapters here run them in an executor so an event loop
+can overlap many loads. Yahoo requests are limited by one process-wide
+ConcurrencyLimit (YAHOO_LIMIT) to avoid flooding the API, however many
+loaders and services issue them.
+"""
+
+import asyncio
+import functools
+import weakref
+from concurrent.futures import Executor
+from typing import Optional, Union
+import pandas as pd
+from core.precision import PrecisionLike
+from data.api.yahoo_loader import YahooFinanceLoader
+from data.base_loader import AbstractDataLoader, AsyncDataLoader
+from data.cache import SharedCache
+from data.csv_loader import CSVDataLoader
+from data.excel_loader import ExcelDataLoader
+
+DEFAULT_YAHOO_CONCURRENCY = 4
+
+
+class ConcurrencyLimit:
+    """
+    Limit of simultaneous loads that several adapters can share.
+
+    Attributes:
+        max_concurrency (int): Maximum number of simultaneous loads.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        """
+        Initialize the limit.
+
+        Args:
+            max_concurrency: Maximum number of simultaneous loads.
+        """
+        self.max_concurrency = max_concurrency
+        # A semaphore belongs to one event loop, so keep one per running loop.
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore of the running loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+
+YAHOO_LIMIT = ConcurrencyLimit(DEFAULT_YAHOO_CONCURRENCY)
+
+
+class AsyncLoaderAdapter(AsyncDataLoader):
+    """
+    Asynchronous adapter running a synchronous loader in an executor.
+
+    Attributes:
+        loader (AbstractDataLoader): Wrapped synchronous loader.
+        limit (ConcurrencyLimit | None): Limit of simultaneous loads; None is unlimited.
+        executor (Executor | None): Executor for blocking calls; the loop default if None.
+    """
+
+    def __init__(
+        self,
+        loader: AbstractDataLoader,
+        max_concurrency: Union[int, ConcurrencyLimit, None] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            loader: Synchronous loader to wrap.
+            max_concurrency: Limit of simultaneous loads, or a limit shared
+                with other adapters; None is unlimited.
+            executor: Executor for blocking calls; the loop default if None.
+        """
+        self.loader = loader
+        if isinstance(max_concurrency, int):
+            max_concurrency = ConcurrencyLimit(max_concurrency)
+        self.limit = max_concurrency
+        self.executor = executor
+
+    def _semaphore(self) -> Optional[asyncio.Semaphore]:
+        """Return the concurrency limit for the running loop."""
+        return None if self.limit is None else self.limit.semaphore()
+
+    async def load(self, source: str, *args, **kwargs) -> pd.DataFrame:
+        """
+        Run the wrapped loader's load() in the executor.
+
+        Args:
+            source: Path or identifier of data source.
+            *args: Passed to the wrapped loader.
+            **kwargs: Passed to the wrapped loader.
+
+        Returns:
+            pd.DataFrame: Loaded financial data.
+
+        Raises:
+            DataLoadError: If loading fails.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self.loader.load, source, *args, **kwargs)
+        semaphore = self._semaphore()
+        if semaphore is None:
+            return await loop.run_in_executor(self.executor, call)
+        async with semaphore:
+            return await loop.run_in_executor(self.executor, call)
+
+
+class AsyncCSVDataLoader(AsyncLoaderAdapter):
+    """Asynchronous loader for CSV files parsed in an executor."""
+
+    def __init__(
+        self, executor: Optional[Executor] = None, precision: PrecisionLike = None
+    ) -> None:
+        """
+        Initialize the loader.
+
+        Args:
+            executor: Executor for parsing; the loop default if None.
+            precision: 'float64' (default) or 'float32' storage of price columns.
+        """
+        super().__init__(CSVDataLoader(precision), executor=executor)
+
+
+class AsyncExcelDataLoader(AsyncLoaderAdapter):
+    """Asynchronous loader for Excel files parsed in an executor."""
+
+    def __init__(
+        self, executor: Optional[Executor] = None, precision: PrecisionLike = None
+    ) -> None:
+        """
+        Initialize the loader.
+
+        Args:
+            executor: Executor for parsing; the loop default if None.
+            precision: 'float64' (default) or 'float32' storage of price columns.
+        """
+        super().__init__(ExcelDataLoader(precision), executor=executor)
+
+
+class AsyncYahooFinanceLoader(AsyncLoaderAdapter):
+    """Asynchronous Yahoo Finance loader with a concurrency limit."""
+
+    def __init__(
+        self,
+        cache: Optional[SharedCache] = None,
+        max_concurrency: Union[int, ConcurrencyLimit] = YAHOO_LIMIT,
+        executor: Optional[Executor] = None,
+        loader: Optional[YahooFinanceLoader] = None,
+        precision: PrecisionLike = None,
+    ) -> None:
+        """
+        Initialize the loader.
+
+        Args:
+            cache: Optional host-level download cache.
+            max_concurrency: Maximum number of simultaneous API requests;
+                shared by every Yahoo loader of the process by default.
+            executor: Executor for API calls; the loop default if None.
+            loader: Synchronous loader to wrap; a new YahooFinanceLoader by default.
+            precision: Storage precision of a newly created loader.
+        """
+        super().__init__(
+            loader or YahooFinanceLoader(cache, precision), max_concurrency, executor
+        )
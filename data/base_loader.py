@@ -1,12 +1,16 @@
 """
 Module defining abstract and base classes for financial data loaders,
-including validation and error handling mechanisms.
+including validation and error handling mechanisms, and the asynchronous
+loader interface.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Iterable, Union
 import pandas as pd
 from core.exceptions import DataLoadError
+from core.precision import FLOAT64, PrecisionLike, PrecisionPolicy, get_policy
+from data.schema import OHLCV_SCHEMA, Schema
 
 
 class AbstractDataLoader(ABC):
@@ -29,20 +33,93 @@ class AbstractDataLoader(ABC):
         pass
 
 
+class AsyncDataLoader(ABC):
+    """Abstract base class for asynchronous data loading strategies."""
+
+    @abstractmethod
+    async def load(self, source: str, *args, **kwargs) -> pd.DataFrame:
+        """
+        Load financial data from specified source without blocking the event loop.
+
+        Args:
+            source: Path or identifier of data source.
+            *args: Loader-specific positional arguments.
+            **kwargs: Loader-specific keyword arguments.
+
+        Returns:
+            pd.DataFrame: Loaded financial data.
+
+        Raises:
+            DataLoadError: If loading fails.
+        """
+        pass
+
+    async def load_many(
+        self, sources: Iterable[str], *args, **kwargs
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Load several sources concurrently.
+
+        Args:
+            sources: Paths or identifiers of data sources.
+            *args: Passed to load() for every source.
+            **kwargs: Passed to load() for every source.
+
+        Returns:
+            dict[str, pd.DataFrame]: Loaded data keyed by source, in input order.
+
+        Raises:
+            DataLoadError: If any source fails to load.
+        """
+        sources = list(sources)
+        frames = await asyncio.gather(
+            *(self.load(source, *args, **kwargs) for source in sources)
+        )
+        return dict(zip(sources, frames))
+
+
 class BaseDataLoader(AbstractDataLoader):
-    """Base class with common functionality for data loaders."""
+    """
+    Base class with common functionality for data loaders.
+
+    Attributes:
+        precision (PrecisionPolicy): Storage precision of loaded price columns.
+    """
+
+    schema: Schema = OHLCV_SCHEMA
 
-    def _validate_data(self, data: pd.DataFrame) -> None:
+    precision: PrecisionPolicy = FLOAT64
+
+    def __init__(self, precision: PrecisionLike = None) -> None:
         """
-        Validate loaded DataFrame structure.
+        Initialize the loader.
+
+        Args:
+            precision: 'float64' (default) or 'float32' storage of price columns.
+        """
+        self.precision = get_policy(precision)
+
+    def _validate_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Validate loaded DataFrame structure and content against the schema.
+
+        Frames already validated against the schema are returned unchanged,
+        apart from the conversion to the loader's precision.
 
         Args:
             data: DataFrame to validate.
 
+        Returns:
+            pd.DataFrame: Validated frame with coerced dtypes and sorted index.
+
         Raises:
             DataLoadError: If validation fails due to wrong type or empty DataFrame.
+            SchemaError: If the content does not match the schema.
         """
         if not isinstance(data, pd.DataFrame):
             raise DataLoadError("Loaded data is not a DataFrame")
         if data.empty:
             raise DataLoadError("Loaded DataFrame is empty")
+        # Casting to the storage precision keeps a validated frame valid.
+        validated = self.precision.cast_frame(self.schema.validate(data))
+        return self.schema.trust(validated)
@@ -0,0 +1,264 @@
+"""
+Module providing a host-level cache shared by concurrent processes.
+
+Entries are DataFrames stored as Parquet files in a common directory, so
+reading an entry never executes code even if the directory is writable by
+others. Writes go to a temporary file that is atomically renamed into
+place, so readers never see partial entries. get_or_compute() takes a
+per-key lock file before computing, which gives single-flight semantics:
+when one process is already downloading a key, others block on the lock
+and then read its result instead of issuing the same request; the holder
+removes the lock file when it is done. The directory is kept under a size
+budget by evicting the least recently used entries.
+
+Only downloads go through the cache. Analyses of files are cached next to
+the files by SidecarService; analyses of downloads are recomputed, which
+takes one pass of the fused kernels over frames that are already loaded.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+ENTRY_SUFFIX = ".parquet"
+LOCK_SUFFIX = ".lock"
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _try_lock(handle) -> bool:
+    """Try to take an exclusive lock on an open file without blocking."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover - Windows
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(handle) -> None:
+    """Release a lock taken with _try_lock."""
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:  # pragma: no cover - Windows
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _is_current(handle, path: str) -> bool:
+    """Whether an open lock file is still the one at path (not removed since)."""
+    try:
+        return os.path.samestat(os.fstat(handle.fileno()), os.stat(path))
+    except OSError:
+        return False
+
+
+class SharedCache:
+    """
+    Directory-backed cache safe to share between processes on one host.
+
+    Attributes:
+        directory (str): Cache directory.
+        max_bytes (int): Size budget for all entries.
+        ttl (float | None): Entry lifetime in seconds; None never expires.
+        lock_timeout (float): Seconds to wait for another process's fetch.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: Optional[float] = 3600.0,
+        lock_timeout: float = 300.0,
+        poll_interval: float = 0.05,
+    ) -> None:
+        """
+        Initialize the cache, creating the directory if needed.
+
+        Args:
+            directory: Cache directory shared by all processes.
+            max_bytes: Size budget; least recently used entries are evicted.
+            ttl: Entry lifetime in seconds; None never expires.
+            lock_timeout: Seconds to wait for another process holding a key.
+                After the timeout the value is computed without the lock.
+            poll_interval: Seconds between lock attempts while waiting.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a file-name safe key from arbitrary parts.
+
+        Args:
+            *parts: Values identifying the entry (e.g. 'yahoo', 'AAPL', '1y').
+
+        Returns:
+            str: Hex digest of the parts.
+        """
+        return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Path of the entry file for key."""
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Return the cached frame for key, or None if missing or expired.
+
+        Args:
+            key: Entry key.
+
+        Returns:
+            Optional[pd.DataFrame]: Cached frame.
+        """
+        path = self._path(key)
+        try:
+            if self.ttl is not None and time.time() - os.stat(path).st_mtime > self.ttl:
+                return None
+            value = pd.read_parquet(path)
+        except (OSError, ValueError):
+            return None
+        # Access time drives eviction; mtime is left alone so TTL still applies.
+        try:
+            os.utime(path, (time.time(), os.stat(path).st_mtime))
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: pd.DataFrame) -> None:
+        """
+        Store a frame under key atomically and enforce the size budget.
+
+        Args:
+            key: Entry key.
+            value: Frame to store.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                value.to_parquet(f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[bool]:
+        """
+        Hold the inter-process lock for key.
+
+        The holder removes the lock file before releasing it. A waiter that
+        then acquires the removed file retries on the current one, so at
+        most one process holds the lock of a key at a time.
+
+        Args:
+            key: Entry key.
+
+        Yields:
+            bool: True if the lock was acquired, False after lock_timeout.
+        """
+        path = os.path.join(self.directory, key + LOCK_SUFFIX)
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            handle = open(path, "a+b")
+            acquired = _try_lock(handle)
+            while not acquired and time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                acquired = _try_lock(handle)
+            if not acquired or _is_current(handle, path):
+                break
+            _unlock(handle)
+            handle.close()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                _unlock(handle)
+            handle.close()
+
+    def get_or_compute(
+        self, key: str, compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Return the cached frame for key, computing it at most once per host.
+
+        Args:
+            key: Entry key.
+            compute: Function producing the frame on a miss.
+
+        Returns:
+            pd.DataFrame: Cached or freshly computed frame.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self.lock(key):
+            # Another process may have filled the entry while we waited.
+            value = self.get(key)
+            if value is None:
+                value = compute()
+                self.put(key, value)
+        return value
+
+    def size(self) -> int:
+        """Total size of all entries in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the size budget is met."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        """List (path, access time, size) of all entries."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_atime, stat.st_size))
+        return entries
@@ -0,0 +1,256 @@
+"""
+Module for deriving currency cross rates from a minimal set of downloads.
+
+Currencies form a graph whose edges are the pairs that can be downloaded.
+For a set of requested pairs, CurrencyGraph.plan() selects a spanning
+forest of downloads: a requested pair is fetched directly only if its two
+currencies are not yet connected by the selected downloads, otherwise it is
+derived. An N x N matrix of pairs between N currencies therefore needs only
+N - 1 downloads, and pairs that cannot be downloaded at all (e.g. EURUSD
+when only RUB quotes are available) are routed through the shortest path of
+available pairs.
+
+Derived rates are computed with vectorized array operations on the
+downloaded series along the path, aligned on their common timestamps.
+"""
+
+from collections import defaultdict, deque
+from typing import Any, Iterable, Mapping, NamedTuple, Optional
+import numpy as np
+import pandas as pd
+from data.alignment import align
+
+
+def split_pair(pair: str) -> tuple[str, str]:
+    """
+    Split a pair symbol such as 'EURUSD' into base and quote currency.
+
+    Args:
+        pair: Six-letter pair symbol.
+
+    Returns:
+        tuple[str, str]: Base and quote currency codes.
+
+    Raises:
+        ValueError: If the symbol is not two different three-letter codes.
+    """
+    pair = pair.upper()
+    if len(pair) != 6 or not pair.isalpha() or pair[:3] == pair[3:]:
+        raise ValueError(f"Invalid currency pair: {pair}")
+    return pair[:3], pair[3:]
+
+
+class CrossRatePlan(NamedTuple):
+    """
+    Downloads needed for requested pairs and how to derive the others.
+
+    Attributes:
+        pairs: Requested pairs in request order.
+        downloads: Pairs to download; they form a forest over the currencies.
+    """
+
+    pairs: list[str]
+    downloads: list[str]
+
+    @property
+    def derived(self) -> list[str]:
+        """Requested pairs that are computed instead of downloaded."""
+        downloads = set(self.downloads)
+        return [pair for pair in self.pairs if pair not in downloads]
+
+    def derive(self, rates: Mapping[str, pd.Series]) -> dict[str, pd.Series]:
+        """
+        Compute all requested pairs from the downloaded rates.
+
+        Downloaded pairs are returned unchanged. A derived pair is the product
+        of the rates along its path of downloads, aligned on their common
+        dates.
+
+        Args:
+            rates: Downloaded rates keyed by pair (quote units per base unit).
+
+        Returns:
+            dict[str, pd.Series]: Rates of the requested pairs in request order.
+        """
+        legs = self.legs()
+        result: dict[str, pd.Series] = {}
+        for pair in self.pairs:
+            if legs[pair] == [(pair, False)]:
+                result[pair] = rates[pair]
+                continue
+            frame = align({edge: rates[edge] for edge, _ in legs[pair]}, "intersection")
+            columns = {edge: frame[edge].to_numpy(dtype=np.float64) for edge in frame}
+            value = cross_rate(legs[pair], columns)
+            result[pair] = pd.Series(value, index=frame.index, name=pair)
+        return result
+
+    def legs(self) -> dict[str, list[tuple[str, bool]]]:
+        """
+        Downloads combined into each requested pair.
+
+        Returns:
+            dict[str, list[tuple[str, bool]]]: For every requested pair, the
+                downloads along its path and whether each one is inverted
+                (divided by) rather than multiplied; a downloaded pair is its
+                own single leg.
+        """
+        adjacency = defaultdict(list)
+        for pair in self.downloads:
+            base, quote = split_pair(pair)
+            adjacency[base].append((quote, pair))
+            adjacency[quote].append((base, pair))
+
+        legs: dict[str, list[tuple[str, bool]]] = {}
+        downloads = set(self.downloads)
+        for pair in self.pairs:
+            if pair in downloads:
+                legs[pair] = [(pair, False)]
+                continue
+            base, quote = split_pair(pair)
+            current = base
+            legs[pair] = []
+            for currency, edge in _tree_path(adjacency, base, quote):
+                legs[pair].append((edge, edge != current + currency))
+                current = currency
+        return legs
+
+
+def cross_rate(legs: list[tuple[str, bool]], rates: Mapping[str, Any]) -> Any:
+    """
+    Combine the rates of a pair's legs (see CrossRatePlan.legs).
+
+    Args:
+        legs: Downloads along the path and whether each one is inverted.
+        rates: Rate of every leg, as floats or aligned arrays.
+
+    Returns:
+        Any: Price of one unit of base in units of quote, of the same kind
+            as the leg rates.
+    """
+    value = 1.0
+    for edge, inverted in legs:
+        value = value / rates[edge] if inverted else value * rates[edge]
+    return value
+
+
+def _tree_path(
+    adjacency: Mapping[str, list[tuple[str, str]]], base: str, quote: str
+) -> list[tuple[str, str]]:
+    """Steps (currency, pair) from base to quote in a forest of downloads."""
+    previous = {base: None}
+    queue = deque([base])
+    while queue and quote not in previous:
+        currency = queue.popleft()
+        for neighbor, pair in adjacency[currency]:
+            if neighbor not in previous:
+                previous[neighbor] = (currency, pair)
+                queue.append(neighbor)
+    path = []
+    while previous[quote] is not None:
+        currency, pair = previous[quote]
+        path.append((quote, pair))
+        quote = currency
+    return path[::-1]
+
+
+class CurrencyGraph:
+    """
+    Graph of currencies connected by downloadable pairs.
+
+    Attributes:
+        pairs (set[str]): Downloadable pairs.
+    """
+
+    def __init__(self, pairs: Iterable[str]) -> None:
+        """
+        Initialize the graph.
+
+        Args:
+            pairs: Pairs that can be downloaded, e.g. ['USDRUB', 'EURRUB'].
+
+        Raises:
+            ValueError: If a pair symbol is invalid.
+        """
+        self.pairs = {pair.upper() for pair in pairs}
+        self._adjacency: dict[str, list[tuple[str, str]]] = defaultdict(list)
+        for pair in sorted(self.pairs):
+            base, quote = split_pair(pair)
+            self._adjacency[base].append((quote, pair))
+            self._adjacency[quote].append((base, pair))
+
+    def can_derive(self, pair: str) -> bool:
+        """Whether a pair is valid and can be downloaded or derived."""
+        try:
+            base, quote = split_pair(pair)
+        except ValueError:
+            return False
+        return self._path(base, quote, ()) is not None
+
+    def plan(self, pairs: Iterable[str]) -> CrossRatePlan:
+        """
+        Select the downloads needed for the requested pairs.
+
+        Downloadable requested pairs are considered first, so they are
+        fetched directly unless their currencies are already connected.
+
+        Args:
+            pairs: Requested pairs.
+
+        Returns:
+            CrossRatePlan: Requested pairs and pairs to download.
+
+        Raises:
+            ValueError: If a pair is invalid or cannot be derived.
+        """
+        pairs = list(dict.fromkeys(pair.upper() for pair in pairs))
+        roots: dict[str, str] = {}
+
+        def find(currency: str) -> str:
+            roots.setdefault(currency, currency)
+            while roots[currency] != currency:
+                roots[currency] = roots[roots[currency]]
+                currency = roots[currency]
+            return currency
+
+        selected: list[str] = []
+        for pair in sorted(pairs, key=lambda p: p not in self.pairs):
+            base, quote = split_pair(pair)
+            if find(base) == find(quote):
+                continue
+            path = [pair] if pair in self.pairs else self._path(base, quote, selected)
+            if path is None:
+                raise ValueError(f"Cannot derive {pair} from available pairs")
+            for edge in path:
+                a, b = split_pair(edge)
+                if find(a) != find(b):
+                    roots[find(a)] = find(b)
+                    selected.append(edge)
+        return CrossRatePlan(pairs, selected)
+
+    def _path(
+        self, base: str, quote: str, selected: Iterable[str]
+    ) -> Optional[list[str]]:
+        """Path of pairs from base to quote preferring already selected pairs."""
+        free = set(selected)
+        cost = {base: 0}
+        previous: dict[str, tuple[str, str]] = {}
+        queue = deque([base])
+        # 0-1 BFS: selected pairs cost nothing, new downloads cost one.
+        while queue:
+            currency = queue.popleft()
+            for neighbor, pair in self._adjacency.get(currency, ()):
+                step = 0 if pair in free else 1
+                if cost[currency] + step < cost.get(neighbor, np.inf):
+                    cost[neighbor] = cost[currency] + step
+                    previous[neighbor] = (currency, pair)
+                    if step:
+                        queue.append(neighbor)
+                    else:
+                        queue.appendleft(neighbor)
+        if quote not in cost:
+            return None
+        path = []
+        while quote != base:
+            quote, pair = previous[quote]
+            path.append(pair)
+        return path[::-1]
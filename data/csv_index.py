@@ -0,0 +1,254 @@
+"""
+Module providing a sparse date -> byte offset index for CSV files.
+
+The index samples every N-th data row of a date-sorted CSV file and records
+the byte offset where that row starts. It is persisted as a sidecar file next
+to the CSV and rebuilt whenever the file size or modification time changes,
+so that date-range queries can parse only the relevant byte range.
+"""
+
+import os
+from typing import Optional
+import numpy as np
+import pandas as pd
+from data.date_range import match_tz
+
+SIDECAR_SUFFIX = ".idx.npz"
+
+READ_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+class CSVDateIndex:
+    """
+    Sparse index of row start offsets and dates for a CSV file.
+
+    Attributes:
+        filepath (str): Path to the indexed CSV file.
+        header (bytes): Header line including its line terminator.
+        offsets (np.ndarray): Byte offsets of sampled row starts (int64).
+        dates (np.ndarray): Dates of sampled rows as UTC nanoseconds (int64).
+        size (int): File size in bytes when the index was built.
+        mtime_ns (int): File modification time when the index was built.
+        is_sorted (bool): Whether sampled dates are non-decreasing.
+        last_date (str): Raw date value of the last row.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        header: bytes,
+        offsets: np.ndarray,
+        dates: np.ndarray,
+        size: int,
+        mtime_ns: int,
+        last_date: str,
+    ) -> None:
+        """
+        Initialize the index from precomputed arrays.
+
+        Args:
+            filepath: Path to the indexed CSV file.
+            header: Header line including its line terminator.
+            offsets: Byte offsets of sampled row starts.
+            dates: Dates of sampled rows as UTC nanoseconds.
+            size: File size in bytes.
+            mtime_ns: File modification time in nanoseconds.
+            last_date: Raw date value of the last row.
+        """
+        self.filepath = filepath
+        self.header = header
+        self.offsets = offsets
+        self.dates = dates
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.last_date = last_date
+        self.is_sorted = bool(np.all(np.diff(dates) >= 0))
+
+    @staticmethod
+    def sidecar_path(filepath: str) -> str:
+        """Return the path of the sidecar index file for filepath."""
+        return filepath + SIDECAR_SUFFIX
+
+    @property
+    def latest(self) -> pd.Timestamp:
+        """Timestamp of the last row in the file."""
+        return pd.Timestamp(self.last_date)
+
+    @classmethod
+    def load_or_build(
+        cls, filepath: str, date_column: str = "Date", stride: int = 1024
+    ) -> "CSVDateIndex":
+        """
+        Load the sidecar index if it is up to date, otherwise build and save it.
+
+        Args:
+            filepath: Path to the CSV file.
+            date_column: Name of the date column.
+            stride: Number of data rows between sampled offsets.
+
+        Returns:
+            CSVDateIndex: Index matching the current file contents.
+        """
+        stat = os.stat(filepath)
+        index = cls._load(filepath, stat.st_size, stat.st_mtime_ns)
+        if index is None:
+            index = cls.build(filepath, date_column, stride)
+            index.save()
+        return index
+
+    @classmethod
+    def _load(cls, filepath: str, size: int, mtime_ns: int) -> Optional["CSVDateIndex"]:
+        """Load a persisted index, returning None if it is missing or stale."""
+        try:
+            with np.load(cls.sidecar_path(filepath)) as stored:
+                if int(stored["size"]) != size or int(stored["mtime_ns"]) != mtime_ns:
+                    return None
+                return cls(
+                    filepath,
+                    stored["header"].tobytes(),
+                    stored["offsets"],
+                    stored["dates"],
+                    size,
+                    mtime_ns,
+                    str(stored["last_date"]),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @classmethod
+    def build(
+        cls, filepath: str, date_column: str = "Date", stride: int = 1024
+    ) -> "CSVDateIndex":
+        """
+        Scan the file once and build a sparse index of row start offsets.
+
+        Line boundaries are located with vectorized byte searches on large
+        chunks; only the sampled rows have their date field parsed.
+
+        Args:
+            filepath: Path to the CSV file.
+            date_column: Name of the date column.
+            stride: Number of data rows between sampled offsets.
+
+        Returns:
+            CSVDateIndex: Freshly built index.
+
+        Raises:
+            ValueError: If the file has no header or lacks the date column.
+        """
+        stat = os.stat(filepath)
+        with open(filepath, "rb") as f:
+            header = f.readline()
+            columns = header.decode().strip().split(",")
+            if date_column not in columns:
+                raise ValueError(
+                    f"Missing column provided to 'parse_dates': '{date_column}'"
+                )
+            # A data row starts right after the header and after every newline.
+            position = len(header)
+            starts = [np.array([position], dtype=np.int64)]
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10)
+                starts.append(newlines.astype(np.int64) + position + 1)
+                position += len(chunk)
+
+        all_starts = np.concatenate(starts)
+        all_starts = all_starts[all_starts < position]
+        if not len(all_starts):
+            raise ValueError("CSV file has no data rows")
+        sample = np.unique(
+            np.concatenate((all_starts[::stride], all_starts[-1:]))
+        ).astype(np.int64)
+
+        column = columns.index(date_column)
+        raw_dates = []
+        with open(filepath, "rb") as f:
+            for offset in sample:
+                f.seek(offset)
+                raw_dates.append(f.readline().decode().split(",")[column].strip())
+
+        dates = pd.to_datetime(raw_dates, utc=True, format="mixed")
+        return cls(
+            filepath,
+            header,
+            sample,
+            dates.as_unit("ns").asi8,
+            stat.st_size,
+            stat.st_mtime_ns,
+            raw_dates[-1],
+        )
+
+    def save(self) -> None:
+        """
+        Persist the index atomically as a sidecar file.
+
+        Failures (e.g. a read-only directory) are ignored; the index is then
+        simply rebuilt on the next read.
+        """
+        path = self.sidecar_path(self.filepath)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    header=np.frombuffer(self.header, dtype=np.uint8),
+                    offsets=self.offsets,
+                    dates=self.dates,
+                    size=self.size,
+                    mtime_ns=self.mtime_ns,
+                    last_date=self.last_date,
+                )
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def byte_range(
+        self, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]
+    ) -> tuple[int, int]:
+        """
+        Return the byte range [begin, stop) that contains all rows within [start, end].
+
+        The range is conservative: it may include up to one stride of rows on
+        either side, which callers must filter out after parsing.
+
+        Args:
+            start: Inclusive start bound.
+            end: Inclusive end bound.
+
+        Returns:
+            tuple[int, int]: Begin and stop byte offsets.
+        """
+        # Resolve the bounds as filter_frame() does: naive bounds are read in
+        # the timezone of the file's dates, before comparing UTC nanoseconds.
+        tz = self.latest.tz
+        start, end = match_tz(start, tz), match_tz(end, tz)
+        begin = len(self.header)
+        stop = self.size
+        if start is not None:
+            position = np.searchsorted(self.dates, start.value, side="left") - 1
+            if position >= 0:
+                begin = int(self.offsets[position])
+        if end is not None:
+            position = np.searchsorted(self.dates, end.value, side="right")
+            if position < len(self.offsets):
+                stop = int(self.offsets[position])
+        return begin, max(begin, stop)
+
+    def read_range(self, begin: int, stop: int) -> bytes:
+        """
+        Read the header followed by the bytes of the given data range.
+
+        Args:
+            begin: Start byte offset of the first data row.
+            stop: End byte offset (exclusive).
+
+        Returns:
+            bytes: CSV content that can be parsed with pandas.read_csv.
+        """
+        with open(self.filepath, "rb") as f:
+            f.seek(begin)
+            return self.header + f.read(stop - begin)
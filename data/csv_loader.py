@@ -3,20 +3,36 @@ Module providing CSV data loader implementation for financial data,
 with validation and error handling.
 """
 
+import io
+from typing import Optional
 import pandas as pd
 from data.base_loader import BaseDataLoader
-from core.exceptions import DataLoadError
+from data.csv_index import CSVDateIndex
+from data.date_range import DateLike, filter_frame, resolve_bounds
+from core.exceptions import DataLoadError, SchemaError
 
 
 class CSVDataLoader(BaseDataLoader):
     """Data loader for CSV files with financial data."""
 
-    def load(self, filepath: str) -> pd.DataFrame:
+    def load(
+        self,
+        filepath: str,
+        start: DateLike = None,
+        end: DateLike = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
         """
         Load financial data from CSV file.
 
+        When a date range is requested, a sparse date index stored next to
+        the file is used to parse only the byte range that covers it.
+
         Args:
             filepath: Path to CSV file.
+            start: Optional inclusive start date.
+            end: Optional inclusive end date.
+            period: Optional period (e.g. '1mo') relative to the latest row.
 
         Returns:
             pd.DataFrame: Loaded financial data.
@@ -25,13 +41,38 @@ class CSVDataLoader(BaseDataLoader):
             DataLoadError: If file loading or parsing fails.
         """
         try:
-            data = pd.read_csv(
-                filepath,
-                parse_dates=["Date"],
-                index_col="Date",
-                float_precision="round_trip",
-            )
-            self._validate_data(data)
-            return data
+            if start is None and end is None and period is None:
+                data = self._read(filepath)
+            else:
+                data = self._load_range(filepath, start, end, period)
+            return self._validate_data(data)
+        except SchemaError:
+            raise
         except Exception as e:
             raise DataLoadError(f"CSV loading error: {str(e)}")
+
+    def _read(self, source: "str | io.BytesIO") -> pd.DataFrame:
+        """Parse CSV content from a path or buffer."""
+        return pd.read_csv(
+            source,
+            parse_dates=["Date"],
+            index_col="Date",
+            float_precision="round_trip",
+        )
+
+    def _load_range(
+        self,
+        filepath: str,
+        start: DateLike,
+        end: DateLike,
+        period: Optional[str],
+    ) -> pd.DataFrame:
+        """Load only the rows within the requested date range."""
+        index = CSVDateIndex.load_or_build(filepath)
+        lower, upper = resolve_bounds(start, end, period, index.latest)
+        if not index.is_sorted:
+            return filter_frame(self._read(filepath), lower, upper)
+
+        begin, stop = index.byte_range(lower, upper)
+        data = self._read(io.BytesIO(index.read_range(begin, stop)))
+        return filter_frame(data, lower, upper)
@@ -0,0 +1,120 @@
+"""
+Module providing append-aware reading of growing CSV files.
+
+CSVTailer remembers, per file, the header, the byte offset after the last
+complete row it has returned and that row's timestamp. Each read() parses
+only the bytes appended since, so polling many append-only files costs time
+proportional to the new data. A trailing line without a line terminator is
+treated as still being written and is left for the next read.
+
+Continuity is validated before any state is advanced: the header must be
+unchanged, the file must not have shrunk, and the appended dates must be
+strictly increasing and later than the last returned row.
+"""
+
+import io
+import os
+from typing import NamedTuple, Optional
+import pandas as pd
+from core.exceptions import DataLoadError
+from data.csv_loader import CSVDataLoader
+
+
+class TailState(NamedTuple):
+    """
+    Position of a tailed file.
+
+    Attributes:
+        header: Header line including its line terminator.
+        offset: Byte offset after the last complete row returned.
+        last_date: Timestamp of that row, or None before the first row.
+    """
+
+    header: bytes
+    offset: int
+    last_date: Optional[pd.Timestamp] = None
+
+
+class CSVTailer:
+    """
+    Reader returning only rows appended to CSV files since the previous read.
+
+    Attributes:
+        loader (CSVDataLoader): Loader used to parse and validate rows.
+        states (dict[str, TailState]): Position of every tailed file.
+    """
+
+    def __init__(self, loader: Optional[CSVDataLoader] = None) -> None:
+        """
+        Initialize the tailer.
+
+        Args:
+            loader: Loader parsing the rows; a float64 CSVDataLoader by default.
+        """
+        self.loader = loader or CSVDataLoader()
+        self.states: dict[str, TailState] = {}
+
+    def reset(self, filepath: str) -> None:
+        """Forget the position of a file, so the next read starts from its first row."""
+        self.states.pop(filepath, None)
+
+    def read(self, filepath: str) -> pd.DataFrame:
+        """
+        Return the complete rows appended since the previous read.
+
+        The first read of a file returns all of its complete rows.
+
+        Args:
+            filepath: Path to the CSV file.
+
+        Returns:
+            pd.DataFrame: Validated new rows; empty if nothing was appended.
+
+        Raises:
+            DataLoadError: If the file cannot be read, was truncated or
+                rewritten, or the appended dates are not increasing.
+            SchemaError: If the appended rows do not match the schema.
+        """
+        state = self.states.get(filepath)
+        try:
+            with open(filepath, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                header = f.readline()
+                if not header.endswith(b"\n"):
+                    # The header itself is still being written.
+                    return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+                if state is None:
+                    state = TailState(header, len(header))
+                elif header != state.header:
+                    raise DataLoadError(f"Header of {filepath} has changed")
+                if size < state.offset:
+                    raise DataLoadError(f"{filepath} was truncated")
+                f.seek(state.offset)
+                chunk = f.read(size - state.offset)
+        except OSError as e:
+            raise DataLoadError(f"CSV tailing error: {str(e)}")
+
+        # Rows are complete up to the last line terminator.
+        complete = chunk.rfind(b"\n") + 1
+        try:
+            data = self.loader._read(io.BytesIO(header + chunk[:complete]))
+        except Exception as e:
+            raise DataLoadError(f"CSV tailing error: {str(e)}")
+        if data.empty:
+            self.states[filepath] = state._replace(offset=state.offset + complete)
+            return data
+
+        # Unparseable dates are left to the schema, which reports their rows.
+        dates = pd.to_datetime(data.index, errors="coerce")
+        if not dates.hasnans and (
+            not (dates.is_monotonic_increasing and dates.is_unique)
+            or (state.last_date is not None and dates[0] <= state.last_date)
+        ):
+            raise DataLoadError(
+                f"Appended rows of {filepath} are not in increasing date order"
+            )
+        data = self.loader._validate_data(data)
+        self.states[filepath] = TailState(
+            header, state.offset + complete, data.index[-1]
+        )
+        return data
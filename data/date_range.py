@@ -0,0 +1,142 @@
+"""
+Module providing helpers for restricting financial data to a date range.
+
+Resolves explicit start/end bounds and Yahoo-style periods ('1mo', 'ytd', ...)
+relative to the latest available row, and filters DataFrames by date index.
+"""
+
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
+
+DateLike = Union[str, pd.Timestamp, None]
+
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "5y": pd.DateOffset(years=5),
+}
+
+
+def _to_timestamp(value: DateLike, end_of_day: bool = False) -> Optional[pd.Timestamp]:
+    """
+    Convert a date-like value to a Timestamp.
+
+    A date-only string used as an upper bound is extended to the end of that day,
+    so that '--end 2024-01-31' includes intraday rows of January 31.
+    """
+    if value is None:
+        return None
+    timestamp = pd.Timestamp(value)
+    if end_of_day and isinstance(value, str) and len(value.strip()) <= 10:
+        timestamp = timestamp + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+    return timestamp
+
+
+def resolve_period(
+    period: Optional[str], latest: pd.Timestamp
+) -> Optional[pd.Timestamp]:
+    """
+    Resolve a period string to an inclusive start bound relative to latest.
+
+    Args:
+        period: Period string (e.g. '1mo', 'ytd', 'max') or None.
+        latest: Timestamp of the latest available row.
+
+    Returns:
+        Optional[pd.Timestamp]: Start bound, or None if the period covers all data.
+
+    Raises:
+        ValueError: If the period is not supported.
+    """
+    if period is None or period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=latest.year, month=1, day=1, tz=latest.tz)
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"Unsupported period: {period}")
+    return latest - PERIOD_OFFSETS[period] + pd.Timedelta(1, "ns")
+
+
+def resolve_bounds(
+    start: DateLike = None,
+    end: DateLike = None,
+    period: Optional[str] = None,
+    latest: Optional[pd.Timestamp] = None,
+) -> tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """
+    Combine explicit bounds and a relative period into an inclusive date range.
+
+    When both a start and a period are given, the later of the two bounds wins.
+
+    Args:
+        start: Inclusive start date.
+        end: Inclusive end date; date-only strings cover the whole day.
+        period: Period relative to latest (e.g. '1mo').
+        latest: Timestamp of the latest available row, required for period.
+
+    Returns:
+        tuple: (start, end) timestamps, each possibly None.
+    """
+    lower = _to_timestamp(start)
+    upper = _to_timestamp(end, end_of_day=True)
+    if period is not None and latest is not None:
+        period_start = resolve_period(period, latest)
+        if period_start is not None and (lower is None or period_start > lower):
+            lower = period_start
+    return lower, upper
+
+
+def match_tz(bound: Optional[pd.Timestamp], tz) -> Optional[pd.Timestamp]:
+    """
+    Align a bound's timezone with the timezone of the dates it is compared to.
+
+    Naive bounds are read in the dates' timezone; aware bounds compared to
+    naive dates are converted to naive UTC.
+
+    Args:
+        bound: Bound to align, or None.
+        tz: Timezone of the dates (None for naive dates).
+
+    Returns:
+        Optional[pd.Timestamp]: Aligned bound.
+    """
+    if bound is None:
+        return None
+    if tz is not None and bound.tz is None:
+        return bound.tz_localize(tz)
+    if tz is None and bound.tz is not None:
+        return bound.tz_convert(None)
+    return bound
+
+
+def filter_frame(
+    data: pd.DataFrame,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Keep rows whose date index lies within the inclusive range [start, end].
+
+    Args:
+        data: DataFrame indexed by dates.
+        start: Inclusive start bound.
+        end: Inclusive end bound.
+
+    Returns:
+        pd.DataFrame: Filtered DataFrame (the input itself if no bound is set).
+    """
+    if start is None and end is None:
+        return data
+    index = pd.DatetimeIndex(data.index)
+    mask = np.ones(len(index), dtype=bool)
+    start = match_tz(start, index.tz)
+    end = match_tz(end, index.tz)
+    if start is not None:
+        mask &= index >= start
+    if end is not None:
+        mask &= index <= end
+    return data[mask]
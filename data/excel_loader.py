@@ -3,20 +3,34 @@ Module for loading financial data from Excel files (.xlsx, .xls),
 with validation and error handling.
 """
 
+from typing import Optional
 import pandas as pd
 from .base_loader import BaseDataLoader
-from core.exceptions import DataLoadError
+from .date_range import DateLike, filter_frame, resolve_bounds
+from core.exceptions import DataLoadError, SchemaError
 
 
 class ExcelDataLoader(BaseDataLoader):
     """Data loader for Excel files (.xlsx, .xls)."""
 
-    def load(self, filepath: str) -> pd.DataFrame:
+    def load(
+        self,
+        filepath: str,
+        start: DateLike = None,
+        end: DateLike = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
         """
         Load financial data from Excel file.
 
+        Excel workbooks cannot be read partially, so the date range is
+        applied after the sheet has been parsed.
+
         Args:
             filepath: Path to Excel file.
+            start: Optional inclusive start date.
+            end: Optional inclusive end date.
+            period: Optional period (e.g. '1mo') relative to the latest row.
 
         Returns:
             pd.DataFrame: Loaded financial data.
@@ -28,7 +42,11 @@ class ExcelDataLoader(BaseDataLoader):
             data = pd.read_excel(
                 filepath, parse_dates=["Date"], index_col="Date", engine="openpyxl"
             )
-            self._validate_data(data)
-            return data
+            if start is not None or end is not None or period is not None:
+                latest = data.index.max() if len(data) else None
+                data = filter_frame(data, *resolve_bounds(start, end, period, latest))
+            return self._validate_data(data)
+        except SchemaError:
+            raise
         except Exception as e:
             raise DataLoadError(f"Excel loading error: {str(e)}")
@@ -0,0 +1,258 @@
+"""
+Module defining declarative schemas for loaded market data.
+
+A Schema lists the expected columns, whether they are required, a lower
+bound and the tolerated share of missing values. Price columns are coerced
+to float64 unless they are already float32. One call to Schema.validate()
+checks and coerces a frame in a single vectorized pass per column:
+non-numeric values, out-of-range prices, excessive NaNs, a non-datetime or
+duplicated index are reported together with 1-based data row numbers, and
+an unsorted index is sorted.
+
+Frames that passed validation are remembered by the schema so trusted
+inputs (e.g. frames read back from a cache) are not validated again. Trust
+is tied to the frame object itself: frames derived from a trusted one (a
+copy, a slice, an arithmetic result) are validated like any other input.
+"""
+
+import weakref
+from typing import NamedTuple, Optional, Sequence
+import numpy as np
+import pandas as pd
+from core.exceptions import SchemaError
+
+MAX_REPORTED_ROWS = 5
+
+
+class ColumnSpec(NamedTuple):
+    """
+    Expected properties of one column.
+
+    Attributes:
+        name: Column name (first level for MultiIndex columns).
+        required: Whether the column must be present.
+        min_value: Lower bound of valid values, or None.
+        min_inclusive: Whether min_value itself is valid.
+        max_nan_ratio: Largest tolerated share of missing values.
+    """
+
+    name: str
+    required: bool = False
+    min_value: Optional[float] = None
+    min_inclusive: bool = False
+    max_nan_ratio: float = 1.0
+
+
+class Problem(NamedTuple):
+    """
+    A validation problem.
+
+    Attributes:
+        column: Column name, or 'index'.
+        message: Description of the problem.
+        rows: 1-based data row numbers (at most MAX_REPORTED_ROWS).
+        count: Total number of affected rows.
+    """
+
+    column: str
+    message: str
+    rows: tuple[int, ...] = ()
+    count: int = 0
+
+    def __str__(self) -> str:
+        if not self.count:
+            return f"{self.column}: {self.message}"
+        rows = ", ".join(map(str, self.rows))
+        more = (
+            f" (+{self.count - len(self.rows)} more)"
+            if self.count > len(self.rows)
+            else ""
+        )
+        return f"{self.column}: {self.message} in rows {rows}{more}"
+
+
+def _problem(column: str, message: str, mask: np.ndarray) -> Problem:
+    """Build a Problem from a boolean mask of affected rows."""
+    rows = np.flatnonzero(mask)
+    return Problem(
+        column, message, tuple(int(r) + 1 for r in rows[:MAX_REPORTED_ROWS]), len(rows)
+    )
+
+
+class Schema:
+    """
+    Declarative schema for a price DataFrame indexed by date.
+
+    Attributes:
+        name (str): Schema name.
+        columns (list[ColumnSpec]): Expected columns.
+    """
+
+    def __init__(self, name: str, columns: Sequence[ColumnSpec]) -> None:
+        """
+        Initialize the schema.
+
+        Args:
+            name: Schema name.
+            columns: Expected columns.
+        """
+        self.name = name
+        self.columns = list(columns)
+        # Trusted frames by id(), held weakly and dropped when collected.
+        self._trusted: dict[int, weakref.ref] = {}
+
+    def is_trusted(self, data: pd.DataFrame) -> bool:
+        """Whether this very frame was already validated against this schema."""
+        ref = self._trusted.get(id(data))
+        return ref is not None and ref() is data
+
+    def trust(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Mark a frame as valid so validate() returns it unchanged.
+
+        Only the given object is trusted; frames derived from it are not.
+
+        Args:
+            data: Frame known to match the schema.
+
+        Returns:
+            pd.DataFrame: The same frame.
+        """
+        key = id(data)
+        self._trusted[key] = weakref.ref(
+            data, lambda _, key=key: self._trusted.pop(key, None)
+        )
+        return data
+
+    def validate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Validate data and return it with coerced dtypes and a sorted index.
+
+        The input frame is not modified; columns are replaced only when they
+        need coercion. The returned object is trusted (see trust()).
+
+        Args:
+            data: Loaded DataFrame.
+
+        Returns:
+            pd.DataFrame: Validated frame.
+
+        Raises:
+            SchemaError: With all problems found, if any.
+        """
+        if self.is_trusted(data):
+            return data
+        problems: list[Problem] = []
+        data, order = self._coerce_index(data, problems)
+
+        level = (
+            data.columns.get_level_values(0)
+            if isinstance(data.columns, pd.MultiIndex)
+            else data.columns
+        )
+        result = data
+        for spec in self.columns:
+            positions = np.flatnonzero(level == spec.name)
+            if not len(positions):
+                if spec.required:
+                    problems.append(Problem(spec.name, "required column is missing"))
+                continue
+            for position in positions:
+                column = data.iloc[:, position]
+                values = self._check_column(spec, column, problems)
+                if values is not None:
+                    if result is data:
+                        result = data.copy(deep=False)
+                    result.isetitem(position, values)
+
+        if problems:
+            raise SchemaError(problems)
+        if order is not None:
+            result = result.iloc[order]
+        return self.trust(result)
+
+    def _coerce_index(
+        self, data: pd.DataFrame, problems: list[Problem]
+    ) -> tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """Convert the index to datetimes, check duplicates and find the sort order."""
+        index = data.index
+        if not isinstance(index, pd.DatetimeIndex):
+            try:
+                converted = pd.to_datetime(index, errors="coerce")
+            except (TypeError, ValueError) as e:
+                problems.append(Problem("index", f"dates cannot be parsed ({e})"))
+                return data, None
+            invalid = np.asarray(converted.isna()) & ~np.asarray(pd.isna(index))
+            if invalid.any():
+                problems.append(_problem("index", "invalid date", invalid))
+            data = data.set_axis(converted, axis=0)
+            index = converted
+
+        stamps = index.asi8
+        if len(stamps) > 1 and not np.all(stamps[1:] > stamps[:-1]):
+            order = np.argsort(stamps, kind="stable")
+            ordered = stamps[order]
+            duplicated = np.zeros(len(stamps), dtype=bool)
+            duplicated[order[1:]] = ordered[1:] == ordered[:-1]
+            if duplicated.any():
+                problems.append(_problem("index", "duplicate date", duplicated))
+            if not np.all(stamps[1:] >= stamps[:-1]):
+                return data, order
+        return data, None
+
+    @staticmethod
+    def _check_column(
+        spec: ColumnSpec, column: pd.Series, problems: list[Problem]
+    ) -> Optional[np.ndarray]:
+        """Check one column; return coerced float values if its dtype changed."""
+        coerced = None
+        if column.dtype in (np.float64, np.float32):
+            # float32 is kept as is under the float32 precision policy.
+            values = column.to_numpy()
+        elif pd.api.types.is_numeric_dtype(
+            column.dtype
+        ) and not pd.api.types.is_bool_dtype(column.dtype):
+            values = coerced = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = coerced = pd.to_numeric(column, errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+            invalid = np.isnan(values) & ~np.asarray(column.isna())
+            if invalid.any():
+                problems.append(_problem(spec.name, "non-numeric value", invalid))
+
+        missing = np.isnan(values)
+        if len(values) and missing.mean() > spec.max_nan_ratio:
+            problems.append(
+                Problem(
+                    spec.name,
+                    f"{missing.mean():.0%} missing values exceed {spec.max_nan_ratio:.0%}",
+                )
+            )
+        if spec.min_value is not None:
+            with np.errstate(invalid="ignore"):
+                if spec.min_inclusive:
+                    below = values < spec.min_value
+                else:
+                    below = values <= spec.min_value
+            if below.any():
+                sign = ">=" if spec.min_inclusive else ">"
+                problems.append(
+                    _problem(
+                        spec.name, f"value must be {sign} {spec.min_value:g}", below
+                    )
+                )
+        return coerced
+
+
+OHLCV_SCHEMA = Schema(
+    "ohlcv",
+    [
+        ColumnSpec("Open", min_value=0.0),
+        ColumnSpec("High", min_value=0.0),
+        ColumnSpec("Low", min_value=0.0),
+        ColumnSpec("Close", required=True, min_value=0.0, max_nan_ratio=0.5),
+        ColumnSpec("Adj Close", min_value=0.0),
+        ColumnSpec("Volume", min_value=0.0, min_inclusive=True),
+    ],
+)
@@ -0,0 +1,253 @@
+"""
+Module defining streaming quote sources for live analytics.
+
+Sources are asynchronous iterators of ticks. ReplaySource replays stored
+price series (useful for tests and simulations); YahooPollingSource polls
+YahooFinanceLoader periodically and emits only rows it has not seen yet;
+CSVTailSource follows growing CSV files and emits their appended rows;
+CrossRateSource turns the quotes of downloaded currency pairs into quotes
+of the requested pairs, deriving the crosses from the latest leg prices.
+"""
+
+import asyncio
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Iterable, Mapping, NamedTuple, Optional, Union
+import pandas as pd
+from core.exceptions import DataLoadError
+from data.api.yahoo_loader import YahooFinanceLoader
+from data.cross_rates import CrossRatePlan, cross_rate
+from data.csv_tail import CSVTailer
+
+
+class Tick(NamedTuple):
+    """
+    A single price update.
+
+    Attributes:
+        symbol: Instrument symbol.
+        timestamp: Market timestamp of the quote.
+        price: Quoted price.
+        received_at: ``time.perf_counter()`` value when the tick arrived.
+    """
+
+    symbol: str
+    timestamp: pd.Timestamp
+    price: float
+    received_at: float
+
+
+class AbstractQuoteSource(ABC):
+    """Abstract base class for streaming quote sources."""
+
+    symbols: list[str]
+
+    @abstractmethod
+    def stream(self) -> AsyncIterator[Tick]:
+        """
+        Yield ticks as they arrive.
+
+        Returns:
+            AsyncIterator[Tick]: Asynchronous iterator of ticks.
+
+        Raises:
+            DataLoadError: If the underlying source fails.
+        """
+        pass
+
+
+class ReplaySource(AbstractQuoteSource):
+    """Quote source replaying stored price series in timestamp order."""
+
+    def __init__(
+        self,
+        prices: Union[pd.DataFrame, Mapping[str, pd.Series]],
+        speed: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the replay.
+
+        Args:
+            prices: DataFrame with one column per symbol, or mapping of symbol
+                to price Series indexed by timestamp.
+            speed: Replay speed relative to market time (e.g. 60 replays one
+                minute per second). None replays as fast as possible.
+        """
+        series = {str(k): v.dropna() for k, v in dict(prices).items()}
+        self.symbols = list(series)
+        frame = pd.concat(
+            [
+                pd.DataFrame({"symbol": k, "price": v.to_numpy()}, index=v.index)
+                for k, v in series.items()
+            ]
+        )
+        self._ticks = frame.sort_index(kind="stable")
+        self.speed = speed
+
+    async def stream(self) -> AsyncIterator[Tick]:
+        """Yield stored prices as ticks, optionally paced by market time."""
+        previous = None
+        for timestamp, symbol, price in zip(
+            self._ticks.index, self._ticks["symbol"], self._ticks["price"]
+        ):
+            if self.speed and previous is not None:
+                gap = (timestamp - previous).total_seconds() / self.speed
+                await asyncio.sleep(max(gap, 0.0))
+            else:
+                await asyncio.sleep(0)
+            previous = timestamp
+            yield Tick(symbol, timestamp, float(price), time.perf_counter())
+
+
+class YahooPollingSource(AbstractQuoteSource):
+    """Quote source polling Yahoo Finance for the latest rows."""
+
+    def __init__(
+        self,
+        symbols: list[str],
+        interval: float = 60.0,
+        period: str = "1d",
+        loader: Optional[YahooFinanceLoader] = None,
+        max_polls: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the poller.
+
+        Args:
+            symbols: Yahoo symbols to poll (e.g. 'AAPL', 'USDRUB=X').
+            interval: Seconds between polling rounds.
+            period: Period requested on every poll.
+            loader: Loader to use; a new YahooFinanceLoader by default.
+            max_polls: Stop after this many rounds (None polls forever).
+        """
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.period = period
+        self.loader = loader or YahooFinanceLoader()
+        self.max_polls = max_polls
+        self._last_seen: dict[str, pd.Timestamp] = {}
+
+    async def stream(self) -> AsyncIterator[Tick]:
+        """Poll every symbol in an executor and yield rows newer than the last seen."""
+        loop = asyncio.get_running_loop()
+        polls = 0
+        while self.max_polls is None or polls < self.max_polls:
+            frames = await asyncio.gather(
+                *(
+                    loop.run_in_executor(None, self.loader.load, symbol, self.period)
+                    for symbol in self.symbols
+                )
+            )
+            for symbol, frame in zip(self.symbols, frames):
+                for tick in self._new_ticks(symbol, frame):
+                    yield tick
+            polls += 1
+            if self.max_polls is None or polls < self.max_polls:
+                await asyncio.sleep(self.interval)
+
+    def _new_ticks(self, symbol: str, frame: pd.DataFrame) -> list[Tick]:
+        """Extract ticks for rows newer than the last seen timestamp."""
+        close = frame["Close"]
+        if isinstance(close, pd.DataFrame):
+            if close.shape[1] != 1:
+                raise DataLoadError(f"Ambiguous 'Close' column for {symbol}")
+            close = close.iloc[:, 0]
+        close = close.dropna()
+        last_seen = self._last_seen.get(symbol)
+        if last_seen is not None:
+            close = close[close.index > last_seen]
+        if close.empty:
+            return []
+        self._last_seen[symbol] = close.index[-1]
+        now = time.perf_counter()
+        return [Tick(symbol, ts, float(p), now) for ts, p in close.items()]
+
+
+class CSVTailSource(AbstractQuoteSource):
+    """Quote source following append-only CSV files."""
+
+    def __init__(
+        self,
+        files: Union[Iterable[str], Mapping[str, str]],
+        interval: float = 60.0,
+        tailer: Optional[CSVTailer] = None,
+        max_polls: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the follower.
+
+        Args:
+            files: CSV paths, or mapping of symbol to path; symbols default
+                to the file names without extension.
+            interval: Seconds between polling rounds.
+            tailer: Tailer holding the file positions; a new one by default.
+            max_polls: Stop after this many rounds (None polls forever).
+        """
+        if not isinstance(files, Mapping):
+            files = {os.path.splitext(os.path.basename(f))[0]: f for f in files}
+        self.files = dict(files)
+        self.symbols = list(self.files)
+        self.interval = interval
+        self.tailer = tailer or CSVTailer()
+        self.max_polls = max_polls
+
+    async def stream(self) -> AsyncIterator[Tick]:
+        """Read appended rows of every file in an executor and yield their closes."""
+        loop = asyncio.get_running_loop()
+        polls = 0
+        while self.max_polls is None or polls < self.max_polls:
+            frames = await asyncio.gather(
+                *(
+                    loop.run_in_executor(None, self.tailer.read, path)
+                    for path in self.files.values()
+                )
+            )
+            now = time.perf_counter()
+            for symbol, frame in zip(self.symbols, frames):
+                if frame.empty:
+                    continue
+                close = frame["Close"].dropna()
+                for timestamp, price in close.items():
+                    yield Tick(symbol, timestamp, float(price), now)
+            polls += 1
+            if self.max_polls is None or polls < self.max_polls:
+                await asyncio.sleep(self.interval)
+
+
+class CrossRateSource(AbstractQuoteSource):
+    """Quote source deriving requested currency pairs from their downloads."""
+
+    def __init__(
+        self, source: AbstractQuoteSource, plan: CrossRatePlan, pairs: Mapping[str, str]
+    ) -> None:
+        """
+        Initialize the source.
+
+        Args:
+            source: Source of quotes of the plan's downloads.
+            plan: Requested pairs and the downloads they are derived from.
+            pairs: Mapping of the source's symbols (e.g. 'USDRUB=X') to the
+                downloaded pairs.
+        """
+        self.source = source
+        self.symbols = list(plan.pairs)
+        self._pairs = dict(pairs)
+        self._legs = plan.legs()
+        # Requested pairs to requote whenever a download moves.
+        self._dependents: dict[str, list[str]] = {pair: [] for pair in plan.downloads}
+        for pair, legs in self._legs.items():
+            for edge, _ in legs:
+                self._dependents[edge].append(pair)
+        self._latest: dict[str, float] = {}
+
+    async def stream(self) -> AsyncIterator[Tick]:
+        """Yield a tick for every requested pair whose legs are all quoted."""
+        async for tick in self.source.stream():
+            download = self._pairs[tick.symbol]
+            self._latest[download] = tick.price
+            for pair in self._dependents[download]:
+                legs = self._legs[pair]
+                if all(edge in self._latest for edge, _ in legs):
+                    price = cross_rate(legs, self._latest)
+                    yield Tick(pair, tick.timestamp, price, tick.received_at)
@@ -0,0 +1,269 @@
+"""
+Module providing a registry of tradable symbols with their metadata.
+
+A universe of tens of thousands of instruments is stored in a compact NPZ
+file: the symbols as a sorted fixed-width byte array and every metadata
+field (asset class, exchange, currency, calendar) as small integer codes
+into a table of distinct values. Universes can also be read from CSV files
+with a 'symbol' column and optional metadata columns.
+
+Registries opened from a file are loaded lazily on first use. Lookups go
+through a hash map built once, and prefix searches use binary search over
+the sorted symbols.
+"""
+
+from typing import Iterable, NamedTuple, Optional
+import numpy as np
+import pandas as pd
+from core.exceptions import DataLoadError
+
+ASSET_CLASSES = ("stock", "currency")
+
+FIELDS = ("asset_class", "exchange", "currency", "calendar")
+
+
+class SymbolInfo(NamedTuple):
+    """
+    Metadata of one instrument.
+
+    Attributes:
+        symbol: Upper-case symbol, e.g. 'AAPL' or 'USDRUB'.
+        asset_class: 'stock' or 'currency'.
+        exchange: Exchange or venue code.
+        currency: Quote currency.
+        calendar: Name of the trading calendar.
+    """
+
+    symbol: str
+    asset_class: str = "stock"
+    exchange: str = ""
+    currency: str = ""
+    calendar: str = ""
+
+    @property
+    def yahoo_symbol(self) -> str:
+        """Symbol used to request the instrument from Yahoo Finance."""
+        if self.asset_class == "currency":
+            return f"{self.symbol}=X"
+        return self.symbol
+
+
+class SymbolRegistry:
+    """
+    Registry of instruments with O(1) lookup and prefix search.
+
+    Attributes:
+        path (str | None): File the registry is loaded from, if any.
+    """
+
+    def __init__(self, records: Iterable[SymbolInfo] = ()) -> None:
+        """
+        Initialize the registry from records.
+
+        Duplicate symbols keep their last record.
+
+        Args:
+            records: Instrument metadata.
+        """
+        self.path: Optional[str] = None
+        self._symbols: Optional[np.ndarray] = None
+        self._codes: dict[str, np.ndarray] = {}
+        self._values: dict[str, np.ndarray] = {}
+        self._positions: Optional[dict[str, int]] = None
+        self._set_records(list(records))
+
+    @classmethod
+    def open(cls, path: str) -> "SymbolRegistry":
+        """
+        Open a universe file (.npz, otherwise CSV) without reading it yet.
+
+        Args:
+            path: Path to the universe file.
+
+        Returns:
+            SymbolRegistry: Registry loaded on first access.
+        """
+        registry = cls()
+        registry.path = path
+        registry._symbols = None
+        return registry
+
+    def save(self, path: str) -> None:
+        """
+        Write the registry in the compact NPZ format.
+
+        Args:
+            path: Output path.
+        """
+        arrays = {"symbols": self._data()}
+        for field in FIELDS:
+            arrays[f"{field}_codes"] = self._codes[field]
+            arrays[f"{field}_values"] = self._values[field]
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    def _set_records(self, records: list[SymbolInfo]) -> None:
+        """Encode records into sorted symbol and code arrays."""
+        by_symbol = {r.symbol.upper(): r for r in records}
+        symbols = np.array(sorted(by_symbol), dtype=np.bytes_)
+        if not len(symbols):
+            symbols = np.empty(0, dtype="S1")
+        ordered = [by_symbol[s.decode()] for s in symbols]
+        for field in FIELDS:
+            values, codes = np.unique(
+                np.array([getattr(r, field) for r in ordered], dtype=str),
+                return_inverse=True,
+            )
+            self._values[field] = values
+            self._codes[field] = codes.astype(np.min_scalar_type(max(len(values), 1)))
+        self._symbols = symbols
+        self._positions = None
+
+    def _data(self) -> np.ndarray:
+        """Sorted symbols, loading the universe file on first access."""
+        if self._symbols is None:
+            self._load()
+        return self._symbols
+
+    def _load(self) -> None:
+        """Read the universe file, raising DataLoadError if it is malformed."""
+        try:
+            if self.path.lower().endswith(".npz"):
+                with np.load(self.path, allow_pickle=False) as data:
+                    self._symbols = data["symbols"]
+                    for field in FIELDS:
+                        self._codes[field] = data[f"{field}_codes"]
+                        self._values[field] = data[f"{field}_values"]
+                return
+            frame = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+        except (OSError, KeyError, ValueError) as e:
+            raise DataLoadError(f"Cannot read universe {self.path}: {str(e)}")
+        frame.columns = [str(c).strip().lower() for c in frame.columns]
+        if "symbol" not in frame.columns:
+            raise DataLoadError(f"Universe {self.path} has no 'symbol' column")
+        defaults = SymbolInfo("")
+        columns = [
+            (
+                frame[field].str.strip().replace("", getattr(defaults, field))
+                if field in frame.columns
+                else pd.Series(getattr(defaults, field), index=frame.index)
+            )
+            for field in SymbolInfo._fields
+        ]
+        records = [SymbolInfo(*row) for row in zip(*columns) if row[0]]
+        invalid = {r.asset_class for r in records} - set(ASSET_CLASSES)
+        if invalid:
+            raise DataLoadError(
+                f"Universe {self.path} has unknown asset classes: "
+                f"{', '.join(sorted(invalid))}"
+            )
+        self._set_records(records)
+
+    def _index(self) -> dict[str, int]:
+        """Hash map of symbol to row, built on first lookup."""
+        if self._positions is None:
+            symbols = self._data()
+            self._positions = {s.decode(): i for i, s in enumerate(symbols)}
+        return self._positions
+
+    def _record(self, position: int) -> SymbolInfo:
+        """Decode the record at a row."""
+        return SymbolInfo(
+            self._symbols[position].decode(),
+            *(
+                str(self._values[field][self._codes[field][position]])
+                for field in FIELDS
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self._data())
+
+    def __contains__(self, symbol: object) -> bool:
+        return isinstance(symbol, str) and symbol.upper() in self._index()
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        """
+        Look up a symbol (case-insensitive).
+
+        Args:
+            symbol: Symbol to look up.
+
+        Returns:
+            SymbolInfo | None: Metadata, or None if the symbol is unknown.
+        """
+        position = self._index().get(symbol.upper())
+        return None if position is None else self._record(position)
+
+    def unknown(
+        self, symbols: Iterable[str], asset_class: Optional[str] = None
+    ) -> list[str]:
+        """
+        Return the symbols that are not registered (with the given asset class).
+
+        Args:
+            symbols: Symbols to check.
+            asset_class: Required asset class, or None for any.
+
+        Returns:
+            list[str]: Unknown symbols in input order.
+        """
+        result = []
+        for symbol in symbols:
+            info = self.get(symbol)
+            if info is None or (asset_class and info.asset_class != asset_class):
+                result.append(symbol)
+        return result
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """
+        Find symbols starting with a prefix in sorted order.
+
+        Args:
+            prefix: Symbol prefix (case-insensitive).
+            limit: Maximum number of symbols returned.
+
+        Returns:
+            list[str]: Matching symbols.
+        """
+        symbols = self._data()
+        key = prefix.upper().encode()
+        start = np.searchsorted(symbols, key, side="left")
+        stop = np.searchsorted(symbols, key + b"\xff", side="left")
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return [s.decode() for s in symbols[start:stop]]
+
+    def symbols(self, asset_class: Optional[str] = None) -> list[str]:
+        """
+        List symbols in sorted order.
+
+        Args:
+            asset_class: Restrict to 'stock' or 'currency'; None for all.
+
+        Returns:
+            list[str]: Symbols.
+        """
+        symbols = self._data()
+        if asset_class is not None:
+            values = list(self._values["asset_class"])
+            if asset_class not in values:
+                return []
+            symbols = symbols[self._codes["asset_class"] == values.index(asset_class)]
+        return [s.decode() for s in symbols]
+
+    def yahoo_symbols(self, symbols: Iterable[str]) -> list[str]:
+        """
+        Map symbols to Yahoo Finance symbols; unknown symbols are passed through.
+
+        Args:
+            symbols: Registered symbols.
+
+        Returns:
+            list[str]: Yahoo Finance symbols in input order.
+        """
+        result = []
+        for symbol in symbols:
+            info = self.get(symbol)
+            result.append(symbol if info is None else info.yahoo_symbol)
+        return result
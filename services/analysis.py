@@ -3,11 +3,32 @@ Module providing the AnalysisService class for financial calculations.
 
 This service performs computations of log returns, percentage returns,
 and rolling volatility for single or multiple financial time series.
+Results are accounted to the memory budget as the 'results' category; with
+a limit, the arrays of multi-symbol results can spill to disk, and arrays
+that would not fit are written to spill files from the start. Results read
+from spill files are copy-on-write memory maps (see core.memory).
 """
 
+from typing import Optional, Union
+import numpy as np
 import pandas as pd
+from analysis import kernels
+from analysis.buffers import BufferPool
+from analysis.results import AnalysisResult
+from analysis.portfolio import PortfolioCalculator, Rebalance, Weights
 from analysis.returns import ReturnsCalculator
 from analysis.volatility import VolatilityCalculator
+from core.memory import get_budget
+from core.precision import PrecisionLike, get_policy
+
+OutBuffers = Union[dict[str, np.ndarray], BufferPool]
+
+
+def _is_clean(values: np.ndarray) -> bool:
+    """Whether prices can take the fused kernel path."""
+    # A single reduction rejects NaN, infinite and non-positive prices,
+    # which the pandas path would drop or propagate instead.
+    return values.shape[0] >= 2 and 0 < values.min() and values.max() < np.inf
 
 
 class AnalysisService:
@@ -18,44 +39,183 @@ class AnalysisService:
     """
 
     @staticmethod
-    def analyze(data: pd.DataFrame) -> dict[str, pd.Series]:
+    def analyze(
+        data: pd.DataFrame,
+        window: int = 21,
+        out: Optional[OutBuffers] = None,
+        precision: PrecisionLike = None,
+    ) -> dict[str, pd.Series]:
         """
         Perform financial analysis on a single DataFrame containing price data.
 
         Calculates returns and volatility based on the 'Close' price column.
+        Clean price series (finite and positive) are processed by a fused
+        kernel that computes both outputs in one pass; other inputs fall back
+        to ReturnsCalculator and VolatilityCalculator.
 
         Args:
             data (pd.DataFrame): DataFrame with at least a 'Close' column representing price data.
+            window (int, optional): Rolling volatility window. Defaults to 21.
+            out (dict[str, np.ndarray] | BufferPool, optional): Buffers with keys
+                'returns' and 'volatility' of length ``len(data) - 1`` to write
+                results into, or a pool to acquire them from. The returned Series
+                are backed by these buffers; with a pool, pass the returned dict
+                to ``pool.release()`` once the Series are no longer used.
+            precision (str, optional): 'float64' (default) or 'float32' storage
+                of prices and results; accumulation is always in float64.
 
         Returns:
             dict[str, pd.Series]: Dictionary with keys 'returns' and 'volatility',
                 each mapped to a pandas Series of calculated values.
         """
-        returns = ReturnsCalculator().calculate(data["Close"])
-        volatility = VolatilityCalculator().calculate(returns)
-        return {
-            "returns": returns,
-            "volatility": volatility,
-        }
+        results = AnalysisService._analyze_series(data["Close"], window, out, precision)
+        budget = get_budget()
+        for series in results.values():
+            budget.track(series, "results")
+        return results
 
     @staticmethod
     def analyze_multiple(
-        data_dict: dict[str, pd.Series]
-    ) -> dict[str, dict[str, pd.Series]]:
+        data_dict: dict[str, pd.Series],
+        window: int = 21,
+        precision: PrecisionLike = None,
+    ) -> AnalysisResult:
         """
         Perform financial analysis on multiple price series.
 
+        Results are stored in one (time, symbols) array per metric over the
+        union of all dates; the fused kernel writes each symbol's rows into
+        its column directly.
+
         Args:
             data_dict (dict[str, pd.Series]): Dictionary mapping asset names or pairs
                 to pandas Series of price data.
+            window (int, optional): Rolling volatility window. Defaults to 21.
+            precision (str, optional): 'float64' (default) or 'float32' storage
+                of prices and results.
 
         Returns:
-            dict[str, dict[str, pd.Series]]: Nested dictionary where the first key is the asset/pair name,
-                and the value is another dictionary with keys 'returns' and 'volatility' mapped to Series.
+            AnalysisResult: Mapping of asset/pair name to a mapping with keys
+                'returns' and 'volatility' mapped to Series, backed by
+                columnar arrays that support cross-sectional operations.
         """
-        results: dict[str, dict[str, pd.Series]] = {}
-        for pair, series in data_dict.items():
-            returns = ReturnsCalculator().calculate(series)
-            volatility = VolatilityCalculator().calculate(returns)
-            results[pair] = {"returns": returns, "volatility": volatility}
-        return results
+        policy = get_policy(precision)
+        symbols = list(data_dict)
+        prices = [data_dict[symbol] for symbol in symbols]
+        values = [p.to_numpy(dtype=policy.dtype, copy=False) for p in prices]
+        # Series that need the pandas fallback are computed up front, since
+        # their dates are only known afterwards.
+        fallback = {
+            column: AnalysisService._analyze_series(
+                prices[column], window, precision=policy
+            )
+            for column in range(len(prices))
+            if not _is_clean(values[column])
+        }
+
+        first = prices[0].index if prices else pd.Index([])
+        if not fallback and all(p.index.equals(first) for p in prices[1:]):
+            # Common case: one calendar for all symbols, no index unions.
+            index, rows = first[1:], [slice(None)] * len(prices)
+        else:
+            index, rows = AnalysisResult.shared_index(
+                [
+                    fallback[c]["returns"].index if c in fallback else p.index[1:]
+                    for c, p in enumerate(prices)
+                ]
+            )
+
+        budget = get_budget()
+        arrays = AnalysisResult.allocate(
+            index, symbols, ("returns", "volatility"), policy.dtype, budget
+        )
+        returns, volatility = arrays["returns"], arrays["volatility"]
+        for column, span in enumerate(rows):
+            if column in fallback:
+                for metric, result in fallback[column].items():
+                    arrays[metric][span, column] = result.to_numpy()
+                continue
+            contiguous = isinstance(span, slice)
+            result = kernels.fused_statistics(
+                values[column],
+                window,
+                out={
+                    "returns": returns[span, column] if contiguous else None,
+                    "std": volatility[span, column] if contiguous else None,
+                },
+                metrics=("std",),
+                scale=np.sqrt(window),
+            )
+            if not contiguous:
+                returns[span, column] = result["returns"]
+                volatility[span, column] = result["std"]
+        names = [series.name for series in prices]
+        arrays = budget.store("results", arrays)
+        return AnalysisResult(index, symbols, arrays, rows, names)
+
+    @staticmethod
+    def analyze_portfolios(
+        data_dict: dict[str, pd.Series],
+        weights: Weights,
+        rebalance: Rebalance = None,
+    ) -> dict[str, Union[pd.DataFrame, pd.Series]]:
+        """
+        Perform portfolio-level analysis over a shared universe of price series.
+
+        The covariance and returns matrices are computed once; every portfolio
+        is then evaluated as part of a single matrix product.
+
+        Args:
+            data_dict (dict[str, pd.Series]): Dictionary mapping symbols to price Series.
+            weights: Portfolio weights, e.g. {'balanced': {'AAPL': 0.5, 'MSFT': 0.5}}
+                or an array of shape (portfolios, symbols).
+            rebalance: None for constant weights, an int number of periods, or a
+                pandas period frequency such as 'M'.
+
+        Returns:
+            dict: 'returns' (DataFrame, dates x portfolios), 'volatility' (Series)
+                and 'risk_contribution' (DataFrame, portfolios x symbols).
+        """
+        calculator = PortfolioCalculator(data_dict)
+        return {
+            "returns": calculator.portfolio_returns(weights, rebalance),
+            "volatility": calculator.volatility(weights),
+            "risk_contribution": calculator.risk_contribution(weights),
+        }
+
+    @staticmethod
+    def _analyze_series(
+        prices: pd.Series,
+        window: int,
+        out: Optional[OutBuffers] = None,
+        precision: PrecisionLike = None,
+    ) -> dict[str, pd.Series]:
+        """Compute returns and volatility, using the fused kernel when possible."""
+        policy = get_policy(precision)
+        values = prices.to_numpy(dtype=policy.dtype, copy=False)
+
+        if not _is_clean(values):
+            returns = ReturnsCalculator(policy).calculate(prices)
+            volatility = VolatilityCalculator(policy).calculate(returns, window=window)
+            return {"returns": returns, "volatility": volatility}
+
+        if isinstance(out, BufferPool):
+            out = out.acquire(values.shape[0] - 1)
+        out = out or {}
+        result = kernels.fused_statistics(
+            values,
+            window,
+            out={"returns": out.get("returns"), "std": out.get("volatility")},
+            metrics=("std",),
+            scale=np.sqrt(window),
+        )
+
+        index = prices.index[1:]
+        return {
+            "returns": pd.Series(
+                result["returns"], index=index, name=prices.name, copy=False
+            ),
+            "volatility": pd.Series(
+                result["std"], index=index, name=prices.name, copy=False
+            ),
+        }
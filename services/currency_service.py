@@ -2,12 +2,21 @@
 Module providing CurrencyService for loading and validating currency exchange rate data.
 
 This service uses YahooFinanceLoader to fetch currency pair data and ensures
-that the 'Close' price column is present for further analysis.
+that the 'Close' price column is present for further analysis. Only a
+minimal set of pairs is downloaded; the other requested pairs are derived
+as cross rates (see data.cross_rates).
 """
 
+from typing import MutableMapping, Optional
 import pandas as pd
 from core.exceptions import DataLoadError
+from core.precision import PrecisionLike
 from data.api.yahoo_loader import YahooFinanceLoader
+from data.async_loader import AsyncYahooFinanceLoader
+from data.cache import SharedCache
+from data.cross_rates import CrossRatePlan, CurrencyGraph
+from data.stream_sources import CrossRateSource, YahooPollingSource
+from data.symbols import SymbolRegistry
 
 
 class CurrencyService:
@@ -16,52 +25,191 @@ class CurrencyService:
 
     Attributes:
         loader (YahooFinanceLoader): Loader instance for fetching data.
+        async_loader (AsyncYahooFinanceLoader): Asynchronous wrapper of loader;
+            every Yahoo loader shares the process-wide request limit.
         period (str): Data retrieval period (e.g., '1y', '6mo').
+        start (str | None): Optional inclusive start date overriding period.
+        end (str | None): Optional inclusive end date overriding period.
+        registry (SymbolRegistry | None): Registry of known currency pairs.
     """
 
-    def __init__(self, period: str = "1y") -> None:
+    def __init__(
+        self,
+        period: str = "1y",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        cache: Optional[SharedCache] = None,
+        precision: PrecisionLike = None,
+        registry: Optional[SymbolRegistry] = None,
+        async_loader: Optional[AsyncYahooFinanceLoader] = None,
+    ) -> None:
         """
-        Initialize CurrencyService with an optional period.
+        Initialize CurrencyService with an optional period or date range.
 
         Args:
             period (str): The time period for data retrieval (default is '1y').
+            start (str | None): Optional inclusive start date.
+            end (str | None): Optional inclusive end date.
+            cache (SharedCache | None): Optional host-level download cache.
+            precision (str | None): 'float64' (default) or 'float32' storage of prices.
+            registry (SymbolRegistry | None): Optional symbol registry used to
+                validate pairs and map them to Yahoo Finance symbols.
+            async_loader (AsyncYahooFinanceLoader | None): Yahoo loader shared
+                with other services (e.g. one per cache and precision); cache
+                and precision are then ignored.
         """
-        self.loader = YahooFinanceLoader()
+        if async_loader is None:
+            async_loader = AsyncYahooFinanceLoader(cache, precision=precision)
+        self.async_loader = async_loader
+        self.loader = async_loader.loader
         self.period = period
+        self.start = start
+        self.end = end
+        self.registry = registry
 
-    def load_pairs(self, pairs: list[str]) -> dict[str, pd.Series]:
+    def load_pairs(
+        self, pairs: list[str], out: Optional[MutableMapping[str, pd.Series]] = None
+    ) -> MutableMapping[str, pd.Series]:
         """
         Load currency exchange rate data for specified currency pairs.
 
+        Pairs sharing currencies are derived from each other, e.g. for
+        USDRUB, EURRUB and EURUSD only two pairs are downloaded. Without a
+        registry every requested pair is assumed to be downloadable; with a
+        registry, the downloads are chosen among its currency pairs.
+
+        Args:
+            pairs (list[str]): List of currency pair symbols (e.g., ['USDRUB']).
+            out (MutableMapping | None): Mapping to store each pair's series in
+                as soon as it is downloaded or derived (e.g. a SpillStore);
+                a new dict by default.
+
+        Returns:
+            MutableMapping[str, pd.Series]: Mapping of each currency pair symbol
+                to its 'Close' price series.
+
+        Raises:
+            DataLoadError: If a pair cannot be derived from the available pairs
+                or 'Close' column is missing in the loaded data.
+        """
+        plan = self._plan(pairs)
+        rates: MutableMapping[str, pd.Series] = {} if out is None else out
+        for pair, symbol in zip(plan.downloads, self._yahoo_symbols(plan.downloads)):
+            df = self.loader.load(symbol, self.period, start=self.start, end=self.end)
+            rates[pair] = self._extract_close(pair, df)
+        return self._derive(plan, rates, out)
+
+    async def load_pairs_async(
+        self, pairs: list[str], out: Optional[MutableMapping[str, pd.Series]] = None
+    ) -> MutableMapping[str, pd.Series]:
+        """
+        Load currency pairs concurrently without blocking the event loop.
+
         Args:
             pairs (list[str]): List of currency pair symbols (e.g., ['USDRUB']).
+            out (MutableMapping | None): Mapping to store each pair's series
+                in (see load_pairs).
 
         Returns:
-            dict[str, pd.Series]: Dictionary mapping each currency pair symbol
+            MutableMapping[str, pd.Series]: Mapping of each currency pair symbol
                 to its 'Close' price series.
 
         Raises:
-            DataLoadError: If 'Close' column is missing in the loaded data.
+            DataLoadError: If a pair cannot be derived from the available pairs
+                or 'Close' column is missing in the loaded data.
         """
-        result: dict[str, pd.Series] = {}
-        for pair in pairs:
-            df = self.loader.load(f"{pair}=X", self.period)
-            print(f"Loaded data for {pair}:")
-            print(df.head())
-
-            if "Close" not in df.columns and not (
-                isinstance(df.columns, pd.MultiIndex)
-                and "Close" in df.columns.get_level_values(0)
-            ):
-                raise DataLoadError(f"Data for {pair} does not contain 'Close' column")
-
-            if isinstance(df.columns, pd.MultiIndex):
-                close = df[("Close", f"{pair}=X")]
-            else:
-                close = df["Close"]
-
-            if isinstance(close, pd.DataFrame) and close.shape[1] == 1:
-                close = close.iloc[:, 0]
-
-            result[pair] = close
-        return result
+        plan = self._plan(pairs)
+        symbols = self._yahoo_symbols(plan.downloads)
+        frames = await self.async_loader.load_many(
+            symbols,
+            self.period,
+            start=self.start,
+            end=self.end,
+        )
+        rates: MutableMapping[str, pd.Series] = {} if out is None else out
+        for pair, symbol in zip(plan.downloads, symbols):
+            rates[pair] = self._extract_close(pair, frames.pop(symbol))
+        return self._derive(plan, rates, out)
+
+    def stream_source(
+        self, pairs: list[str], interval: float = 60.0, max_polls: Optional[int] = None
+    ) -> CrossRateSource:
+        """
+        Build a streaming source of the requested pairs.
+
+        Only the pairs selected by the download plan are polled; the other
+        requested pairs are derived from their latest quotes.
+
+        Args:
+            pairs (list[str]): List of currency pair symbols (e.g., ['USDRUB']).
+            interval (float): Seconds between polling rounds.
+            max_polls (int | None): Stop after this many rounds (None polls forever).
+
+        Returns:
+            CrossRateSource: Source yielding ticks of the requested pairs.
+
+        Raises:
+            DataLoadError: If a pair cannot be derived from the available pairs.
+        """
+        plan = self._plan(pairs)
+        symbols = self._yahoo_symbols(plan.downloads)
+        poller = YahooPollingSource(
+            symbols, interval=interval, loader=self.loader, max_polls=max_polls
+        )
+        return CrossRateSource(poller, plan, dict(zip(symbols, plan.downloads)))
+
+    def _plan(self, pairs: list[str]) -> CrossRatePlan:
+        """Choose the pairs to download for the requested pairs."""
+        available = (
+            pairs if self.registry is None else self.registry.symbols("currency")
+        )
+        try:
+            return CurrencyGraph(available).plan(pairs)
+        except ValueError as e:
+            raise DataLoadError(str(e))
+
+    def _yahoo_symbols(self, pairs: list[str]) -> list[str]:
+        """Map pairs to Yahoo Finance symbols."""
+        if self.registry is None:
+            return [f"{pair}=X" for pair in pairs]
+        return self.registry.yahoo_symbols(pairs)
+
+    def _derive(
+        self,
+        plan: CrossRatePlan,
+        rates: MutableMapping[str, pd.Series],
+        out: Optional[MutableMapping[str, pd.Series]] = None,
+    ) -> MutableMapping[str, pd.Series]:
+        """Derive the requested pairs and store them in the loader's precision."""
+        result = plan.derive(rates)
+        dtype = self.loader.precision.dtype
+        for pair in plan.derived:
+            result[pair] = result[pair].astype(dtype)
+        if out is None:
+            return result
+        # Downloads are already in out, which also holds the derived pairs.
+        for pair in plan.derived:
+            out[pair] = result.pop(pair)
+        return out
+
+    @staticmethod
+    def _extract_close(pair: str, df: pd.DataFrame) -> pd.Series:
+        """Extract the 'Close' price series of a pair from downloaded data."""
+        print(f"Loaded data for {pair}:")
+        print(df.head())
+
+        if "Close" not in df.columns and not (
+            isinstance(df.columns, pd.MultiIndex)
+            and "Close" in df.columns.get_level_values(0)
+        ):
+            raise DataLoadError(f"Data for {pair} does not contain 'Close' column")
+
+        if isinstance(df.columns, pd.MultiIndex):
+            close = df[("Close", f"{pair}=X")]
+        else:
+            close = df["Close"]
+
+        if isinstance(close, pd.DataFrame) and close.shape[1] == 1:
+            close = close.iloc[:, 0]
+
+        return close
@@ -2,16 +2,124 @@
 Module providing DataService for loading financial data from various sources.
 
 Supports loading currency pairs, CSV files, Excel files, and stock tickers
-based on the provided arguments.
+based on the provided arguments, synchronously or from an event loop.
+Loaded data is accounted to the memory budget. With a limit, the Series of
+multi-symbol sources are put in a SpillStore one by one while loading, so
+cold ones spill to disk before the next symbol arrives, and a CSV or Excel
+frame that does not fit is replaced by a memory-mapped copy. Spilled data
+is read back through copy-on-write memory maps (see core.memory).
 """
 
-from typing import Any, Tuple
+import functools
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Mapping,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from core.memory import SpillStore, get_budget
+from core.precision import get_policy
+from data.async_loader import (
+    AsyncCSVDataLoader,
+    AsyncExcelDataLoader,
+    AsyncYahooFinanceLoader,
+)
+from data.cache import SharedCache
 from data.csv_loader import CSVDataLoader
 from data.excel_loader import ExcelDataLoader
 from services.currency_service import CurrencyService
 from services.stock_service import StockService
 
 
+def _store() -> Optional[MutableMapping[str, Any]]:
+    """SpillStore to load symbols into, if the memory budget has a limit."""
+    budget = get_budget()
+    return budget.store("loaders") if budget.limit is not None else None
+
+
+def _account(data: Any, name: str = "data") -> Any:
+    """Account loaded data to the memory budget."""
+    budget = get_budget()
+    if isinstance(data, SpillStore):
+        return data
+    if isinstance(data, Mapping):
+        return budget.store("loaders", data)
+    return budget.hold(data, "loaders", name)
+
+
+@functools.lru_cache(maxsize=None)
+def _yahoo_loader(cache_dir: Optional[str], precision: str) -> AsyncYahooFinanceLoader:
+    """Yahoo loader shared by every request with the same cache and precision."""
+    cache = SharedCache(cache_dir) if cache_dir else None
+    return AsyncYahooFinanceLoader(cache, precision=precision)
+
+
+class _Request(NamedTuple):
+    """Loading calls for the data source selected by arguments."""
+
+    load: Callable[[], Any]
+    load_async: Callable[[], Awaitable[Any]]
+    title: Callable[[Any], str]
+
+
+def _request(args: Any) -> _Request:
+    """Select the data source described by args (see DataService.load_data)."""
+    start = getattr(args, "start", None)
+    end = getattr(args, "end", None)
+    # Files hold their full history, so a period is applied only on request.
+    file_period = args.period if getattr(args, "period_explicit", False) else None
+    precision = getattr(args, "precision", None)
+    options = {
+        "period": args.period or "1y",
+        "start": start,
+        "end": end,
+        "registry": getattr(args, "registry", None),
+        "async_loader": _yahoo_loader(
+            getattr(args, "cache_dir", None), get_policy(precision).name
+        ),
+    }
+    bounds = {"start": start, "end": end, "period": file_period}
+
+    if args.currencies:
+        currencies = CurrencyService(**options)
+        return _Request(
+            lambda: currencies.load_pairs(args.currencies, _store()),
+            lambda: currencies.load_pairs_async(args.currencies, _store()),
+            lambda data: f"Currency Pairs: {', '.join(data.keys())}",
+        )
+
+    elif args.csv:
+        return _Request(
+            lambda: CSVDataLoader(precision=precision).load(args.csv, **bounds),
+            lambda: AsyncCSVDataLoader(precision=precision).load(args.csv, **bounds),
+            lambda data: f"CSV: {args.csv}",
+        )
+
+    elif args.excel:
+        return _Request(
+            lambda: ExcelDataLoader(precision=precision).load(args.excel, **bounds),
+            lambda: AsyncExcelDataLoader(precision=precision).load(
+                args.excel, **bounds
+            ),
+            lambda data: f"Excel: {args.excel}",
+        )
+
+    elif args.tickers:
+        stocks = StockService(**options)
+        return _Request(
+            lambda: stocks.load_stocks(args.tickers, _store()),
+            lambda: stocks.load_stocks_async(args.tickers, _store()),
+            lambda data: f"Stocks: {', '.join(data.keys())} ({args.period})",
+        )
+
+    else:
+        raise ValueError("No valid data source specified.")
+
+
 class DataService:
     """Service for loading financial data from multiple sources."""
 
@@ -27,6 +135,12 @@ class DataService:
                   - excel (str | None): path to Excel file
                   - tickers (list[str] | None): stock ticker symbols
                   - period (str | None): data period (e.g., '1y', '6mo')
+                  - start (str | None): inclusive start date
+                  - end (str | None): inclusive end date
+                  - period_explicit (bool): whether period also applies to files
+                  - cache_dir (str | None): shared download cache directory
+                  - precision (str | None): 'float64' or 'float32' price storage
+                  - registry (SymbolRegistry | None): registry validating symbols
 
         Returns:
             Tuple containing:
@@ -36,27 +150,31 @@ class DataService:
         Raises:
             ValueError: If no valid data source is specified in args.
         """
-        if args.currencies:
-            service = CurrencyService(period=args.period or "1y")
-            currency_data = service.load_pairs(args.currencies)
-            title = f"Currency Pairs: {', '.join(currency_data.keys())}"
-            return currency_data, title
-
-        elif args.csv:
-            data = CSVDataLoader().load(args.csv)
-            title = f"CSV: {args.csv}"
-            return data, title
-
-        elif args.excel:
-            data = ExcelDataLoader().load(args.excel)
-            title = f"Excel: {args.excel}"
-            return data, title
-
-        elif args.tickers:
-            service = StockService(period=args.period or "1y")
-            stock_data = service.load_stocks(args.tickers)
-            title = f"Stocks: {', '.join(stock_data.keys())} ({args.period})"
-            return stock_data, title
-
-        else:
-            raise ValueError("No valid data source specified.")
+        request = _request(args)
+        data = request.load()
+        title = request.title(data)
+        return _account(data, title), title
+
+    @staticmethod
+    async def load_data_async(args: Any) -> Tuple[Any, str]:
+        """
+        Load financial data like load_data() without blocking the event loop.
+
+        File parsing and API requests run in executors, so a server handling
+        many requests can overlap their I/O. Yahoo loaders are shared by
+        requests with the same cache and precision, and all of them share
+        one limit of simultaneous API requests.
+
+        Args:
+            args: Same attributes as for load_data().
+
+        Returns:
+            Tuple containing the loaded data and a title string.
+
+        Raises:
+            ValueError: If no valid data source is specified in args.
+        """
+        request = _request(args)
+        data = await request.load_async()
+        title = request.title(data)
+        return _account(data, title), title
@@ -0,0 +1,186 @@
+"""
+Module providing min/max-preserving downsampling of series for charting.
+
+Implements M4 decimation (first, min, max and last point per bucket) over a
+precomputed multi-resolution pyramid. Each level groups the buckets of the
+previous level, so the whole pyramid is built in O(n) and a level whose
+bucket count matches the plot's pixel width can be picked per render. Peaks
+and troughs of every bucket are always kept, so the rendered line is visually
+identical to plotting all points.
+"""
+
+import weakref
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+class DownsamplePyramid:
+    """
+    Multi-resolution M4 pyramid over the values of a single series.
+
+    Attributes:
+        length (int): Number of points in the source series.
+        factor (int): Number of buckets of one level merged into the next.
+        levels (list[np.ndarray]): Per level, an (n_buckets, 4) array with the
+            positions of the first, min, max and last point of each bucket;
+            padding entries are -1.
+    """
+
+    def __init__(
+        self, values: np.ndarray, factor: int = 4, min_buckets: int = 64
+    ) -> None:
+        """
+        Build all pyramid levels for the given values.
+
+        The finest level has buckets of ``factor ** 2`` points; every next
+        level merges ``factor`` buckets of the previous one.
+
+        Args:
+            values: 1-D array of series values (NaNs are ignored for min/max).
+            factor: Bucket growth factor between consecutive levels.
+            min_buckets: Stop building once a level has at most this many buckets.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.length = values.shape[0]
+        self.factor = factor
+        self.levels: list[np.ndarray] = []
+
+        # Values used to pick the minimum/maximum, with NaN neutralized.
+        low = np.where(np.isnan(values), np.inf, values)
+        high = np.where(np.isnan(values), -np.inf, values)
+
+        level = self._merge(
+            np.arange(self.length, dtype=np.int64), low, high, factor * factor
+        )
+        self.levels.append(level)
+        while level.shape[0] > min_buckets:
+            level = self._merge(level.ravel(), low, high, 4 * factor)
+            self.levels.append(level)
+
+    @staticmethod
+    def _merge(
+        candidates: np.ndarray, low: np.ndarray, high: np.ndarray, width: int
+    ) -> np.ndarray:
+        """Group candidate positions by width and keep first/min/max/last of each group."""
+        pad = (-candidates.shape[0]) % width
+        grid = np.concatenate((candidates, np.full(pad, -1, dtype=np.int64)))
+        grid = grid.reshape(-1, width)
+
+        valid = grid >= 0
+        safe = np.where(valid, grid, 0)
+        grid_low = np.where(valid, low[safe], np.inf)
+        grid_high = np.where(valid, high[safe], -np.inf)
+
+        rows = np.arange(grid.shape[0])
+        level = np.empty((grid.shape[0], 4), dtype=np.int64)
+        level[:, 0] = grid[:, 0]
+        level[:, 1] = grid[rows, grid_low.argmin(axis=1)]
+        level[:, 2] = grid[rows, grid_high.argmax(axis=1)]
+        level[:, 3] = grid.max(axis=1)
+        return level
+
+    def select(self, buckets: int) -> Optional[np.ndarray]:
+        """
+        Return sorted positions of the points to draw for a target bucket count.
+
+        The coarsest level that still has at least ``buckets`` buckets is used.
+
+        Args:
+            buckets: Desired minimum number of buckets (e.g. the pixel width).
+
+        Returns:
+            Optional[np.ndarray]: Sorted unique positions, or None if the series
+                is small enough to be drawn in full.
+        """
+        if self.length <= 4 * buckets:
+            return None
+        chosen = self.levels[0]
+        for level in self.levels[1:]:
+            if level.shape[0] < buckets:
+                break
+            chosen = level
+        positions = np.unique(chosen)
+        return positions[positions >= 0]
+
+
+# (length, first, last, sum) of the values a pyramid was built from, as bytes
+# so that NaN values compare equal.
+Signature = tuple[int, bytes, bytes, bytes]
+
+_cache: dict[int, tuple[weakref.ref, Signature, DownsamplePyramid]] = {}
+
+
+def _signature(values: np.ndarray) -> Signature:
+    """Cheap content check of a series' values."""
+    return (
+        len(values),
+        values[:1].tobytes(),
+        values[-1:].tobytes(),
+        np.nansum(values).tobytes(),
+    )
+
+
+def get_pyramid(series: pd.Series) -> DownsamplePyramid:
+    """
+    Return the cached pyramid for a series, building it on first use.
+
+    Pyramids are cached per series object and dropped when the series is
+    garbage collected. A cached pyramid is rebuilt when the length, first
+    or last value, or sum of the values changed, which catches in-place
+    edits such as ``series.iloc[i] = ...``.
+
+    Args:
+        series: Series to downsample.
+
+    Returns:
+        DownsamplePyramid: Pyramid for the series values.
+    """
+    key = id(series)
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    signature = _signature(values)
+    cached = _cache.get(key)
+    if cached is not None and cached[0]() is series and cached[1] == signature:
+        return cached[2]
+
+    pyramid = DownsamplePyramid(values)
+    _cache[key] = (
+        weakref.ref(series, lambda _: _cache.pop(key, None)),
+        signature,
+        pyramid,
+    )
+    return pyramid
+
+
+def downsample(series: pd.Series, pixels: int) -> tuple[pd.Index, np.ndarray]:
+    """
+    Reduce a series to the points needed to draw it at the given pixel width.
+
+    Args:
+        series: Series to plot.
+        pixels: Width of the target axes in pixels.
+
+    Returns:
+        tuple: (index, values) to pass to ``ax.plot``.
+    """
+    if len(series) <= 4 * pixels:
+        return series.index, series.to_numpy()
+    positions = get_pyramid(series).select(pixels)
+    if positions is None:
+        return series.index, series.to_numpy()
+    return series.index[positions], series.to_numpy()[positions]
+
+
+def axes_pixel_width(ax) -> int:
+    """
+    Return the width of a matplotlib axes in device pixels.
+
+    Args:
+        ax: Matplotlib axes.
+
+    Returns:
+        int: Width in pixels (at least 1).
+    """
+    fig = ax.get_figure()
+    width = ax.get_position().width * fig.get_figwidth() * fig.dpi
+    return max(int(width), 1)
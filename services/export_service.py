@@ -0,0 +1,449 @@
+"""
+Module providing ExportService for writing analytics results to disk.
+
+The nested results of AnalysisService.analyze_multiple are flattened into
+columns with NumPy (an AnalysisResult is sliced directly, without creating
+per-symbol Series) and written in one bulk operation as a long table (date,
+symbol, one column per metric) or a wide table (one column per symbol and
+metric). Supported formats are CSV (with pandas compression), NPZ, and
+Parquet/Arrow IPC through the optional pyarrow dependency.
+
+Rolling correlation or covariance matrices are too large to materialize;
+export_matrices() streams their time chunks instead, writing one batch of
+rows per chunk (a record batch for Parquet/Arrow, appended rows for CSV).
+"""
+
+import contextlib
+import os
+from typing import Iterable, Iterator, Mapping, Optional, Sequence
+import numpy as np
+import pandas as pd
+from core.exceptions import ExportError
+from analysis.results import AnalysisResult
+from data.alignment import align
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = ("parquet", "csv", "arrow", "npz")
+
+LAYOUTS = ("long", "wide")
+
+# Codecs accepted per format; NPZ takes any value as a switch for zip.
+CODECS = {
+    "csv": ("gzip", "bz2", "zip", "xz", "zstd", "tar"),
+    "parquet": ("snappy", "gzip", "brotli", "lz4", "zstd", "none"),
+    "arrow": ("lz4", "zstd"),
+}
+
+# Rows per batch for buffered CSV and Arrow writers.
+BATCH_ROWS = 100_000
+
+_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".csv": "csv",
+    ".gz": "csv",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".npz": "npz",
+}
+
+# CSV codecs inferred from the extension when writing batches to a handle.
+_CSV_CODECS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".zip": "zip",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".tar": "tar",
+}
+
+Results = Mapping[str, Mapping[str, pd.Series]]
+
+Columns = dict[str, np.ndarray]
+
+
+def _check(path: str, fmt: Optional[str], compression: Optional[str]) -> str:
+    """Resolve the export format and validate the codec against it."""
+    fmt = fmt or ExportService.infer_format(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unsupported export format: {fmt}")
+    if compression and fmt in CODECS and compression not in CODECS[fmt]:
+        raise ExportError(
+            f"Unsupported {fmt} compression: {compression} "
+            f"(expected one of {', '.join(CODECS[fmt])})"
+        )
+    return fmt
+
+
+def _slices(columns: Columns) -> Iterator[Columns]:
+    """Split columns into batches of BATCH_ROWS rows without copying."""
+    rows = len(next(iter(columns.values()))) if columns else 0
+    # An empty table still gets one batch, which carries the schema.
+    for start in range(0, max(rows, 1), BATCH_ROWS):
+        yield {
+            name: values[start : start + BATCH_ROWS] for name, values in columns.items()
+        }
+
+
+class ExportService:
+    """Service for exporting analytics results in bulk formats."""
+
+    @staticmethod
+    def infer_format(path: str) -> str:
+        """
+        Infer the export format from a file extension.
+
+        Args:
+            path: Output path.
+
+        Returns:
+            str: One of EXPORT_FORMATS; 'csv' for unknown extensions.
+        """
+        return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv")
+
+    @staticmethod
+    def to_columns(results: Results, layout: str = "long") -> dict[str, np.ndarray]:
+        """
+        Flatten nested results into equally long column arrays.
+
+        Args:
+            results: Mapping of symbol to mapping of metric to Series.
+            layout: 'long' for (date, symbol, metrics...) rows or 'wide' for
+                one 'SYMBOL.metric' column per series on the union of dates.
+
+        Returns:
+            dict[str, np.ndarray]: Columns in output order.
+
+        Raises:
+            ExportError: If the layout is not supported.
+        """
+        if isinstance(results, AnalysisResult):
+            return ExportService._result_columns(results, layout)
+        if layout == "wide":
+            frame = align(
+                {
+                    f"{symbol}.{metric}": series
+                    for symbol, metrics in results.items()
+                    for metric, series in metrics.items()
+                },
+                "union",
+            )
+            columns = {"date": frame.index.to_numpy()}
+            columns.update({c: frame[c].to_numpy() for c in frame.columns})
+            return columns
+        if layout != "long":
+            raise ExportError(f"Unsupported export layout: {layout}")
+
+        metrics = list(dict.fromkeys(m for ms in results.values() for m in ms))
+        dates, symbols, values = [], [], {m: [] for m in metrics}
+        for symbol, series_by_metric in results.items():
+            # Metrics of one symbol may cover different dates (e.g. warm-up).
+            index = None
+            for series in series_by_metric.values():
+                index = series.index if index is None else index.union(series.index)
+            dates.append(index.to_numpy())
+            symbols.append(np.full(len(index), symbol, dtype=object))
+            for metric in metrics:
+                series = series_by_metric.get(metric)
+                if series is None:
+                    values[metric].append(np.full(len(index), np.nan))
+                elif series.index.equals(index):
+                    values[metric].append(series.to_numpy(dtype=np.float64))
+                else:
+                    values[metric].append(
+                        series.reindex(index).to_numpy(dtype=np.float64)
+                    )
+
+        columns = {
+            "date": np.concatenate(dates) if dates else np.empty(0, "M8[ns]"),
+            "symbol": np.concatenate(symbols) if symbols else np.empty(0, object),
+        }
+        for metric in metrics:
+            columns[metric] = np.concatenate(values[metric])
+        return columns
+
+    @staticmethod
+    def _result_columns(results: AnalysisResult, layout: str) -> dict[str, np.ndarray]:
+        """Flatten a columnar result by slicing its arrays, without Series."""
+        metrics = results.metrics
+        if layout == "wide":
+            columns = {"date": results.index.to_numpy()}
+            for column, symbol in enumerate(results.symbols):
+                for metric in metrics:
+                    columns[f"{symbol}.{metric}"] = results.arrays[metric][:, column]
+            return columns
+        if layout != "long":
+            raise ExportError(f"Unsupported export layout: {layout}")
+
+        dates = results.index.to_numpy()
+        counts = [len(dates[rows]) for rows in results.rows]
+        columns = {
+            "date": (
+                np.concatenate([dates[rows] for rows in results.rows])
+                if counts
+                else np.empty(0, "M8[ns]")
+            ),
+            "symbol": np.repeat(np.array(results.symbols, dtype=object), counts),
+        }
+        for metric in metrics:
+            values = results.arrays[metric]
+            columns[metric] = (
+                np.concatenate(
+                    [values[rows, c] for c, rows in enumerate(results.rows)]
+                ).astype(np.float64, copy=False)
+                if counts
+                else np.empty(0)
+            )
+        return columns
+
+    @staticmethod
+    def export(
+        results: Results,
+        path: str,
+        fmt: Optional[str] = None,
+        layout: str = "long",
+        compression: Optional[str] = None,
+    ) -> int:
+        """
+        Write nested analytics results to a file in one bulk write.
+
+        Args:
+            results: Mapping of symbol to mapping of metric to Series.
+            path: Output path.
+            fmt: One of EXPORT_FORMATS; inferred from the extension if None.
+            layout: 'long' or 'wide' (see to_columns).
+            compression: Codec passed to the writer, one of CODECS[fmt] (Arrow
+                IPC only supports 'lz4' and 'zstd'); for NPZ any value enables
+                zip compression.
+
+        Returns:
+            int: Number of rows written.
+
+        Raises:
+            ExportError: If the format or codec is unsupported, pyarrow is
+                missing for Parquet/Arrow, or writing fails.
+        """
+        columns = ExportService.to_columns(results, layout)
+        return ExportService.write_columns(columns, path, fmt, compression)
+
+    @staticmethod
+    def export_frame(
+        frame: pd.DataFrame,
+        path: str,
+        fmt: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> int:
+        """
+        Write a DataFrame with its index as columns.
+
+        Rolling matrices are better streamed with export_matrices() than
+        materialized with RollingCovariance.to_frame() and written here.
+
+        Args:
+            frame: Frame to write.
+            path: Output path.
+            fmt: One of EXPORT_FORMATS; inferred from the extension if None.
+            compression: Writer codec (see export).
+
+        Returns:
+            int: Number of rows written.
+
+        Raises:
+            ExportError: If the format or codec is unsupported or writing fails.
+        """
+        flat = frame.reset_index()
+        columns = {str(c): flat[c].to_numpy() for c in flat.columns}
+        return ExportService.write_columns(columns, path, fmt, compression)
+
+    @staticmethod
+    def write_columns(
+        columns: dict[str, np.ndarray],
+        path: str,
+        fmt: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> int:
+        """
+        Write equally long column arrays to a file.
+
+        Args:
+            columns: Column arrays in output order.
+            path: Output path.
+            fmt: One of EXPORT_FORMATS; inferred from the extension if None.
+            compression: Writer codec (see export).
+
+        Returns:
+            int: Number of rows written.
+
+        Raises:
+            ExportError: If the format or codec is unsupported or writing fails.
+        """
+        fmt = _check(path, fmt, compression)
+        rows = len(next(iter(columns.values()))) if columns else 0
+        try:
+            if fmt == "csv":
+                pd.DataFrame(columns, copy=False).to_csv(
+                    path,
+                    index=False,
+                    compression=compression or "infer",
+                    chunksize=BATCH_ROWS,
+                )
+            elif fmt == "npz":
+                arrays = {
+                    name: (values.astype(str) if values.dtype == object else values)
+                    for name, values in columns.items()
+                }
+                save = np.savez_compressed if compression else np.savez
+                with open(path, "wb") as f:
+                    save(f, **arrays)
+            else:
+                ExportService._write_arrow(_slices(columns), path, fmt, compression)
+        except ExportError:
+            raise
+        except Exception as e:
+            raise ExportError(f"Export to {path} failed: {str(e)}")
+        return rows
+
+    @staticmethod
+    def export_matrices(
+        chunks: Iterable[tuple[pd.Index, np.ndarray]],
+        symbols: Sequence[str],
+        path: str,
+        fmt: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> int:
+        """
+        Stream chunks of (time, k, k) matrices to a file.
+
+        Rows are (date, symbol, one column per symbol), as in
+        RollingCovariance.to_frame(), but only one chunk is held at a time.
+
+        Args:
+            chunks: Dates and matrices per chunk, e.g. from
+                RollingCovariance.correlation_chunks().
+            symbols: Symbols of the matrix rows and columns.
+            path: Output path.
+            fmt: One of EXPORT_FORMATS; inferred from the extension if None.
+            compression: Writer codec (see export).
+
+        Returns:
+            int: Number of rows written.
+
+        Raises:
+            ExportError: If the format or codec is unsupported or writing fails.
+        """
+        names = np.array(symbols, dtype=object)
+
+        def batches() -> Iterator[Columns]:
+            for index, values in chunks:
+                flat = values.reshape(-1, len(names))
+                columns = {
+                    "date": np.repeat(index.to_numpy(), len(names)),
+                    "symbol": np.tile(names, len(index)),
+                }
+                columns.update({str(s): flat[:, i] for i, s in enumerate(names)})
+                yield columns
+
+        return ExportService.write_batches(batches(), path, fmt, compression)
+
+    @staticmethod
+    def write_batches(
+        batches: Iterable[Columns],
+        path: str,
+        fmt: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> int:
+        """
+        Write batches of columns to a file as they are produced.
+
+        Parquet, Arrow IPC and CSV are written batch by batch. NPZ, zip and
+        tar archives cannot be appended to, so their batches are collected
+        and written at once.
+
+        Args:
+            batches: Column arrays per batch, with the same columns in order.
+            path: Output path.
+            fmt: One of EXPORT_FORMATS; inferred from the extension if None.
+            compression: Writer codec (see export).
+
+        Returns:
+            int: Number of rows written.
+
+        Raises:
+            ExportError: If the format or codec is unsupported or writing fails.
+        """
+        fmt = _check(path, fmt, compression)
+        if fmt == "csv":
+            extension = os.path.splitext(path)[1].lower()
+            compression = compression or _CSV_CODECS.get(extension)
+        if fmt == "npz" or compression in ("zip", "tar"):
+            parts: dict[str, list[np.ndarray]] = {}
+            for columns in batches:
+                for name, values in columns.items():
+                    parts.setdefault(name, []).append(values)
+            columns = {name: np.concatenate(p) for name, p in parts.items()}
+            return ExportService.write_columns(columns, path, fmt, compression)
+        try:
+            if fmt == "csv":
+                return ExportService._write_csv(batches, path, compression)
+            return ExportService._write_arrow(batches, path, fmt, compression)
+        except ExportError:
+            raise
+        except Exception as e:
+            raise ExportError(f"Export to {path} failed: {str(e)}")
+
+    @staticmethod
+    def _write_csv(
+        batches: Iterable[Columns], path: str, compression: Optional[str]
+    ) -> int:
+        """Append batches to a CSV file, one compressed stream per batch."""
+        rows = 0
+        with open(path, "wb") as f:
+            for columns in batches:
+                pd.DataFrame(columns, copy=False).to_csv(
+                    f, index=False, header=rows == 0, compression=compression
+                )
+                rows += len(next(iter(columns.values())))
+        return rows
+
+    @staticmethod
+    def _write_arrow(
+        batches: Iterable[Columns], path: str, fmt: str, compression: Optional[str]
+    ) -> int:
+        """Write batches as Parquet or Arrow IPC, converting one batch at a time."""
+        if pa is None:
+            raise ExportError(
+                f"Export to {fmt} requires pyarrow; install it or use csv/npz"
+            )
+        rows = 0
+        with contextlib.ExitStack() as stack:
+            writer = None
+            for columns in batches:
+                batch = pa.record_batch(
+                    [pa.array(values) for values in columns.values()],
+                    names=list(columns),
+                )
+                if writer is None:
+                    writer = stack.enter_context(
+                        ExportService._arrow_writer(
+                            path, fmt, batch.schema, compression
+                        )
+                    )
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    @staticmethod
+    def _arrow_writer(
+        path: str, fmt: str, schema: "pa.Schema", compression: Optional[str]
+    ):
+        """Open a Parquet or Arrow IPC file writer for schema."""
+        if fmt == "parquet":
+            return pq.ParquetWriter(path, schema, compression=compression or "snappy")
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        return pa.ipc.new_file(path, schema, options=options)
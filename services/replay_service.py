@@ -0,0 +1,276 @@
+"""
+Module providing a historical replay engine for backtesting analytics.
+
+The engine reads a stored price history once and steps through it in time
+order, feeding returns and rolling volatility incrementally chunk by chunk.
+Any number of parameter sets (window, log vs simple returns) are evaluated
+in the same sweep, and results are collected column by column.
+"""
+
+import os
+from typing import Callable, Iterator, NamedTuple, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from analysis import kernels
+from core.exceptions import CalculationError, DataLoadError
+from data.csv_loader import CSVDataLoader
+from data.excel_loader import ExcelDataLoader
+
+
+class ReplayParameters(NamedTuple):
+    """
+    Parameter set evaluated by the replay engine.
+
+    Attributes:
+        window: Rolling volatility window.
+        log_returns: If True, use log returns; otherwise simple returns.
+    """
+
+    window: int = 21
+    log_returns: bool = True
+
+    @property
+    def label(self) -> str:
+        """Short column label such as 'w21_log'."""
+        return f"w{self.window}_{'log' if self.log_returns else 'simple'}"
+
+
+class _ReturnsState:
+    """Carried state for one returns kind and all windows that use it."""
+
+    def __init__(self, log_returns: bool, max_window: int) -> None:
+        self.log_returns = log_returns
+        self.last_price: Optional[float] = None
+        self.tail = np.empty(0)
+        self.max_window = max_window
+
+    def step(self, prices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return (returns of this chunk, carried tail + returns)."""
+        if self.last_price is None:
+            values = prices
+        else:
+            values = np.concatenate(([self.last_price], prices))
+        self.last_price = float(prices[-1])
+        returns = (
+            kernels.returns(values, self.log_returns)
+            if len(values) > 1
+            else np.empty(0)
+        )
+        extended = np.concatenate((self.tail, returns))
+        self.tail = (
+            extended[-(self.max_window - 1) :] if self.max_window > 1 else np.empty(0)
+        )
+        return returns, extended
+
+
+class ReplayResult:
+    """
+    Columnar replay results sharing one time index.
+
+    Attributes:
+        index (pd.Index): Dates of the return rows.
+        columns (dict[str, dict[str, np.ndarray]]): Metric arrays per parameter label.
+    """
+
+    def __init__(
+        self, index: pd.Index, columns: dict[str, dict[str, np.ndarray]]
+    ) -> None:
+        """
+        Initialize results.
+
+        Args:
+            index: Dates of the return rows.
+            columns: Mapping of parameter label to mapping of metric to array.
+        """
+        self.index = index
+        self.columns = columns
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return results as a DataFrame with (parameters, metric) column levels.
+
+        Returns:
+            pd.DataFrame: Wide result table.
+        """
+        data = {
+            (label, metric): values
+            for label, metrics in self.columns.items()
+            for metric, values in metrics.items()
+        }
+        return pd.DataFrame(data, index=self.index)
+
+    def write(self, path: str) -> None:
+        """
+        Write results columnarly to '.npz' (one array per column) or '.csv'.
+
+        Args:
+            path: Output path; the extension selects the format.
+
+        Raises:
+            ValueError: If the extension is not supported.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".npz":
+            arrays = {
+                f"{label}/{metric}": values
+                for label, metrics in self.columns.items()
+                for metric, values in metrics.items()
+            }
+            index = pd.DatetimeIndex(self.index).as_unit("ns").asi8
+            with open(path, "wb") as f:
+                np.savez(f, index=index, **arrays)
+        elif extension == ".csv":
+            frame = self.to_frame()
+            frame.columns = [f"{label}.{metric}" for label, metric in frame.columns]
+            frame.to_csv(path, index_label="Date")
+        else:
+            raise ValueError(f"Unsupported replay output format: {extension}")
+
+
+class ReplayEngine:
+    """
+    Engine stepping through a stored price history with incremental analytics.
+
+    Attributes:
+        prices (pd.Series): Price history being replayed.
+        parameters (list[ReplayParameters]): Parameter sets evaluated per step.
+        chunk_size (int): Number of rows fed per step.
+    """
+
+    def __init__(
+        self,
+        prices: pd.Series,
+        parameters: Sequence[Union[ReplayParameters, tuple[int, bool]]] = (
+            ReplayParameters(),
+        ),
+        chunk_size: int = 65_536,
+    ) -> None:
+        """
+        Initialize the engine.
+
+        Args:
+            prices: Price Series indexed by date; NaNs are dropped.
+            parameters: Parameter sets as ReplayParameters or (window, log_returns).
+            chunk_size: Number of rows fed to the analytics per step.
+
+        Raises:
+            CalculationError: If no parameters are given or a window is invalid.
+        """
+        self.prices = prices.dropna()
+        self.parameters = [ReplayParameters(*p) for p in parameters]
+        if not self.parameters:
+            raise CalculationError("At least one parameter set is required")
+        if any(p.window < 1 for p in self.parameters):
+            raise CalculationError("Replay windows must be positive")
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ReplayEngine":
+        """
+        Create an engine from a CSV/Excel file or an '.npz' binary price store.
+
+        Args:
+            path: Path to the stored dataset.
+            **kwargs: Passed to the ReplayEngine constructor.
+
+        Returns:
+            ReplayEngine: Engine over the file's 'Close' prices.
+
+        Raises:
+            DataLoadError: If the file cannot be loaded.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".npz":
+            try:
+                with np.load(path) as stored:
+                    index = pd.to_datetime(stored["index"])
+                    prices = pd.Series(stored["close"], index=index, name="Close")
+            except (OSError, KeyError, ValueError) as e:
+                raise DataLoadError(f"Price store loading error: {str(e)}")
+        elif extension in (".xlsx", ".xls"):
+            prices = ExcelDataLoader().load(path)["Close"]
+        else:
+            prices = CSVDataLoader().load(path)["Close"]
+        return cls(prices, **kwargs)
+
+    @staticmethod
+    def write_store(path: str, prices: pd.Series) -> None:
+        """
+        Save a price Series as an '.npz' binary store readable by from_file.
+
+        Args:
+            path: Output path ending in '.npz'.
+            prices: Price Series indexed by date.
+        """
+        index = pd.DatetimeIndex(prices.index).as_unit("ns").asi8
+        with open(path, "wb") as f:
+            np.savez(f, index=index, close=prices.to_numpy(dtype=np.float64))
+
+    def steps(self) -> Iterator[tuple[pd.Index, dict[str, dict[str, np.ndarray]]]]:
+        """
+        Step through the history chunk by chunk.
+
+        Every yielded chunk only depends on data up to its last row, exactly
+        as if the analytics had been run live.
+
+        Yields:
+            tuple: Dates of the chunk's return rows and metric arrays per label.
+        """
+        values = self.prices.to_numpy(dtype=np.float64)
+        index = self.prices.index
+        states = {
+            kind: _ReturnsState(
+                kind, max(p.window for p in self.parameters if p.log_returns == kind)
+            )
+            for kind in {p.log_returns for p in self.parameters}
+        }
+
+        for start in range(0, len(values), self.chunk_size):
+            stop = min(start + self.chunk_size, len(values))
+            chunk = {}
+            step_results = {
+                kind: s.step(values[start:stop]) for kind, s in states.items()
+            }
+            for params in self.parameters:
+                returns, extended = step_results[params.log_returns]
+                if len(returns) == 0:
+                    continue
+                volatility = kernels.rolling_std(
+                    extended, params.window, scale=np.sqrt(params.window)
+                )[-len(returns) :]
+                chunk[params.label] = {"returns": returns, "volatility": volatility}
+            if chunk:
+                first = max(start, 1)
+                yield index[first:stop], chunk
+
+    def run(
+        self,
+        on_step: Optional[
+            Callable[[pd.Index, dict[str, dict[str, np.ndarray]]], None]
+        ] = None,
+    ) -> ReplayResult:
+        """
+        Replay the whole history in one sweep.
+
+        Args:
+            on_step: Optional callback receiving every chunk as it is produced.
+
+        Returns:
+            ReplayResult: Columnar results for all parameter sets.
+        """
+        labels = [p.label for p in self.parameters]
+        length = max(len(self.prices) - 1, 0)
+        columns = {
+            label: {"returns": np.empty(length), "volatility": np.empty(length)}
+            for label in labels
+        }
+        position = 0
+        for chunk_index, chunk in self.steps():
+            size = len(chunk_index)
+            for label, metrics in chunk.items():
+                for metric, values in metrics.items():
+                    columns[label][metric][position : position + size] = values
+            position += size
+            if on_step is not None:
+                on_step(chunk_index, chunk)
+        return ReplayResult(self.prices.index[1:], columns)
@@ -0,0 +1,331 @@
+"""
+Module providing SidecarService for caching parsed files with their analysis.
+
+The first analysis of a CSV or Excel file writes a binary columnar sidecar
+(NPZ) holding the validated price columns, the date index and the returns
+and volatility arrays. The sidecar is keyed by the source file's size,
+modification time and content hash and by the analysis parameters (window
+and precision), so re-runs skip parsing and computation entirely.
+
+When a CSV file has only grown and its previous content is unchanged (the
+hash of the old bytes matches), only the appended rows are
+parsed and the analytics are extended incrementally: returns need the last
+stored price and rolling volatility the last ``window - 1`` stored returns.
+Any other change triggers a full reload.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+from typing import Optional
+import numpy as np
+import pandas as pd
+from analysis import kernels
+from core.exceptions import DataLoadError, SchemaError
+from core.precision import PrecisionLike, get_policy
+from data.base_loader import BaseDataLoader
+from data.csv_index import READ_CHUNK_SIZE
+from data.csv_loader import CSVDataLoader
+from data.excel_loader import ExcelDataLoader
+from data.schema import OHLCV_SCHEMA
+from services.analysis import AnalysisService
+
+SIDECAR_SUFFIX = ".analysis.npz"
+
+FORMAT_VERSION = 1
+
+Analysis = dict[str, pd.Series]
+
+
+def _digests(filepath: str, size: int, checkpoint: int) -> tuple[str, str]:
+    """Hashes of the first checkpoint bytes and of the first size bytes of a file."""
+    hasher = hashlib.blake2b(digest_size=16)
+    prefix = hasher.hexdigest() if checkpoint == 0 else ""
+    position = 0
+    with open(filepath, "rb") as f:
+        while position < size:
+            limit = checkpoint if position < checkpoint else size
+            chunk = f.read(min(READ_CHUNK_SIZE, limit - position))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            position += len(chunk)
+            if position == checkpoint:
+                prefix = hasher.hexdigest()
+    return prefix, hasher.hexdigest()
+
+
+def _column_values(column: pd.Series) -> np.ndarray:
+    """Column as an array that NPZ stores without pickling."""
+    values = column.to_numpy()
+    return values.astype(str) if values.dtype == object else values
+
+
+class SidecarService:
+    """
+    Service loading CSV/Excel files and their analysis through sidecar files.
+
+    Attributes:
+        directory (str | None): Directory for sidecars; None stores them
+            next to the source files.
+        window (int): Rolling volatility window.
+        precision (PrecisionPolicy): Storage precision of prices and results.
+        last_mode (str | None): How the last load was served: 'hit',
+            'append' or 'full'.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        window: int = 21,
+        precision: PrecisionLike = None,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            directory: Directory for sidecars (created if missing); None
+                stores them next to the source files.
+            window: Rolling volatility window.
+            precision: 'float64' (default) or 'float32' storage.
+        """
+        self.directory = directory
+        self.window = window
+        self.precision = get_policy(precision)
+        self.last_mode: Optional[str] = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, filepath: str) -> str:
+        """
+        Return the sidecar path for a source file and the analysis parameters.
+
+        Args:
+            filepath: Path to the CSV or Excel file.
+
+        Returns:
+            str: Path of the sidecar file.
+        """
+        name = f"w{self.window}.{self.precision.name}{SIDECAR_SUFFIX}"
+        if not self.directory:
+            return f"{filepath}.{name}"
+        # Files with equal names in different directories get distinct sidecars.
+        key = hashlib.sha256(os.path.abspath(filepath).encode()).hexdigest()[:16]
+        return os.path.join(
+            self.directory, f"{key}-{os.path.basename(filepath)}.{name}"
+        )
+
+    def load(self, filepath: str) -> tuple[pd.DataFrame, Analysis]:
+        """
+        Load a file and its analysis, reusing or extending the sidecar.
+
+        Args:
+            filepath: Path to the CSV or Excel file.
+
+        Returns:
+            tuple: Validated price frame and a dict with 'returns' and
+                'volatility' Series, as from AnalysisService.analyze().
+
+        Raises:
+            DataLoadError: If the file cannot be loaded.
+            SchemaError: If the file content does not match the schema.
+        """
+        try:
+            stat = os.stat(filepath)
+        except OSError as e:
+            raise DataLoadError(f"Cannot read {filepath}: {str(e)}")
+        stored = self._read_sidecar(filepath)
+        meta = stored["meta"] if stored is not None else None
+
+        if meta is not None:
+            if meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+                self.last_mode = "hit"
+                return self._unpack(stored)
+            old_size = meta["size"] if meta["size"] <= stat.st_size else 0
+            prefix, digest = _digests(filepath, stat.st_size, old_size)
+            if prefix == meta["hash"]:
+                if old_size == stat.st_size:
+                    # Touched but unchanged: refresh the key only.
+                    meta["mtime_ns"] = stat.st_mtime_ns
+                    self._write_sidecar(filepath, stored)
+                    self.last_mode = "hit"
+                    return self._unpack(stored)
+                result = self._append(filepath, stored, stat, digest)
+                if result is not None:
+                    self.last_mode = "append"
+                    return result
+        else:
+            digest = _digests(filepath, stat.st_size, 0)[1]
+
+        data = self._loader(filepath).load(filepath)
+        analysis = AnalysisService.analyze(
+            data, window=self.window, precision=self.precision
+        )
+        self._write_sidecar(
+            filepath, self._pack(filepath, data, analysis, stat, digest)
+        )
+        self.last_mode = "full"
+        return data, analysis
+
+    def _loader(self, filepath: str) -> BaseDataLoader:
+        """Loader for the file type."""
+        if filepath.lower().endswith((".xlsx", ".xls")):
+            return ExcelDataLoader(precision=self.precision)
+        return CSVDataLoader(precision=self.precision)
+
+    def _append(
+        self, filepath: str, stored: dict, stat: os.stat_result, digest: str
+    ) -> Optional[tuple[pd.DataFrame, Analysis]]:
+        """Parse and analyze only appended rows, or return None if not possible."""
+        meta = stored["meta"]
+        loader = self._loader(filepath)
+        # Excel files cannot be appended to; a partial last line may have changed.
+        if not isinstance(loader, CSVDataLoader) or not meta["newline"]:
+            return None
+        if not meta["clean"]:
+            return None
+        # The matching hash of the old bytes guarantees an unchanged header.
+        with open(filepath, "rb") as f:
+            header = f.readline()
+            f.seek(meta["size"])
+            tail = f.read(stat.st_size - meta["size"])
+        try:
+            new = loader._validate_data(loader._read(io.BytesIO(header + tail)))
+        except (DataLoadError, SchemaError, ValueError):
+            return None
+        if list(map(str, new.columns)) != meta["columns"]:
+            return None
+
+        index = self._index(stored)
+        new_close = new["Close"].to_numpy(dtype=self.precision.dtype)
+        if new.index[0] <= index[-1] or not (
+            0 < new_close.min() and new_close.max() < np.inf
+        ):
+            return None
+
+        window = self.window
+        close = stored["col:Close"]
+        old_returns = stored["returns"]
+        returns = kernels.returns(np.r_[close[-1:], new_close])
+        # Volatility of the new rows needs the previous window - 1 returns.
+        history = np.r_[old_returns[max(len(old_returns) - window + 1, 0) :], returns]
+        volatility = kernels.rolling_std(history, window, scale=np.sqrt(window))
+
+        stored["index"] = np.r_[stored["index"], new.index.as_unit(meta["unit"]).asi8]
+        for column in meta["columns"]:
+            key = f"col:{column}"
+            stored[key] = np.r_[stored[key], _column_values(new[column])]
+        stored["returns"] = np.r_[old_returns, returns]
+        stored["volatility"] = np.r_[
+            stored["volatility"], volatility[len(history) - len(returns) :]
+        ]
+        meta.update(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            hash=digest,
+            newline=tail.endswith(b"\n"),
+        )
+        self._write_sidecar(filepath, stored)
+        return self._unpack(stored)
+
+    def _pack(
+        self,
+        filepath: str,
+        data: pd.DataFrame,
+        analysis: Analysis,
+        stat: os.stat_result,
+        digest: str,
+    ) -> dict:
+        """Columnar arrays and metadata of a loaded file and its analysis."""
+        with open(filepath, "rb") as f:
+            f.seek(max(stat.st_size - 1, 0))
+            newline = f.read(1) == b"\n"
+        close = data["Close"].to_numpy(dtype=self.precision.dtype)
+        meta = {
+            "version": FORMAT_VERSION,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": digest,
+            "newline": newline,
+            "window": self.window,
+            "precision": self.precision.name,
+            "columns": [str(c) for c in data.columns],
+            "unit": data.index.unit,
+            "tz": None if data.index.tz is None else str(data.index.tz),
+            # Incremental updates reproduce the fused kernel path only.
+            "clean": bool(len(close) > 1 and 0 < close.min() and close.max() < np.inf),
+        }
+        stored = {
+            "meta": meta,
+            "index": data.index.asi8,
+            "returns": analysis["returns"].to_numpy(),
+            "volatility": analysis["volatility"].to_numpy(),
+        }
+        for column in data.columns:
+            stored[f"col:{column}"] = _column_values(data[column])
+        return stored
+
+    def _index(self, stored: dict) -> pd.DatetimeIndex:
+        """Date index of stored rows."""
+        meta = stored["meta"]
+        index = pd.DatetimeIndex(
+            stored["index"].view(f"M8[{meta['unit']}]"), name="Date"
+        )
+        tz = meta["tz"]
+        return index if tz is None else index.tz_localize("UTC").tz_convert(tz)
+
+    def _unpack(self, stored: dict) -> tuple[pd.DataFrame, Analysis]:
+        """Price frame and analysis Series from stored arrays."""
+        index = self._index(stored)
+        data = pd.DataFrame(
+            {column: stored[f"col:{column}"] for column in stored["meta"]["columns"]},
+            index=index,
+        )
+        OHLCV_SCHEMA.trust(data)
+        analysis = {
+            metric: pd.Series(stored[metric], index=index[1:], name="Close")
+            for metric in ("returns", "volatility")
+        }
+        return data, analysis
+
+    def _read_sidecar(self, filepath: str) -> Optional[dict]:
+        """Stored arrays, or None if the sidecar is missing or incompatible."""
+        try:
+            with np.load(self.path_for(filepath), allow_pickle=False) as f:
+                stored = {name: f[name] for name in f.files}
+            stored["meta"] = json.loads(str(stored["meta"]))
+        except (OSError, KeyError, ValueError):
+            return None
+        meta = stored["meta"]
+        if (
+            meta.get("version") != FORMAT_VERSION
+            or meta.get("window") != self.window
+            or meta.get("precision") != self.precision.name
+        ):
+            return None
+        return stored
+
+    def _write_sidecar(self, filepath: str, stored: dict) -> None:
+        """
+        Write the sidecar atomically.
+
+        Failures (e.g. a read-only directory) are ignored; the file is then
+        simply analyzed again on the next run.
+        """
+        path = self.path_for(filepath)
+        arrays = dict(stored, meta=np.array(json.dumps(stored["meta"])))
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path) or ".", suffix=".tmp"
+            )
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
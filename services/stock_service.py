@@ -3,25 +3,54 @@ Module providing StockService for loading stock market data
 using YahooFinanceLoader and handling various data formats.
 """
 
+from typing import Any, MutableMapping, Optional
 import pandas as pd
 from core.exceptions import DataLoadError
+from core.precision import PrecisionLike
 from data.api.yahoo_loader import YahooFinanceLoader
+from data.async_loader import AsyncYahooFinanceLoader
+from data.cache import SharedCache
+from data.symbols import SymbolRegistry
 
 
 class StockService:
     """Service for loading stock market data."""
 
-    def __init__(self, period: str = "1y") -> None:
+    def __init__(
+        self,
+        period: str = "1y",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        cache: Optional[SharedCache] = None,
+        precision: PrecisionLike = None,
+        registry: Optional[SymbolRegistry] = None,
+        async_loader: Optional[AsyncYahooFinanceLoader] = None,
+    ) -> None:
         """
-        Initialize StockService with a data loading period.
+        Initialize StockService with a data loading period or date range.
 
         Args:
             period: Data period string (e.g., '1y', '6mo').
+            start: Optional inclusive start date overriding period.
+            end: Optional inclusive end date overriding period.
+            cache: Optional host-level download cache.
+            precision: 'float64' (default) or 'float32' storage of prices.
+            registry: Optional symbol registry used to validate tickers.
+            async_loader: Yahoo loader shared with other services (e.g. one
+                per cache and precision); cache and precision are then ignored.
         """
-        self.loader = YahooFinanceLoader()
+        if async_loader is None:
+            async_loader = AsyncYahooFinanceLoader(cache, precision=precision)
+        self.async_loader = async_loader
+        self.loader = async_loader.loader
         self.period = period
+        self.start = start
+        self.end = end
+        self.registry = registry
 
-    def load_stocks(self, tickers: list[str]) -> dict[str, pd.Series]:
+    def load_stocks(
+        self, tickers: list[str], out: Optional[MutableMapping[str, pd.Series]] = None
+    ) -> MutableMapping[str, pd.Series]:
         """
         Load stock price data for given tickers.
 
@@ -32,34 +61,72 @@ class StockService:
 
         Args:
             tickers: List of stock ticker symbols.
+            out: Mapping to store each ticker's Series in as soon as it is
+                extracted (e.g. a SpillStore); a new dict by default.
 
         Returns:
-            Dictionary mapping ticker symbols (uppercase) to their
+            Mapping of ticker symbols (uppercase) to their
             closing price pandas Series with NaNs dropped.
 
         Raises:
-            DataLoadError: If the data format is unexpected or required
-            'Close' column is missing.
+            DataLoadError: If a ticker is not in the registry, the data format
+            is unexpected or required 'Close' column is missing.
         """
-        all_data = self.loader.load(tickers, self.period)
+        all_data = self.loader.load(
+            self._yahoo_symbols(tickers), self.period, start=self.start, end=self.end
+        )
+        return self._extract_close(all_data, out)
 
+    async def load_stocks_async(
+        self, tickers: list[str], out: Optional[MutableMapping[str, pd.Series]] = None
+    ) -> MutableMapping[str, pd.Series]:
+        """
+        Load stock price data without blocking the event loop.
+
+        Args:
+            tickers: List of stock ticker symbols.
+            out: Mapping to store each ticker's Series in (see load_stocks).
+
+        Returns:
+            Mapping of ticker symbols (uppercase) to their
+            closing price pandas Series with NaNs dropped.
+
+        Raises:
+            DataLoadError: If a ticker is not in the registry, the data format
+            is unexpected or required 'Close' column is missing.
+        """
+        all_data = await self.async_loader.load(
+            self._yahoo_symbols(tickers), self.period, start=self.start, end=self.end
+        )
+        return self._extract_close(all_data, out)
+
+    def _yahoo_symbols(self, tickers: list[str]) -> list[str]:
+        """Validate tickers against the registry and map them to Yahoo symbols."""
+        if self.registry is None:
+            return tickers
+        unknown = self.registry.unknown(tickers, "stock")
+        if unknown:
+            raise DataLoadError(f"Unknown stock tickers: {', '.join(unknown)}")
+        return self.registry.yahoo_symbols(tickers)
+
+    @staticmethod
+    def _extract_close(
+        all_data: Any, out: Optional[MutableMapping[str, pd.Series]] = None
+    ) -> MutableMapping[str, pd.Series]:
+        """Extract closing prices per ticker from any supported loader format."""
+        result = {} if out is None else out
         if isinstance(all_data, pd.DataFrame):
             if isinstance(all_data.columns, pd.MultiIndex):
                 if "Close" not in all_data.columns.levels[0]:
                     raise DataLoadError("MultiIndex: 'Close' column not found")
-
-                return {
-                    ticker.upper(): all_data["Close"][ticker].dropna()
-                    for ticker in all_data["Close"].columns
-                }
+                close = all_data["Close"]
             else:
-                return {
-                    ticker.upper(): all_data[ticker].dropna()
-                    for ticker in all_data.columns
-                }
+                close = all_data
+            for ticker in close.columns:
+                result[ticker.upper()] = close[ticker].dropna()
+            return result
 
         if isinstance(all_data, dict):
-            result = {}
             for ticker, df in all_data.items():
                 if "Close" not in df.columns:
                     raise DataLoadError(f"'Close' column missing for {ticker}")
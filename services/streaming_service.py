@@ -0,0 +1,182 @@
+"""
+Module providing StreamingService for live incremental analytics.
+
+Ticks from a quote source flow through a bounded asyncio queue into
+incremental returns/volatility/correlation state. When the consumer falls
+behind, the queue fills up and the producer waits (backpressure). Metrics
+snapshots are emitted at a configurable cadence together with latency and
+queue-depth statistics.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, Union
+import numpy as np
+from analysis.incremental import IncrementalAnalytics
+from data.stream_sources import AbstractQuoteSource
+
+MetricsCallback = Callable[[dict], Union[None, Awaitable[None]]]
+
+
+class LatencyStats:
+    """
+    Ring buffer of recent latency samples with summary statistics.
+
+    Attributes:
+        count (int): Total number of recorded samples.
+        max (float): Largest latency recorded, in seconds.
+    """
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        """
+        Initialize an empty buffer.
+
+        Args:
+            capacity: Number of most recent samples used for percentiles.
+        """
+        self._samples = np.zeros(capacity)
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Record one latency sample.
+
+        Args:
+            seconds: Latency in seconds.
+        """
+        self._samples[self.count % len(self._samples)] = seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def summary(self) -> dict[str, float]:
+        """
+        Summarize recent samples.
+
+        Returns:
+            dict[str, float]: 'count', 'mean', 'p50', 'p99' and 'max' (seconds).
+        """
+        recent = self._samples[: min(self.count, len(self._samples))]
+        if not len(recent):
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        p50, p99 = np.percentile(recent, [50, 99])
+        return {
+            "count": self.count,
+            "mean": float(recent.mean()),
+            "p50": float(p50),
+            "p99": float(p99),
+            "max": self.max,
+        }
+
+
+class StreamingService:
+    """
+    Service running a quote source through incremental analytics.
+
+    Attributes:
+        source (AbstractQuoteSource): Source of ticks.
+        analytics (IncrementalAnalytics): Incremental analytics state.
+        emit_interval (float): Seconds between metrics snapshots.
+        latency (LatencyStats): Tick arrival to state update latency.
+        max_queue_depth (int): Largest queue depth observed.
+    """
+
+    def __init__(
+        self,
+        source: AbstractQuoteSource,
+        window: int = 21,
+        log_returns: bool = True,
+        emit_interval: float = 1.0,
+        queue_size: int = 1024,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            source: Source of ticks.
+            window: Rolling window for volatility and correlation.
+            log_returns: If True, use log returns; otherwise simple returns.
+            emit_interval: Seconds between metrics snapshots.
+            queue_size: Capacity of the bounded tick queue.
+        """
+        self.source = source
+        self.analytics = IncrementalAnalytics(source.symbols, window, log_returns)
+        self.emit_interval = emit_interval
+        self.queue_size = queue_size
+        self.latency = LatencyStats()
+        self.max_queue_depth = 0
+        self._queue: Optional[asyncio.Queue] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Current number of ticks waiting in the queue."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def run(
+        self,
+        on_metrics: Optional[MetricsCallback] = None,
+        max_ticks: Optional[int] = None,
+    ) -> dict:
+        """
+        Consume the source until it is exhausted or max_ticks were processed.
+
+        Args:
+            on_metrics: Callback (sync or async) receiving every metrics snapshot.
+            max_ticks: Optional limit on the number of processed ticks.
+
+        Returns:
+            dict: Final metrics snapshot; it is only emitted again if ticks
+                arrived since the last snapshot.
+        """
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        producer = asyncio.create_task(self._produce(self._queue))
+        processed = 0
+        metrics: Optional[dict] = None
+        changed = False
+        next_emit = time.perf_counter() + self.emit_interval
+        try:
+            while max_ticks is None or processed < max_ticks:
+                self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+                tick = await self._queue.get()
+                if tick is None:
+                    break
+                if isinstance(tick, Exception):
+                    raise tick
+                self.analytics.update(tick.symbol, tick.price)
+                self.latency.record(time.perf_counter() - tick.received_at)
+                processed += 1
+                changed = True
+
+                if time.perf_counter() >= next_emit:
+                    metrics = await self._emit(on_metrics)
+                    changed = False
+                    next_emit = time.perf_counter() + self.emit_interval
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+        if changed or metrics is None:
+            metrics = await self._emit(on_metrics)
+        return metrics
+
+    async def _produce(self, queue: asyncio.Queue) -> None:
+        """Move ticks from the source into the queue, waiting when it is full."""
+        try:
+            async for tick in self.source.stream():
+                await queue.put(tick)
+        except Exception as e:
+            # Hand source failures to the consumer so run() raises them.
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    async def _emit(self, on_metrics: Optional[MetricsCallback]) -> dict:
+        """Build a metrics snapshot and pass it to the callback."""
+        metrics = self.analytics.snapshot()
+        metrics["latency"] = self.latency.summary()
+        metrics["queue_depth"] = self.queue_depth
+        metrics["max_queue_depth"] = self.max_queue_depth
+        if on_metrics is not None:
+            result = on_metrics(metrics)
+            if asyncio.iscoroutine(result):
+                await result
+        return metrics
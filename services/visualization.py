@@ -1,17 +1,38 @@
 """
 Module providing visualization services for financial data,
 including single asset visualization, currency price dynamics
-with correlation, and multiple stock visualizations.
+with correlation, multiple stock visualizations, and rolling
+correlation/beta time series.
+
+Long series are decimated to the axes' pixel width with a min/max-preserving
+pyramid before plotting, so render time does not grow with history length.
+
+The show() services build a new figure per call. For periodic refresh the
+dashboard renderers create their figure once and on every update only swap
+line data, heatmap values and, when the data leaves them, axis limits;
+unchanged backgrounds are restored by blitting where the canvas supports it.
 """
 
+import time
+from typing import Mapping, Optional, Sequence
+import numpy as np
 import pandas as pd
 import seaborn as sns
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
-
+from data.alignment import align
+from services.downsampling import axes_pixel_width, downsample
+from services.streaming_service import LatencyStats
 
 sns.set(style="darkgrid")
 
 
+def _plot(ax, series: pd.Series, **kwargs) -> list:
+    """Plot a series on ax, downsampled to the axes' pixel width."""
+    index, values = downsample(series, axes_pixel_width(ax))
+    return ax.plot(index, values, **kwargs)
+
+
 class VisualizationService:
     """Service for single asset data visualization."""
 
@@ -28,25 +49,15 @@ class VisualizationService:
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
         fig.suptitle(f"{title}", fontsize=16)
 
-        ax1.plot(prices.index, prices.values, label="Price", color="blue")
+        _plot(ax1, prices, label="Price", color="blue")
         ax1.set_ylabel("Price")
         ax1.legend()
         ax1.grid(True)
 
-        ax2.plot(
-            analysis["returns"].index,
-            analysis["returns"].values,
-            label="Returns",
-            color="green",
-        )
+        _plot(ax2, analysis["returns"], label="Returns", color="green")
 
         ax2_vol = ax2.twinx()
-        ax2_vol.plot(
-            analysis["volatility"].index,
-            analysis["volatility"].values,
-            label="Volatility",
-            color="red",
-        )
+        _plot(ax2_vol, analysis["volatility"], label="Volatility", color="red")
 
         ax2.set_ylabel("Returns")
         ax2_vol.set_ylabel("Volatility")
@@ -70,19 +81,23 @@ class CurrencyVisualizationService:
         """
         Display price charts and correlation matrix for multiple currencies.
 
+        Prices are plotted on the union of all dates; correlation uses only
+        dates on which every pair traded, so different calendars do not
+        misalign returns.
+
         Args:
             currency_data: Dictionary mapping currency pairs to their price Series.
             title: Title for the plots.
         """
-        df = pd.DataFrame(currency_data)
-        corr = df.pct_change(fill_method=None).corr()
+        df = align(currency_data, "union")
+        corr = align(currency_data, "intersection").pct_change().corr()
 
         fig, axes = plt.subplots(2, 1, figsize=(12, 10))
         fig.suptitle(f"{title}", fontsize=16)
 
         palette = sns.color_palette("tab10", n_colors=len(df.columns))
         for i, col in enumerate(df.columns):
-            axes[0].plot(df.index, df[col], label=col, color=palette[i])
+            _plot(axes[0], df[col], label=col, color=palette[i])
 
         axes[0].set_title("Currency Prices", fontsize=14)
         axes[0].set_xlabel("Date")
@@ -103,15 +118,16 @@ class StockVisualizationService:
     @staticmethod
     def show(
         price_data_dict: dict[str, pd.Series],
-        analysis_dict: dict[str, dict[str, pd.Series]],
+        analysis_dict: Mapping[str, Mapping[str, pd.Series]],
     ) -> None:
         """
         Display prices, returns, and volatility for multiple stocks.
 
         Args:
             price_data_dict: Dictionary mapping tickers to price Series.
-            analysis_dict: Nested dictionary mapping tickers to their analysis,
-                           each containing 'returns' and 'volatility' Series.
+            analysis_dict: Mapping of tickers to their analysis (e.g. an
+                           AnalysisResult), each containing 'returns' and
+                           'volatility' Series.
         """
         tickers = list(price_data_dict.keys())
 
@@ -122,21 +138,17 @@ class StockVisualizationService:
         color_map = dict(zip(tickers, palette))
 
         for ticker in tickers:
-            axes[0].plot(
-                price_data_dict[ticker].index,
-                price_data_dict[ticker].values,
-                label=ticker,
-                color=color_map[ticker],
+            _plot(
+                axes[0], price_data_dict[ticker], label=ticker, color=color_map[ticker]
             )
         axes[0].set_ylabel("Price")
         axes[0].legend(title="Ticker")
         axes[0].grid(True)
 
         for ticker in tickers:
-            ret_series = analysis_dict[ticker]["returns"]
-            axes[1].plot(
-                ret_series.index,
-                ret_series.values,
+            _plot(
+                axes[1],
+                analysis_dict[ticker]["returns"],
                 label=ticker,
                 color=color_map[ticker],
             )
@@ -145,10 +157,9 @@ class StockVisualizationService:
         axes[1].grid(True)
 
         for ticker in tickers:
-            vol_series = analysis_dict[ticker]["volatility"]
-            axes[2].plot(
-                vol_series.index,
-                vol_series.values,
+            _plot(
+                axes[2],
+                analysis_dict[ticker]["volatility"],
                 label=ticker,
                 color=color_map[ticker],
             )
@@ -159,3 +170,340 @@ class StockVisualizationService:
         axes[2].set_xlabel("Date")
         plt.tight_layout(rect=[0, 0, 1, 0.96])
         plt.show()
+
+
+class RollingCorrelationVisualizationService:
+    """Service for visualizing rolling correlations and betas."""
+
+    @staticmethod
+    def show(correlations: pd.DataFrame, betas: pd.DataFrame, title: str) -> None:
+        """
+        Display rolling pairwise correlations and rolling betas.
+
+        Args:
+            correlations: Rolling correlation per pair (see RollingCovariance.pairs).
+            betas: Rolling beta per asset (see rolling_beta).
+            title: Title for the plots.
+        """
+        fig, axes = plt.subplots(2, 1, figsize=(15, 10), sharex=True)
+        fig.suptitle(title, fontsize=16)
+
+        palette = sns.color_palette("tab10", n_colors=len(correlations.columns))
+        for i, col in enumerate(correlations.columns):
+            _plot(axes[0], correlations[col], label=col, color=palette[i])
+        axes[0].set_ylabel("Correlation")
+        axes[0].set_ylim(-1, 1)
+        axes[0].legend(title="Pair")
+        axes[0].grid(True)
+
+        palette = sns.color_palette("tab10", n_colors=len(betas.columns))
+        for i, col in enumerate(betas.columns):
+            _plot(axes[1], betas[col].dropna(), label=col, color=palette[i])
+        axes[1].set_ylabel("Beta")
+        axes[1].legend(title="Asset")
+        axes[1].grid(True)
+
+        axes[1].set_xlabel("Date")
+        plt.tight_layout(rect=[0, 0, 1, 0.96])
+        plt.show()
+
+
+class DashboardRenderer:
+    """
+    Figure with line panels and an optional heatmap that is updated in place.
+
+    Attributes:
+        fig (matplotlib.figure.Figure): The figure, created once.
+        axes (list): Line panel axes followed by the heatmap axes, if any.
+        blit (bool): Whether unchanged backgrounds are restored by blitting.
+        frame_times (LatencyStats): Duration of every update in seconds.
+    """
+
+    # Headroom added to axis limits so that small moves do not force a relayout.
+    MARGIN = 0.1
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        heatmap: bool = False,
+        title: str = "",
+        figsize: tuple[float, float] = (15, 10),
+        blit: Optional[bool] = None,
+    ) -> None:
+        """
+        Create the figure.
+
+        Args:
+            labels: Y-axis label of each line panel, top to bottom.
+            heatmap: Whether to add a heatmap panel below the lines.
+            title: Figure title.
+            figsize: Figure size in inches.
+            blit: Use blitting; by default if the canvas supports it.
+        """
+        self.fig, axes = plt.subplots(
+            len(labels) + heatmap, 1, figsize=figsize, squeeze=False
+        )
+        self.axes = list(axes[:, 0])
+        self.fig.suptitle(title, fontsize=16)
+        for ax, label in zip(self.axes, labels):
+            ax.set_ylabel(label)
+            ax.grid(True)
+        self.blit = (
+            bool(getattr(self.fig.canvas, "supports_blit", False))
+            if blit is None
+            else blit
+        )
+        self.frame_times = LatencyStats()
+        self._lines: list[dict] = [{} for _ in labels]
+        self._date_axes: set = set()
+        self._heatmap_axes = self.axes[-1] if heatmap else None
+        self._mesh = None
+        self._texts: list = []
+        self._matrix_labels: Optional[tuple] = None
+        self._background = None
+
+    def close(self) -> None:
+        """Close the figure."""
+        plt.close(self.fig)
+
+    def update(
+        self,
+        panels: Sequence[Mapping[str, pd.Series]],
+        matrix: Optional[pd.DataFrame] = None,
+    ) -> float:
+        """
+        Draw new data into the existing figure.
+
+        Args:
+            panels: For every line panel, a mapping of line label to Series.
+            matrix: New heatmap values, if the renderer has a heatmap.
+
+        Returns:
+            float: Duration of the update in seconds.
+        """
+        start = time.perf_counter()
+        relayout = self._background is None
+        for ax, lines, series_by_label in zip(self.axes, self._lines, panels):
+            relayout |= self._update_lines(ax, lines, series_by_label)
+        if matrix is not None and self._heatmap_axes is not None:
+            relayout |= self._update_heatmap(matrix)
+
+        canvas = self.fig.canvas
+        if relayout:
+            if self.blit:
+                # Render the static background once without the animated artists.
+                canvas.draw()
+                self._background = canvas.copy_from_bbox(self.fig.bbox)
+                self._draw_animated()
+                canvas.blit(self.fig.bbox)
+            else:
+                canvas.draw()
+                self._background = True
+        elif self.blit:
+            canvas.restore_region(self._background)
+            self._draw_animated()
+            canvas.blit(self.fig.bbox)
+        else:
+            canvas.draw()
+        canvas.flush_events()
+
+        elapsed = time.perf_counter() - start
+        self.frame_times.record(elapsed)
+        return elapsed
+
+    def _animated(self) -> list:
+        """Artists redrawn on every frame."""
+        artists = [line for lines in self._lines for line in lines.values()]
+        if self._mesh is not None:
+            artists.append(self._mesh)
+            artists.extend(self._texts)
+        return artists
+
+    def _draw_animated(self) -> None:
+        """Draw the animated artists on top of the restored background."""
+        for artist in self._animated():
+            artist.axes.draw_artist(artist)
+
+    def _update_lines(
+        self, ax, lines: dict, series_by_label: Mapping[str, pd.Series]
+    ) -> bool:
+        """Swap line data; return whether the panel needs a full redraw."""
+        relayout = False
+        if list(lines) != list(series_by_label):
+            for line in lines.values():
+                line.remove()
+            lines.clear()
+            palette = sns.color_palette("tab10", n_colors=max(len(series_by_label), 1))
+            for color, label in zip(palette, series_by_label):
+                (lines[label],) = ax.plot([], [], label=label, color=color)
+                lines[label].set_animated(self.blit)
+            if lines:
+                ax.legend(loc="upper left")
+            relayout = True
+
+        x_min = y_min = np.inf
+        x_max = y_max = -np.inf
+        pixels = axes_pixel_width(ax)
+        for label, series in series_by_label.items():
+            index, values = downsample(series, pixels)
+            if isinstance(index, pd.DatetimeIndex):
+                if ax not in self._date_axes:
+                    ax.xaxis_date()
+                    self._date_axes.add(ax)
+                    relayout = True
+                x = mdates.date2num(index)
+            else:
+                x = np.asarray(index, dtype=np.float64)
+            y = np.asarray(values, dtype=np.float64)
+            lines[label].set_data(x, y)
+            if len(x):
+                x_min, x_max = min(x_min, x[0]), max(x_max, x[-1])
+                finite = y[np.isfinite(y)]
+                if len(finite):
+                    y_min, y_max = min(y_min, finite.min()), max(y_max, finite.max())
+
+        if np.isfinite(x_min):
+            relayout |= self._fit(ax.get_xlim, ax.set_xlim, x_min, x_max)
+        if np.isfinite(y_min):
+            relayout |= self._fit(ax.get_ylim, ax.set_ylim, y_min, y_max)
+        return relayout
+
+    def _fit(self, get_limits, set_limits, low: float, high: float) -> bool:
+        """Widen limits with headroom if the data leaves them or fills too little."""
+        current_low, current_high = get_limits()
+        span = max(high - low, abs(high) * 1e-9, 1e-12)
+        shrunk = (high - low) < 0.5 * (current_high - current_low)
+        if low >= current_low and high <= current_high and not shrunk:
+            return False
+        set_limits(low - self.MARGIN * span, high + self.MARGIN * span)
+        return True
+
+    def _update_heatmap(self, matrix: pd.DataFrame) -> bool:
+        """Swap heatmap values; return whether the panel was rebuilt."""
+        values = matrix.to_numpy(dtype=np.float64)
+        labels = (tuple(matrix.index), tuple(matrix.columns))
+        if (
+            self._mesh is not None
+            and labels == self._matrix_labels
+            and len(self._texts) == values.size
+            and not np.isnan(values).any()
+        ):
+            self._mesh.set_array(values.ravel())
+            for text, value in zip(self._texts, values.ravel()):
+                text.set_text(f"{value:.2g}")
+            return False
+
+        ax = self._heatmap_axes
+        ax.clear()
+        sns.heatmap(
+            matrix,
+            annot=True,
+            cmap="coolwarm",
+            vmin=-1,
+            vmax=1,
+            ax=ax,
+            cbar=self._mesh is None,
+        )
+        self._mesh = ax.collections[0]
+        self._texts = list(ax.texts)
+        self._matrix_labels = labels
+        for artist in [self._mesh, *self._texts]:
+            artist.set_animated(self.blit)
+        return True
+
+
+class AssetDashboard(DashboardRenderer):
+    """Refreshable price, returns and volatility panels of one asset."""
+
+    def __init__(self, title: str = "", **kwargs) -> None:
+        """
+        Create the figure.
+
+        Args:
+            title: Figure title.
+            **kwargs: Passed to DashboardRenderer.
+        """
+        super().__init__(("Price", "Returns", "Volatility"), title=title, **kwargs)
+
+    def refresh(self, prices: pd.Series, analysis: dict[str, pd.Series]) -> float:
+        """
+        Draw new data.
+
+        Args:
+            prices: Series of asset prices indexed by date.
+            analysis: Dictionary with 'returns' and 'volatility' Series.
+
+        Returns:
+            float: Duration of the update in seconds.
+        """
+        return self.update(
+            [
+                {"Price": prices},
+                {"Returns": analysis["returns"]},
+                {"Volatility": analysis["volatility"]},
+            ]
+        )
+
+
+class CurrencyDashboard(DashboardRenderer):
+    """Refreshable currency prices and correlation heatmap."""
+
+    def __init__(self, title: str = "", **kwargs) -> None:
+        """
+        Create the figure.
+
+        Args:
+            title: Figure title.
+            **kwargs: Passed to DashboardRenderer.
+        """
+        super().__init__(("Price",), heatmap=True, title=title, **kwargs)
+
+    def refresh(self, currency_data: dict[str, pd.Series]) -> float:
+        """
+        Draw new data; see CurrencyVisualizationService.show.
+
+        Args:
+            currency_data: Dictionary mapping currency pairs to their price Series.
+
+        Returns:
+            float: Duration of the update in seconds.
+        """
+        corr = align(currency_data, "intersection").pct_change().corr()
+        return self.update([currency_data], corr)
+
+
+class StockDashboard(DashboardRenderer):
+    """Refreshable prices, returns and volatility of many stocks."""
+
+    def __init__(self, title: str = "Stocks", **kwargs) -> None:
+        """
+        Create the figure.
+
+        Args:
+            title: Figure title.
+            **kwargs: Passed to DashboardRenderer.
+        """
+        super().__init__(("Price", "Returns", "Volatility"), title=title, **kwargs)
+
+    def refresh(
+        self,
+        price_data_dict: dict[str, pd.Series],
+        analysis_dict: Mapping[str, Mapping[str, pd.Series]],
+    ) -> float:
+        """
+        Draw new data; see StockVisualizationService.show.
+
+        Args:
+            price_data_dict: Dictionary mapping tickers to price Series.
+            analysis_dict: Nested dictionary mapping tickers to their analysis.
+
+        Returns:
+            float: Duration of the update in seconds.
+        """
+        return self.update(
+            [
+                price_data_dict,
+                {t: analysis_dict[t]["returns"] for t in price_data_dict},
+                {t: analysis_dict[t]["volatility"] for t in price_data_dict},
+            ]
+        )
@@ -6,13 +6,36 @@ Tests cover:
 - Logarithmic and percentage return calculations
 - Rolling volatility calculations
 - Handling of invalid input through CalculationError exceptions
+- Parity of the numba and NumPy kernel backends with the pandas implementation
+- Portfolio returns, volatility, risk contribution and rebalancing
+- Incremental (streaming) volatility and correlation
+- Columnar analysis results with cross-sectional ranking
+- Monte Carlo simulation of VaR, expected shortfall and path percentiles
+- Screening expressions and top-K ranking over a symbol universe
+- Trading calendars, calendar windows and annualization
 """
 
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
 import pytest
 from pandas import Series, DataFrame
+from analysis import kernels
+from analysis.correlation import RollingCovariance, rolling_beta
+from analysis.incremental import IncrementalAnalytics, RollingCorrelation
+from analysis.portfolio import PortfolioCalculator
+from analysis.results import AnalysisResult
 from analysis.returns import ReturnsCalculator
+from analysis.screener import Expression, Screener
+from analysis.simulation import MonteCarloSimulator
 from analysis.volatility import VolatilityCalculator
+from core.calendar import get_calendar, parse_window
 from core.exceptions import CalculationError
+from core.precision import FLOAT32
+from services.analysis import AnalysisService
 
 
 def test_log_returns(price_data: DataFrame) -> None:
@@ -49,3 +72,679 @@ def test_volatility_calculate_exception() -> None:
     vc = VolatilityCalculator()
     with pytest.raises(CalculationError):
         vc.calculate(12345)  # Invalid input type
+
+
+def test_volatility_calculate_multi_matches_calculate() -> None:
+    """Test that the multi-window sweep matches calculate() including NaN warm-up."""
+    rng = np.random.default_rng(3)
+    returns = pd.Series(rng.normal(0.0005, 0.01, 3000))
+    returns.iloc[[100, 1500, 1501]] = np.nan
+    calc = VolatilityCalculator()
+
+    result = calc.calculate_multi(returns)
+
+    assert list(result.columns) == [5, 10, 21, 63, 126, 252]
+    for window in result.columns:
+        expected = calc.calculate(returns, window)
+        pd.testing.assert_index_equal(
+            result[window].dropna().index, expected.dropna().index
+        )
+        np.testing.assert_allclose(result[window], expected, rtol=1e-9)
+
+
+def test_calculators_float32_precision(price_data: DataFrame) -> None:
+    """Test that calculators store float32 results close to the float64 path."""
+    prices = price_data["Close"]
+    returns = ReturnsCalculator().calculate(prices)
+    returns32 = ReturnsCalculator("float32").calculate(prices.astype(np.float32))
+    volatility = VolatilityCalculator().calculate(returns, window=3)
+    volatility32 = VolatilityCalculator("float32").calculate(returns32, window=3)
+
+    assert returns32.dtype == np.float32 and volatility32.dtype == np.float32
+    assert (returns32 - returns).abs().max() <= FLOAT32.returns_atol()
+    error = (volatility32 - volatility).abs().dropna()
+    assert (error <= FLOAT32.volatility_atol(3, volatility.dropna())).all()
+    with pytest.raises(ValueError, match="precision"):
+        ReturnsCalculator("float16")
+
+
+def test_calendar_sessions_and_windows() -> None:
+    """Test NYSE session counts, holiday handling and window parsing."""
+    nyse = get_calendar("XNYS")
+    assert [nyse.count(f"{y - 1}-12-31", f"{y}-12-31") for y in (2023, 2024)] == [
+        250,
+        252,
+    ]
+    assert np.datetime64("2024-03-29") not in nyse.sessions  # Good Friday
+    assert 251 < nyse.sessions_per_year < 253
+    assert get_calendar("fx").sessions_per_year > nyse.sessions_per_year
+
+    index = pd.DatetimeIndex(["2024-03-27", "2024-03-28", "2024-04-01"])
+    np.testing.assert_array_equal(nyse.elapsed(index), [1, 1])
+    np.testing.assert_array_equal(
+        nyse.window_bounds(index, "2 sessions"), nyse.positions(index) - 2
+    )
+    assert parse_window("4W") == (28, "days")
+    assert parse_window(21) == parse_window("21 sessions")
+    with pytest.raises(ValueError):
+        parse_window("21 hours")
+    with pytest.raises(ValueError):
+        get_calendar("XLON")
+
+
+def test_volatility_calendar_window() -> None:
+    """Test that session windows match row windows on gapless data and skip gaps."""
+    rng = np.random.default_rng(4)
+    index = pd.bdate_range("2024-01-01", periods=40)
+    returns = Series(rng.normal(0, 0.01, 40), index=index)
+    fx = VolatilityCalculator(calendar="FX")
+    pd.testing.assert_series_equal(
+        fx.calculate(returns, "5 sessions"), fx.calculate(returns, 5), check_freq=False
+    )
+
+    # Without two rows the 5-session windows covering the gap hold 3 returns.
+    gapped = returns.drop(returns.index[[6, 7]])
+    volatility = fx.calculate(gapped, "5 sessions")
+    expected = gapped.iloc[4:7].std() * np.sqrt(5)
+    assert volatility.iloc[6] == pytest.approx(expected)
+    assert volatility.iloc[:4].isna().all()
+
+    annual = fx.calculate(returns, 5, annualize=True)
+    ratio = np.sqrt(fx.calendar.sessions_per_year / 5)
+    np.testing.assert_allclose(annual, fx.calculate(returns, 5) * ratio)
+
+
+def test_returns_per_session_and_annualized() -> None:
+    """Test that gap returns are split per session and annualized by the calendar."""
+    index = pd.DatetimeIndex(["2024-03-27", "2024-03-28", "2024-04-02"])
+    prices = Series([100.0, 101.0, 103.0], index=index)
+    calculator = ReturnsCalculator(calendar="XNYS")
+
+    per_session = calculator.calculate(prices, per_session=True)
+    np.testing.assert_allclose(per_session, [np.log(1.01), np.log(103 / 101) / 2])
+    simple = calculator.calculate(prices, log_returns=False, per_session=True)
+    np.testing.assert_allclose(simple, np.expm1(per_session))
+
+    sessions_per_year = calculator.calendar.sessions_per_year
+    assert calculator.annualized(prices) == pytest.approx(
+        np.log(1.03) * sessions_per_year / 3
+    )
+    with pytest.raises(CalculationError):
+        calculator.annualized(prices.iloc[:1])
+
+
+def test_volatility_calendar_window_wraps_errors() -> None:
+    """Test that any failure of a calendar window raises CalculationError."""
+    calculator = VolatilityCalculator()
+    returns = pd.Series([0.1, 0.2], index=pd.date_range("2024-01-01", periods=2))
+    with patch.object(calculator.calendar, "positions", side_effect=KeyError("x")):
+        with pytest.raises(CalculationError, match="Volatility calculation error"):
+            calculator.calculate(returns, window="30D")
+
+
+def test_volatility_calculate_multi_invalid_window() -> None:
+    """Test that non-positive windows raise CalculationError."""
+    with pytest.raises(CalculationError):
+        VolatilityCalculator().calculate_multi(pd.Series([0.1, 0.2]), windows=[0])
+
+
+# -----------------------------
+# Kernel Tests
+# -----------------------------
+
+
+@pytest.fixture
+def random_prices() -> np.ndarray:
+    """Fixture returning a reproducible random-walk price array."""
+    rng = np.random.default_rng(42)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 5000)))
+
+
+@pytest.mark.parametrize("backend", kernels.BACKENDS)
+@pytest.mark.parametrize("log_returns", [True, False])
+def test_kernel_fused_statistics_parity(
+    random_prices: np.ndarray, backend: str, log_returns: bool
+) -> None:
+    """Test that fused kernel outputs match the pandas reference for both backends."""
+    prices = pd.Series(random_prices)
+    if log_returns:
+        expected = np.log(prices / prices.shift(1)).dropna()
+    else:
+        expected = prices.pct_change().dropna()
+
+    result = kernels.fused_statistics(
+        random_prices, 21, log_returns=log_returns, scale=np.sqrt(21), backend=backend
+    )
+
+    np.testing.assert_allclose(
+        result["returns"], expected.values, rtol=1e-12, atol=1e-14
+    )
+    np.testing.assert_allclose(
+        result["mean"], expected.rolling(21).mean().values, rtol=1e-9, atol=1e-10
+    )
+    np.testing.assert_allclose(
+        result["std"],
+        (expected.rolling(21).std() * np.sqrt(21)).values,
+        rtol=1e-9,
+        atol=1e-10,
+    )
+    np.testing.assert_allclose(
+        result["drawdown"], (prices / prices.cummax() - 1).values, atol=1e-12
+    )
+
+
+@pytest.mark.parametrize("backend", kernels.BACKENDS)
+@pytest.mark.parametrize("window", [1, 2, 63, kernels.BLOCK_SIZE + 7])
+def test_kernel_rolling_parity(
+    random_prices: np.ndarray, backend: str, window: int
+) -> None:
+    """Test rolling mean/std parity including windows spanning several blocks."""
+    values = np.diff(np.log(random_prices))
+    series = pd.Series(values)
+
+    std = kernels.rolling_std(values, window, backend=backend)
+    mean = kernels.rolling_mean(values, window, backend=backend)
+
+    np.testing.assert_allclose(
+        std, series.rolling(window).std().values, rtol=1e-8, atol=1e-10
+    )
+    np.testing.assert_allclose(
+        mean, series.rolling(window).mean().values, rtol=1e-8, atol=1e-10
+    )
+
+
+@pytest.mark.parametrize("backend", kernels.BACKENDS)
+def test_kernel_writes_into_preallocated_output(
+    random_prices: np.ndarray, backend: str
+) -> None:
+    """Test that kernels write into caller-provided buffers instead of allocating."""
+    n = len(random_prices) - 1
+    out = {"returns": np.empty(n), "std": np.empty(n)}
+
+    result = kernels.fused_statistics(
+        random_prices, 10, out=out, metrics=["std"], backend=backend
+    )
+
+    assert result["returns"] is out["returns"]
+    assert result["std"] is out["std"]
+    assert set(result) == {"returns", "std"}
+
+
+@pytest.mark.parametrize("backend", kernels.BACKENDS)
+@pytest.mark.parametrize("window", [2, 21, kernels.BLOCK_SIZE + 7])
+def test_kernel_float32_within_error_bounds(
+    random_prices: np.ndarray, backend: str, window: int
+) -> None:
+    """Test that float32 storage stays within the documented error bounds."""
+    expected = kernels.fused_statistics(
+        random_prices, window, scale=np.sqrt(window), backend=backend
+    )
+    result = kernels.fused_statistics(
+        random_prices.astype(np.float32),
+        window,
+        scale=np.sqrt(window),
+        backend=backend,
+    )
+
+    assert all(values.dtype == np.float32 for values in result.values())
+    returns_error = np.abs(result["returns"] - expected["returns"])
+    assert returns_error.max() <= FLOAT32.returns_atol()
+    std_error = np.abs(result["std"] - expected["std"])[window - 1 :]
+    bound = FLOAT32.volatility_atol(window, expected["std"][window - 1 :])
+    assert np.all(std_error <= bound)
+
+
+def test_kernel_invalid_arguments(random_prices: np.ndarray) -> None:
+    """Test that kernels reject bad windows, backends and output buffers."""
+    with pytest.raises(ValueError, match="Window"):
+        kernels.rolling_std(random_prices, 0)
+    with pytest.raises(ValueError, match="backend"):
+        kernels.rolling_std(random_prices, 5, backend="cuda")
+    with pytest.raises(ValueError, match="Output buffer"):
+        kernels.drawdown(random_prices, out=np.empty(3))
+    with pytest.raises(ValueError, match="Unknown metrics"):
+        kernels.fused_statistics(random_prices, 5, metrics=["skew"])
+
+
+# -----------------------------
+# PortfolioCalculator Tests
+# -----------------------------
+
+
+@pytest.fixture
+def universe_prices() -> DataFrame:
+    """Fixture returning prices of three assets over 120 business days."""
+    rng = np.random.default_rng(11)
+    index = pd.bdate_range("2024-01-01", periods=120)
+    returns = rng.normal(0.0005, 0.01, size=(120, 3))
+    prices = 100 * np.exp(np.cumsum(returns, axis=0))
+    return pd.DataFrame(prices, index=index, columns=["AAPL", "MSFT", "NVDA"])
+
+
+def test_portfolio_volatility_matches_return_std(universe_prices: DataFrame) -> None:
+    """Test that covariance-based volatility equals the std of portfolio returns."""
+    calc = PortfolioCalculator(universe_prices)
+    weights = np.array([[0.5, 0.3, 0.2], [1.0, 0.0, 0.0], [0.2, 0.2, 0.6]])
+
+    volatility = calc.volatility(weights)
+    returns = calc.portfolio_returns(weights)
+
+    np.testing.assert_allclose(volatility.values, returns.std().values, rtol=1e-10)
+
+
+def test_portfolio_risk_contribution_sums_to_volatility(
+    universe_prices: DataFrame,
+) -> None:
+    """Test that per-asset risk contributions add up to portfolio volatility."""
+    calc = PortfolioCalculator(universe_prices)
+    weights = {"balanced": {"AAPL": 0.4, "MSFT": 0.3, "NVDA": 0.3}, "solo": {"MSFT": 1}}
+
+    contribution = calc.risk_contribution(weights)
+
+    np.testing.assert_allclose(
+        contribution.sum(axis=1).values, calc.volatility(weights).values
+    )
+    assert contribution.loc["solo", "AAPL"] == 0
+
+
+def test_portfolio_rebalancing(universe_prices: DataFrame) -> None:
+    """Test rebalancing schedules against constant-mix and buy-and-hold values."""
+    calc = PortfolioCalculator(universe_prices)
+    weights = np.array([0.5, 0.25, 0.25])
+
+    every_period = calc.portfolio_returns(weights, rebalance=1)
+    never = calc.portfolio_returns(weights, rebalance=10_000)
+    monthly = calc.portfolio_returns(weights, rebalance="M")
+
+    pd.testing.assert_frame_equal(every_period, calc.portfolio_returns(weights))
+    relative = universe_prices.iloc[-1] / universe_prices.iloc[0]
+    assert np.isclose((1 + never["0"]).prod(), relative @ weights)
+    assert monthly.shape == never.shape
+
+
+def test_portfolio_rebalancing_unnormalized_weights(universe_prices: DataFrame) -> None:
+    """Test rebalancing with leveraged and dollar-neutral weights."""
+    calc = PortfolioCalculator(universe_prices)
+    weights = np.array([[1.5, 0.5, 0.0], [1.0, -1.0, 0.0]])
+
+    every_period = calc.portfolio_returns(weights, rebalance=1)
+    never = calc.portfolio_returns(weights, rebalance=10_000)
+
+    pd.testing.assert_frame_equal(every_period, calc.portfolio_returns(weights))
+    assert np.isfinite(never.to_numpy()).all()
+    # Buy-and-hold capital is 1 plus the profit of the initial positions.
+    relative = universe_prices.iloc[-1] / universe_prices.iloc[0] - 1.0
+    assert np.allclose((1 + never).prod().to_numpy(), 1.0 + weights @ relative)
+
+
+def test_portfolio_invalid_input(universe_prices: DataFrame) -> None:
+    """Test that mismatched weights and bad schedules raise CalculationError."""
+    calc = PortfolioCalculator(universe_prices)
+    with pytest.raises(CalculationError):
+        calc.volatility(np.ones(2))
+    with pytest.raises(CalculationError, match="Unknown symbols"):
+        calc.volatility({"p": {"TSLA": 1.0}})
+    with pytest.raises(CalculationError, match="rebalance"):
+        calc.portfolio_returns(np.ones(3), rebalance=0)
+    with pytest.raises(CalculationError):
+        PortfolioCalculator(universe_prices.iloc[:1])
+
+
+# -----------------------------
+# Incremental Analytics Tests
+# -----------------------------
+
+
+def test_incremental_volatility_matches_batch(random_prices: np.ndarray) -> None:
+    """Test that streamed updates reproduce the batch returns and volatility."""
+    prices = pd.Series(random_prices[:300])
+    returns = ReturnsCalculator().calculate(prices)
+    volatility = VolatilityCalculator().calculate(returns)
+
+    analytics = IncrementalAnalytics(["X"])
+    streamed = []
+    for price in prices:
+        analytics.update("X", price)
+        streamed.append(analytics.states["X"].volatility)
+
+    np.testing.assert_allclose(streamed[1:], volatility.values, rtol=1e-9)
+    assert analytics.states["X"].last_return == pytest.approx(returns.iloc[-1])
+
+
+def test_rolling_correlation_matches_pandas() -> None:
+    """Test that the rolling correlation equals pandas on the last window."""
+    rng = np.random.default_rng(1)
+    rows = rng.normal(size=(50, 3))
+    corr = RollingCorrelation(["A", "B", "C"], window=20)
+    for row in rows:
+        corr.update(row)
+
+    expected = pd.DataFrame(rows[-20:], columns=["A", "B", "C"]).corr()
+    pd.testing.assert_frame_equal(corr.correlation(), expected)
+
+
+def test_incremental_unknown_symbol() -> None:
+    """Test that ticks for unknown symbols raise CalculationError."""
+    with pytest.raises(CalculationError, match="Unknown symbol"):
+        IncrementalAnalytics(["A"]).update("B", 1.0)
+
+
+# -----------------------------
+# Rolling Correlation Tests
+# -----------------------------
+
+
+def test_rolling_covariance_matches_pandas(universe_prices: DataFrame) -> None:
+    """Test that chunked prefix-sum covariance matches pandas rolling covariance."""
+    calc = RollingCovariance.from_prices(universe_prices, window=10, max_chunk_bytes=1)
+    returns = universe_prices.pct_change().dropna()
+    expected = returns.rolling(10).cov().dropna()
+
+    assert calc.chunk_rows == 1 and calc.block_size == 1
+    result = calc.to_frame("covariance")
+
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+
+def test_rolling_covariance_carries_cross_products(
+    universe_prices: DataFrame,
+) -> None:
+    """Test that every row's outer product is computed once across chunks."""
+    calc = RollingCovariance.from_prices(
+        universe_prices, window=10, max_chunk_bytes=8 * 9 * 24
+    )
+    returns = universe_prices.pct_change().dropna()
+    expected = returns.rolling(10).cov().dropna()
+    calls = []
+    multiply = np.multiply
+
+    def counting(a, b, **kwargs):
+        calls.append(len(a))
+        return multiply(a, b, **kwargs)
+
+    assert calc.chunk_rows == 2 and calc.block_size == 3
+    with patch.object(np, "multiply", counting):
+        result = calc.to_frame("covariance")
+
+    assert sum(calls) == len(returns)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+
+def test_rolling_covariance_asset_blocks_within_budget() -> None:
+    """Test that a window too large for the budget is split into asset blocks."""
+    rng = np.random.default_rng(3)
+    returns = pd.DataFrame(rng.normal(0, 0.01, size=(60, 120)))
+    budget = 1024 * 1024
+    calc = RollingCovariance(returns, window=20, max_chunk_bytes=budget)
+    full = RollingCovariance(returns, window=20, max_chunk_bytes=10**9)
+
+    assert calc.block_size < 120 and full.block_size == 120
+    tracemalloc.start()
+    blocked = [cov.copy() for _, cov in calc.chunks()]
+    tracemalloc.stop()
+    tracemalloc.start()
+    for _ in calc.chunks():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak <= budget * 1.05
+    np.testing.assert_allclose(
+        np.concatenate(blocked), np.concatenate([c for _, c in full.chunks()])
+    )
+
+
+def test_rolling_correlation_pairs(universe_prices: DataFrame) -> None:
+    """Test that pair correlation series match pandas rolling correlation."""
+    calc = RollingCovariance.from_prices(universe_prices, window=20)
+    returns = universe_prices.pct_change().dropna()
+
+    pairs = calc.pairs([("AAPL", "MSFT"), ("MSFT", "NVDA")])
+
+    expected = returns["AAPL"].rolling(20).corr(returns["MSFT"]).dropna()
+    assert list(pairs.columns) == ["AAPL/MSFT", "MSFT/NVDA"]
+    np.testing.assert_allclose(pairs["AAPL/MSFT"], expected, rtol=1e-9)
+    with pytest.raises(CalculationError):
+        calc.pairs([("AAPL", "XXX")])
+
+
+def test_rolling_beta_matches_cov_over_var(universe_prices: DataFrame) -> None:
+    """Test that rolling beta equals rolling cov / rolling var of the benchmark."""
+    returns = universe_prices.pct_change().dropna()
+
+    beta = rolling_beta(returns, "AAPL", window=15)
+
+    expected = (
+        returns["NVDA"].rolling(15).cov(returns["AAPL"])
+        / returns["AAPL"].rolling(15).var()
+    )
+    np.testing.assert_allclose(beta["NVDA"], expected, rtol=1e-9)
+    np.testing.assert_allclose(beta["AAPL"].dropna(), 1.0)
+
+
+# -----------------------------
+# AnalysisResult Tests
+# -----------------------------
+
+
+@pytest.fixture
+def columnar_result() -> AnalysisResult:
+    """Fixture returning a result of four symbols, one ending a row early."""
+    index = pd.date_range("2024-01-01", periods=3)
+    volatility = {
+        "A": Series([0.1, 0.2, 0.3], index=index),
+        "B": Series([0.5, 0.1, np.nan], index=index),
+        "C": Series([0.4, 0.9], index=index[:2]),
+        "D": Series([0.2, 0.3, 0.25], index=index),
+    }
+    return AnalysisResult.from_series(
+        {s: {"volatility": v, "returns": v * 0} for s, v in volatility.items()}
+    )
+
+
+def test_analysis_result_is_a_nested_mapping(columnar_result) -> None:
+    """Test backward-compatible access by symbol and metric."""
+    assert set(columnar_result.keys()) == {"A", "B", "C", "D"}
+    assert list(columnar_result["C"]) == ["volatility", "returns"]
+    assert len(columnar_result["C"]["volatility"]) == 2
+    assert dict(columnar_result["A"])["volatility"].iloc[-1] == 0.3
+    assert "E" not in columnar_result
+
+
+def test_analysis_result_top_and_rank(columnar_result) -> None:
+    """Test cross-sectional selection on each symbol's latest row."""
+    top = columnar_result.top("volatility", 2)
+    bottom = columnar_result.top("volatility", 1, largest=False)
+
+    assert list(top.index) == ["C", "A"]
+    np.testing.assert_allclose(top.to_numpy(), [0.9, 0.3])
+    assert list(bottom.index) == ["D"]
+    assert list(columnar_result.top("volatility", 10, row=0).index) == [
+        "B",
+        "C",
+        "D",
+        "A",
+    ]
+    assert columnar_result.rank("volatility").to_dict() == {
+        "A": 2,
+        "B": 4,
+        "C": 1,
+        "D": 3,
+    }
+
+
+# -----------------------------
+# MonteCarloSimulator Tests
+# -----------------------------
+
+
+def test_simulation_gbm_matches_normal_var_and_es(universe_prices: DataFrame) -> None:
+    """Test that GBM VaR and ES approach the closed-form lognormal values."""
+    sim = MonteCarloSimulator.from_prices(universe_prices)
+    result = sim.simulate(200_000, horizon=10, seed=7, levels=[0.95])
+
+    normal = NormalDist()
+    mean, std = sim.mean * 10, sim.sigma * np.sqrt(10)
+    z = normal.inv_cdf(0.05)
+    var = -np.expm1(mean + z * std)
+    tail = np.array([normal.cdf(z - s) for s in std])
+    es = 1 - np.exp(mean + std**2 / 2) * tail / 0.05
+    np.testing.assert_allclose(result.var[0], var, rtol=0.02)
+    np.testing.assert_allclose(result.es[0], es, rtol=0.02)
+    assert list(result.risk_frame().columns) == ["VaR 95.0%", "ES 95.0%"]
+
+
+def test_simulation_percentiles_match_materialized_paths(
+    universe_prices: DataFrame,
+) -> None:
+    """Test that histogram percentiles match percentiles of the same paths."""
+    sim = MonteCarloSimulator.from_prices(
+        universe_prices, method="bootstrap", chunk_bytes=100_000
+    )
+    result = sim.simulate(20_000, horizon=5, seed=3, steps=[2])
+
+    sizes = sim.chunk_sizes(20_000, 5)
+    seeds = np.random.SeedSequence(3).spawn(len(sizes))
+    paths = np.concatenate(
+        [
+            np.cumsum(sim._step_returns(np.random.default_rng(s), n, 5), axis=1)
+            for s, n in zip(seeds, sizes)
+        ]
+    )
+    assert len(sizes) > 1
+    assert list(result.steps) == [2, 5]
+    expected = np.expm1(np.percentile(paths[:, [1, 4]], [5, 50, 95], axis=0))
+    np.testing.assert_allclose(result.percentiles, expected, atol=1e-4)
+
+
+def test_simulation_is_reproducible_across_executors(
+    universe_prices: DataFrame,
+) -> None:
+    """Test that per-chunk seed streams make results independent of the executor."""
+    sim = MonteCarloSimulator.from_prices(
+        universe_prices, method="filtered", chunk_bytes=50_000
+    )
+    serial = sim.simulate(5_000, horizon=4, seed=11)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        parallel = sim.simulate(5_000, horizon=4, seed=11, executor=executor)
+
+    for name in ("var", "es", "percentiles"):
+        np.testing.assert_array_equal(getattr(serial, name), getattr(parallel, name))
+    assert not np.array_equal(serial.var, sim.simulate(5_000, horizon=4, seed=12).var)
+
+
+def test_simulation_from_analysis_uses_latest_volatility(
+    universe_prices: DataFrame,
+) -> None:
+    """Test that analysis results drive the simulator's current volatility."""
+    results = AnalysisService.analyze_multiple(
+        {c: universe_prices[c] for c in universe_prices}
+    )
+    sim = MonteCarloSimulator.from_analysis(results)
+
+    expected = [results[s]["volatility"].iloc[-1] / np.sqrt(21) for s in sim.symbols]
+    np.testing.assert_allclose(sim.sigma, expected)
+    assert sim.returns.shape == (119, 3)
+
+
+def test_simulation_invalid_arguments(universe_prices: DataFrame) -> None:
+    """Test that invalid methods and parameters raise CalculationError."""
+    with pytest.raises(CalculationError):
+        MonteCarloSimulator.from_prices(universe_prices, method="garch")
+    sim = MonteCarloSimulator.from_prices(universe_prices)
+    with pytest.raises(CalculationError):
+        sim.simulate(100, horizon=5, levels=[1.5])
+    with pytest.raises(CalculationError):
+        sim.simulate(100, horizon=5, steps=[6])
+
+
+# -----------------------------
+# Screener Tests
+# -----------------------------
+
+
+def test_screener_metrics_match_pandas(universe_prices: DataFrame) -> None:
+    """Test the vectorized metrics against per-symbol pandas computations."""
+    screener = Screener(universe_prices, window=21, benchmark="AAPL")
+    metrics = screener.metrics()
+
+    # Without missing quotes the matrix is used as is, without reordering.
+    assert screener._own is screener.prices
+
+    log_returns = np.log(universe_prices).diff().iloc[-21:]
+    peaks = universe_prices.cummax()
+    np.testing.assert_allclose(
+        metrics["returns"], universe_prices.iloc[-1] / universe_prices.iloc[-22] - 1
+    )
+    np.testing.assert_allclose(metrics["volatility"], log_returns.std() * np.sqrt(21))
+    np.testing.assert_allclose(
+        metrics["drawdown"], universe_prices.iloc[-1] / peaks.max() - 1
+    )
+    np.testing.assert_allclose(
+        metrics["max_drawdown"], (universe_prices / peaks - 1).min()
+    )
+    np.testing.assert_allclose(
+        metrics["correlation"], log_returns.corrwith(log_returns["AAPL"])
+    )
+
+
+def test_screener_filters_and_ranks_top_k() -> None:
+    """Test filtering, top-K order and exclusion of symbols without history."""
+    index = pd.bdate_range("2024-01-01", periods=30)
+    rng = np.random.default_rng(5)
+    prices = {
+        f"S{i}": Series(
+            100 * np.exp(np.cumsum(rng.normal(0, 0.01 * (i + 1), 30))), index=index
+        )
+        for i in range(6)
+    }
+    prices["SHORT"] = Series([100.0, 101.0], index=index[-2:])
+    screener = Screener(prices)
+    volatility = screener.metric("volatility")
+
+    table = screener.screen("volatility > 0.1", top=2)
+    expected = [f"S{i}" for i in np.argsort(-volatility[:6])[:2]]
+    assert list(table.index) == expected
+    assert list(table.columns) == ["volatility", "score"]
+    assert (table["volatility"] > 0.1).all()
+
+    ranked = screener.screen(sort="-abs(returns)", ascending=True)
+    assert "SHORT" not in ranked.index
+    assert ranked["score"].is_monotonic_increasing
+    assert screener.screen("not (price > 0)").empty
+
+
+def test_screener_uses_own_rows_across_calendars() -> None:
+    """Test that symbols on different calendars are not forward-filled."""
+    rng = np.random.default_rng(8)
+    weekdays = pd.bdate_range("2024-01-01", periods=60)
+    every_day = pd.date_range("2024-01-01", periods=90)
+    prices = {
+        "STOCK": Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 60))), weekdays),
+        "FX": Series(90 * np.exp(np.cumsum(rng.normal(0, 0.01, 90))), every_day),
+    }
+    screener = Screener(prices, window=21, benchmark="FX")
+    analysis = AnalysisService.analyze_multiple(prices, window=21)
+
+    np.testing.assert_allclose(
+        screener.metric("volatility"), analysis.cross_section("volatility")
+    )
+    stock = np.log(prices["STOCK"]).diff().iloc[-21:]
+    fx = np.log(prices["FX"].reindex(weekdays)).diff().iloc[-21:]
+    assert screener.metric("correlation")[0] == pytest.approx(stock.corr(fx))
+    assert screener.metric("price")[0] == prices["STOCK"].iloc[-1]
+
+
+def test_screener_invalid_expressions(universe_prices: DataFrame) -> None:
+    """Test that unknown names, disallowed syntax and a missing benchmark are rejected."""
+    assert Expression("abs(returns) / volatility >= 1").names == {
+        "returns",
+        "volatility",
+    }
+    for text in ("alpha > 1", "__import__('os')", "returns.real", "volatility >"):
+        with pytest.raises(CalculationError):
+            Expression(text)
+    with pytest.raises(CalculationError):
+        Screener(universe_prices).screen(sort="correlation")
+    with pytest.raises(CalculationError):
+        Screener(universe_prices, benchmark="IBM")
@@ -6,25 +6,55 @@ This module contains test cases for the following data loader classes:
 - ExcelDataLoader
 - YahooFinanceLoader
 - BaseDataLoader (abstract validation logic)
+- CSVDateIndex (sparse date -> byte offset sidecar index)
+- ReplaySource and YahooPollingSource (streaming quote sources)
+- Aligner (union/intersection/as-of alignment of different calendars)
+- SharedCache (multi-process download cache)
+- Async loader adapters (executor offloading and concurrency limits)
+- OHLCV schema validation and coercion
+- SymbolRegistry (compact universe files, lookup and prefix search)
+- CurrencyGraph (minimal downloads and derived cross rates)
 
 Tests cover:
 - Successful and unsuccessful data loading from CSV, Excel, and Yahoo Finance API
 - File not found and invalid file content
 - Proper handling of invalid DataFrame structure or content
 - Internal validation errors raised by the base loader
+- Date-range and period slicing with byte-range pushdown for CSV files
+- Append-aware tailing of growing CSV files
 """
 
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+import numpy as np
 import pytest
 import pandas as pd
 from unittest.mock import patch
 from typing import Any
 from pathlib import Path
 
+from data.alignment import Aligner
+from data.async_loader import AsyncCSVDataLoader, AsyncYahooFinanceLoader
+from data.cache import SharedCache
+from data.csv_index import CSVDateIndex
+from data.csv_tail import CSVTailer
+from data.cross_rates import CurrencyGraph
 from data.csv_loader import CSVDataLoader
 from data.excel_loader import ExcelDataLoader
 from data.api.yahoo_loader import YahooFinanceLoader
 from data.base_loader import BaseDataLoader
-from core.exceptions import DataLoadError
+from data.schema import OHLCV_SCHEMA
+from data.stream_sources import (
+    CSVTailSource,
+    CrossRateSource,
+    ReplaySource,
+    YahooPollingSource,
+)
+from data.symbols import SymbolInfo, SymbolRegistry
+from core.exceptions import DataLoadError, SchemaError
 
 
 @pytest.fixture
@@ -66,11 +96,87 @@ def test_validate_data_empty_dataframe() -> None:
         loader._validate_data(pd.DataFrame())
 
 
+def test_schema_reports_problems_with_row_numbers() -> None:
+    """Test that all problems are reported together with 1-based row numbers."""
+    data = pd.DataFrame(
+        {"Close": ["100", "oops", "-1", "102"], "Volume": [1, 2, -3, 4]},
+        index=pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-04"]),
+    )
+
+    with pytest.raises(SchemaError) as error:
+        OHLCV_SCHEMA.validate(data)
+
+    problems = {(p.column, p.message): p.rows for p in error.value.problems}
+    assert problems[("index", "duplicate date")] == (3,)
+    assert problems[("Close", "non-numeric value")] == (2,)
+    assert problems[("Close", "value must be > 0")] == (3,)
+    assert problems[("Volume", "value must be >= 0")] == (3,)
+    assert isinstance(error.value, DataLoadError)
+
+
+def test_schema_coerces_and_sorts() -> None:
+    """Test that numeric strings are coerced and an unsorted index is sorted."""
+    data = pd.DataFrame({"Close": ["101.5", "100"]}, index=["2024-01-02", "2024-01-01"])
+
+    result = OHLCV_SCHEMA.validate(data)
+
+    assert result["Close"].dtype == "float64"
+    assert list(result["Close"]) == [100.0, 101.5]
+    assert result.index.is_monotonic_increasing
+    assert data["Close"].iloc[0] == "101.5"
+
+
+def test_schema_skips_trusted_frames() -> None:
+    """Test that a validated frame is not checked again, but derived frames are."""
+    data = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.date_range("2024", periods=2))
+    validated = OHLCV_SCHEMA.validate(data)
+
+    assert OHLCV_SCHEMA.validate(validated) is validated
+    for derived in (validated * -1.0, validated.copy(), validated.iloc[:1]):
+        assert not OHLCV_SCHEMA.is_trusted(derived)
+    with pytest.raises(SchemaError, match="Close: value must be > 0"):
+        OHLCV_SCHEMA.validate(validated * -1.0)
+
+
+def test_schema_validates_multiindex_columns() -> None:
+    """Test that every ticker under a first-level column is checked."""
+    columns = pd.MultiIndex.from_product([["Close"], ["AAPL", "MSFT"]])
+    data = pd.DataFrame(
+        [[1.0, 2.0], [1.5, 0.0]],
+        index=pd.date_range("2024", periods=2),
+        columns=columns,
+    )
+
+    with pytest.raises(SchemaError, match="Close: value must be > 0 in rows 2"):
+        OHLCV_SCHEMA.validate(data)
+
+
+def test_csv_loader_raises_schema_error(tmp_path: Path) -> None:
+    """Test that loaders surface schema problems as SchemaError."""
+    file = tmp_path / "bad.csv"
+    file.write_text("Date,Close\n2024-01-01,100\n2024-01-02,abc\n")
+
+    with pytest.raises(SchemaError, match="rows 2"):
+        CSVDataLoader().load(str(file))
+
+
 # -----------------------------
 # CSVDataLoader Tests
 # -----------------------------
 
 
+def test_csv_loader_float32_precision(tmp_path: Path) -> None:
+    """Test that a float32 loader stores price columns as float32."""
+    file = tmp_path / "prices.csv"
+    file.write_text("Date,Close,Volume\n2024-01-01,100.5,10\n2024-01-02,101.25,12\n")
+
+    data = CSVDataLoader(precision="float32").load(str(file))
+
+    assert data["Close"].dtype == np.float32
+    assert data["Close"].tolist() == [100.5, 101.25]
+    assert OHLCV_SCHEMA.is_trusted(data)
+
+
 def test_csv_loader_file_not_found() -> None:
     """Test that CSVDataLoader raises DataLoadError when file does not exist."""
     loader = CSVDataLoader()
@@ -114,6 +220,159 @@ def test_csv_loader_valid(tmp_path: Path) -> None:
     assert df.index.name == "Date"
 
 
+@pytest.fixture
+def daily_csv(tmp_path: Path) -> Path:
+    """Fixture writing a sorted daily CSV file spanning 100 days."""
+    dates = pd.date_range("2024-01-01", periods=100, freq="D")
+    df = pd.DataFrame({"Date": dates, "Close": range(100)})
+    file = tmp_path / "daily.csv"
+    df.to_csv(file, index=False)
+    return file
+
+
+def test_csv_index_byte_range_covers_requested_rows(daily_csv: Path) -> None:
+    """Test that the sparse index yields a byte range containing the date range."""
+    index = CSVDateIndex.build(str(daily_csv), stride=10)
+    start, end = pd.Timestamp("2024-02-01"), pd.Timestamp("2024-02-10")
+
+    begin, stop = index.byte_range(start, end)
+    content = index.read_range(begin, stop)
+
+    assert index.is_sorted
+    assert stop - begin < daily_csv.stat().st_size / 2
+    assert b"2024-02-01" in content and b"2024-02-10" in content
+
+
+def test_csv_loader_range_with_utc_offsets(
+    tmp_path: Path, csv_loader: CSVDataLoader
+) -> None:
+    """Test that naive bounds select rows in the file's own UTC offset."""
+    dates = pd.date_range("2024-01-01", periods=96, freq="h", tz="UTC+03:00")
+    file = tmp_path / "offsets.csv"
+    pd.DataFrame({"Date": dates, "Close": range(96)}).to_csv(file, index=False)
+    # A dense index makes the byte range exact, so no slack hides an error.
+    CSVDateIndex.build(str(file), stride=1).save()
+
+    df = csv_loader.load(str(file), start="2024-01-02", end="2024-01-02")
+
+    assert len(df) == 24
+    assert df.index[0] == pd.Timestamp("2024-01-02", tz="UTC+03:00")
+    assert df.index[-1] == pd.Timestamp("2024-01-02 23:00", tz="UTC+03:00")
+
+
+def test_csv_index_sidecar_is_rebuilt_when_stale(daily_csv: Path) -> None:
+    """Test that the sidecar is persisted and rebuilt after the file changes."""
+    first = CSVDateIndex.load_or_build(str(daily_csv))
+    assert Path(CSVDateIndex.sidecar_path(str(daily_csv))).exists()
+
+    with open(daily_csv, "a") as f:
+        f.write("2024-04-10,100\n")
+    second = CSVDateIndex.load_or_build(str(daily_csv))
+
+    assert first.last_date == "2024-04-09"
+    assert second.last_date == "2024-04-10"
+
+
+def test_csv_loader_date_range(daily_csv: Path, csv_loader: CSVDataLoader) -> None:
+    """Test that start/end bounds are inclusive and applied exactly."""
+    df = csv_loader.load(str(daily_csv), start="2024-02-01", end="2024-02-10")
+    assert df.index[0] == pd.Timestamp("2024-02-01")
+    assert df.index[-1] == pd.Timestamp("2024-02-10")
+    assert len(df) == 10
+
+
+def test_csv_loader_period_relative_to_latest_row(
+    daily_csv: Path, csv_loader: CSVDataLoader
+) -> None:
+    """Test that a period is counted back from the latest row of the file."""
+    df = csv_loader.load(str(daily_csv), period="5d")
+    assert list(df["Close"]) == [95, 96, 97, 98, 99]
+
+
+def test_csv_loader_unsorted_file_falls_back(
+    tmp_path: Path, csv_loader: CSVDataLoader
+) -> None:
+    """Test that unsorted files are filtered after a full read."""
+    file = tmp_path / "unsorted.csv"
+    file.write_text("Date,Close\n2024-01-03,3\n2024-01-01,1\n2024-01-02,2\n")
+
+    df = csv_loader.load(str(file), start="2024-01-02")
+
+    assert sorted(df["Close"]) == [2, 3]
+
+
+def test_csv_tailer_reads_only_appended_rows(tmp_path: Path) -> None:
+    """Test that reads return new complete rows and keep partial lines for later."""
+    file = tmp_path / "quotes.csv"
+    file.write_text("Date,Close\n2024-01-01,1\n2024-01-02,2\n2024-01-0")
+    tailer = CSVTailer()
+
+    first = tailer.read(str(file))
+    with open(file, "a") as f:
+        f.write("3,3\n2024-01-04,4\n")
+    with patch.object(tailer.loader, "_read", wraps=tailer.loader._read) as read:
+        second = tailer.read(str(file))
+    third = tailer.read(str(file))
+
+    assert list(first["Close"]) == [1, 2]
+    assert list(second["Close"]) == [3, 4]
+    assert read.call_args.args[0].getvalue() == (
+        b"Date,Close\n2024-01-03,3\n2024-01-04,4\n"
+    )
+    assert third.empty
+    state = tailer.states[str(file)]
+    assert state.offset == file.stat().st_size
+    assert state.last_date == pd.Timestamp("2024-01-04")
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        (lambda f: f.write_text("Date,Open\n2024-01-01,1\n2024-01-02,2\n"), "Header"),
+        (lambda f: f.write_text("Date,Close\n2024-01-01,1\n"), "truncated"),
+        (lambda f: f.open("a").write("2024-01-01,3\n"), "increasing"),
+    ],
+)
+def test_csv_tailer_validates_continuity(tmp_path: Path, change, message) -> None:
+    """Test that rewritten headers, truncation and old dates raise DataLoadError."""
+    file = tmp_path / "quotes.csv"
+    file.write_text("Date,Close\n2024-01-01,1\n2024-01-02,2\n")
+    tailer = CSVTailer()
+    tailer.read(str(file))
+    state = tailer.states[str(file)]
+
+    change(file)
+
+    with pytest.raises(DataLoadError, match=message):
+        tailer.read(str(file))
+    assert tailer.states[str(file)] == state
+
+
+def test_csv_tail_source_streams_new_rows(tmp_path: Path) -> None:
+    """Test that the tail source yields the rows of every poll once."""
+    file = tmp_path / "quotes.csv"
+    file.write_text("Date,Close\n2024-01-01,1\n")
+    source = CSVTailSource([str(file)], interval=0, max_polls=2)
+
+    async def collect() -> list:
+        ticks = []
+        async for tick in source.stream():
+            ticks.append(tick)
+            with open(file, "a") as f:
+                f.write("2024-01-02,2\n")
+        return ticks
+
+    ticks = asyncio.run(collect())
+
+    assert [(t.symbol, t.price) for t in ticks] == [("quotes", 1.0), ("quotes", 2.0)]
+
+
+def test_csv_loader_empty_range(daily_csv: Path, csv_loader: CSVDataLoader) -> None:
+    """Test that a range without rows raises DataLoadError."""
+    with pytest.raises(DataLoadError, match="empty"):
+        csv_loader.load(str(daily_csv), start="2030-01-01")
+
+
 # -----------------------------
 # ExcelDataLoader Tests
 # -----------------------------
@@ -166,6 +425,19 @@ def test_excel_loader_valid(tmp_path: Path) -> None:
     assert loaded_df.index.name == "Date"
 
 
+def test_excel_loader_date_range(tmp_path: Path) -> None:
+    """Test that ExcelDataLoader applies the period relative to the latest row."""
+    file_path = tmp_path / "range.xlsx"
+    df = pd.DataFrame(
+        {"Date": pd.date_range("2024-01-01", periods=40), "Close": range(40)}
+    )
+    df.to_excel(file_path, index=False)
+
+    loaded_df = ExcelDataLoader().load(str(file_path), period="5d")
+
+    assert list(loaded_df["Close"]) == [35, 36, 37, 38, 39]
+
+
 # -----------------------------
 # YahooFinanceLoader Tests
 # -----------------------------
@@ -212,3 +484,405 @@ def test_yahoo_loader_success(monkeypatch: pytest.MonkeyPatch) -> None:
     assert isinstance(result, pd.DataFrame)
     assert not result.empty
     assert "Close" in result.columns
+
+
+def test_yahoo_loader_date_range(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that start/end are passed to yfinance with an exclusive end date."""
+    calls = {}
+
+    def fake_download(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        calls.update(kwargs)
+        return pd.DataFrame({"Close": [1.0]})
+
+    monkeypatch.setattr("yfinance.download", fake_download)
+
+    YahooFinanceLoader().load("AAPL", start="2024-01-01", end="2024-01-31")
+
+    assert str(calls["start"]) == "2024-01-01"
+    assert str(calls["end"]) == "2024-02-01"
+    assert "period" not in calls
+
+
+# -----------------------------
+# Streaming Source Tests
+# -----------------------------
+
+
+async def _collect(source) -> list:
+    """Collect all ticks from a source."""
+    return [tick async for tick in source.stream()]
+
+
+def test_replay_source_orders_ticks_by_time() -> None:
+    """Test that ReplaySource merges series in timestamp order."""
+    index = pd.date_range("2024-01-01", periods=3, freq="D")
+    source = ReplaySource(
+        {
+            "A": pd.Series([1.0, 2.0, 3.0], index=index),
+            "B": pd.Series([10.0, 20.0], index=index[1:] + pd.Timedelta(hours=1)),
+        }
+    )
+
+    ticks = asyncio.run(_collect(source))
+
+    assert [t.symbol for t in ticks] == ["A", "A", "B", "A", "B"]
+    assert source.symbols == ["A", "B"]
+
+
+def test_yahoo_polling_source_emits_only_new_rows() -> None:
+    """Test that repeated polls do not re-emit rows that were already seen."""
+    index = pd.date_range("2024-01-01", periods=3, freq="D")
+    frames = [
+        pd.DataFrame({"Close": [1.0, 2.0]}, index=index[:2]),
+        pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index),
+    ]
+
+    class FakeLoader:
+        def load(self, symbol: str, period: str) -> pd.DataFrame:
+            return frames.pop(0)
+
+    source = YahooPollingSource(["AAPL"], interval=0, loader=FakeLoader(), max_polls=2)
+
+    ticks = asyncio.run(_collect(source))
+
+    assert [t.price for t in ticks] == [1.0, 2.0, 3.0]
+
+
+def test_cross_rate_source_derives_requested_pairs() -> None:
+    """Test that crosses are quoted from the latest prices of their legs."""
+    plan = CurrencyGraph(["USDRUB", "EURRUB"]).plan(["USDRUB", "EURUSD"])
+    index = pd.date_range("2024-01-01", periods=2, freq="D")
+    quotes = ReplaySource(
+        {
+            "USDRUB=X": pd.Series([90.0, 100.0], index=index),
+            "EURRUB=X": pd.Series([99.0], index=index[:1] + pd.Timedelta(hours=1)),
+        }
+    )
+    source = CrossRateSource(quotes, plan, {"USDRUB=X": "USDRUB", "EURRUB=X": "EURRUB"})
+
+    ticks = asyncio.run(_collect(source))
+
+    assert source.symbols == ["USDRUB", "EURUSD"]
+    assert [(t.symbol, t.price) for t in ticks] == [
+        ("USDRUB", 90.0),
+        ("EURUSD", pytest.approx(1.1)),
+        ("USDRUB", 100.0),
+        ("EURUSD", pytest.approx(0.99)),
+    ]
+
+
+# -----------------------------
+# Alignment Tests
+# -----------------------------
+
+
+@pytest.fixture
+def calendars() -> dict[str, pd.Series]:
+    """Fixture returning a weekday stock series and a daily FX series."""
+    days = pd.date_range("2024-01-01", periods=10, freq="D")
+    stock = pd.Series(np.arange(10.0), index=days)[days.dayofweek < 5]
+    fx = pd.Series(np.arange(100.0, 110.0), index=days)
+    return {"AAPL": stock, "USDRUB": fx}
+
+
+def test_align_union_and_intersection(calendars) -> None:
+    """Test that union keeps every date and intersection only common dates."""
+    aligner = Aligner()
+
+    union = aligner.align(calendars, "union")
+    common = aligner.align(calendars, "intersection")
+
+    assert len(union) == 10 and union["AAPL"].isna().sum() == 2
+    assert len(common) == 8 and not common.isna().any().any()
+    pd.testing.assert_frame_equal(
+        common, pd.DataFrame(calendars).dropna(), check_freq=False
+    )
+
+
+def test_align_union_forward_fill_limit(calendars) -> None:
+    """Test that forward filling stops after the given number of rows."""
+    aligner = Aligner()
+
+    filled = aligner.align(calendars, "union", limit=1)
+    unlimited = aligner.align(calendars, "union", limit=None)
+
+    # 2024-01-06 and 01-07 are a weekend: only the first one is filled.
+    assert filled.loc["2024-01-06", "AAPL"] == 4.0
+    assert np.isnan(filled.loc["2024-01-07", "AAPL"])
+    assert unlimited.loc["2024-01-07", "AAPL"] == 4.0
+
+
+def test_align_asof_tolerance() -> None:
+    """Test that as-of alignment takes the last observation within tolerance."""
+    base = pd.Series(
+        [1.0, 2.0], index=pd.to_datetime(["2024-01-01 10:00", "2024-01-02 10:00"])
+    )
+    other = pd.Series([5.0], index=pd.to_datetime(["2024-01-01 09:00"]))
+
+    result = Aligner().align(
+        {"A": base, "B": other}, "asof", tolerance=pd.Timedelta("2h")
+    )
+
+    assert list(result.index) == list(base.index)
+    assert result["B"].iloc[0] == 5.0 and np.isnan(result["B"].iloc[1])
+
+
+def test_align_plan_cached_per_symbol_set(calendars) -> None:
+    """Test that a plan is reused while the inputs keep the same shape."""
+    aligner = Aligner()
+    first, _ = aligner.plan(calendars)
+    again, _ = aligner.plan(calendars)
+    grown = dict(
+        calendars,
+        USDRUB=pd.concat(
+            [calendars["USDRUB"], pd.Series([1.0], index=[pd.Timestamp("2024-02-01")])]
+        ),
+    )
+    rebuilt, _ = aligner.plan(grown)
+
+    assert again is first
+    assert rebuilt is not first and len(rebuilt.stamps) == 11
+
+
+def test_align_plan_rebuilt_for_moved_interior_dates() -> None:
+    """Test that a plan is not reused when only interior dates differ."""
+    aligner = Aligner()
+    dates = pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-04"])
+    moved = pd.to_datetime(["2024-01-01", "2024-01-03", "2024-01-04"])
+    other = pd.Series([1.0, 2.0, 3.0], index=dates)
+
+    aligner.align({"A": pd.Series([1.0, 2.0, 3.0], index=dates), "B": other})
+    result = aligner.align({"A": pd.Series([1.0, 2.0, 3.0], index=moved), "B": other})
+
+    assert len(result) == 4
+    assert result.loc["2024-01-03", "A"] == 2.0
+    assert np.isnan(result.loc["2024-01-02", "A"])
+
+
+def test_align_rejects_unknown_strategy(calendars) -> None:
+    """Test that an unsupported strategy raises ValueError."""
+    with pytest.raises(ValueError):
+        Aligner().align(calendars, "outer")
+
+
+# -----------------------------
+# SharedCache Tests
+# -----------------------------
+
+
+def _slow_fetch(directory: str, log: str) -> None:
+    """Fetch a value through the cache, recording every real computation."""
+
+    def compute() -> pd.DataFrame:
+        with open(log, "a") as f:
+            f.write("fetch\n")
+        time.sleep(0.3)
+        return pd.DataFrame({"Close": [1.0, 2.0]})
+
+    SharedCache(directory).get_or_compute("AAPL-1y", compute)
+
+
+def test_shared_cache_single_flight_across_processes(tmp_path: Path) -> None:
+    """Test that concurrent processes compute a missing key only once."""
+    log = tmp_path / "fetches.log"
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_slow_fetch, args=(str(tmp_path / "cache"), str(log)))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert log.read_text().count("fetch") == 1
+    cached = SharedCache(str(tmp_path / "cache")).get("AAPL-1y")
+    assert list(cached["Close"]) == [1.0, 2.0]
+
+
+def test_shared_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test that entries beyond the size budget are evicted oldest first."""
+    frame = pd.DataFrame({"Close": np.arange(1000.0)})
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.parquet"
+        SharedCache(str(tmp_path)).put(name, frame)
+        stamp = {"a": 1, "b": 3, "c": 2}[name]
+        os.utime(path, (stamp, time.time()))
+    cache = SharedCache(str(tmp_path), max_bytes=int(3.5 * path.stat().st_size))
+    cache.put("d", frame)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None and cache.get("d") is not None
+    assert cache.size() <= cache.max_bytes
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_shared_cache_ttl_expires_entries(tmp_path: Path) -> None:
+    """Test that entries older than the TTL are treated as missing."""
+    cache = SharedCache(str(tmp_path), ttl=60)
+    cache.put("key", pd.DataFrame({"Close": [1.0]}))
+    os.utime(tmp_path / "key.parquet", (time.time(), time.time() - 120))
+
+    assert cache.get("key") is None
+    fresh = cache.get_or_compute("key", lambda: pd.DataFrame({"Close": [2.0]}))
+    assert list(fresh["Close"]) == [2.0]
+
+
+def test_shared_cache_stores_parquet_and_removes_locks(tmp_path: Path) -> None:
+    """Test that entries are Parquet files and no lock file is left behind."""
+    frame = pd.DataFrame(
+        {("Close", "AAPL"): np.array([1.0, 2.0], dtype=np.float32)},
+        index=pd.date_range("2024-01-01", periods=2, name="Date"),
+    )
+    cache = SharedCache(str(tmp_path))
+
+    cached = cache.get_or_compute("AAPL-1y", lambda: frame)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["AAPL-1y.parquet"]
+    pd.testing.assert_frame_equal(cache.get("AAPL-1y"), frame, check_freq=False)
+    assert cached is frame
+
+
+def test_yahoo_loader_uses_shared_cache(tmp_path: Path) -> None:
+    """Test that identical requests through a cache download only once."""
+    frame = pd.DataFrame({"Close": [1.0, 2.0]})
+    cache = SharedCache(str(tmp_path))
+    with patch("data.api.yahoo_loader.yf.download", return_value=frame) as download:
+        first = YahooFinanceLoader(cache).load("AAPL", "1y")
+        second = YahooFinanceLoader(cache).load("AAPL", "1y")
+
+    assert download.call_count == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+# -----------------------------
+# Async Loader Tests
+# -----------------------------
+
+
+def test_async_csv_loader_load_many(tmp_path: Path) -> None:
+    """Test that several CSV files are loaded concurrently in input order."""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"prices_{i}.csv"
+        pd.DataFrame(
+            {
+                "Date": pd.date_range("2024-01-01", periods=2),
+                "Close": [i + 1.0, i + 2.0],
+            }
+        ).to_csv(path, index=False)
+        paths.append(str(path))
+
+    frames = asyncio.run(AsyncCSVDataLoader().load_many(paths))
+
+    assert list(frames) == paths
+    assert [frame["Close"].iloc[0] for frame in frames.values()] == [1, 2, 3]
+
+
+def test_async_yahoo_loader_limits_concurrency() -> None:
+    """Test that no more than max_concurrency requests run at the same time."""
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    class SlowLoader:
+        def load(self, symbol: str, period: str) -> pd.DataFrame:
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return pd.DataFrame({"Close": [1.0]})
+
+    loader = AsyncYahooFinanceLoader(max_concurrency=2, loader=SlowLoader())
+    symbols = [f"S{i}" for i in range(8)]
+
+    frames = asyncio.run(loader.load_many(symbols, "1y"))
+
+    assert list(frames) == symbols
+    assert state["peak"] == 2
+
+
+# -----------------------------
+# SymbolRegistry Tests
+# -----------------------------
+
+
+def test_symbol_registry_lookup_and_prefix_search(tmp_path: Path) -> None:
+    """Test lookup, prefix search and the lazily loaded NPZ round trip."""
+    registry = SymbolRegistry(
+        [SymbolInfo(f"S{i:05d}", "stock", "US", "USD", "XNYS") for i in range(20000)]
+        + [SymbolInfo("USDRUB", "currency", "FX", "RUB", "FX")]
+    )
+    path = tmp_path / "universe.npz"
+    registry.save(str(path))
+
+    loaded = SymbolRegistry.open(str(path))
+    assert loaded._symbols is None
+    assert len(loaded) == 20001
+    assert loaded.get("usdrub") == SymbolInfo("USDRUB", "currency", "FX", "RUB", "FX")
+    assert loaded.get("usdrub").yahoo_symbol == "USDRUB=X"
+    assert "S00042" in loaded and "MISSING" not in loaded
+    assert loaded.prefix("s0001", limit=3) == ["S00010", "S00011", "S00012"]
+    assert len(loaded.prefix("S1")) == 10000
+    assert loaded.symbols("currency") == ["USDRUB"]
+    assert loaded.unknown(["S00001", "USDRUB", "X"], "stock") == ["USDRUB", "X"]
+
+
+def test_symbol_registry_reads_csv(tmp_path: Path) -> None:
+    """Test CSV universes with optional columns and invalid asset classes."""
+    path = tmp_path / "universe.csv"
+    path.write_text("Symbol,Asset_Class,Currency\nmsft,,USD\nEURRUB,currency,RUB\n")
+
+    registry = SymbolRegistry.open(str(path))
+
+    assert registry.get("MSFT") == SymbolInfo("MSFT", "stock", "", "USD", "")
+    assert registry.symbols("currency") == ["EURRUB"]
+
+    path.write_text("symbol,asset_class\nBTC,crypto\n")
+    with pytest.raises(DataLoadError, match="crypto"):
+        len(SymbolRegistry.open(str(path)))
+    with pytest.raises(DataLoadError):
+        len(SymbolRegistry.open(str(tmp_path / "missing.csv")))
+
+
+# -----------------------------
+# CurrencyGraph Tests
+# -----------------------------
+
+
+def test_currency_graph_plans_minimal_downloads() -> None:
+    """Test that N x N pairs need N - 1 downloads and others route via a pivot."""
+    currencies = ["USD", "EUR", "GBP", "JPY", "RUB"]
+    matrix = [a + b for a in currencies for b in currencies if a != b]
+    plan = CurrencyGraph(matrix).plan(matrix)
+    assert len(plan.downloads) == len(currencies) - 1
+    assert len(plan.derived) == len(matrix) - len(currencies) + 1
+
+    graph = CurrencyGraph(["USDRUB", "EURRUB", "GBPRUB"])
+    plan = graph.plan(["EURUSD", "USDRUB"])
+    assert plan.downloads == ["USDRUB", "EURRUB"]
+    assert plan.derived == ["EURUSD"]
+    assert graph.can_derive("GBPEUR") and not graph.can_derive("CHFRUB")
+    with pytest.raises(ValueError, match="Cannot derive"):
+        graph.plan(["CHFUSD"])
+
+
+def test_currency_graph_derives_aligned_cross_rates() -> None:
+    """Test derived rates against hand-computed ratios on common dates."""
+    index = pd.date_range("2024-01-01", periods=4)
+    rates = {
+        "USDRUB": pd.Series([90.0, 91.0, 92.0, 93.0], index=index),
+        "EURRUB": pd.Series([100.0, 101.0, 103.0], index=index[[0, 1, 3]]),
+    }
+    plan = CurrencyGraph(rates).plan(["EURUSD", "RUBEUR", "USDRUB"])
+
+    result = plan.derive(rates)
+
+    assert list(result) == ["EURUSD", "RUBEUR", "USDRUB"]
+    assert result["USDRUB"] is rates["USDRUB"]
+    expected = rates["EURRUB"] / rates["USDRUB"].reindex(index[[0, 1, 3]])
+    np.testing.assert_allclose(result["EURUSD"], expected)
+    assert result["EURUSD"].index.equals(index[[0, 1, 3]])
+    np.testing.assert_allclose(result["RUBEUR"], 1 / rates["EURRUB"])
@@ -9,6 +9,8 @@ Tests cover:
 - Valid and invalid ticker arguments
 - Valid and invalid currency arguments
 - File path arguments for CSV and Excel
+- Date range arguments and explicit period detection
+- Export arguments
 - Behavior when no arguments are provided
 
 All tests use `pytest` and monkeypatch `sys.argv` to simulate command-line input.
@@ -72,3 +74,149 @@ def test_parser_no_args(monkeypatch: pytest.MonkeyPatch) -> None:
     assert args.csv is None
     assert args.excel is None
     assert args.period == "1y"
+    assert args.period_explicit is False
+
+
+def test_parser_date_range(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that --start/--end and an explicit --period are parsed."""
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["prog", "--csv", "f.csv", "--start", "2024-01-01", "--period", "1mo"],
+    )
+    args = parser.parse_arguments()
+    assert args.start == "2024-01-01"
+    assert args.end is None
+    assert args.period == "1mo"
+    assert args.period_explicit is True
+
+
+@pytest.mark.parametrize(
+    "dates",
+    [["--start", "yesterday"], ["--start", "2024-02-01", "--end", "2024-01-01"]],
+)
+def test_parser_invalid_date_range(monkeypatch: pytest.MonkeyPatch, dates) -> None:
+    """Test that malformed or reversed date ranges cause a SystemExit."""
+    monkeypatch.setattr(sys, "argv", ["prog", "--csv", "f.csv", *dates])
+    with pytest.raises(SystemExit) as e:
+        parser.parse_arguments()
+    assert e.value.code != 0
+
+
+def test_parser_export_options(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that export path, format, layout and compression are parsed."""
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["prog", "--tickers", "AAPL", "--export", "out.csv.gz", "--format", "csv"]
+        + ["--layout", "wide", "--compression", "gzip"],
+    )
+    args = parser.parse_arguments()
+    assert (args.export, args.format, args.layout, args.compression) == (
+        "out.csv.gz",
+        "csv",
+        "wide",
+        "gzip",
+    )
+
+
+def test_parser_matrices_require_export(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that --matrices is accepted with --export and rejected without it."""
+    argv = ["prog", "--tickers", "AAPL", "MSFT", "--matrices", "correlation"]
+    monkeypatch.setattr(sys, "argv", argv + ["--export", "corr.parquet"])
+    assert parser.parse_arguments().matrices == "correlation"
+
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as e:
+        parser.parse_arguments()
+    assert e.value.code != 0
+
+
+def test_parser_precision(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that --precision defaults to float64 and rejects unknown values."""
+    monkeypatch.setattr(sys, "argv", ["prog", "--csv", "f.csv"])
+    assert parser.parse_arguments().precision == "float64"
+
+    monkeypatch.setattr(
+        sys, "argv", ["prog", "--csv", "f.csv", "--precision", "float16"]
+    )
+    with pytest.raises(SystemExit):
+        parser.parse_arguments()
+
+
+def test_parser_max_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that --max-memory is parsed into bytes and rejects malformed sizes."""
+    monkeypatch.setattr(sys, "argv", ["prog", "--csv", "f.csv", "--max-memory", "2GB"])
+    assert parser.parse_arguments().max_memory == 2 * 1024**3
+
+    monkeypatch.setattr(sys, "argv", ["prog", "--csv", "f.csv", "--max-memory", "lots"])
+    with pytest.raises(SystemExit):
+        parser.parse_arguments()
+
+
+def test_parser_follow(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that --follow enables streaming and requires a CSV file."""
+    monkeypatch.setattr(sys, "argv", ["prog", "--csv", "f.csv", "--follow"])
+    assert parser.parse_arguments().stream
+
+    monkeypatch.setattr(sys, "argv", ["prog", "--tickers", "AAPL", "--follow"])
+    with pytest.raises(SystemExit):
+        parser.parse_arguments()
+
+
+def test_parser_sidecar(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that --sidecar needs a file source and no date range."""
+    monkeypatch.setattr(sys, "argv", ["prog", "--csv", "f.csv", "--sidecar"])
+    assert parser.parse_arguments().sidecar
+
+    for extra in (["--tickers", "AAPL"], ["--csv", "f.csv", "--period", "1mo"]):
+        monkeypatch.setattr(sys, "argv", ["prog", *extra, "--sidecar"])
+        with pytest.raises(SystemExit):
+            parser.parse_arguments()
+
+
+def test_parser_screen(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that --screen validates expressions, sources and the benchmark."""
+    monkeypatch.setattr(
+        sys, "argv", ["prog", "--tickers", "AAPL", "MSFT", "--screen", "--top", "1"]
+    )
+    args = parser.parse_arguments()
+    assert (args.screen, args.sort, args.top) == ("", "volatility", 1)
+
+    for argv in (
+        ["--tickers", "AAPL", "--screen", "alpha > 1"],
+        ["--tickers", "AAPL", "--screen", "--sort", "correlation"],
+        ["--tickers", "AAPL", "--screen", "--benchmark", "MSFT"],
+        ["--csv", "f.csv", "--screen"],
+    ):
+        monkeypatch.setattr(sys, "argv", ["prog", *argv])
+        with pytest.raises(SystemExit):
+            parser.parse_arguments()
+
+
+def test_parser_universe(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """Test that --universe validates symbols and selects all of them by default."""
+    universe = tmp_path / "universe.csv"
+    universe.write_text("symbol\nIBM\nORCL\n")
+
+    monkeypatch.setattr(sys, "argv", ["prog", "--universe", str(universe)])
+    args = parser.parse_arguments()
+    assert args.tickers == ["IBM", "ORCL"]
+    assert args.currencies is None
+    assert "IBM" in args.registry
+
+    monkeypatch.setattr(
+        sys, "argv", ["prog", "--universe", str(universe), "--tickers", "AAPL"]
+    )
+    with pytest.raises(SystemExit):
+        parser.parse_arguments()
+
+
+def test_parser_accepts_derivable_cross_pairs(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that cross pairs of supported currencies are accepted."""
+    monkeypatch.setattr(sys, "argv", ["prog", "--currencies", "eurusd", "USDRUB"])
+    assert parser.parse_arguments().currencies == ["EURUSD", "USDRUB"]
+
+    monkeypatch.setattr(sys, "argv", ["prog", "--currencies", "EURXYZ"])
+    with pytest.raises(SystemExit):
+        parser.parse_arguments()
@@ -5,26 +5,54 @@ Tests cover:
 - Data loading logic (from CSV, Excel, Yahoo API)
 - Stock and currency data processing
 - Analytical computations (returns, volatility)
-- Visualization rendering
+- Visualization rendering and min/max-preserving downsampling
+- Streaming analytics with backpressure and latency measurement
+- Memory budget accounting and spilling of cold series and results
 - Error handling for edge cases
 
 Mocks are used to isolate service behavior from external dependencies.
 """
 
+import asyncio
+import threading
+import time
+import tracemalloc
+import numpy as np
 import pytest
 import pandas as pd
 import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 from pandas import DataFrame
-from core.exceptions import DataLoadError
+from analysis.buffers import BufferPool
+from analysis.correlation import RollingCovariance
+from analysis.returns import ReturnsCalculator
+from analysis.volatility import VolatilityCalculator
+from core import memory
+from core.exceptions import DataLoadError, ExportError
+from core.memory import MemoryBudget, SpillStore
+from core.precision import get_policy
+from data.async_loader import DEFAULT_YAHOO_CONCURRENCY
+from data.stream_sources import ReplaySource, Tick
+from data.csv_loader import CSVDataLoader
+from data.symbols import SymbolInfo, SymbolRegistry
 from services.data_service import DataService
 from services.stock_service import StockService
+from services.export_service import ExportService
+from services.sidecar_service import SidecarService
+from services.replay_service import ReplayEngine, ReplayParameters
+from services.streaming_service import StreamingService
 from services.currency_service import CurrencyService
 from services.analysis import AnalysisService
+from services.downsampling import DownsamplePyramid, downsample, get_pyramid
 from services.visualization import (
     VisualizationService,
     StockVisualizationService,
     CurrencyVisualizationService,
+    RollingCorrelationVisualizationService,
+    AssetDashboard,
+    CurrencyDashboard,
+    StockDashboard,
 )
 
 # --- Analysis Service Tests ---
@@ -45,6 +73,565 @@ def test_analysis_service_analyze_multiple() -> None:
     assert set(results.keys()) == {"AAPL", "MSFT"}
 
 
+def test_analysis_service_analyze_multiple_is_columnar() -> None:
+    """Test that per-symbol views match per-series analysis and share arrays."""
+    index = pd.bdate_range("2024-01-01", periods=80)
+    prices = pd.Series(100 * np.exp(np.linspace(0, 0.2, 80) ** 2), index=index)
+    data = {"FULL": prices, "LATE": prices.iloc[30:] * 2, "SPARSE": prices.iloc[::2]}
+
+    results = AnalysisService.analyze_multiple(data, window=5)
+
+    assert len(results.index) == 79
+    for symbol, series in data.items():
+        expected = AnalysisService.analyze(series.to_frame("Close"), window=5)
+        for metric in ("returns", "volatility"):
+            pd.testing.assert_series_equal(
+                results[symbol][metric],
+                expected[metric].rename(series.name),
+                check_freq=False,
+            )
+    view = results["LATE"]["volatility"].to_numpy()
+    assert np.shares_memory(view, results.arrays["volatility"])
+    assert np.isnan(results.frame("returns")["LATE"].iloc[:29]).all()
+
+
+def test_analysis_service_analyze_portfolios() -> None:
+    """Test that analyze_portfolios evaluates every portfolio over the universe."""
+    index = pd.date_range("2024-01-01", periods=4)
+    data = {
+        "AAPL": pd.Series([100.0, 101.0, 103.0, 102.0], index=index),
+        "MSFT": pd.Series([200.0, 198.0, 202.0, 205.0], index=index),
+    }
+    weights = {"even": {"AAPL": 0.5, "MSFT": 0.5}, "aapl": {"AAPL": 1.0}}
+
+    result = AnalysisService.analyze_portfolios(data, weights)
+
+    assert list(result["returns"].columns) == ["even", "aapl"]
+    assert result["returns"]["aapl"].iloc[0] == pytest.approx(0.01)
+    assert set(result["volatility"].index) == {"even", "aapl"}
+    assert result["risk_contribution"].shape == (2, 2)
+
+
+@pytest.fixture
+def long_price_frame() -> DataFrame:
+    """Fixture returning a long random-walk price DataFrame with a date index."""
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 200_000)))
+    index = pd.date_range("2000-01-01", periods=len(close), freq="min")
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+def test_analysis_service_fused_matches_calculators(long_price_frame) -> None:
+    """Test that the fused path matches ReturnsCalculator and VolatilityCalculator."""
+    returns = ReturnsCalculator().calculate(long_price_frame["Close"])
+    volatility = VolatilityCalculator().calculate(returns)
+
+    result = AnalysisService.analyze(long_price_frame)
+
+    pd.testing.assert_series_equal(result["returns"], returns, rtol=1e-12)
+    pd.testing.assert_series_equal(
+        result["volatility"], volatility, rtol=1e-8, atol=1e-10
+    )
+
+
+def test_analysis_service_fallback_with_nan() -> None:
+    """Test that prices with gaps go through the calculators and drop NaNs."""
+    df = pd.DataFrame({"Close": [100.0, np.nan, 102.0, 104.0, 107.0]})
+    result = AnalysisService.analyze(df, window=2)
+    assert not result["returns"].isnull().any()
+    assert len(result["returns"]) == 2
+
+
+def test_analysis_service_writes_into_out(long_price_frame) -> None:
+    """Test that results are written into caller-provided buffers."""
+    n = len(long_price_frame) - 1
+    out = {"returns": np.empty(n), "volatility": np.empty(n)}
+
+    result = AnalysisService.analyze(long_price_frame, out=out)
+
+    assert np.shares_memory(result["returns"].to_numpy(), out["returns"])
+    assert np.shares_memory(result["volatility"].to_numpy(), out["volatility"])
+
+
+def test_analysis_service_buffer_pool_reuse(price_data: DataFrame) -> None:
+    """Test that buffers behind released results are reused by the next call."""
+    pool = BufferPool()
+    first = AnalysisService.analyze(price_data, window=2, out=pool)
+    backing = first["returns"].to_numpy()
+    pool.release(first)
+
+    result = AnalysisService.analyze(price_data, window=2, out=pool)
+
+    assert np.shares_memory(result["returns"].to_numpy(), backing)
+    assert len(pool._lent) == 1
+    # Results not backed by the pool (pandas fallback) are ignored.
+    pool.release(AnalysisService.analyze(pd.DataFrame({"Close": [1.0, np.nan, 2.0]})))
+
+
+def test_analysis_service_float32_precision(long_price_frame) -> None:
+    """Test that float32 results halve memory and stay within the error bounds."""
+    window = 21
+    expected = AnalysisService.analyze(long_price_frame, window)
+
+    result = AnalysisService.analyze(long_price_frame, window, precision="float32")
+
+    policy = get_policy("float32")
+    assert result["returns"].dtype == np.float32
+    assert result["volatility"].nbytes * 2 == expected["volatility"].nbytes
+    assert (result["returns"] - expected["returns"]).abs().max() <= (
+        policy.returns_atol()
+    )
+    error = (result["volatility"] - expected["volatility"]).abs().dropna()
+    bound = policy.volatility_atol(window, expected["volatility"].dropna())
+    assert (error <= bound).all()
+
+
+def test_memory_budget_spills_and_reloads_series() -> None:
+    """Test that cold series spill to memory maps and reload unchanged."""
+    budget = MemoryBudget(limit=20_000)
+    index = pd.bdate_range("2024-01-01", periods=1000)
+    expected = {
+        f"S{i}": pd.Series(np.arange(1000.0) * i, index=index) for i in range(4)
+    }
+    store = budget.store("loaders", expected)
+
+    assert isinstance(store, SpillStore)
+    assert [store.is_spilled(k) for k in store] == [True, True, True, False]
+    report = budget.report()
+    assert report["current"] <= 20_000 < report["peak"]
+    assert report["spilled"] == 3 * expected["S0"].memory_usage()
+
+    reloaded = store["S1"]
+    assert isinstance(reloaded.values, np.memmap)
+    pd.testing.assert_series_equal(reloaded, expected["S1"])
+    del store["S1"]
+    assert budget.report()["spilled"] == 2 * expected["S0"].memory_usage()
+
+
+def test_memory_budget_without_limit_tracks_usage() -> None:
+    """Test that tracked objects are released when collected and pools drop idle buffers."""
+    budget = MemoryBudget()
+    data = budget.store("loaders", {"A": np.ones(1000)})
+    assert type(data) is dict
+    assert budget.current == 8000
+    del data
+    assert budget.current == 0 and budget.peak == 8000
+
+    pool = BufferPool(budget=budget)
+    pool.release(pool.acquire(100))
+    assert budget.report()["categories"]["cache"] == 1600
+    assert pool.spill(1) == 1600
+    assert budget.report()["categories"]["cache"] == 0
+
+
+def test_analysis_service_results_spill_under_budget(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    """Test that spilled result arrays give the same results and exports."""
+    index = pd.bdate_range("2024-01-01", periods=500)
+    rng = np.random.default_rng(2)
+    data = {
+        f"S{i}": pd.Series(
+            100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500))), index=index
+        )
+        for i in range(8)
+    }
+    expected = AnalysisService.analyze_multiple(data)
+    monkeypatch.setattr(memory, "_budget", MemoryBudget(limit=40_000))
+
+    results = AnalysisService.analyze_multiple(data)
+
+    assert isinstance(results.arrays, SpillStore)
+    # The second array does not fit and is created in a spill file.
+    assert not isinstance(results.arrays["returns"], np.memmap)
+    assert isinstance(results.arrays["volatility"], np.memmap)
+    assert memory.get_budget().report()["peak"] <= 40_000
+    pd.testing.assert_series_equal(results["S3"]["returns"], expected["S3"]["returns"])
+    np.testing.assert_array_equal(
+        results.top("volatility", 3), expected.top("volatility", 3)
+    )
+    rows = ExportService.export(results, str(tmp_path / "out.csv"))
+    assert rows == ExportService.export(expected, str(tmp_path / "expected.csv"))
+
+
+@patch("data.api.yahoo_loader.YahooFinanceLoader.load")
+def test_load_data_spills_per_symbol_while_loading(
+    mock_load, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that loaded pairs spill one by one, keeping the peak near the limit."""
+    index = pd.bdate_range("2024-01-01", periods=5000)
+    mock_load.side_effect = lambda symbol, *args, **kwargs: pd.DataFrame(
+        {"Close": np.linspace(1.0, 2.0, 5000)}, index=index
+    )
+    size = pd.Series(np.ones(5000), index=index).memory_usage()
+    budget = MemoryBudget(limit=200_000)
+    monkeypatch.setattr(memory, "_budget", budget)
+
+    class Args:
+        csv = excel = tickers = None
+        currencies = ["USDRUB", "EURGBP", "AUDJPY", "CHFCAD", "NZDSEK", "NOKHKD"]
+        period = "1y"
+
+    data, _ = DataService.load_data(Args())
+
+    assert isinstance(data, SpillStore) and len(data) == 6
+    assert budget.report()["peak"] <= 200_000 + size
+    assert budget.spilled >= 3 * size
+    assert data.is_spilled("USDRUB")
+    rates = data["USDRUB"]
+    rates.iloc[0] = 5.0
+    assert rates.iloc[0] == 5.0 and rates.iloc[1] == pytest.approx(1.0002)
+
+
+def test_load_data_spills_large_frame(
+    monkeypatch: pytest.MonkeyPatch, args_csv
+) -> None:
+    """Test that a CSV frame larger than the limit is replaced by a memory map."""
+    dates = pd.bdate_range("2024-01-01", periods=3000)
+    expected = pd.DataFrame(
+        {"Close": np.linspace(100.0, 200.0, 3000), "Volume": 1000.0},
+        index=pd.Index(dates, name="Date"),
+    )
+    expected.to_csv(args_csv.csv)
+    budget = MemoryBudget(limit=50_000)
+    monkeypatch.setattr(memory, "_budget", budget)
+
+    data, _ = DataService.load_data(args_csv)
+
+    pd.testing.assert_frame_equal(data, expected, check_freq=False)
+    assert budget.current == 0 and budget.spilled == expected.memory_usage().sum()
+    data.iloc[0, 0] = 1.0
+    assert data.iloc[0, 0] == 1.0
+    del data
+    assert budget.spilled == 0
+
+
+def test_analysis_service_allocations(long_price_frame) -> None:
+    """Test with tracemalloc that only the two result arrays are allocated."""
+    array_bytes = (len(long_price_frame) - 1) * 8
+    AnalysisService.analyze(long_price_frame)
+
+    tracemalloc.start()
+    AnalysisService.analyze(long_price_frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 2.5 * array_bytes
+
+    out = {
+        "returns": np.empty(array_bytes // 8),
+        "volatility": np.empty(array_bytes // 8),
+    }
+    tracemalloc.start()
+    AnalysisService.analyze(long_price_frame, out=out)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 0.25 * array_bytes
+
+
+# --- StreamingService Tests ---
+
+
+def test_streaming_service_matches_batch_analysis(long_price_frame) -> None:
+    """Test that streamed metrics end at the batch analysis values."""
+    prices = long_price_frame["Close"].iloc[:2000]
+    service = StreamingService(ReplaySource({"X": prices}), emit_interval=0)
+    snapshots = []
+
+    final = asyncio.run(service.run(on_metrics=snapshots.append))
+
+    expected = AnalysisService.analyze(prices.to_frame())
+    assert final["volatility"]["X"] == pytest.approx(expected["volatility"].iloc[-1])
+    assert final["latency"]["count"] == len(prices)
+    # Every tick is emitted once; the final snapshot is not repeated.
+    assert len(snapshots) == len(prices) and snapshots[-1] is final
+
+
+def test_streaming_service_backpressure(long_price_frame) -> None:
+    """Test that the bounded queue never exceeds its capacity."""
+    prices = long_price_frame["Close"].iloc[:500]
+
+    class BurstSource(ReplaySource):
+        async def stream(self):
+            for timestamp, price in prices.items():
+                yield Tick("X", timestamp, price, time.perf_counter())
+
+    service = StreamingService(BurstSource({"X": prices}), queue_size=8)
+
+    final = asyncio.run(service.run(max_ticks=300))
+
+    assert final["latency"]["count"] == 300
+    assert 1 < service.max_queue_depth <= 8
+
+
+def test_streaming_service_propagates_source_errors() -> None:
+    """Test that failures in the source are raised from run()."""
+
+    class BrokenSource(ReplaySource):
+        async def stream(self):
+            raise DataLoadError("feed down")
+            yield
+
+    source = BrokenSource({"X": pd.Series([1.0], index=[pd.Timestamp("2024")])})
+    with pytest.raises(DataLoadError, match="feed down"):
+        asyncio.run(StreamingService(source).run())
+
+
+# --- ReplayEngine Tests ---
+
+
+def test_replay_engine_matches_calculators(long_price_frame) -> None:
+    """Test that chunked replay of several parameter sets matches batch calculators."""
+    prices = long_price_frame["Close"].iloc[:5000]
+    parameters = [(5, True), (21, True), (63, False)]
+    steps = []
+
+    result = ReplayEngine(prices, parameters, chunk_size=777).run(
+        on_step=lambda index, chunk: steps.append(len(index))
+    )
+
+    assert sum(steps) == len(prices) - 1
+    frame = result.to_frame()
+    for window, log_returns in parameters:
+        label = ReplayParameters(window, log_returns).label
+        returns = ReturnsCalculator().calculate(prices, log_returns=log_returns)
+        volatility = VolatilityCalculator().calculate(returns, window)
+        np.testing.assert_allclose(frame[(label, "returns")], returns, rtol=1e-12)
+        np.testing.assert_allclose(
+            frame[(label, "volatility")], volatility, rtol=1e-8, atol=1e-12
+        )
+
+
+def test_replay_engine_reads_store_and_writes_columns(tmp_path, price_data) -> None:
+    """Test the binary price store round trip and columnar npz output."""
+    store = tmp_path / "prices.npz"
+    ReplayEngine.write_store(str(store), price_data["Close"])
+
+    engine = ReplayEngine.from_file(str(store), parameters=[(2, True)])
+    result = engine.run()
+    result.write(str(tmp_path / "out.npz"))
+
+    with np.load(tmp_path / "out.npz") as saved:
+        assert set(saved.files) == {"index", "w2_log/returns", "w2_log/volatility"}
+        np.testing.assert_allclose(
+            saved["w2_log/returns"], result.columns["w2_log"]["returns"]
+        )
+        assert len(saved["index"]) == len(price_data) - 1
+
+
+# --- ExportService Tests ---
+
+
+@pytest.fixture
+def analysis_results(long_price_frame) -> dict:
+    """Fixture returning analyze_multiple results for two symbols."""
+    prices = long_price_frame["Close"].iloc[:300]
+    return AnalysisService.analyze_multiple({"AAA": prices, "BBB": prices.iloc[100:]})
+
+
+def test_export_long_csv_with_compression(tmp_path, analysis_results) -> None:
+    """Test that the long table holds one row per date and symbol."""
+    path = tmp_path / "results.csv.gz"
+
+    rows = ExportService.export(analysis_results, str(path), compression="gzip")
+
+    table = pd.read_csv(path, parse_dates=["date"])
+    assert rows == len(table) == 299 + 199
+    assert list(table.columns) == ["date", "symbol", "returns", "volatility"]
+    bbb = table[table["symbol"] == "BBB"]
+    np.testing.assert_allclose(
+        bbb["volatility"].to_numpy(),
+        analysis_results["BBB"]["volatility"].to_numpy(),
+        equal_nan=True,
+    )
+
+
+def test_export_wide_npz(tmp_path, analysis_results) -> None:
+    """Test that the wide table has one column per symbol and metric."""
+    path = tmp_path / "results.npz"
+
+    rows = ExportService.export(analysis_results, str(path), layout="wide")
+
+    with np.load(path) as saved:
+        assert rows == len(saved["date"]) == 299
+        assert set(saved.files) == {
+            "date",
+            "AAA.returns",
+            "AAA.volatility",
+            "BBB.returns",
+            "BBB.volatility",
+        }
+        assert np.isnan(saved["BBB.returns"][:100]).all()
+
+
+def test_export_parquet_requires_pyarrow(tmp_path, analysis_results) -> None:
+    """Test that a missing optional dependency raises ExportError."""
+    with patch("services.export_service.pa", None):
+        with pytest.raises(ExportError, match="pyarrow"):
+            ExportService.export(analysis_results, str(tmp_path / "r.parquet"))
+
+
+def test_export_parquet_round_trip(tmp_path, analysis_results) -> None:
+    """Test that a compressed Parquet export reads back with the same values."""
+    path = tmp_path / "results.parquet"
+
+    rows = ExportService.export(analysis_results, str(path), compression="zstd")
+
+    table = pd.read_parquet(path)
+    assert rows == len(table) == 299 + 199
+    assert list(table.columns) == ["date", "symbol", "returns", "volatility"]
+    np.testing.assert_allclose(
+        table.loc[table["symbol"] == "BBB", "returns"].to_numpy(),
+        analysis_results["BBB"]["returns"].to_numpy(),
+    )
+
+
+def test_export_arrow_round_trip(tmp_path, analysis_results) -> None:
+    """Test that a wide Arrow IPC export reads back with the same values."""
+    path = tmp_path / "results.arrow"
+
+    rows = ExportService.export(
+        analysis_results, str(path), layout="wide", compression="lz4"
+    )
+
+    table = pd.read_feather(path)
+    assert rows == len(table) == 299
+    np.testing.assert_allclose(
+        table["AAA.volatility"].to_numpy(),
+        analysis_results["AAA"]["volatility"].to_numpy(),
+        equal_nan=True,
+    )
+    assert table["BBB.returns"].iloc[:100].isna().all()
+
+
+@pytest.mark.parametrize(
+    "name", ["corr.parquet", "corr.arrow", "corr.csv.gz", "corr.npz"]
+)
+def test_export_matrices_streams_chunks(tmp_path, long_price_frame, name) -> None:
+    """Test that streamed matrix chunks equal the materialized long frame."""
+    prices = long_price_frame["Close"].iloc[:200]
+    data = {
+        "AAA": prices,
+        "BBB": prices.iloc[::-1].set_axis(prices.index),
+        "CCC": prices**2,
+    }
+    calc = RollingCovariance.from_prices(data, max_chunk_bytes=8 * 9 * 80)
+    expected = calc.to_frame().reset_index()
+    path = tmp_path / name
+
+    assert len(list(calc.chunks())) > 1
+    rows = ExportService.export_matrices(
+        calc.correlation_chunks(), calc.symbols, str(path)
+    )
+
+    if name.endswith(".npz"):
+        with np.load(path) as saved:
+            table = pd.DataFrame({f: saved[f] for f in saved.files})
+    elif name.endswith(".csv.gz"):
+        table = pd.read_csv(path)
+    else:
+        table = pd.read_parquet(path) if "parquet" in name else pd.read_feather(path)
+    assert rows == len(table) == len(expected)
+    assert list(table.columns) == ["date", "symbol", "AAA", "BBB", "CCC"]
+    assert list(table["symbol"]) == list(expected["level_1"])
+    np.testing.assert_allclose(
+        table[calc.symbols].to_numpy(), expected[calc.symbols].to_numpy()
+    )
+
+
+def test_export_rejects_codec_of_other_format(tmp_path, analysis_results) -> None:
+    """Test that codecs are checked per format before anything is written."""
+    path = tmp_path / "r.arrow"
+    with pytest.raises(ExportError, match="arrow compression: gzip"):
+        ExportService.export(analysis_results, str(path), compression="gzip")
+    with pytest.raises(ExportError, match="csv compression: snappy"):
+        ExportService.export(
+            analysis_results, str(tmp_path / "r.csv"), compression="snappy"
+        )
+    assert not path.exists()
+
+
+def test_export_rejects_unknown_format(tmp_path, analysis_results) -> None:
+    """Test that unsupported formats raise ExportError."""
+    with pytest.raises(ExportError):
+        ExportService.export(analysis_results, str(tmp_path / "r.bin"), fmt="xml")
+
+
+# --- Sidecar Tests ---
+
+
+@pytest.fixture
+def sidecar_csv(tmp_path):
+    """Fixture writing the first 200 rows of the example CSV; returns (path, rest)."""
+    with open("data_example/test_data.csv", encoding="utf-8-sig") as f:
+        lines = f.readlines()
+    path = tmp_path / "prices.csv"
+    path.write_text("".join(lines[:200]))
+    return str(path), lines[200:]
+
+
+def test_sidecar_reuses_stored_analysis(sidecar_csv, tmp_path) -> None:
+    """Test that a second load is served from the sidecar without parsing."""
+    path, _ = sidecar_csv
+    service = SidecarService(str(tmp_path / "cache"))
+    data, analysis = service.load(path)
+    assert service.last_mode == "full"
+
+    with patch("services.sidecar_service.CSVDataLoader._read") as read:
+        cached, cached_analysis = service.load(path)
+    read.assert_not_called()
+    assert service.last_mode == "hit"
+    pd.testing.assert_frame_equal(cached, data, check_freq=False)
+    pd.testing.assert_series_equal(
+        cached_analysis["volatility"], analysis["volatility"], check_freq=False
+    )
+    assert SidecarService(str(tmp_path / "cache"), window=10).path_for(path) != (
+        service.path_for(path)
+    )
+
+
+def test_sidecar_appends_match_full_analysis(sidecar_csv) -> None:
+    """Test that appended rows are analyzed incrementally like a full run."""
+    path, rest = sidecar_csv
+    service = SidecarService(window=5)
+    service.load(path)
+    with open(path, "a") as f:
+        f.writelines(rest)
+
+    data, analysis = service.load(path)
+
+    assert service.last_mode == "append"
+    expected = CSVDataLoader().load(path)
+    reference = AnalysisService.analyze(expected, window=5)
+    pd.testing.assert_frame_equal(data, expected, check_freq=False)
+    for metric in ("returns", "volatility"):
+        np.testing.assert_allclose(
+            analysis[metric].to_numpy(),
+            reference[metric].to_numpy(),
+            rtol=1e-12,
+            atol=1e-15,
+            equal_nan=True,
+        )
+    service.load(path)
+    assert service.last_mode == "hit"
+
+
+def test_sidecar_recomputes_rewritten_file(sidecar_csv) -> None:
+    """Test that changed earlier rows trigger a full reload."""
+    path, rest = sidecar_csv
+    service = SidecarService()
+    service.load(path)
+    with open(path) as f:
+        lines = f.readlines()
+    lines[1] = lines[1].replace(",", ",1", 1)
+    with open(path, "w") as f:
+        f.writelines(lines + rest)
+
+    data, _ = service.load(path)
+
+    assert service.last_mode == "full"
+    pd.testing.assert_frame_equal(data, CSVDataLoader().load(path), check_freq=False)
+
+
 # --- Visualization Tests ---
 
 
@@ -86,6 +673,135 @@ def test_currency_visualization(monkeypatch, price_data: DataFrame) -> None:
     assert shown.get("done")
 
 
+def test_rolling_correlation_visualization(monkeypatch) -> None:
+    """Test that rolling correlation visualization calls plt.show()."""
+    shown = {}
+    monkeypatch.setattr(plt, "show", lambda: shown.setdefault("done", True))
+    index = pd.date_range("2024-01-01", periods=30)
+    correlations = pd.DataFrame({"A/B": np.linspace(-1, 1, 30)}, index=index)
+    betas = pd.DataFrame({"A": np.ones(30), "B": np.full(30, 0.5)}, index=index)
+
+    RollingCorrelationVisualizationService.show(correlations, betas, "Rolling")
+    assert shown.get("done")
+
+
+def test_stock_dashboard_refresh_reuses_figure(price_data: DataFrame) -> None:
+    """Test that refreshes update existing lines and relayout only when needed."""
+    figures = len(plt.get_fignums())
+    prices = {"A": price_data["Close"], "B": price_data["Close"] * 2}
+    analysis = AnalysisService.analyze_multiple(prices, window=2)
+    dashboard = StockDashboard(blit=True)
+
+    dashboard.refresh(prices, analysis)
+    line = dashboard.axes[0].get_lines()[0]
+    background = dashboard._background
+    dashboard.refresh({k: v * 1.01 for k, v in prices.items()}, analysis)
+
+    assert dashboard.axes[0].get_lines()[0] is line
+    np.testing.assert_allclose(line.get_ydata(), price_data["Close"] * 1.01)
+    assert dashboard._background is background
+    assert len(plt.get_fignums()) == figures + 1
+
+    dashboard.refresh({k: v * 10 for k, v in prices.items()}, analysis)
+    assert dashboard._background is not background
+    assert dashboard.frame_times.count == 3
+    dashboard.close()
+
+
+def test_currency_dashboard_updates_heatmap_in_place(price_data: DataFrame) -> None:
+    """Test that heatmap values and labels are swapped without a rebuild."""
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2024-01-01", periods=30)
+    data = {
+        pair: pd.Series(100 + np.cumsum(rng.normal(size=30)), index=index)
+        for pair in ("USDRUB", "EURRUB")
+    }
+    dashboard = CurrencyDashboard("FX", blit=False)
+
+    dashboard.refresh(data)
+    mesh = dashboard._mesh
+    assert dashboard._texts[1].get_text() != "1"
+    data["EURRUB"] = data["USDRUB"] * 2
+    dashboard.refresh(data)
+
+    assert dashboard._mesh is mesh
+    assert np.asarray(mesh.get_array())[1] == pytest.approx(1.0)
+    assert dashboard._texts[1].get_text() == "1"
+    dashboard.close()
+
+    asset = AssetDashboard("Asset")
+    asset.refresh(price_data["Close"], AnalysisService.analyze(price_data, window=2))
+    assert [ax.get_lines()[0].get_label() for ax in asset.axes] == [
+        "Price",
+        "Returns",
+        "Volatility",
+    ]
+    asset.close()
+
+
+def test_downsample_preserves_extremes() -> None:
+    """Test that decimation keeps global peaks/troughs, endpoints and order."""
+    rng = np.random.default_rng(3)
+    series = pd.Series(
+        np.cumsum(rng.normal(size=500_000)),
+        index=pd.date_range("2000-01-01", periods=500_000, freq="min"),
+    )
+    series.iloc[:50] = np.nan
+
+    index, values = downsample(series, 800)
+
+    assert 800 <= len(values) < 20_000
+    assert np.nanmax(values) == series.max()
+    assert np.nanmin(values) == series.min()
+    assert index[-1] == series.index[-1]
+    assert index.is_monotonic_increasing
+
+
+def test_downsample_short_series_untouched(price_data: DataFrame) -> None:
+    """Test that series shorter than the pixel budget are returned in full."""
+    index, values = downsample(price_data["Close"], 800)
+    assert len(values) == len(price_data)
+
+
+def test_downsample_pyramid_cached_per_series() -> None:
+    """Test that the pyramid is built once per series object."""
+    series = pd.Series(np.arange(100_000, dtype=float))
+    first = get_pyramid(series)
+    assert get_pyramid(series) is first
+    assert get_pyramid(series.copy()) is not first
+
+    series.iloc[50_000] = 1e9
+    rebuilt = get_pyramid(series)
+    assert rebuilt is not first
+    assert 50_000 in rebuilt.select(800)
+
+
+def test_downsample_pyramid_levels_shrink() -> None:
+    """Test that each pyramid level has fewer buckets than the previous one."""
+    pyramid = DownsamplePyramid(np.arange(100_000, dtype=float))
+    sizes = [level.shape[0] for level in pyramid.levels]
+    assert sizes == sorted(sizes, reverse=True)
+    assert sizes[-1] <= 64
+
+
+def test_visualization_plots_decimated_lines(monkeypatch) -> None:
+    """Test that long histories are drawn with a bounded number of points."""
+    rng = np.random.default_rng(5)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, 300_000)))
+    df = pd.DataFrame(
+        {"Close": close},
+        index=pd.date_range("2000-01-01", periods=len(close), freq="min"),
+    )
+    analysis = AnalysisService.analyze(df)
+    monkeypatch.setattr(plt, "show", lambda: None)
+
+    VisualizationService.show(df["Close"], analysis, "Long")
+
+    line = plt.gcf().axes[0].get_lines()[0]
+    assert len(line.get_xdata()) < 50_000
+    plt.close("all")
+
+
 # --- DataService Tests ---
 
 
@@ -113,6 +829,20 @@ def test_load_data_csv_explicit_true_path(args_csv) -> None:
         assert "CSV" in title
 
 
+def test_load_data_csv_passes_date_range(args_csv) -> None:
+    """Test that date bounds and an explicit period reach the CSV loader."""
+    args_csv.start = "2024-01-01"
+    args_csv.end = None
+    args_csv.period_explicit = True
+
+    with patch("data.csv_loader.CSVDataLoader.load", return_value="csv") as load:
+        DataService.load_data(args_csv)
+
+    load.assert_called_once_with(
+        args_csv.csv, start="2024-01-01", end=None, period="1y"
+    )
+
+
 def test_load_data_excel_mock(args_excel) -> None:
     """Test loading data using a mocked Excel loader."""
     with patch("data.excel_loader.ExcelDataLoader.load", return_value="excel"):
@@ -155,6 +885,17 @@ def test_load_stocks_multiindex_with_close(mock_load) -> None:
     assert all(isinstance(series, pd.Series) for series in result.values())
 
 
+@patch("data.api.yahoo_loader.YahooFinanceLoader.load")
+def test_load_stocks_validates_against_registry(mock_load) -> None:
+    """Test that a registry rejects unknown tickers before downloading."""
+    registry = SymbolRegistry([SymbolInfo("AAPL"), SymbolInfo("USDRUB", "currency")])
+    service = StockService(registry=registry)
+
+    with pytest.raises(DataLoadError, match="USDRUB, IBM"):
+        service.load_stocks(["AAPL", "USDRUB", "IBM"])
+    mock_load.assert_not_called()
+
+
 @patch("data.api.yahoo_loader.YahooFinanceLoader.load")
 def test_load_stocks_multiindex_missing_close(mock_load) -> None:
     """Test missing 'Close' in MultiIndex raises DataLoadError."""
@@ -237,6 +978,126 @@ def test_load_data_currency_mock(mock_loader, args_currency) -> None:
     assert title == "Currency Pairs: USDRUB"
 
 
+@patch("data.api.yahoo_loader.YahooFinanceLoader.load")
+def test_load_data_async_currencies(mock_loader) -> None:
+    """Test that the async variant loads every pair concurrently."""
+    index = pd.date_range("2024-01-01", periods=3)
+    mock_loader.return_value = pd.DataFrame({"Close": [80.5, 81.2, 82.0]}, index=index)
+
+    class Args:
+        csv = excel = tickers = None
+        currencies = ["USDRUB", "EURRUB"]
+        period = "1y"
+
+    data, title = asyncio.run(DataService.load_data_async(Args()))
+
+    assert list(data) == ["USDRUB", "EURRUB"]
+    assert mock_loader.call_count == 2
+    assert title == "Currency Pairs: USDRUB, EURRUB"
+
+
+def test_load_stocks_async_limits_concurrency_across_calls() -> None:
+    """Test that concurrent calls on one service share the request limit."""
+    index = pd.date_range("2024-01-01", periods=3)
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def load(symbols, *args, **kwargs):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return pd.DataFrame({s: [1.0, 2.0, 3.0] for s in symbols}, index=index)
+
+    service = StockService()
+
+    async def run():
+        with patch.object(service.loader, "load", side_effect=load):
+            await asyncio.gather(
+                *(service.load_stocks_async([f"T{i}"]) for i in range(12))
+            )
+
+    with ThreadPoolExecutor(max_workers=12) as executor:
+        service.async_loader.executor = executor
+        asyncio.run(run())
+
+    assert active["max"] <= DEFAULT_YAHOO_CONCURRENCY
+
+
+@patch("data.api.yahoo_loader.YahooFinanceLoader.load")
+def test_load_data_async_limits_concurrency_across_requests(mock_loader) -> None:
+    """Test that separate load_data_async calls share the Yahoo request limit."""
+    index = pd.date_range("2024-01-01", periods=3)
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def load(symbol, *args, **kwargs):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index)
+
+    mock_loader.side_effect = load
+
+    class Args:
+        csv = excel = currencies = None
+        period = "1y"
+
+        def __init__(self, ticker: str) -> None:
+            self.tickers = [ticker]
+
+    async def run():
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=12)
+        )
+        await asyncio.gather(
+            *(DataService.load_data_async(Args(f"T{i}")) for i in range(12))
+        )
+
+    asyncio.run(run())
+
+    assert mock_loader.call_count == 12
+    assert active["max"] <= DEFAULT_YAHOO_CONCURRENCY
+
+
+def test_load_data_async_csv(args_csv) -> None:
+    """Test that the async variant parses files through the CSV loader."""
+    with patch("data.csv_loader.CSVDataLoader.load", return_value="csv"):
+        data, title = asyncio.run(DataService.load_data_async(args_csv))
+    assert data == "csv"
+    assert title.startswith("CSV")
+
+
+@patch("data.api.yahoo_loader.YahooFinanceLoader.load")
+def test_load_pairs_derives_cross_rates(mock_load) -> None:
+    """Test that pairs sharing currencies are derived instead of downloaded."""
+    index = pd.date_range("2024-01-01", periods=3)
+    quotes = {"USDRUB=X": [90.0, 91.0, 92.0], "EURRUB=X": [99.0, 100.1, 101.2]}
+    mock_load.side_effect = lambda symbol, *args, **kwargs: pd.DataFrame(
+        {"Close": quotes[symbol]}, index=index
+    )
+
+    result = CurrencyService().load_pairs(["USDRUB", "EURRUB", "EURUSD"])
+
+    assert mock_load.call_count == 2
+    np.testing.assert_allclose(result["EURUSD"], [1.1, 1.1, 1.1])
+
+    registry = SymbolRegistry(
+        [SymbolInfo(p, "currency") for p in ("USDRUB", "EURRUB", "GBPRUB")]
+    )
+    mock_load.reset_mock()
+    result = CurrencyService(registry=registry).load_pairs(["EURUSD"])
+    assert mock_load.call_count == 2
+    assert list(result) == ["EURUSD"]
+    with pytest.raises(DataLoadError, match="Cannot derive CHFUSD"):
+        CurrencyService(registry=registry).load_pairs(["CHFUSD"])
+
+
 @patch("data.api.yahoo_loader.YahooFinanceLoader.load")
 def test_load_pairs_normal_df(mock_load) -> None:
     """Test currency pair loading from a normal single-level DataFrame."""